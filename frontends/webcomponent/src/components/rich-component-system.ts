@@ -514,7 +514,10 @@ export class DataFrameComponentRenderer extends BaseComponentRenderer {
       striped = true,
       bordered = true,
       compact = false,
-      column_types = {}
+      column_types = {},
+      server_paginated = false,
+      source,
+      page_endpoint
     } = component.data;
 
     // Limit displayed rows
@@ -608,12 +611,132 @@ export class DataFrameComponentRenderer extends BaseComponentRenderer {
     `;
 
 
+    // Large results only carry the first page; fetch the rest from the server
+    if (server_paginated && source && page_endpoint) {
+      this.attachServerPagination(container, component, columns, column_types);
+      return container;
+    }
+
     // Add event listeners
     this.attachEventListeners(container, displayedData, columns);
 
     return container;
   }
 
+  private attachServerPagination(
+    container: HTMLElement,
+    component: RichComponent,
+    columns: string[],
+    columnTypes: Record<string, string>
+  ): void {
+    const { source, page_endpoint, page_size = 25, row_count = 0 } = component.data;
+    const state = {
+      page: 0,
+      totalRows: row_count as number,
+      sortBy: null as string | null,
+      sortDirection: 'asc' as 'asc' | 'desc',
+      search: ''
+    };
+
+    // Replace the client-side truncation note with a pager
+    container.querySelector('.dataframe-truncated')?.remove();
+    const pager = document.createElement('div');
+    pager.className = 'dataframe-pager';
+    pager.innerHTML = `
+      <button class="pager-prev" title="Previous page">‹</button>
+      <span class="pager-status"></span>
+      <button class="pager-next" title="Next page">›</button>
+    `;
+    container.querySelector('.dataframe-table-container')?.appendChild(pager);
+
+    const renderPager = () => {
+      const pageCount = Math.max(1, Math.ceil(state.totalRows / page_size));
+      const status = pager.querySelector('.pager-status');
+      if (status) status.textContent = `Page ${state.page + 1} of ${pageCount} (${state.totalRows} rows)`;
+      (pager.querySelector('.pager-prev') as HTMLButtonElement).disabled = state.page === 0;
+      (pager.querySelector('.pager-next') as HTMLButtonElement).disabled = state.page >= pageCount - 1;
+    };
+
+    const loadPage = async () => {
+      try {
+        const response = await fetch(page_endpoint, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          credentials: 'include',
+          body: JSON.stringify({
+            source,
+            page: state.page,
+            page_size,
+            sort_by: state.sortBy,
+            sort_direction: state.sortDirection,
+            search: state.search || null
+          })
+        });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const result = await response.json();
+        state.totalRows = result.total_rows;
+
+        const tbody = container.querySelector('tbody');
+        if (tbody) {
+          tbody.innerHTML = result.rows.map((row: any) => `
+            <tr>
+              ${columns.map(col => {
+                const columnType = columnTypes[col] || 'string';
+                return `<td class="cell-${columnType}">${this.formatCellValue(row[col], columnType)}</td>`;
+              }).join('')}
+            </tr>
+          `).join('');
+        }
+        renderPager();
+      } catch (error) {
+        console.error('Failed to load DataFrame page:', error);
+      }
+    };
+
+    pager.querySelector('.pager-prev')?.addEventListener('click', () => {
+      if (state.page > 0) {
+        state.page -= 1;
+        loadPage();
+      }
+    });
+    pager.querySelector('.pager-next')?.addEventListener('click', () => {
+      state.page += 1;
+      loadPage();
+    });
+
+    let searchTimer: number | undefined;
+    const searchInput = container.querySelector('.search-input') as HTMLInputElement;
+    searchInput?.addEventListener('input', (e) => {
+      window.clearTimeout(searchTimer);
+      searchTimer = window.setTimeout(() => {
+        state.search = (e.target as HTMLInputElement).value;
+        state.page = 0;
+        loadPage();
+      }, 300);
+    });
+
+    container.querySelectorAll('th.sortable').forEach(header => {
+      header.addEventListener('click', (e) => {
+        const column = (e.currentTarget as HTMLElement).dataset.column;
+        if (!column) return;
+        state.sortDirection = state.sortBy === column && state.sortDirection === 'asc' ? 'desc' : 'asc';
+        state.sortBy = column;
+        container.querySelectorAll('th .sort-indicator').forEach(indicator => {
+          indicator.textContent = '';
+        });
+        const indicator = (e.currentTarget as HTMLElement).querySelector('.sort-indicator');
+        if (indicator) indicator.textContent = state.sortDirection === 'asc' ? '↑' : '↓';
+        state.page = 0;
+        loadPage();
+      });
+    });
+
+    // Export only has the current page on the client; hide it for server-side data
+    container.querySelector('.export-btn')?.remove();
+
+    renderPager();
+  }
+
   private formatCellValue(value: any, columnType: string): string {
     if (value === null || value === undefined) {
       return '<em class="null-value">NULL</em>';
@@ -898,6 +898,23 @@ export const richComponentStyles = css`
     font-size: 0.875rem;
   }
 
+  .dataframe-pager {
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    gap: var(--vanna-space-3);
+    padding: var(--vanna-space-3) var(--vanna-space-5);
+    color: var(--vanna-foreground-dimmer);
+    background: var(--vanna-background-root);
+    border-top: 1px solid var(--vanna-outline-dimmer);
+    font-size: 0.875rem;
+  }
+
+  .dataframe-pager button:disabled {
+    opacity: 0.4;
+    cursor: default;
+  }
+
   .dataframe-empty {
     padding: var(--vanna-space-8) var(--vanna-space-5);
     text-align: center;
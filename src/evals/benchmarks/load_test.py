@@ -0,0 +1,501 @@
+"""
+Agent Pipeline Load Test
+
+This script measures the framework's own overhead, without any network
+calls: a scripted MockLlmService searches agent memory and runs SQL against
+a generated SQLite dataset for every message, while N concurrent
+conversations are driven through ChatHandler or the FastAPI app.
+
+It reports throughput, end-to-end and per-stage latency percentiles and
+peak RSS as JSON, so results from two versions can be compared.
+
+Run from repository root:
+    PYTHONPATH=src python src/evals/benchmarks/load_test.py \\
+        --conversations 200 --concurrency 20 --output load_test.json
+    PYTHONPATH=src python src/evals/benchmarks/load_test.py \\
+        --baseline load_test.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import vanna
+from vanna import Agent
+from vanna.capabilities.agent_memory import AgentMemory
+from vanna.core.agent.config import AgentConfig
+from vanna.core.registry import ToolRegistry
+from vanna.core.tool import ToolCall, ToolContext
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import (
+    InMemoryMetricsProvider,
+    LocalFileSystem,
+    MemoryConversationStore,
+)
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+from vanna.integrations.sqlite import SqliteRunner
+from vanna.servers.base import ChatHandler, ChatRequest
+from vanna.tools import RunSqlTool
+from vanna.tools.agent_memory import SearchSavedCorrectToolUsesTool
+
+REGIONS = ["north", "south", "east", "west"]
+PRODUCTS = ["widget", "gadget", "gizmo", "doohickey", "sprocket"]
+
+QUERY_SQL = (
+    "SELECT c.region, COUNT(*) AS orders, SUM(o.amount) AS revenue "
+    "FROM orders o JOIN customers c ON c.id = o.customer_id "
+    "GROUP BY c.region ORDER BY revenue DESC"
+)
+
+
+class BenchmarkUserResolver(UserResolver):
+    """Resolves each conversation's user from the ``x-user`` header."""
+
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        user_id = request_context.get_header("x-user") or "bench"
+        return User(id=user_id, group_memberships=["user"])
+
+
+def generate_dataset(path: Path, rows: int, seed: int) -> None:
+    """Create a customers/orders SQLite database with deterministic data."""
+    rng = random.Random(seed)
+    customers = max(rows // 10, 1)
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT, region TEXT);
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY,
+            customer_id INTEGER REFERENCES customers (id),
+            product TEXT,
+            amount REAL
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO customers VALUES (?, ?, ?)",
+        [(i, f"customer {i}", rng.choice(REGIONS)) for i in range(customers)],
+    )
+    conn.executemany(
+        "INSERT INTO orders VALUES (?, ?, ?, ?)",
+        [
+            (
+                i,
+                rng.randrange(customers),
+                rng.choice(PRODUCTS),
+                round(rng.uniform(1, 500), 2),
+            )
+            for i in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def make_demo_memory(work_dir: Path) -> AgentMemory:
+    return DemoAgentMemory()
+
+
+def make_chromadb_memory(work_dir: Path) -> AgentMemory:
+    from vanna.integrations.chromadb import ChromaAgentMemory
+
+    return ChromaAgentMemory(persist_directory=str(work_dir / "chroma"))
+
+
+def make_faiss_memory(work_dir: Path) -> AgentMemory:
+    from vanna.integrations.faiss import FAISSAgentMemory
+
+    return FAISSAgentMemory(persist_path=str(work_dir / "faiss"))
+
+
+def make_qdrant_memory(work_dir: Path) -> AgentMemory:
+    from vanna.integrations.qdrant import QdrantAgentMemory
+
+    return QdrantAgentMemory(path=str(work_dir / "qdrant"))
+
+
+# Backends other than "demo" need their optional dependencies, and may need
+# to download an embedding model on first use
+MEMORY_BACKENDS: Dict[str, Callable[[Path], AgentMemory]] = {
+    "demo": make_demo_memory,
+    "chromadb": make_chromadb_memory,
+    "faiss": make_faiss_memory,
+    "qdrant": make_qdrant_memory,
+}
+
+
+async def seed_memory(memory: AgentMemory, items: int, seed: int) -> None:
+    """Save deterministic tool usages so memory searches have work to do."""
+    rng = random.Random(seed)
+    context = ToolContext(
+        user=User(id="seed"),
+        conversation_id="seed",
+        request_id="seed",
+        agent_memory=memory,
+    )
+    for i in range(items):
+        region = rng.choice(REGIONS)
+        product = rng.choice(PRODUCTS)
+        await memory.save_tool_usage(
+            question=f"What was the {product} revenue in the {region} region? #{i}",
+            tool_name="run_sql",
+            args={"sql": f"SELECT SUM(amount) FROM orders WHERE product = '{product}'"},
+            context=context,
+        )
+
+
+def build_agent(
+    memory: AgentMemory,
+    database_path: Path,
+    work_dir: Path,
+    metrics: InMemoryMetricsProvider,
+    llm_latency: float,
+    stream: bool,
+) -> Agent:
+    """Build an agent whose LLM searches memory, then runs SQL, then answers."""
+    llm = MockLlmService(
+        response_content="Revenue is highest in the north region.",
+        tool_call_script=[
+            [
+                ToolCall(
+                    id="search",
+                    name="search_saved_correct_tool_uses",
+                    arguments={"question": "revenue by region"},
+                )
+            ],
+            [ToolCall(id="sql", name="run_sql", arguments={"sql": QUERY_SQL})],
+        ],
+        latency=llm_latency,
+        chunk_latency=0.0,
+    )
+
+    registry = ToolRegistry()
+    registry.register_local_tool(SearchSavedCorrectToolUsesTool(), access_groups=[])
+    registry.register_local_tool(
+        RunSqlTool(
+            SqliteRunner(str(database_path)),
+            file_system=LocalFileSystem(str(work_dir / "files")),
+        ),
+        access_groups=[],
+    )
+
+    return Agent(
+        llm_service=llm,
+        tool_registry=registry,
+        user_resolver=BenchmarkUserResolver(),
+        conversation_store=MemoryConversationStore(),
+        agent_memory=memory,
+        config=AgentConfig(stream_responses=stream),
+        observability_provider=metrics,
+    )
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Exact p50/p95/p99, mean and max of a list of latencies."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "mean": sum(ordered) / len(ordered),
+        "max": ordered[-1],
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class TurnDriver:
+    """Sends one message and returns (first chunk ms, total ms, chunk count)."""
+
+    async def start(self, agent: Agent) -> None:
+        pass
+
+    async def send(
+        self, user_id: str, conversation_id: str, message: str
+    ) -> Dict[str, float]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class ChatHandlerDriver(TurnDriver):
+    """Drives the agent in process through ChatHandler."""
+
+    async def start(self, agent: Agent) -> None:
+        self.handler = ChatHandler(agent)
+
+    async def send(
+        self, user_id: str, conversation_id: str, message: str
+    ) -> Dict[str, float]:
+        request = ChatRequest(
+            message=message,
+            conversation_id=conversation_id,
+            request_context=RequestContext(headers={"x-user": user_id}),
+        )
+        start = time.perf_counter()
+        first: Optional[float] = None
+        chunks = 0
+        async for _ in self.handler.handle_stream(request):
+            if first is None:
+                first = time.perf_counter()
+            chunks += 1
+        end = time.perf_counter()
+        return {
+            "first_chunk_ms": ((first or end) - start) * 1000,
+            "total_ms": (end - start) * 1000,
+            "chunks": chunks,
+        }
+
+
+class FastAPIDriver(TurnDriver):
+    """Drives the FastAPI app's SSE endpoint in process over ASGI.
+
+    httpx's ASGI transport delivers the response body only once the app has
+    finished, so first-chunk latency equals total latency here.
+    """
+
+    async def start(self, agent: Agent) -> None:
+        import httpx
+
+        from vanna.servers.fastapi import VannaFastAPIServer
+
+        app = VannaFastAPIServer(agent).create_app()
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            timeout=None,
+        )
+
+    async def send(
+        self, user_id: str, conversation_id: str, message: str
+    ) -> Dict[str, float]:
+        start = time.perf_counter()
+        first: Optional[float] = None
+        chunks = 0
+        async with self.client.stream(
+            "POST",
+            "/api/vanna/v2/chat_sse",
+            json={"message": message, "conversation_id": conversation_id},
+            headers={"x-user": user_id},
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: ") or line == "data: [DONE]":
+                    continue
+                if first is None:
+                    first = time.perf_counter()
+                chunks += 1
+        end = time.perf_counter()
+        return {
+            "first_chunk_ms": ((first or end) - start) * 1000,
+            "total_ms": (end - start) * 1000,
+            "chunks": chunks,
+        }
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+DRIVERS: Dict[str, Callable[[], TurnDriver]] = {
+    "handler": ChatHandlerDriver,
+    "fastapi": FastAPIDriver,
+}
+
+
+async def run_scenario(
+    memory_backend: str, transport: str, args: argparse.Namespace, work_dir: Path
+) -> Dict[str, Any]:
+    """Run all conversations against one memory backend and transport."""
+    scenario_dir = work_dir / f"{memory_backend}-{transport}"
+    scenario_dir.mkdir()
+    database_path = scenario_dir / "bench.sqlite"
+    generate_dataset(database_path, args.rows, args.seed)
+
+    memory = MEMORY_BACKENDS[memory_backend](scenario_dir)
+    await seed_memory(memory, args.memory_items, args.seed)
+
+    metrics = InMemoryMetricsProvider()
+    agent = build_agent(
+        memory, database_path, scenario_dir, metrics, args.llm_latency, args.stream
+    )
+    driver = DRIVERS[transport]()
+    await driver.start(agent)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    turns: List[Dict[str, float]] = []
+    errors: List[str] = []
+
+    async def conversation(index: int) -> None:
+        async with semaphore:
+            for turn in range(args.turns):
+                try:
+                    turns.append(
+                        await driver.send(
+                            f"user-{index % args.users}",
+                            f"conversation-{index}",
+                            f"What is the revenue by region? (turn {turn})",
+                        )
+                    )
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(conversation(i) for i in range(args.conversations)))
+    wall_time = time.perf_counter() - start
+    await driver.close()
+
+    return {
+        "memory_backend": memory_backend,
+        "transport": transport,
+        "turns": len(turns),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "wall_time_s": wall_time,
+        "throughput_turns_per_s": len(turns) / wall_time if wall_time else 0.0,
+        "turn_latency_ms": percentiles([t["total_ms"] for t in turns]),
+        "first_chunk_latency_ms": percentiles([t["first_chunk_ms"] for t in turns]),
+        "chunks_per_turn": (sum(t["chunks"] for t in turns) / len(turns))
+        if turns
+        else 0.0,
+        "stages_ms": {
+            name: metrics.summary(name) for name in metrics.histogram_names()
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print relative changes of the headline numbers against a baseline run."""
+    previous = {
+        (r["memory_backend"], r["transport"]): r for r in baseline.get("results", [])
+    }
+    print(f"Compared with vanna {baseline.get('vanna_version', '?')}:")
+    for result in results["results"]:
+        key = (result["memory_backend"], result["transport"])
+        old = previous.get(key)
+        if old is None:
+            print(f"  {key[0]}/{key[1]}: no baseline")
+            continue
+        for label, new_value, old_value in [
+            (
+                "throughput",
+                result["throughput_turns_per_s"],
+                old["throughput_turns_per_s"],
+            ),
+            ("p50", result["turn_latency_ms"]["p50"], old["turn_latency_ms"]["p50"]),
+            ("p99", result["turn_latency_ms"]["p99"], old["turn_latency_ms"]["p99"]),
+            ("peak RSS", result["peak_rss_mb"], old["peak_rss_mb"]),
+        ]:
+            change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+            print(
+                f"  {key[0]}/{key[1]} {label}: "
+                f"{old_value:.2f} -> {new_value:.2f} ({change:+.1f}%)"
+            )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="vanna-load-test-") as tmp:
+        for memory_backend in args.memory:
+            for transport in args.transport:
+                print(f"Running {memory_backend}/{transport}...", file=sys.stderr)
+                try:
+                    results.append(
+                        await run_scenario(memory_backend, transport, args, Path(tmp))
+                    )
+                except ImportError as e:
+                    print(f"  skipped: {e}", file=sys.stderr)
+                    results.append(
+                        {
+                            "memory_backend": memory_backend,
+                            "transport": transport,
+                            "skipped": str(e),
+                        }
+                    )
+
+    return {
+        "benchmark": "agent_load_test",
+        "vanna_version": vanna.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: value for key, value in vars(args).items() if key != "baseline"
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--turns", type=int, default=2, help="Messages per conversation"
+    )
+    parser.add_argument("--users", type=int, default=10, help="Distinct users")
+    parser.add_argument("--rows", type=int, default=10_000, help="Orders generated")
+    parser.add_argument("--memory-items", type=int, default=500)
+    parser.add_argument(
+        "--llm-latency",
+        type=float,
+        default=0.0,
+        help="Simulated seconds per LLM request (0 measures pure overhead)",
+    )
+    parser.add_argument("--stream", action="store_true", help="Stream LLM responses")
+    parser.add_argument(
+        "--memory",
+        nargs="+",
+        default=["demo"],
+        choices=sorted(MEMORY_BACKENDS),
+        help="Agent memory backends to run",
+    )
+    parser.add_argument(
+        "--transport", nargs="+", default=["handler"], choices=sorted(DRIVERS)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the load test and print or save the JSON results."""
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"Results saved to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.baseline:
+        compare(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
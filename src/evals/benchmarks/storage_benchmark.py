@@ -0,0 +1,438 @@
+"""
+Storage Micro-Benchmarks
+
+This script compares AgentMemory backends and SqlRunner implementations on
+synthetic data generated from fixed seeds, fully offline:
+
+- memory backends: insert throughput, search latency and recall@k as the
+  collection grows, and reload time for persistent backends. Each query is
+  a perturbed copy of one stored question, which is the expected hit; an
+  exhaustive token-overlap search is reported as the brute-force baseline.
+- SQL runners: time to fetch results of 1 to 1M rows into a DataFrame.
+
+Backends whose optional dependencies are missing are reported as skipped.
+Results are printed as Markdown comparison tables and can be saved as JSON.
+
+Run from repository root:
+    PYTHONPATH=src python src/evals/benchmarks/storage_benchmark.py
+    PYTHONPATH=src python src/evals/benchmarks/storage_benchmark.py \\
+        --sizes 1000 10000 --row-counts 1 1000 1000000 --output storage.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import platform
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+import vanna
+from vanna.capabilities.agent_memory import AgentMemory
+from vanna.capabilities.sql_runner import RunSqlToolArgs, SqlRunner
+from vanna.core.tool import ToolContext
+from vanna.core.user import User
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+
+METRICS = ["revenue", "order count", "average price", "margin", "refund rate"]
+DIMENSIONS = ["region", "product", "customer segment", "sales rep", "channel"]
+PERIODS = ["last week", "last month", "this quarter", "2023", "year to date"]
+FILTERS = ["for enterprise accounts", "in Europe", "for new customers", "", ""]
+
+EMBEDDING_DIMENSION = 384
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokens(text: str) -> Set[str]:
+    return set(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def generate_questions(count: int, seed: int) -> List[str]:
+    """Generate distinct analytics questions from templates."""
+    rng = random.Random(seed)
+    questions = []
+    for i in range(count):
+        question = (
+            f"What was the {rng.choice(METRICS)} by {rng.choice(DIMENSIONS)} "
+            f"{rng.choice(PERIODS)} {rng.choice(FILTERS)}".strip()
+        )
+        # The suffix keeps questions distinct, like real question wording does
+        questions.append(f"{question} (report {i})")
+    return questions
+
+
+def perturb(question: str, rng: random.Random) -> str:
+    """Drop one word and swap two neighbours, keeping the report marker."""
+    words = question.split()
+    if len(words) > 4:
+        del words[rng.randrange(1, len(words) - 2)]
+        i = rng.randrange(1, len(words) - 3)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    return " ".join(words)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": 0.0, "p99": 0.0}
+    return {
+        "p50": ordered[min(len(ordered) - 1, int(0.50 * len(ordered)))],
+        "p99": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+    }
+
+
+class HashingEmbeddingFunction:
+    """Deterministic offline embedding for ChromaDB (hashed bag of words)."""
+
+    def __call__(self, input: Sequence[str]) -> List[List[float]]:
+        vectors = []
+        for text in input:
+            vector = [0.0] * EMBEDDING_DIMENSION
+            for token in tokens(text):
+                digest = hashlib.md5(token.encode()).digest()
+                vector[int.from_bytes(digest[:4], "little") % EMBEDDING_DIMENSION] += 1
+            norm = sum(v * v for v in vector) ** 0.5 or 1.0
+            vectors.append([v / norm for v in vector])
+        return vectors
+
+
+def make_demo(path: Path) -> AgentMemory:
+    return DemoAgentMemory(max_items=10_000_000)
+
+
+def make_faiss(path: Path) -> AgentMemory:
+    from vanna.integrations.faiss import FAISSAgentMemory
+
+    return FAISSAgentMemory(persist_path=str(path))
+
+
+def make_chromadb(path: Path) -> AgentMemory:
+    from vanna.integrations.chromadb import ChromaAgentMemory
+
+    return ChromaAgentMemory(
+        persist_directory=str(path), embedding_function=HashingEmbeddingFunction()
+    )
+
+
+def make_qdrant(path: Path) -> AgentMemory:
+    from vanna.integrations.qdrant import QdrantAgentMemory
+
+    return QdrantAgentMemory(path=str(path))
+
+
+# name -> (factory, whether a new instance on the same path reloads the data)
+MEMORY_BACKENDS: Dict[str, Any] = {
+    "demo": (make_demo, False),
+    "faiss": (make_faiss, True),
+    "chromadb": (make_chromadb, True),
+    "qdrant": (make_qdrant, True),
+}
+
+
+def make_context(memory: AgentMemory) -> ToolContext:
+    return ToolContext(
+        user=User(id="bench"),
+        conversation_id="bench",
+        request_id="bench",
+        agent_memory=memory,
+    )
+
+
+async def search_items(
+    memory: AgentMemory, query: str, context: ToolContext, k: int
+) -> List[int]:
+    results = await memory.search_similar_usage(
+        query, context, limit=k, similarity_threshold=0.0
+    )
+    return [result.memory.args.get("item", -1) for result in results]
+
+
+async def bench_memory(
+    name: str,
+    size: int,
+    queries: List[Any],
+    questions: List[str],
+    k: int,
+    work_dir: Path,
+) -> Dict[str, Any]:
+    """Insert ``size`` questions into a fresh backend and search it."""
+    factory, persistent = MEMORY_BACKENDS[name]
+    path = work_dir / f"{name}-{size}"
+    memory = factory(path)
+    context = make_context(memory)
+
+    start = time.perf_counter()
+    for item, question in enumerate(questions[:size]):
+        await memory.save_tool_usage(
+            question=question,
+            tool_name="run_sql",
+            args={"item": item, "sql": f"SELECT {item}"},
+            context=context,
+        )
+    insert_time = time.perf_counter() - start
+
+    latencies = []
+    hits = 0
+    for query, expected in queries:
+        start = time.perf_counter()
+        found = await search_items(memory, query, context, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += expected in found
+
+    result: Dict[str, Any] = {
+        "backend": name,
+        "size": size,
+        "insert_per_s": size / insert_time if insert_time else 0.0,
+        "search_ms": percentiles(latencies),
+        f"recall_at_{k}": hits / len(queries) if queries else 0.0,
+        "reload_s": None,
+    }
+
+    if persistent:
+        del memory
+        start = time.perf_counter()
+        reloaded = factory(path)
+        await search_items(reloaded, queries[0][0], make_context(reloaded), k)
+        result["reload_s"] = time.perf_counter() - start
+
+    return result
+
+
+def bench_brute_force(
+    size: int, queries: List[Any], questions: List[str], k: int
+) -> Dict[str, Any]:
+    """Exhaustive token-overlap (Jaccard) search, the reference for recall."""
+    corpus = [tokens(q) for q in questions[:size]]
+    latencies = []
+    hits = 0
+    for query, expected in queries:
+        start = time.perf_counter()
+        query_tokens = tokens(query)
+        scores = [len(query_tokens & doc) / len(query_tokens | doc) for doc in corpus]
+        top = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:k]
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += expected in top
+    return {
+        "backend": "brute_force",
+        "size": size,
+        "insert_per_s": None,
+        "search_ms": percentiles(latencies),
+        f"recall_at_{k}": hits / len(queries) if queries else 0.0,
+        "reload_s": None,
+    }
+
+
+async def run_memory_benchmarks(
+    args: argparse.Namespace, work_dir: Path
+) -> List[Dict[str, Any]]:
+    questions = generate_questions(max(args.sizes), args.seed)
+    rng = random.Random(args.seed + 1)
+    results: List[Dict[str, Any]] = []
+
+    for size in sorted(args.sizes):
+        targets = [rng.randrange(size) for _ in range(args.queries)]
+        queries = [(perturb(questions[t], rng), t) for t in targets]
+
+        results.append(bench_brute_force(size, queries, questions, args.k))
+        for name in args.memory:
+            print(f"memory {name} size={size}...", file=sys.stderr)
+            try:
+                results.append(
+                    await bench_memory(name, size, queries, questions, args.k, work_dir)
+                )
+            except ImportError as e:
+                results.append({"backend": name, "size": size, "skipped": str(e)})
+    return results
+
+
+def create_sqlite_table(path: Path, rows: int, seed: int) -> SqlRunner:
+    from vanna.integrations.sqlite import SqliteRunner
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE facts (id INTEGER PRIMARY KEY, category TEXT, value REAL, "
+        "label TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO facts VALUES (?, ?, ?, ?)",
+        (
+            (i, rng.choice(DIMENSIONS), rng.random() * 1000, f"row {i}")
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+    conn.close()
+    return SqliteRunner(str(path))
+
+
+def create_duckdb_table(path: Path, rows: int, seed: int) -> SqlRunner:
+    from vanna.integrations.duckdb import DuckDBRunner
+
+    runner = DuckDBRunner(str(path))
+    conn = runner._get_connection()
+    conn.execute(f"SELECT setseed({(seed % 1000) / 1000})")
+    # Same columns as SQLite; values come from DuckDB's own seeded generator
+    categories = ", ".join(f"'{d}'" for d in DIMENSIONS)
+    conn.execute(
+        f"CREATE TABLE facts AS SELECT range AS id, "
+        f"list_extract([{categories}], (range % {len(DIMENSIONS)}) + 1) AS category, "
+        f"random() * 1000 AS value, 'row ' || range AS label FROM range({rows})"
+    )
+    return runner
+
+
+SQL_RUNNERS: Dict[str, Callable[[Path, int, int], SqlRunner]] = {
+    "sqlite": create_sqlite_table,
+    "duckdb": create_duckdb_table,
+}
+
+
+async def run_sql_benchmarks(
+    args: argparse.Namespace, work_dir: Path
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    max_rows = max(args.row_counts)
+
+    for name in args.sql:
+        print(f"sql {name} rows={max_rows}...", file=sys.stderr)
+        try:
+            runner = SQL_RUNNERS[name](work_dir / f"bench.{name}", max_rows, args.seed)
+        except ImportError as e:
+            results.append({"runner": name, "skipped": str(e)})
+            continue
+
+        context = make_context(DemoAgentMemory())
+        for rows in sorted(args.row_counts):
+            query = RunSqlToolArgs(sql=f"SELECT * FROM facts ORDER BY id LIMIT {rows}")
+            timings = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                df = await runner.run_sql(query, context)
+                timings.append(time.perf_counter() - start)
+            assert len(df) == rows
+            best = min(timings)
+            results.append(
+                {
+                    "runner": name,
+                    "rows": rows,
+                    "best_ms": best * 1000,
+                    "median_ms": sorted(timings)[len(timings) // 2] * 1000,
+                    "rows_per_s": rows / best if best else 0.0,
+                }
+            )
+    return results
+
+
+def markdown_tables(results: Dict[str, Any], k: int) -> str:
+    """Render the results as Markdown comparison tables."""
+    recall = f"recall_at_{k}"
+    lines = [
+        "## Agent memory",
+        "",
+        f"| backend | size | insert/s | search p50 ms | search p99 ms "
+        f"| recall@{k} | reload s |",
+        "|---|---:|---:|---:|---:|---:|---:|",
+    ]
+    for r in results["memory"]:
+        if "skipped" in r:
+            lines.append(f"| {r['backend']} | {r['size']} | skipped | | | | |")
+            continue
+        lines.append(
+            "| {} | {} | {} | {:.3f} | {:.3f} | {:.2f} | {} |".format(
+                r["backend"],
+                r["size"],
+                f"{r['insert_per_s']:.0f}" if r["insert_per_s"] else "-",
+                r["search_ms"]["p50"],
+                r["search_ms"]["p99"],
+                r[recall],
+                f"{r['reload_s']:.3f}" if r["reload_s"] is not None else "-",
+            )
+        )
+
+    lines += [
+        "",
+        "## SQL runners",
+        "",
+        "| runner | rows | best ms | median ms | rows/s |",
+        "|---|---:|---:|---:|---:|",
+    ]
+    for r in results["sql"]:
+        if "skipped" in r:
+            lines.append(f"| {r['runner']} | skipped | | | |")
+            continue
+        lines.append(
+            f"| {r['runner']} | {r['rows']} | {r['best_ms']:.2f} "
+            f"| {r['median_ms']:.2f} | {r['rows_per_s']:.0f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="vanna-storage-bench-") as tmp:
+        work_dir = Path(tmp)
+        memory = await run_memory_benchmarks(args, work_dir) if args.memory else []
+        sql = await run_sql_benchmarks(args, work_dir) if args.sql else []
+
+    return {
+        "benchmark": "storage",
+        "vanna_version": vanna.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "memory": memory,
+        "sql": sql,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--memory",
+        nargs="*",
+        default=sorted(MEMORY_BACKENDS),
+        choices=sorted(MEMORY_BACKENDS),
+        help="Agent memory backends to benchmark",
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1_000, 10_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5, help="Results per search")
+    parser.add_argument(
+        "--sql",
+        nargs="*",
+        default=sorted(SQL_RUNNERS),
+        choices=sorted(SQL_RUNNERS),
+        help="SQL runners to benchmark",
+    )
+    parser.add_argument(
+        "--row-counts", nargs="+", type=int, default=[1, 100, 10_000, 1_000_000]
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--markdown", help="Write the Markdown tables to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmarks and print the comparison tables."""
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    tables = markdown_tables(results, args.k)
+    print(tables)
+    if args.markdown:
+        Path(args.markdown).write_text(tables, encoding="utf-8")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results saved to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
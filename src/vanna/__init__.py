@@ -74,6 +74,8 @@ from .core import (
     EvaluationDataset,
     # Exceptions
     AgentError,
+    ConversationConflictError,
+    QuotaExceededError,
     ConversationNotFoundError,
     LlmServiceError,
     PermissionError,
@@ -166,6 +168,8 @@ __all__ = [
     "ToolExecutionError",
     "ToolNotFoundError",
     "PermissionError",
+    "ConversationConflictError",
+    "QuotaExceededError",
     "ConversationNotFoundError",
     "LlmServiceError",
     "ValidationError",
@@ -4,8 +4,9 @@ File system capability interface.
 This module contains the abstract base class for file system operations.
 """
 
+import io
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Optional, TextIO
 
 from .models import CommandResult, FileSearchMatch
 
@@ -26,6 +27,14 @@ class FileSystem(ABC):
         """Read the contents of a file."""
         pass
 
+    async def open_file(self, filename: str, context: "ToolContext") -> TextIO:
+        """Open a file as a seekable text stream, which the caller closes.
+
+        The default reads the whole file with ``read_file``; file systems that
+        can stream from storage should override it.
+        """
+        return io.StringIO(await self.read_file(filename, context))
+
     @abstractmethod
     async def write_file(
         self,
@@ -32,6 +32,13 @@ class DataFrameComponent(RichComponent):
     paginated: bool = True
     page_size: int = 25
 
+    # Server-side pagination: when enabled, ``rows`` only holds the first page
+    # and the client fetches further pages, sorting and filtering from
+    # ``page_endpoint`` using the ``source`` artifact reference.
+    server_paginated: bool = False
+    source: Optional[str] = None
+    page_endpoint: Optional[str] = None
+
     # Data types for better formatting (optional)
     column_types: Dict[str, str] = Field(
         default_factory=dict
@@ -91,3 +98,42 @@ class DataFrameComponent(RichComponent):
         component_data.update(kwargs)
 
         return cls(**component_data)
+
+    @classmethod
+    def from_first_page(
+        cls,
+        records: List[Dict[str, Any]],
+        columns: List[str],
+        total_rows: int,
+        source: str,
+        page_endpoint: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "DataFrameComponent":
+        """Create a server-paginated DataFrame component.
+
+        Only the first page of ``records`` is embedded in the component; the
+        remaining rows stay in the ``source`` artifact and are served on demand
+        by ``page_endpoint``.
+        """
+        component_data: Dict[str, Any] = {
+            "rows": records,
+            "columns": columns,
+            "row_count": total_rows,
+            "column_count": len(columns),
+            "column_types": {},
+            "page_size": len(records) or cls.model_fields["page_size"].default,
+            "server_paginated": True,
+            "source": source,
+            "page_endpoint": page_endpoint,
+        }
+
+        if title is not None:
+            component_data["title"] = title
+        if description is not None:
+            component_data["description"] = description
+
+        component_data.update(kwargs)
+
+        return cls(**component_data)
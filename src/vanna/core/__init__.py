@@ -7,19 +7,33 @@ that form the foundation of the agent framework.
 
 # Core domains - re-export from new structure
 from .tool import T, Tool, ToolCall, ToolContext, ToolResult, ToolSchema
-from .llm import LlmMessage, LlmRequest, LlmResponse, LlmService, LlmStreamChunk
+from .llm import (
+    LlmMessage,
+    LlmRequest,
+    LlmResponse,
+    LlmService,
+    LlmRoute,
+    LlmStreamChunk,
+    ModelPrice,
+    PriceTable,
+    RoutingLlmService,
+    TokenUsage,
+    capture_llm_usage,
+)
 from .storage import Conversation, ConversationStore, Message
 from .user import User, UserService
 from .agent import Agent, AgentConfig
 from .system_prompt import DefaultSystemPromptBuilder, SystemPromptBuilder
 from .lifecycle import LifecycleHook
-from .middleware import LlmMiddleware
+from .quota import AdmissionController, QuotaBackend, QuotaHook, QuotaPolicy, RateLimit
+from .middleware import LlmMiddleware, ResponseCacheMiddleware
 from .workflow import WorkflowHandler, WorkflowResult, DefaultWorkflowHandler
 from .recovery import ErrorRecoveryStrategy, RecoveryAction, RecoveryActionType
 from .enricher import ToolContextEnricher
 from .enhancer import LlmContextEnhancer, DefaultLlmContextEnhancer
-from .filter import ConversationFilter
+from .filter import ConversationFilter, TokenBudgetFilter
 from .observability import ObservabilityProvider, Span, Metric
+from .profiling import ProfileStore, RequestProfile, RequestProfiler
 from .audit import (
     AuditLogger,
     AuditEvent,
@@ -57,6 +71,8 @@ from ..components import (
 # Exceptions
 from .errors import (
     AgentError,
+    ConversationConflictError,
+    QuotaExceededError,
     ConversationNotFoundError,
     LlmServiceError,
     PermissionError,
@@ -107,6 +123,12 @@ __all__ = [
     "LlmRequest",
     "LlmResponse",
     "LlmStreamChunk",
+    "TokenUsage",
+    "ModelPrice",
+    "PriceTable",
+    "capture_llm_usage",
+    "LlmRoute",
+    "RoutingLlmService",
     "RecoveryAction",
     "RecoveryActionType",
     "Span",
@@ -119,7 +141,13 @@ __all__ = [
     "UserService",
     "SystemPromptBuilder",
     "LifecycleHook",
+    "QuotaHook",
+    "QuotaPolicy",
+    "RateLimit",
+    "QuotaBackend",
+    "AdmissionController",
     "LlmMiddleware",
+    "ResponseCacheMiddleware",
     "WorkflowHandler",
     "DefaultWorkflowHandler",
     "WorkflowResult",
@@ -128,7 +156,11 @@ __all__ = [
     "LlmContextEnhancer",
     "DefaultLlmContextEnhancer",
     "ConversationFilter",
+    "TokenBudgetFilter",
     "ObservabilityProvider",
+    "RequestProfiler",
+    "RequestProfile",
+    "ProfileStore",
     "AuditLogger",
     "T",
     # Audit
@@ -187,6 +219,8 @@ __all__ = [
     "ToolExecutionError",
     "ToolNotFoundError",
     "PermissionError",
+    "ConversationConflictError",
+    "QuotaExceededError",
     "ConversationNotFoundError",
     "LlmServiceError",
     "ValidationError",
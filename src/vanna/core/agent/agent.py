@@ -7,7 +7,7 @@ between LLM services, tools, and conversation storage.
 
 import traceback
 import uuid
-from typing import TYPE_CHECKING, AsyncGenerator, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, List, Optional
 
 from vanna.components import (
     UiComponent,
@@ -25,7 +25,14 @@ from vanna.core.llm import LlmService
 from vanna.core.system_prompt import SystemPromptBuilder
 from vanna.core.storage import Conversation, Message
 from vanna.core.llm import LlmMessage, LlmRequest, LlmResponse
-from vanna.core.tool import ToolCall, ToolContext, ToolResult, ToolSchema
+from vanna.core.llm.usage import (
+    LlmUsageRecord,
+    PriceTable,
+    TokenUsage,
+    UsageSummary,
+    record_llm_usage,
+)
+from vanna.core.tool import Tool, ToolCall, ToolContext, ToolResult, ToolSchema
 from vanna.core.user import User
 from vanna.core.registry import ToolRegistry
 from vanna.core.system_prompt import DefaultSystemPromptBuilder
@@ -36,11 +43,17 @@ from vanna.core.recovery import ErrorRecoveryStrategy, RecoveryActionType
 from vanna.core.enricher import ToolContextEnricher
 from vanna.core.enhancer import LlmContextEnhancer, DefaultLlmContextEnhancer
 from vanna.core.filter import ConversationFilter
-from vanna.core.observability import ObservabilityProvider
+from vanna.core.observability import (
+    ObservabilityProvider,
+    activate_span,
+    get_current_span,
+)
+from vanna.core.profiling import RequestProfiler
 from vanna.core.user.resolver import UserResolver
 from vanna.core.user.request_context import RequestContext
 from vanna.core.agent.config import UiFeature
 from vanna.core.audit import AuditLogger
+from vanna.core.errors import QuotaExceededError
 from vanna.capabilities.agent_memory import AgentMemory
 
 import logging
@@ -53,6 +66,22 @@ if TYPE_CHECKING:
     pass
 
 
+class _LlmRequestState:
+    """LLM messages built for one request, reused across its tool rounds."""
+
+    def __init__(self) -> None:
+        self.messages: List[LlmMessage] = []
+        # Conversation messages processed so far, and the last of them
+        self.source_count = 0
+        self.last_source: Optional[Message] = None
+
+    def can_extend(self, source: List[Message]) -> bool:
+        """Whether ``source`` only appends to the messages processed so far."""
+        if self.source_count == 0 or len(source) < self.source_count:
+            return False
+        return source[self.source_count - 1] is self.last_source
+
+
 class Agent:
     """Main agent implementation.
 
@@ -67,6 +96,9 @@ class Agent:
     - conversation_filters: Filter conversation history before LLM calls
     - observability_provider: Collect telemetry and monitoring data
 
+    Passing a ``profiler`` enables profiling: sampled and slow requests are
+    captured with a timeline of their stages (see ``RequestProfiler``).
+
     Example:
         agent = Agent(
             llm_service=AnthropicLlmService(api_key="..."),
@@ -97,6 +129,8 @@ class Agent:
         conversation_filters: List[ConversationFilter] = [],
         observability_provider: Optional[ObservabilityProvider] = None,
         audit_logger: Optional[AuditLogger] = None,
+        price_table: Optional[PriceTable] = None,
+        profiler: Optional[RequestProfiler] = None,
     ):
         self.llm_service = llm_service
         self.tool_registry = tool_registry
@@ -130,7 +164,16 @@ class Agent:
 
         self.conversation_filters = conversation_filters
         self.observability_provider = observability_provider
+        self.profiler = profiler
+        # Spans and metrics go through this provider, which also feeds the
+        # profiler's stage timelines when there is one
+        self._observability = (
+            profiler.wrap(observability_provider)
+            if profiler is not None
+            else observability_provider
+        )
         self.audit_logger = audit_logger
+        self.price_table = price_table
 
         # Wire audit logger into tool registry
         if self.audit_logger and self.config.audit_config.enabled:
@@ -157,13 +200,26 @@ class Agent:
         Yields:
             UiComponent instances for UI updates
         """
+        # Spans left open by a failed request must not become the parent of
+        # the next request handled in the same task
+        outer_span = get_current_span()
+        end_error: Optional[BaseException] = None
+        profile_capture = (
+            self.profiler.start(message, conversation_id) if self.profiler else None
+        )
         try:
             # Delegate to internal method
             async for component in self._send_message(
                 request_context, message, conversation_id=conversation_id
             ):
                 yield component
+        except QuotaExceededError as e:
+            end_error = e
+            logger.info(f"Message rejected by quota ({e.scope}, {e.limit}): {e}")
+            for component in self._quota_rejection_components(e):
+                yield component
         except Exception as e:
+            end_error = e
             # Log full stack trace
             stack_trace = traceback.format_exc()
             logger.error(
@@ -172,9 +228,9 @@ class Agent:
             )
 
             # Log to observability provider if available
-            if self.observability_provider:
+            if self._observability:
                 try:
-                    error_span = await self.observability_provider.create_span(
+                    error_span = await self._observability.create_span(
                         "agent.send_message.error",
                         attributes={
                             "error_type": type(e).__name__,
@@ -182,8 +238,8 @@ class Agent:
                             "conversation_id": conversation_id or "none",
                         },
                     )
-                    await self.observability_provider.end_span(error_span)
-                    await self.observability_provider.record_metric(
+                    await self._observability.end_span(error_span)
+                    await self._observability.record_metric(
                         "agent.error.count",
                         1.0,
                         "count",
@@ -227,6 +283,94 @@ class Agent:
                     placeholder="Try again...", disabled=False
                 )
             )
+        except BaseException as e:
+            # Cancellation or the client closing the stream
+            end_error = e
+            raise
+        finally:
+            await self._run_message_end_hooks(end_error)
+            activate_span(outer_span)
+            if self.profiler and profile_capture:
+                await self.profiler.finish(profile_capture, end_error)
+
+    async def _run_message_end_hooks(self, error: Optional[BaseException]) -> None:
+        """Run on_message_end hooks; a failing hook does not affect the others."""
+        for hook in self.lifecycle_hooks:
+            try:
+                await hook.on_message_end(error)
+            except Exception as e:
+                logger.error(
+                    f"Error in on_message_end hook {hook.__class__.__name__}: {e}",
+                    exc_info=True,
+                )
+
+    def _quota_rejection_card(self, error: QuotaExceededError) -> UiComponent:
+        """Build the status card describing a quota rejection."""
+        return UiComponent(
+            rich_component=StatusCardComponent(
+                title="Rate Limit Reached",
+                status="warning",
+                description=str(error),
+                icon="⏳",
+                metadata={
+                    "limit": error.limit,
+                    "scope": error.scope,
+                    "retry_after_seconds": error.retry_after,
+                },
+            ),
+            simple_component=SimpleTextComponent(text=str(error)),
+        )
+
+    def _quota_rejection_components(
+        self, error: QuotaExceededError
+    ) -> List[UiComponent]:
+        """Build the components ending a message rejected by a quota."""
+        return [
+            self._quota_rejection_card(error),
+            UiComponent(  # type: ignore
+                rich_component=StatusBarUpdateComponent(
+                    status="idle",
+                    message="Rate limit reached",
+                    detail=str(error),
+                )
+            ),
+            UiComponent(  # type: ignore
+                rich_component=ChatInputUpdateComponent(
+                    placeholder="Try again later...", disabled=False
+                )
+            ),
+        ]
+
+    async def _run_before_tool_hooks(
+        self, tool: "Tool[Any]", tool_call: ToolCall, context: ToolContext
+    ) -> None:
+        """Run before_tool hooks with observability."""
+        for hook in self.lifecycle_hooks:
+            hook_span = None
+            if self._observability:
+                hook_span = await self._observability.create_span(
+                    "agent.hook.before_tool",
+                    attributes={
+                        "hook": hook.__class__.__name__,
+                        "tool": tool_call.name,
+                    },
+                )
+
+            await hook.before_tool(tool, context)
+
+            if self._observability and hook_span:
+                await self._observability.end_span(hook_span)
+                if hook_span.duration_ms():
+                    await self._observability.record_metric(
+                        "agent.hook.duration",
+                        hook_span.duration_ms() or 0,
+                        "ms",
+                        tags={
+                            "hook": hook.__class__.__name__,
+                            "phase": "before_tool",
+                            "tool": tool_call.name,
+                        },
+                    )
 
     async def _send_message(
         self,
@@ -248,19 +392,19 @@ class Agent:
         """
         # Resolve user from request context with observability
         user_resolution_span = None
-        if self.observability_provider:
-            user_resolution_span = await self.observability_provider.create_span(
+        if self._observability:
+            user_resolution_span = await self._observability.create_span(
                 "agent.user_resolution",
                 attributes={"has_context": request_context is not None},
             )
 
         user = await self.user_resolver.resolve_user(request_context)
 
-        if self.observability_provider and user_resolution_span:
+        if self._observability and user_resolution_span:
             user_resolution_span.set_attribute("user_id", user.id)
-            await self.observability_provider.end_span(user_resolution_span)
+            await self._observability.end_span(user_resolution_span)
             if user_resolution_span.duration_ms():
-                await self.observability_provider.record_metric(
+                await self._observability.record_metric(
                     "agent.user_resolution.duration",
                     user_resolution_span.duration_ms() or 0,
                     "ms",
@@ -274,8 +418,8 @@ class Agent:
         if is_starter_request and self.workflow_handler:
             # Handle starter UI request with observability
             starter_span = None
-            if self.observability_provider:
-                starter_span = await self.observability_provider.create_span(
+            if self._observability:
+                starter_span = await self._observability.create_span(
                     "agent.workflow_handler.starter_ui", attributes={"user_id": user.id}
                 )
 
@@ -298,7 +442,7 @@ class Agent:
                     self, user, conversation
                 )
 
-                if self.observability_provider and starter_span:
+                if self._observability and starter_span:
                     starter_span.set_attribute("has_components", components is not None)
                     starter_span.set_attribute(
                         "component_count", len(components) if components else 0
@@ -323,10 +467,10 @@ class Agent:
                         )
                     )
 
-                if self.observability_provider and starter_span:
-                    await self.observability_provider.end_span(starter_span)
+                if self._observability and starter_span:
+                    await self._observability.end_span(starter_span)
                     if starter_span.duration_ms():
-                        await self.observability_provider.record_metric(
+                        await self._observability.record_metric(
                             "agent.workflow_handler.starter_ui.duration",
                             starter_span.duration_ms() or 0,
                             "ms",
@@ -340,9 +484,9 @@ class Agent:
 
             except Exception as e:
                 logger.error(f"Error generating starter UI: {e}", exc_info=True)
-                if self.observability_provider and starter_span:
+                if self._observability and starter_span:
                     starter_span.set_attribute("error", str(e))
-                    await self.observability_provider.end_span(starter_span)
+                    await self._observability.end_span(starter_span)
                 # Fall through to normal processing on error
 
         # Don't process actual empty messages (that aren't starter requests)
@@ -351,8 +495,8 @@ class Agent:
 
         # Create observability span for entire message processing
         message_span = None
-        if self.observability_provider:
-            message_span = await self.observability_provider.create_span(
+        if self._observability:
+            message_span = await self._observability.create_span(
                 "agent.send_message",
                 attributes={
                     "user_id": user.id,
@@ -364,8 +508,8 @@ class Agent:
         modified_message = message
         for hook in self.lifecycle_hooks:
             hook_span = None
-            if self.observability_provider:
-                hook_span = await self.observability_provider.create_span(
+            if self._observability:
+                hook_span = await self._observability.create_span(
                     "agent.hook.before_message",
                     attributes={"hook": hook.__class__.__name__},
                 )
@@ -374,11 +518,11 @@ class Agent:
             if hook_result is not None:
                 modified_message = hook_result
 
-            if self.observability_provider and hook_span:
+            if self._observability and hook_span:
                 hook_span.set_attribute("modified_message", hook_result is not None)
-                await self.observability_provider.end_span(hook_span)
+                await self._observability.end_span(hook_span)
                 if hook_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.hook.duration",
                         hook_span.duration_ms() or 0,
                         "ms",
@@ -408,8 +552,8 @@ class Agent:
 
         # Load or create conversation with observability (but don't add message yet)
         conversation_span = None
-        if self.observability_provider:
-            conversation_span = await self.observability_provider.create_span(
+        if self._observability:
+            conversation_span = await self._observability.create_span(
                 "agent.conversation.load",
                 attributes={"conversation_id": conversation_id, "user_id": user.id},
             )
@@ -424,12 +568,12 @@ class Agent:
             # Create empty conversation (will add message after workflow handler check)
             conversation = Conversation(id=conversation_id, user=user, messages=[])
 
-        if self.observability_provider and conversation_span:
+        if self._observability and conversation_span:
             conversation_span.set_attribute("is_new", is_new_conversation)
             conversation_span.set_attribute("message_count", len(conversation.messages))
-            await self.observability_provider.end_span(conversation_span)
+            await self._observability.end_span(conversation_span)
             if conversation_span.duration_ms():
-                await self.observability_provider.record_metric(
+                await self._observability.record_metric(
                     "agent.conversation.load.duration",
                     conversation_span.duration_ms() or 0,
                     "ms",
@@ -439,8 +583,8 @@ class Agent:
         # Try workflow handler before adding message to conversation
         if self.workflow_handler:
             trigger_span = None
-            if self.observability_provider:
-                trigger_span = await self.observability_provider.create_span(
+            if self._observability:
+                trigger_span = await self._observability.create_span(
                     "agent.workflow_handler.try_handle",
                     attributes={"user_id": user.id, "conversation_id": conversation_id},
                 )
@@ -450,7 +594,7 @@ class Agent:
                     self, user, conversation, message
                 )
 
-                if self.observability_provider and trigger_span:
+                if self._observability and trigger_span:
                     trigger_span.set_attribute(
                         "should_skip_llm", workflow_result.should_skip_llm
                     )
@@ -490,29 +634,30 @@ class Agent:
                     if self.config.auto_save_conversations:
                         await self.conversation_store.update_conversation(conversation)
 
-                    if self.observability_provider and trigger_span:
-                        await self.observability_provider.end_span(trigger_span)
+                    if self._observability and trigger_span:
+                        await self._observability.end_span(trigger_span)
 
                     # Exit without calling LLM
                     return
 
             except Exception as e:
                 logger.error(f"Error in workflow handler: {e}", exc_info=True)
-                if self.observability_provider and trigger_span:
+                if self._observability and trigger_span:
                     trigger_span.set_attribute("error", str(e))
-                    await self.observability_provider.end_span(trigger_span)
+                    await self._observability.end_span(trigger_span)
                 # Fall through to normal LLM processing on error
 
             finally:
-                if self.observability_provider and trigger_span:
-                    await self.observability_provider.end_span(trigger_span)
+                if self._observability and trigger_span:
+                    await self._observability.end_span(trigger_span)
 
         # Persist new conversation to store before adding message
         if is_new_conversation:
             await self.conversation_store.update_conversation(conversation)
 
         # Not triggered, add user message to conversation now
-        conversation.add_message(Message(role="user", content=message))
+        user_message = Message(role="user", content=message)
+        conversation.add_message(user_message)
 
         # Add initial task
         context_task = Task(
@@ -536,25 +681,25 @@ class Agent:
             conversation_id=conversation_id,
             request_id=request_id,
             agent_memory=self.agent_memory,
-            observability_provider=self.observability_provider,
+            observability_provider=self._observability,
             metadata={"ui_features_available": ui_features_available},
         )
 
         # Enrich context with additional data with observability
         for enricher in self.context_enrichers:
             enrichment_span = None
-            if self.observability_provider:
-                enrichment_span = await self.observability_provider.create_span(
+            if self._observability:
+                enrichment_span = await self._observability.create_span(
                     "agent.context.enrichment",
                     attributes={"enricher": enricher.__class__.__name__},
                 )
 
             context = await enricher.enrich_context(context)
 
-            if self.observability_provider and enrichment_span:
-                await self.observability_provider.end_span(enrichment_span)
+            if self._observability and enrichment_span:
+                await self._observability.end_span(enrichment_span)
                 if enrichment_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.enrichment.duration",
                         enrichment_span.duration_ms() or 0,
                         "ms",
@@ -563,18 +708,18 @@ class Agent:
 
         # Get available tools for user with observability
         schema_span = None
-        if self.observability_provider:
-            schema_span = await self.observability_provider.create_span(
+        if self._observability:
+            schema_span = await self._observability.create_span(
                 "agent.tool_schemas.fetch", attributes={"user_id": user.id}
             )
 
         tool_schemas = await self.tool_registry.get_schemas(user)
 
-        if self.observability_provider and schema_span:
+        if self._observability and schema_span:
             schema_span.set_attribute("schema_count", len(tool_schemas))
-            await self.observability_provider.end_span(schema_span)
+            await self._observability.end_span(schema_span)
             if schema_span.duration_ms():
-                await self.observability_provider.record_metric(
+                await self._observability.record_metric(
                     "agent.tool_schemas.duration",
                     schema_span.duration_ms() or 0,
                     "ms",
@@ -590,8 +735,8 @@ class Agent:
 
         # Build system prompt with observability
         prompt_span = None
-        if self.observability_provider:
-            prompt_span = await self.observability_provider.create_span(
+        if self._observability:
+            prompt_span = await self._observability.create_span(
                 "agent.system_prompt.build",
                 attributes={"tool_count": len(tool_schemas)},
             )
@@ -603,8 +748,8 @@ class Agent:
         # Enhance system prompt with LLM context enhancer
         if self.llm_context_enhancer and system_prompt is not None:
             enhancement_span = None
-            if self.observability_provider:
-                enhancement_span = await self.observability_provider.create_span(
+            if self._observability:
+                enhancement_span = await self._observability.create_span(
                     "agent.llm_context.enhance_system_prompt",
                     attributes={
                         "enhancer": self.llm_context_enhancer.__class__.__name__
@@ -615,33 +760,35 @@ class Agent:
                 system_prompt, message, user
             )
 
-            if self.observability_provider and enhancement_span:
-                await self.observability_provider.end_span(enhancement_span)
+            if self._observability and enhancement_span:
+                await self._observability.end_span(enhancement_span)
                 if enhancement_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.llm_context.enhance_system_prompt.duration",
                         enhancement_span.duration_ms() or 0,
                         "ms",
                         tags={"enhancer": self.llm_context_enhancer.__class__.__name__},
                     )
 
-        if self.observability_provider and prompt_span:
+        if self._observability and prompt_span:
             prompt_span.set_attribute(
                 "prompt_length", len(system_prompt) if system_prompt else 0
             )
-            await self.observability_provider.end_span(prompt_span)
+            await self._observability.end_span(prompt_span)
             if prompt_span.duration_ms():
-                await self.observability_provider.record_metric(
+                await self._observability.record_metric(
                     "agent.system_prompt.duration", prompt_span.duration_ms() or 0, "ms"
                 )
 
-        # Build LLM request
+        # Build LLM request; tool rounds extend the messages built here
+        request_state = _LlmRequestState()
         request = await self._build_llm_request(
-            conversation, tool_schemas, user, system_prompt
+            conversation, tool_schemas, user, system_prompt, request_state
         )
 
         # Process with tool loop
         tool_iterations = 0
+        message_usage = UsageSummary()
 
         while tool_iterations < self.config.max_tool_iterations:
             if self.config.include_thinking_indicators and tool_iterations == 0:
@@ -654,6 +801,8 @@ class Agent:
             else:
                 response = await self._send_llm_request(request)
 
+            await self._record_llm_usage(request, response, message_usage)
+
             # Handle tool calls
             if response.is_tool_call():
                 tool_iterations += 1
@@ -783,40 +932,17 @@ class Agent:
 
                     # Run before_tool hooks with observability
                     tool = await self.tool_registry.get_tool(tool_call.name)
+                    quota_error: Optional[QuotaExceededError] = None
                     if tool:
-                        for hook in self.lifecycle_hooks:
-                            hook_span = None
-                            if self.observability_provider:
-                                hook_span = (
-                                    await self.observability_provider.create_span(
-                                        "agent.hook.before_tool",
-                                        attributes={
-                                            "hook": hook.__class__.__name__,
-                                            "tool": tool_call.name,
-                                        },
-                                    )
-                                )
-
-                            await hook.before_tool(tool, context)
-
-                            if self.observability_provider and hook_span:
-                                await self.observability_provider.end_span(hook_span)
-                                if hook_span.duration_ms():
-                                    await self.observability_provider.record_metric(
-                                        "agent.hook.duration",
-                                        hook_span.duration_ms() or 0,
-                                        "ms",
-                                        tags={
-                                            "hook": hook.__class__.__name__,
-                                            "phase": "before_tool",
-                                            "tool": tool_call.name,
-                                        },
-                                    )
+                        try:
+                            await self._run_before_tool_hooks(tool, tool_call, context)
+                        except QuotaExceededError as e:
+                            quota_error = e
 
                     # Execute tool with observability
                     tool_exec_span = None
-                    if self.observability_provider:
-                        tool_exec_span = await self.observability_provider.create_span(
+                    if self._observability:
+                        tool_exec_span = await self._observability.create_span(
                             "agent.tool.execute",
                             attributes={
                                 "tool": tool_call.name,
@@ -824,17 +950,27 @@ class Agent:
                             },
                         )
 
-                    result = await self.tool_registry.execute(tool_call, context)
+                    if quota_error is not None:
+                        # Let the LLM explain the rejection instead of failing
+                        result = ToolResult(
+                            success=False,
+                            result_for_llm=f"Tool not executed: {quota_error}",
+                            ui_component=self._quota_rejection_card(quota_error),
+                            error=str(quota_error),
+                            metadata={"quota_limit": quota_error.limit},
+                        )
+                    else:
+                        result = await self.tool_registry.execute(tool_call, context)
 
-                    if self.observability_provider and tool_exec_span:
+                    if self._observability and tool_exec_span:
                         tool_exec_span.set_attribute("success", result.success)
                         if not result.success:
                             tool_exec_span.set_attribute(
                                 "error", result.error or "unknown"
                             )
-                        await self.observability_provider.end_span(tool_exec_span)
+                        await self._observability.end_span(tool_exec_span)
                         if tool_exec_span.duration_ms():
-                            await self.observability_provider.record_metric(
+                            await self._observability.record_metric(
                                 "agent.tool.duration",
                                 tool_exec_span.duration_ms() or 0,
                                 "ms",
@@ -847,8 +983,8 @@ class Agent:
                     # Run after_tool hooks with observability
                     for hook in self.lifecycle_hooks:
                         hook_span = None
-                        if self.observability_provider:
-                            hook_span = await self.observability_provider.create_span(
+                        if self._observability:
+                            hook_span = await self._observability.create_span(
                                 "agent.hook.after_tool",
                                 attributes={
                                     "hook": hook.__class__.__name__,
@@ -860,13 +996,13 @@ class Agent:
                         if modified_result is not None:
                             result = modified_result
 
-                        if self.observability_provider and hook_span:
+                        if self._observability and hook_span:
                             hook_span.set_attribute(
                                 "modified_result", modified_result is not None
                             )
-                            await self.observability_provider.end_span(hook_span)
+                            await self._observability.end_span(hook_span)
                             if hook_span.duration_ms():
-                                await self.observability_provider.record_metric(
+                                await self._observability.record_metric(
                                     "agent.hook.duration",
                                     hook_span.duration_ms() or 0,
                                     "ms",
@@ -953,8 +1089,9 @@ class Agent:
 
                     # Yield tool result
                     if result.ui_component:
-                        # For errors, check if user has access to see error details
-                        if not result.success:
+                        # For errors, check if user has access to see error details;
+                        # quota rejections are meant for the user and always shown
+                        if not result.success and quota_error is None:
                             has_tool_error_access = (
                                 self.config.ui_features.can_user_access_feature(
                                     UiFeature.UI_FEATURE_SHOW_TOOL_ERROR, user
@@ -1008,7 +1145,7 @@ class Agent:
 
                 # Rebuild request with tool responses
                 request = await self._build_llm_request(
-                    conversation, tool_schemas, user, system_prompt
+                    conversation, tool_schemas, user, system_prompt, request_state
                 )
             else:
                 # Update status to idle and set completion message
@@ -1084,11 +1221,14 @@ You can:
                 )
             )
 
+        if message_usage.llm_requests:
+            self._add_usage_to_conversation(conversation, user_message, message_usage)
+
         # Save conversation if configured
         if self.config.auto_save_conversations:
             save_span = None
-            if self.observability_provider:
-                save_span = await self.observability_provider.create_span(
+            if self._observability:
+                save_span = await self._observability.create_span(
                     "agent.conversation.save",
                     attributes={
                         "conversation_id": conversation_id,
@@ -1098,10 +1238,10 @@ You can:
 
             await self.conversation_store.update_conversation(conversation)
 
-            if self.observability_provider and save_span:
-                await self.observability_provider.end_span(save_span)
+            if self._observability and save_span:
+                await self._observability.end_span(save_span)
                 if save_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.conversation.save.duration",
                         save_span.duration_ms() or 0,
                         "ms",
@@ -1110,18 +1250,18 @@ You can:
         # Run after_message hooks with observability
         for hook in self.lifecycle_hooks:
             hook_span = None
-            if self.observability_provider:
-                hook_span = await self.observability_provider.create_span(
+            if self._observability:
+                hook_span = await self._observability.create_span(
                     "agent.hook.after_message",
                     attributes={"hook": hook.__class__.__name__},
                 )
 
             await hook.after_message(conversation)
 
-            if self.observability_provider and hook_span:
-                await self.observability_provider.end_span(hook_span)
+            if self._observability and hook_span:
+                await self._observability.end_span(hook_span)
                 if hook_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.hook.duration",
                         hook_span.duration_ms() or 0,
                         "ms",
@@ -1132,26 +1272,95 @@ You can:
                     )
 
         # End observability span and record metrics
-        if self.observability_provider and message_span:
+        if self._observability and message_span:
             message_span.set_attribute("tool_iterations", tool_iterations)
 
             # Track if we hit the tool iteration limit
             hit_tool_limit = tool_iterations >= self.config.max_tool_iterations
             message_span.set_attribute("hit_tool_limit", hit_tool_limit)
+            message_span.set_attribute("total_tokens", message_usage.usage.total_tokens)
+            if message_usage.cost_usd is not None:
+                message_span.set_attribute("cost_usd", message_usage.cost_usd)
             if hit_tool_limit:
                 message_span.set_attribute("incomplete_response", True)
                 logger.info(
                     f"Tool limit reached - marking response as potentially incomplete"
                 )
 
-            await self.observability_provider.end_span(message_span)
+            await self._observability.end_span(message_span)
             if message_span.duration_ms():
-                await self.observability_provider.record_metric(
+                await self._observability.record_metric(
                     "agent.message.duration",
                     message_span.duration_ms() or 0,
                     "ms",
                     tags={"user_id": user.id, "hit_tool_limit": str(hit_tool_limit)},
                 )
+            if message_usage.llm_requests:
+                await self._observability.record_metric(
+                    "agent.message.tokens",
+                    message_usage.usage.total_tokens,
+                    "tokens",
+                    tags={"user_id": user.id},
+                )
+
+    async def _record_llm_usage(
+        self, request: LlmRequest, response: LlmResponse, summary: UsageSummary
+    ) -> None:
+        """Account for the token usage of one LLM response.
+
+        Adds the usage to the message's summary and to any active
+        ``capture_llm_usage`` recorders, and records per-model, per-user
+        token and cost metrics.
+        """
+        if not response.usage:
+            return
+
+        model = str(
+            response.metadata.get("model")
+            or getattr(self.llm_service, "model", "unknown")
+        )
+        usage = TokenUsage.from_dict(response.usage)
+        record = LlmUsageRecord(
+            model=model,
+            usage=usage,
+            cost_usd=(
+                self.price_table.estimate_cost(model, usage)
+                if self.price_table
+                else None
+            ),
+            stream=request.stream,
+        )
+        summary.add(record)
+        record_llm_usage(record)
+
+        if self._observability:
+            tags = {"model": model, "user_id": request.user.id}
+            for kind, value in (
+                ("prompt", usage.prompt_tokens),
+                ("completion", usage.completion_tokens),
+                ("cached", usage.cached_tokens),
+            ):
+                await self._observability.record_metric(
+                    f"llm.tokens.{kind}", value, "tokens", tags=tags
+                )
+            if record.cost_usd is not None:
+                await self._observability.record_metric(
+                    "llm.cost", record.cost_usd, "usd", tags=tags
+                )
+
+    def _add_usage_to_conversation(
+        self, conversation: Conversation, message: Message, summary: UsageSummary
+    ) -> None:
+        """Store a message's usage on it and add it to the conversation total."""
+        message.metadata["usage"] = summary.model_dump()
+
+        previous = conversation.metadata.get("usage")
+        total = UsageSummary.model_validate(previous) if previous else UsageSummary()
+        total.usage = total.usage + summary.usage
+        total.llm_requests += summary.llm_requests
+        if summary.cost_usd is not None:
+            total.cost_usd = (total.cost_usd or 0.0) + summary.cost_usd
+        conversation.metadata["usage"] = total.model_dump()
 
     async def get_available_tools(self, user: User) -> List[ToolSchema]:
         """Get tools available to the user."""
@@ -1163,28 +1372,48 @@ You can:
         tool_schemas: List[ToolSchema],
         user: User,
         system_prompt: Optional[str] = None,
+        state: Optional["_LlmRequestState"] = None,
     ) -> LlmRequest:
-        """Build LLM request from conversation and tools."""
+        """Build LLM request from conversation and tools.
+
+        When a ``state`` from the previous tool round of the same request is
+        given, and every filter and the enhancer are incremental, only the
+        messages added since that round are filtered, converted and enhanced.
+        Otherwise the whole conversation is processed and ``state`` is reset.
+        """
+        source = conversation.messages
+        incremental = (
+            state is not None
+            and state.can_extend(source)
+            and all(f.incremental for f in self.conversation_filters)
+            and (
+                self.llm_context_enhancer is None
+                or self.llm_context_enhancer.incremental
+            )
+        )
+        new_messages = source[state.source_count :] if incremental and state else source
+
         # Apply conversation filters with observability
-        filtered_messages = conversation.messages
+        filtered_messages = new_messages
         for filter in self.conversation_filters:
             filter_span = None
-            if self.observability_provider:
-                filter_span = await self.observability_provider.create_span(
+            if self._observability:
+                filter_span = await self._observability.create_span(
                     "agent.conversation.filter",
                     attributes={
                         "filter": filter.__class__.__name__,
                         "message_count_before": len(filtered_messages),
+                        "incremental": incremental,
                     },
                 )
 
             filtered_messages = await filter.filter_messages(filtered_messages)
 
-            if self.observability_provider and filter_span:
+            if self._observability and filter_span:
                 filter_span.set_attribute("message_count_after", len(filtered_messages))
-                await self.observability_provider.end_span(filter_span)
+                await self._observability.end_span(filter_span)
                 if filter_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.filter.duration",
                         filter_span.duration_ms() or 0,
                         "ms",
@@ -1204,12 +1433,13 @@ You can:
         # Enhance messages with LLM context enhancer
         if self.llm_context_enhancer:
             enhancement_span = None
-            if self.observability_provider:
-                enhancement_span = await self.observability_provider.create_span(
+            if self._observability:
+                enhancement_span = await self._observability.create_span(
                     "agent.llm_context.enhance_user_messages",
                     attributes={
                         "enhancer": self.llm_context_enhancer.__class__.__name__,
                         "message_count": len(messages),
+                        "incremental": incremental,
                     },
                 )
 
@@ -1217,17 +1447,32 @@ You can:
                 messages, user
             )
 
-            if self.observability_provider and enhancement_span:
+            if self._observability and enhancement_span:
                 enhancement_span.set_attribute("message_count_after", len(messages))
-                await self.observability_provider.end_span(enhancement_span)
+                await self._observability.end_span(enhancement_span)
                 if enhancement_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.llm_context.enhance_user_messages.duration",
                         enhancement_span.duration_ms() or 0,
                         "ms",
                         tags={"enhancer": self.llm_context_enhancer.__class__.__name__},
                     )
 
+        if state is not None:
+            if incremental:
+                state.messages.extend(messages)
+            else:
+                state.messages = list(messages)
+            state.source_count = len(source)
+            state.last_source = source[-1] if source else None
+            messages = list(state.messages)
+
+        prompt_caching = self.config.prompt_caching
+        if prompt_caching and messages:
+            # The next tool iteration or turn extends this prompt, so cache
+            # everything up to the latest message
+            messages[-1] = messages[-1].model_copy(update={"cache_breakpoint": True})
+
         return LlmRequest(
             messages=messages,
             tools=tool_schemas if tool_schemas else None,
@@ -1236,25 +1481,44 @@ You can:
             max_tokens=self.config.max_tokens,
             stream=self.config.stream_responses,
             system_prompt=system_prompt,
+            cache_system_prompt=prompt_caching,
+            cache_tools=prompt_caching,
         )
 
+    async def _short_circuit_llm_request(
+        self, request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Get a response from the first middleware that answers the request."""
+        for middleware in self.llm_middlewares:
+            response = await middleware.short_circuit_llm_request(request)
+            if response is not None:
+                if self._observability:
+                    await self._observability.record_metric(
+                        "agent.middleware.short_circuit",
+                        1.0,
+                        "count",
+                        tags={"middleware": middleware.__class__.__name__},
+                    )
+                return response
+        return None
+
     async def _send_llm_request(self, request: LlmRequest) -> LlmResponse:
         """Send LLM request with middleware and observability."""
         # Apply before_llm_request middlewares with observability
         for middleware in self.llm_middlewares:
             mw_span = None
-            if self.observability_provider:
-                mw_span = await self.observability_provider.create_span(
+            if self._observability:
+                mw_span = await self._observability.create_span(
                     "agent.middleware.before_llm",
                     attributes={"middleware": middleware.__class__.__name__},
                 )
 
             request = await middleware.before_llm_request(request)
 
-            if self.observability_provider and mw_span:
-                await self.observability_provider.end_span(mw_span)
+            if self._observability and mw_span:
+                await self._observability.end_span(mw_span)
                 if mw_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.middleware.duration",
                         mw_span.duration_ms() or 0,
                         "ms",
@@ -1264,43 +1528,45 @@ You can:
                         },
                     )
 
-        # Create observability span for LLM call
-        llm_span = None
-        if self.observability_provider:
-            llm_span = await self.observability_provider.create_span(
-                "llm.request",
-                attributes={
-                    "model": getattr(self.llm_service, "model", "unknown"),
-                    "stream": request.stream,
-                },
-            )
+        response = await self._short_circuit_llm_request(request)
+        if response is None:
+            # Create observability span for LLM call
+            llm_span = None
+            if self._observability:
+                llm_span = await self._observability.create_span(
+                    "llm.request",
+                    attributes={
+                        "model": getattr(self.llm_service, "model", "unknown"),
+                        "stream": request.stream,
+                    },
+                )
 
-        # Send request
-        response = await self.llm_service.send_request(request)
+            # Send request
+            response = await self.llm_service.send_request(request)
 
-        # End span and record metrics
-        if self.observability_provider and llm_span:
-            await self.observability_provider.end_span(llm_span)
-            if llm_span.duration_ms():
-                await self.observability_provider.record_metric(
-                    "llm.request.duration", llm_span.duration_ms() or 0, "ms"
-                )
+            # End span and record metrics
+            if self._observability and llm_span:
+                await self._observability.end_span(llm_span)
+                if llm_span.duration_ms():
+                    await self._observability.record_metric(
+                        "llm.request.duration", llm_span.duration_ms() or 0, "ms"
+                    )
 
         # Apply after_llm_response middlewares with observability
         for middleware in self.llm_middlewares:
             mw_span = None
-            if self.observability_provider:
-                mw_span = await self.observability_provider.create_span(
+            if self._observability:
+                mw_span = await self._observability.create_span(
                     "agent.middleware.after_llm",
                     attributes={"middleware": middleware.__class__.__name__},
                 )
 
             response = await middleware.after_llm_response(request, response)
 
-            if self.observability_provider and mw_span:
-                await self.observability_provider.end_span(mw_span)
+            if self._observability and mw_span:
+                await self._observability.end_span(mw_span)
                 if mw_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.middleware.duration",
                         mw_span.duration_ms() or 0,
                         "ms",
@@ -1317,8 +1583,8 @@ You can:
         # Apply before_llm_request middlewares with observability
         for middleware in self.llm_middlewares:
             mw_span = None
-            if self.observability_provider:
-                mw_span = await self.observability_provider.create_span(
+            if self._observability:
+                mw_span = await self._observability.create_span(
                     "agent.middleware.before_llm",
                     attributes={
                         "middleware": middleware.__class__.__name__,
@@ -1328,10 +1594,10 @@ You can:
 
             request = await middleware.before_llm_request(request)
 
-            if self.observability_provider and mw_span:
-                await self.observability_provider.end_span(mw_span)
+            if self._observability and mw_span:
+                await self._observability.end_span(mw_span)
                 if mw_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.middleware.duration",
                         mw_span.duration_ms() or 0,
                         "ms",
@@ -1342,45 +1608,60 @@ You can:
                         },
                     )
 
-        accumulated_content = ""
-        accumulated_tool_calls = []
+        response = await self._short_circuit_llm_request(request)
+        if response is None:
+            accumulated_content = ""
+            accumulated_tool_calls = []
+            accumulated_usage: Dict[str, int] = {}
+            accumulated_metadata: Dict[str, Any] = {}
+
+            # Create span for streaming
+            stream_span = None
+            if self._observability:
+                stream_span = await self._observability.create_span(
+                    "llm.stream",
+                    attributes={"model": getattr(self.llm_service, "model", "unknown")},
+                )
 
-        # Create span for streaming
-        stream_span = None
-        if self.observability_provider:
-            stream_span = await self.observability_provider.create_span(
-                "llm.stream",
-                attributes={"model": getattr(self.llm_service, "model", "unknown")},
-            )
+            async for chunk in self.llm_service.stream_request(request):
+                if chunk.content:
+                    accumulated_content += chunk.content
+                    # Could yield intermediate TextChunk here
+
+                if chunk.tool_calls:
+                    accumulated_tool_calls.extend(chunk.tool_calls)
 
-        async for chunk in self.llm_service.stream_request(request):
-            if chunk.content:
-                accumulated_content += chunk.content
-                # Could yield intermediate TextChunk here
-
-            if chunk.tool_calls:
-                accumulated_tool_calls.extend(chunk.tool_calls)
-
-        # End streaming span
-        if self.observability_provider and stream_span:
-            stream_span.set_attribute("content_length", len(accumulated_content))
-            stream_span.set_attribute("tool_call_count", len(accumulated_tool_calls))
-            await self.observability_provider.end_span(stream_span)
-            if stream_span.duration_ms():
-                await self.observability_provider.record_metric(
-                    "llm.stream.duration", stream_span.duration_ms() or 0, "ms"
+                if chunk.usage:
+                    for key, value in chunk.usage.items():
+                        accumulated_usage[key] = accumulated_usage.get(key, 0) + value
+
+                if chunk.metadata:
+                    accumulated_metadata.update(chunk.metadata)
+
+            # End streaming span
+            if self._observability and stream_span:
+                stream_span.set_attribute("content_length", len(accumulated_content))
+                stream_span.set_attribute(
+                    "tool_call_count", len(accumulated_tool_calls)
                 )
+                await self._observability.end_span(stream_span)
+                if stream_span.duration_ms():
+                    await self._observability.record_metric(
+                        "llm.stream.duration", stream_span.duration_ms() or 0, "ms"
+                    )
 
-        response = LlmResponse(
-            content=accumulated_content if accumulated_content else None,
-            tool_calls=accumulated_tool_calls if accumulated_tool_calls else None,
-        )
+            response = LlmResponse(
+                content=accumulated_content if accumulated_content else None,
+                tool_calls=accumulated_tool_calls if accumulated_tool_calls else None,
+                usage=accumulated_usage or None,
+                metadata=accumulated_metadata,
+            )
 
         # Apply after_llm_response middlewares with observability
         for middleware in self.llm_middlewares:
             mw_span = None
-            if self.observability_provider:
-                mw_span = await self.observability_provider.create_span(
+            if self._observability:
+                mw_span = await self._observability.create_span(
                     "agent.middleware.after_llm",
                     attributes={
                         "middleware": middleware.__class__.__name__,
@@ -1390,10 +1671,10 @@ You can:
 
             response = await middleware.after_llm_response(request, response)
 
-            if self.observability_provider and mw_span:
-                await self.observability_provider.end_span(mw_span)
+            if self._observability and mw_span:
+                await self._observability.end_span(mw_span)
                 if mw_span.duration_ms():
-                    await self.observability_provider.record_metric(
+                    await self._observability.record_metric(
                         "agent.middleware.duration",
                         mw_span.duration_ms() or 0,
                         "ms",
@@ -119,5 +119,8 @@ class AgentConfig(BaseModel):
     include_thinking_indicators: bool = Field(default=True)
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: Optional[int] = Field(default=None, gt=0)
+    # Mark tools, system prompt and conversation so far as cacheable in LLM
+    # requests; tool iterations and follow-up turns then reuse the prefix
+    prompt_caching: bool = Field(default=True)
     ui_features: UiFeatures = Field(default_factory=UiFeatures)
     audit_config: AuditConfig = Field(default_factory=AuditConfig)
@@ -49,8 +49,14 @@ class LlmContextEnhancer(ABC):
             llm_service=...,
             llm_context_enhancer=MemoryBasedEnhancer(agent_memory)
         )
+
+    ``incremental = True`` declares that ``enhance_user_messages`` treats
+    messages independently, so within a request the agent only passes it
+    the messages added since the previous tool round.
     """
 
+    incremental: bool = False
+
     async def enhance_system_prompt(
         self, system_prompt: str, user_message: str, user: "User"
     ) -> str:
@@ -29,6 +29,9 @@ class DefaultLlmContextEnhancer(LlmContextEnhancer):
         )
     """
 
+    # User messages are passed through unchanged
+    incremental = True
+
     def __init__(self, agent_memory: Optional["AgentMemory"] = None):
         """Initialize with optional agent memory.
 
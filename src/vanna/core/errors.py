@@ -4,6 +4,8 @@ Exception classes for the Vanna Agents framework.
 This module defines all custom exceptions used throughout the framework.
 """
 
+from typing import Optional
+
 
 class AgentError(Exception):
     """Base exception for agent framework."""
@@ -35,6 +37,12 @@ class ConversationNotFoundError(AgentError):
     pass
 
 
+class ConversationConflictError(AgentError):
+    """Conversation was modified concurrently by another writer."""
+
+    pass
+
+
 class LlmServiceError(AgentError):
     """Error communicating with LLM service."""
 
@@ -45,3 +53,28 @@ class ValidationError(AgentError):
     """Data validation error."""
 
     pass
+
+
+class QuotaExceededError(AgentError):
+    """Request rejected by a rate limit or concurrency quota."""
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        limit: str,
+        scope: str = "user",
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Initialize the error.
+
+        Args:
+            message: Human-readable explanation
+            limit: Name of the exceeded limit, e.g. ``"messages"``
+            scope: Quota key the limit applies to, e.g. ``"user:alice"``
+            retry_after: Seconds until the request may succeed, if known
+        """
+        super().__init__(message)
+        self.limit = limit
+        self.scope = scope
+        self.retry_after = retry_after
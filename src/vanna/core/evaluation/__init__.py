@@ -6,6 +6,7 @@ agent variants, with special focus on LLM comparison use cases.
 
 Key Features:
 - Parallel execution for efficient I/O-bound operations
+- Resumable runs with a JSONL checkpoint of completed results
 - Multiple built-in evaluators (trajectory, output, LLM-as-judge, efficiency)
 - Rich reporting (HTML, CSV, console)
 - Dataset loaders (YAML, JSON)
@@ -47,6 +48,7 @@ from .base import (
     TestCaseResult,
     AgentVariant,
 )
+from .checkpoint import EvaluationCheckpoint, JudgmentCache
 from .runner import EvaluationRunner
 from .evaluators import (
     TrajectoryEvaluator,
@@ -68,6 +70,8 @@ __all__ = [
     "AgentVariant",
     # Runner
     "EvaluationRunner",
+    "EvaluationCheckpoint",
+    "JudgmentCache",
     # Built-in evaluators
     "TrajectoryEvaluator",
     "OutputEvaluator",
@@ -5,6 +5,8 @@ This module provides the base classes and models for evaluating agent behavior,
 including test cases, expected outcomes, and evaluation results.
 """
 
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Callable
 from dataclasses import dataclass, field
@@ -71,6 +73,10 @@ class AgentResult:
     llm_requests: List[Dict[str, Any]] = field(default_factory=list)
     execution_time_ms: float = 0.0
     total_tokens: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    estimated_cost_usd: Optional[float] = None
     error: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -147,11 +153,30 @@ class AgentVariant:
         name: Human-readable name for this variant
         agent: The agent instance to evaluate
         metadata: Additional info (model name, provider, config, etc)
+        agent_factory: Picklable callable building the agent, required to
+            run the variant in worker processes
+        max_concurrency: Maximum concurrent test cases for this variant
     """
 
     name: str
     agent: Any  # Agent type - avoiding circular import
     metadata: Dict[str, Any] = field(default_factory=dict)
+    agent_factory: Optional[Callable[[], Any]] = None
+    max_concurrency: Optional[int] = None
+
+    def config_hash(self) -> str:
+        """Hash identifying this variant's configuration in checkpoints.
+
+        The agent object itself cannot be hashed, so the hash covers the
+        name and metadata: put everything that changes the agent's behaviour
+        (model, prompt version, settings) in ``metadata``.
+        """
+        payload = json.dumps(
+            {"name": self.name, "metadata": self.metadata},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
 
 
 class Evaluator(ABC):
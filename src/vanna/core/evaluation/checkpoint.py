@@ -0,0 +1,222 @@
+"""
+Evaluation checkpoints and judgment cache.
+
+A checkpoint is an append-only JSONL file with one line per completed
+(variant, test case) pair, keyed by the variant's config hash and the test
+case's content hash. Reruns load it and skip the pairs it already holds, so
+an interrupted evaluation resumes where it stopped and unchanged pairs are
+not run again. The judgment cache stores LLM judge verdicts the same way.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from vanna.components import RichTextComponent
+from vanna.core import UiComponent
+
+from .base import AgentResult, EvaluationResult, TestCase, TestCaseResult
+
+logger = logging.getLogger(__name__)
+
+
+def hash_test_case(test_case: TestCase) -> str:
+    """Hash of a test case's content, including its ID and expectations."""
+    payload = json.dumps(test_case.model_dump(mode="json"), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def serialize_result(result: TestCaseResult) -> Dict[str, Any]:
+    """Convert a test case result to JSON-compatible data.
+
+    UI components are not serializable in general, so only the final answer
+    text is kept; ``deserialize_result`` turns it back into a text component.
+    """
+    agent_result = asdict(result.agent_result)
+    agent_result.pop("components")
+    agent_result["final_answer"] = result.agent_result.get_final_answer()
+    return {
+        "test_case": result.test_case.model_dump(mode="json"),
+        "agent_result": agent_result,
+        "evaluations": [e.model_dump(mode="json") for e in result.evaluations],
+        "execution_time_ms": result.execution_time_ms,
+    }
+
+
+def deserialize_result(data: Dict[str, Any]) -> TestCaseResult:
+    """Rebuild a test case result from ``serialize_result`` data."""
+    agent_data = dict(data["agent_result"])
+    final_answer = agent_data.pop("final_answer", "")
+    components = (
+        [
+            UiComponent(
+                rich_component=RichTextComponent(content=final_answer),
+                simple_component=None,
+            )
+        ]
+        if final_answer
+        else []
+    )
+    return TestCaseResult(
+        test_case=TestCase.model_validate(data["test_case"]),
+        agent_result=AgentResult(components=components, **agent_data),
+        evaluations=[EvaluationResult.model_validate(e) for e in data["evaluations"]],
+        execution_time_ms=data["execution_time_ms"],
+    )
+
+
+class _JsonlStore:
+    """Append-only JSONL file of records, loaded into memory on open.
+
+    Lines are flushed as they are written, so at most the line being
+    written is lost when a run is interrupted; unreadable lines are skipped
+    on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._file: Optional[Any] = None
+        # A run interrupted mid-write leaves a partial line to terminate
+        self._needs_newline = False
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A copy in another process opens its own handle to append with
+        state = self.__dict__.copy()
+        state["_file"] = None
+        return state
+
+    def _read(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as f:
+            f.seek(0, 2)
+            if f.tell() > 0:
+                f.seek(-1, 2)
+                self._needs_newline = f.read(1) != b"\n"
+        skipped = 0
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    skipped += 1
+        if skipped:
+            logger.warning(f"Skipped {skipped} unreadable lines in {self.path}")
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+            if self._needs_newline:
+                self._file.write("\n")
+                self._needs_newline = False
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file handle; it is reopened on the next write."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class EvaluationCheckpoint(_JsonlStore):
+    """Append-only JSONL store of completed evaluation results.
+
+    Each line records the variant name and config hash, the test case hash,
+    the names of the evaluators that scored the result and the serialized
+    result.
+    """
+
+    def __init__(self, path: str):
+        """Open a checkpoint file, loading the results it already holds.
+
+        Args:
+            path: JSONL file to read and append to (created if missing)
+        """
+        super().__init__(path)
+        self._records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for record in self._read():
+            if "variant_hash" in record and "test_case_hash" in record:
+                self._records[(record["variant_hash"], record["test_case_hash"])] = (
+                    record
+                )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(
+        self, variant_hash: str, test_case_hash: str, evaluator_names: List[str]
+    ) -> Optional[TestCaseResult]:
+        """Get a cached result scored by the same evaluators, if any."""
+        record = self._records.get((variant_hash, test_case_hash))
+        if record is None or record.get("evaluators") != evaluator_names:
+            return None
+        try:
+            return deserialize_result(record["result"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint record: {e}")
+            return None
+
+    def append(
+        self,
+        variant_name: str,
+        variant_hash: str,
+        result: TestCaseResult,
+        evaluator_names: List[str],
+    ) -> None:
+        """Record a completed result."""
+        test_case_hash = hash_test_case(result.test_case)
+        record = {
+            "variant": variant_name,
+            "variant_hash": variant_hash,
+            "test_case_id": result.test_case.id,
+            "test_case_hash": test_case_hash,
+            "evaluators": evaluator_names,
+            "result": serialize_result(result),
+        }
+        self._write(record)
+        self._records[(variant_hash, test_case_hash)] = record
+
+
+class JudgmentCache(_JsonlStore):
+    """Append-only JSONL cache of LLM judge verdicts.
+
+    Verdicts are keyed by a content hash of what was judged (see
+    ``LLMAsJudgeEvaluator``), so identical judgments are reused across
+    reruns and agent variants.
+    """
+
+    def __init__(self, path: str):
+        """Open a judgment cache, loading the verdicts it already holds.
+
+        Args:
+            path: JSONL file to read and append to (created if missing)
+        """
+        super().__init__(path)
+        self._verdicts: Dict[str, Dict[str, Any]] = {
+            record["key"]: record for record in self._read() if "key" in record
+        }
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached verdict."""
+        return self._verdicts.get(key)
+
+    def put(self, key: str, verdict: Dict[str, Any]) -> None:
+        """Cache a verdict."""
+        record = {"key": key, **verdict}
+        self._write(record)
+        self._verdicts[key] = record
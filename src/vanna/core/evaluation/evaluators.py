@@ -8,11 +8,27 @@ This module provides ready-to-use evaluators for:
 - Efficiency evaluation (time, tokens, cost)
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
 from .base import Evaluator, TestCase, AgentResult, EvaluationResult
-from vanna.core import LlmService
+from .checkpoint import JudgmentCache
+from vanna.core import LlmService, User
+from vanna.core.quota import RateLimit, take_tokens
+
+
+@dataclass
+class _Judgment:
+    """A response waiting for the judge's verdict."""
+
+    query: str
+    response: str
+    user: User
 
 
 class TrajectoryEvaluator(Evaluator):
@@ -173,17 +189,97 @@ class LLMAsJudgeEvaluator(Evaluator):
 
     This evaluator uses a separate LLM to assess the quality of the
     agent's output based on natural language criteria.
+
+    Judging is limited independently of the agent under test: with
+    ``max_concurrency`` set, at most that many judge requests run at once,
+    optionally further limited by ``rate_limit`` (judge requests, not
+    judgments).
+
+    With ``batch_size`` above one, judgments requested at about the same
+    time - as the evaluation runner does when running test cases in
+    parallel - are packed into one judge request asking for a JSON array of
+    verdicts. Use it with judge models that follow structured output
+    instructions reliably; judgments missing from a batch response are
+    retried individually.
+
+    With ``cache_path`` set, verdicts are cached on disk keyed by a hash of
+    the judge model, criteria, user query and agent response, and identical
+    judgments running at the same time share one request.
+
+    The evaluator can be pickled to worker processes (``num_processes`` in
+    ``EvaluationRunner``). Each process then limits its own judge requests,
+    and all of them read the verdicts cached when the run started and append
+    to the same cache file.
     """
 
-    def __init__(self, judge_llm: LlmService, criteria: str):
+    def __init__(
+        self,
+        judge_llm: LlmService,
+        criteria: str,
+        *,
+        batch_size: int = 1,
+        batch_window_ms: float = 50.0,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[RateLimit] = None,
+        cache_path: Optional[str] = None,
+    ):
         """Initialize LLM-as-judge evaluator.
 
         Args:
             judge_llm: The LLM service to use for judging
             criteria: Natural language description of what to evaluate
+            batch_size: Maximum judgments packed into one judge request
+            batch_window_ms: How long a judgment waits for others to batch with
+            max_concurrency: Maximum concurrent judge requests; None for no limit
+            rate_limit: Optional limit on judge requests
+            cache_path: JSONL file caching verdicts across runs
         """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
         self.judge_llm = judge_llm
         self.criteria = criteria
+        self.batch_size = batch_size
+        self.batch_window_ms = batch_window_ms
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.cache = JudgmentCache(cache_path) if cache_path else None
+        self._init_run_state()
+
+    def _init_run_state(self) -> None:
+        """Create the limits and pending work, which are per process."""
+        self._semaphore: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        self._rate_tokens = self.rate_limit.capacity if self.rate_limit else 0.0
+        self._rate_updated = time.monotonic()
+        self._rate_lock = asyncio.Lock()
+        self._in_flight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._pending: List[Tuple[_Judgment, "asyncio.Future[Dict[str, Any]]"]] = []
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+        self._batch_tasks: Set["asyncio.Task[None]"] = set()
+
+    _RUN_STATE = (
+        "_semaphore",
+        "_rate_tokens",
+        "_rate_updated",
+        "_rate_lock",
+        "_in_flight",
+        "_pending",
+        "_flush_task",
+        "_batch_tasks",
+    )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # asyncio primitives and pending work belong to this process
+        state = self.__dict__.copy()
+        for name in self._RUN_STATE:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_run_state()
 
     @property
     def name(self) -> str:
@@ -202,15 +298,163 @@ class LLMAsJudgeEvaluator(Evaluator):
                 reasoning=f"Agent execution failed: {agent_result.error}",
             )
 
-        final_answer = agent_result.get_final_answer()
+        judgment = _Judgment(
+            query=test_case.message,
+            response=agent_result.get_final_answer(),
+            user=test_case.user,
+        )
+        key = self._cache_key(judgment)
+
+        cached = self.cache.get(key) if self.cache is not None else None
+        try:
+            if cached is not None:
+                verdict = cached
+            elif key in self._in_flight:
+                verdict = await asyncio.shield(self._in_flight[key])
+            else:
+                future: "asyncio.Future[Dict[str, Any]]" = (
+                    asyncio.get_running_loop().create_future()
+                )
+                self._in_flight[key] = future
+                try:
+                    verdict = await self._judge(judgment)
+                    future.set_result(verdict)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    future.set_exception(e)
+                    # Waiters get the exception; nobody else needs to retrieve it
+                    future.exception()
+                    raise
+                finally:
+                    del self._in_flight[key]
+                if self.cache is not None:
+                    self.cache.put(key, verdict)
+        except Exception as e:
+            return EvaluationResult(
+                test_case_id=test_case.id,
+                evaluator_name=self.name,
+                passed=False,
+                score=0.0,
+                reasoning=f"LLM judge evaluation failed: {str(e)}",
+            )
+
+        return EvaluationResult(
+            test_case_id=test_case.id,
+            evaluator_name=self.name,
+            passed=verdict["passed"],
+            score=verdict["score"],
+            reasoning=verdict["reasoning"],
+            metrics={
+                "judge_response": verdict["judge_response"],
+                "cached": cached is not None,
+            },
+        )
+
+    def _cache_key(self, judgment: "_Judgment") -> str:
+        payload = json.dumps(
+            [
+                getattr(self.judge_llm, "model", type(self.judge_llm).__name__),
+                self.criteria,
+                judgment.query,
+                judgment.response,
+            ]
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def _judge(self, judgment: "_Judgment") -> Dict[str, Any]:
+        """Get a verdict, batching it with others if enabled."""
+        if self.batch_size == 1:
+            return await self._judge_single(judgment)
 
+        future: "asyncio.Future[Dict[str, Any]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending.append((judgment, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.batch_window_ms / 1000)
+        self._flush_task = None
+        while self._pending:
+            self._flush()
+
+    def _flush(self) -> None:
+        batch = self._pending[: self.batch_size]
+        del self._pending[: self.batch_size]
+        task = asyncio.create_task(self._run_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(
+        self, batch: List[Tuple["_Judgment", "asyncio.Future[Dict[str, Any]]"]]
+    ) -> None:
+        verdicts: Dict[int, Dict[str, Any]] = {}
+        if len(batch) > 1:
+            try:
+                verdicts = await self._judge_batch([j for j, _ in batch])
+            except Exception:
+                # Fall back to judging each item on its own
+                verdicts = {}
+
+        async def settle(index: int, judgment: "_Judgment", future: Any) -> None:
+            try:
+                verdict = verdicts.get(index) or await self._judge_single(judgment)
+                if not future.done():
+                    future.set_result(verdict)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+
+        await asyncio.gather(
+            *(settle(i, judgment, future) for i, (judgment, future) in enumerate(batch))
+        )
+
+    async def _send_judge_request(self, user: Any, prompt: str) -> str:
+        """Send a judge request within the judge's own limits."""
+        from vanna.core.llm import LlmRequest, LlmMessage
+
+        request = LlmRequest(
+            user=user,
+            messages=[LlmMessage(role="user", content=prompt)],
+            temperature=0.0,  # Deterministic judging
+        )
+        if self._semaphore is None:
+            await self._wait_for_rate_limit()
+            response = await self.judge_llm.send_request(request)
+        else:
+            async with self._semaphore:
+                await self._wait_for_rate_limit()
+                response = await self.judge_llm.send_request(request)
+        return response.content or ""
+
+    async def _wait_for_rate_limit(self) -> None:
+        if self.rate_limit is None:
+            return
+        async with self._rate_lock:
+            while True:
+                now = time.monotonic()
+                self._rate_tokens, result = take_tokens(
+                    self._rate_tokens, now - self._rate_updated, self.rate_limit, 1
+                )
+                self._rate_updated = now
+                if result.granted:
+                    return
+                await asyncio.sleep(result.retry_after or 1.0)
+
+    async def _judge_single(self, judgment: "_Judgment") -> Dict[str, Any]:
         # Build prompt for judge
         judge_prompt = f"""You are evaluating an AI agent's response to a user query.
 
-User Query: {test_case.message}
+User Query: {judgment.query}
 
 Agent's Response:
-{final_answer}
+{judgment.response}
 
 Evaluation Criteria:
 {self.criteria}
@@ -226,41 +470,64 @@ PASSED: <yes/no>
 REASONING: <your explanation>
 """
 
-        try:
-            # Call judge LLM
-            from vanna.core.llm import LlmRequest, LlmMessage
+        judgment_text = await self._send_judge_request(judgment.user, judge_prompt)
+        return {
+            "score": self._parse_score(judgment_text),
+            "passed": self._parse_passed(judgment_text),
+            "reasoning": self._parse_reasoning(judgment_text),
+            "judge_response": judgment_text,
+        }
+
+    async def _judge_batch(
+        self, judgments: List["_Judgment"]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Judge several responses in one request.
+
+        Returns:
+            Verdicts by position in ``judgments``; unparseable items are left out
+        """
+        items = "\n\n".join(
+            f"### Item {i}\n\nUser Query: {j.query}\n\nAgent's Response:\n{j.response}"
+            for i, j in enumerate(judgments, start=1)
+        )
+        judge_prompt = f"""You are evaluating an AI agent's responses to several user queries.
 
-            request = LlmRequest(
-                user=test_case.user,
-                messages=[LlmMessage(role="user", content=judge_prompt)],
-                temperature=0.0,  # Deterministic judging
-            )
+Evaluation Criteria:
+{self.criteria}
 
-            response = await self.judge_llm.send_request(request)
-            judgment = response.content or ""
+{items}
 
-            # Parse response
-            score = self._parse_score(judgment)
-            passed = self._parse_passed(judgment)
-            reasoning = self._parse_reasoning(judgment)
+Evaluate each item independently against the criteria. For each item provide
+a score from 0.0 to 1.0 (where 1.0 is perfect), whether it passes
+(score >= 0.7) and brief reasoning.
 
-            return EvaluationResult(
-                test_case_id=test_case.id,
-                evaluator_name=self.name,
-                passed=passed,
-                score=score,
-                reasoning=reasoning,
-                metrics={"judge_response": judgment},
-            )
+Respond with only a JSON array containing one object per item, in order:
+[{{"item": 1, "score": <number>, "passed": <true/false>, "reasoning": "<your explanation>"}}]
+"""
 
-        except Exception as e:
-            return EvaluationResult(
-                test_case_id=test_case.id,
-                evaluator_name=self.name,
-                passed=False,
-                score=0.0,
-                reasoning=f"LLM judge evaluation failed: {str(e)}",
-            )
+        judgment_text = await self._send_judge_request(judgments[0].user, judge_prompt)
+        start, end = judgment_text.find("["), judgment_text.rfind("]")
+        parsed = json.loads(judgment_text[start : end + 1]) if start >= 0 else []
+
+        verdicts: Dict[int, Dict[str, Any]] = {}
+        for entry in parsed if isinstance(parsed, list) else []:
+            try:
+                index = int(entry["item"]) - 1
+                score = float(entry["score"])
+                passed = entry["passed"]
+                if isinstance(passed, str):
+                    passed = passed.strip().lower() in ["yes", "true", "pass"]
+                verdict = {
+                    "score": score,
+                    "passed": bool(passed),
+                    "reasoning": str(entry.get("reasoning", "")),
+                    "judge_response": json.dumps(entry),
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= index < len(judgments):
+                verdicts[index] = verdict
+        return verdicts
 
     def _parse_score(self, judgment: str) -> float:
         """Parse score from judge response."""
@@ -340,8 +607,14 @@ class EfficiencyEvaluator(Evaluator):
                 )
                 score -= 0.33
 
-        # Check cost (would need cost calculation from metadata)
-        # For now, skip cost evaluation
+        # Check cost (only known when the agent has a price table)
+        if self.max_cost_usd and agent_result.estimated_cost_usd is not None:
+            if agent_result.estimated_cost_usd > self.max_cost_usd:
+                issues.append(
+                    f"Estimated cost ${agent_result.estimated_cost_usd:.4f} "
+                    f"exceeded limit ${self.max_cost_usd:.4f}"
+                )
+                score -= 0.33
 
         # Check from expected outcome if specified
         expected = test_case.expected_outcome
@@ -371,6 +644,7 @@ class EfficiencyEvaluator(Evaluator):
             metrics={
                 "execution_time_ms": agent_result.execution_time_ms,
                 "total_tokens": agent_result.total_tokens,
+                "estimated_cost_usd": agent_result.estimated_cost_usd,
                 "issues": issues,
             },
         )
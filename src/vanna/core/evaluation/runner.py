@@ -7,7 +7,17 @@ especially when comparing multiple LLMs or model versions.
 """
 
 import asyncio
-from typing import Any, List, Dict, Optional, AsyncGenerator, TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 from datetime import datetime
 
 from .base import (
@@ -17,9 +27,21 @@ from .base import (
     AgentVariant,
     Evaluator,
 )
+from .checkpoint import (
+    EvaluationCheckpoint,
+    deserialize_result,
+    hash_test_case,
+    serialize_result,
+)
 from vanna.core import UiComponent
+from vanna.core.llm import capture_llm_usage
 from vanna.core.user.request_context import RequestContext
-from vanna.core.observability import ObservabilityProvider
+from vanna.core.observability import (
+    ObservabilityProvider,
+    Span,
+    activate_span,
+    get_current_span,
+)
 
 if TYPE_CHECKING:
     from vanna import Agent
@@ -33,10 +55,18 @@ class EvaluationRunner:
     on the same set of test cases. The runner executes test cases in parallel with
     configurable concurrency to handle I/O-bound LLM operations efficiently.
 
+    Comparisons can be checkpointed: with ``checkpoint_path`` set, every
+    completed result is appended to a JSONL file keyed by the variant's
+    config hash and the test case's content hash, and reruns skip the pairs
+    already in the file. With ``num_processes`` above one, pending test cases
+    are run in chunks on a process pool; each variant then needs a picklable
+    ``agent_factory``, and the evaluators must be picklable too.
+
     Example:
         >>> runner = EvaluationRunner(
         ...     evaluators=[TrajectoryEvaluator(), OutputEvaluator()],
-        ...     max_concurrency=20
+        ...     max_concurrency=20,
+        ...     checkpoint_path="evals/checkpoint.jsonl",
         ... )
         >>> comparison = await runner.compare_agents(
         ...     agent_variants=[claude_variant, gpt_variant],
@@ -49,6 +79,10 @@ class EvaluationRunner:
         evaluators: List[Evaluator],
         max_concurrency: int = 10,
         observability_provider: Optional[ObservabilityProvider] = None,
+        *,
+        checkpoint_path: Optional[str] = None,
+        num_processes: int = 1,
+        process_chunk_size: int = 10,
     ):
         """Initialize the evaluation runner.
 
@@ -56,10 +90,22 @@ class EvaluationRunner:
             evaluators: List of evaluators to apply to each test case
             max_concurrency: Maximum number of concurrent test case executions
             observability_provider: Optional observability for tracking eval runs
+            checkpoint_path: JSONL file caching completed results across runs
+            num_processes: Worker processes to run test cases on; 1 runs them
+                in this process
+            process_chunk_size: Test cases sent to a worker process at a time
         """
+        if num_processes < 1:
+            raise ValueError("num_processes must be at least 1")
+        if process_chunk_size < 1:
+            raise ValueError("process_chunk_size must be at least 1")
+
         self.evaluators = evaluators
         self.max_concurrency = max_concurrency
         self.observability = observability_provider
+        self.checkpoint_path = checkpoint_path
+        self.num_processes = num_processes
+        self.process_chunk_size = process_chunk_size
         self._semaphore = asyncio.Semaphore(max_concurrency)
 
     async def run_evaluation(
@@ -103,7 +149,7 @@ class EvaluationRunner:
         Returns:
             ComparisonReport with results for all variants
         """
-        from .report import ComparisonReport
+        from .report import ComparisonReport, EvaluationReport
 
         # Create span for overall comparison
         if self.observability:
@@ -115,19 +161,34 @@ class EvaluationRunner:
                 },
             )
 
-        # Run all variants in parallel
-        tasks = [
-            self._run_agent_variant(variant, test_cases) for variant in agent_variants
-        ]
-
-        variant_reports = await asyncio.gather(*tasks)
+        results: Dict[str, Dict[str, TestCaseResult]] = {
+            v.name: {} for v in agent_variants
+        }
+        async for variant_name, result in self._iter_results(
+            agent_variants, test_cases
+        ):
+            results[variant_name][result.test_case.id] = result
 
         if self.observability:
             await self.observability.end_span(span)
 
+        reports = {
+            variant.name: EvaluationReport(
+                agent_name=variant.name,
+                results=[
+                    results[variant.name][test_case.id]
+                    for test_case in test_cases
+                    if test_case.id in results[variant.name]
+                ],
+                evaluators=self.evaluators,
+                metadata=variant.metadata,
+                timestamp=datetime.now(),
+            )
+            for variant in agent_variants
+        }
         return ComparisonReport(
             variants=agent_variants,
-            reports=dict(zip([v.name for v in agent_variants], variant_reports)),
+            reports=reports,
             test_cases=test_cases,
             timestamp=datetime.now(),
         )
@@ -140,7 +201,9 @@ class EvaluationRunner:
         """Stream comparison results as they complete.
 
         Useful for long-running evaluations where you want to see
-        progress updates in real-time (e.g., for UI display).
+        progress updates in real-time (e.g., for UI display). Results
+        loaded from the checkpoint are yielded first; results are not
+        retained by the runner.
 
         Args:
             agent_variants: Agent variants to compare
@@ -149,67 +212,189 @@ class EvaluationRunner:
         Yields:
             Tuples of (variant_name, result, completed_count, total_count)
         """
-        queue: asyncio.Queue[tuple[str, TestCaseResult]] = asyncio.Queue()
-
-        async def worker(variant: AgentVariant) -> None:
-            """Worker that runs test cases for one variant."""
-            results = await self._run_test_cases_parallel(variant.agent, test_cases)
-            for result in results:
-                await queue.put((variant.name, result))
-
-        # Start all workers
-        workers = [asyncio.create_task(worker(v)) for v in agent_variants]
-
-        # Yield results as they arrive
         completed = 0
         total = len(agent_variants) * len(test_cases)
 
-        while completed < total:
-            variant_name, result = await queue.get()
+        async for variant_name, result in self._iter_results(
+            agent_variants, test_cases
+        ):
             completed += 1
             yield variant_name, result, completed, total
 
-        # Wait for all workers to complete
-        await asyncio.gather(*workers)
-
-    async def _run_agent_variant(
+    async def _iter_results(
         self,
-        variant: AgentVariant,
+        agent_variants: List[AgentVariant],
         test_cases: List[TestCase],
-    ) -> "EvaluationReport":
-        """Run a single agent variant on all test cases.
+    ) -> AsyncGenerator[Tuple[str, TestCaseResult], None]:
+        """Yield (variant name, result) pairs, cached ones first.
 
-        Args:
-            variant: The agent variant to evaluate
-            test_cases: Test cases to run
+        New results are appended to the checkpoint as they complete.
+        """
+        checkpoint = (
+            EvaluationCheckpoint(self.checkpoint_path) if self.checkpoint_path else None
+        )
+        evaluator_names = [e.name for e in self.evaluators]
+        case_hashes = {id(case): hash_test_case(case) for case in test_cases}
+
+        # One span per variant, ended once all of its results are in
+        spans: Dict[int, Span] = {}
+        remaining = {id(variant): len(test_cases) for variant in agent_variants}
+
+        async def completed(variant: AgentVariant) -> None:
+            remaining[id(variant)] -= 1
+            if remaining[id(variant)] == 0 and id(variant) in spans:
+                assert self.observability is not None
+                await self.observability.end_span(spans.pop(id(variant)))
+
+        if self.observability and test_cases:
+            # Variant spans are siblings; each is made active only in the
+            # tasks running that variant's test cases
+            parent = get_current_span()
+            for variant in agent_variants:
+                spans[id(variant)] = await self.observability.create_span(
+                    f"variant_{variant.name}",
+                    attributes={
+                        "variant": variant.name,
+                        "num_test_cases": len(test_cases),
+                        **variant.metadata,
+                    },
+                )
+                activate_span(parent)
+
+        pending: List[Tuple[AgentVariant, List[TestCase]]] = []
+        for variant in agent_variants:
+            variant_hash = variant.config_hash()
+            todo = []
+            for test_case in test_cases:
+                cached = (
+                    checkpoint.get(
+                        variant_hash, case_hashes[id(test_case)], evaluator_names
+                    )
+                    if checkpoint is not None
+                    else None
+                )
+                if cached is not None:
+                    await completed(variant)
+                    yield variant.name, cached
+                else:
+                    todo.append(test_case)
+            if todo:
+                pending.append((variant, todo))
+
+        if self.num_processes > 1:
+            source = self._run_in_processes(pending)
+        else:
+            source = self._run_in_event_loop(pending, spans)
 
-        Returns:
-            EvaluationReport for this variant
+        try:
+            async for variant, result in source:
+                if checkpoint is not None:
+                    checkpoint.append(
+                        variant.name, variant.config_hash(), result, evaluator_names
+                    )
+                await completed(variant)
+                yield variant.name, result
+        finally:
+            await source.aclose()
+            if checkpoint is not None:
+                checkpoint.close()
+            if self.observability:
+                for span in spans.values():
+                    await self.observability.end_span(span)
+
+    async def _run_in_event_loop(
+        self,
+        pending: List[Tuple[AgentVariant, List[TestCase]]],
+        spans: Dict[int, Span],
+    ) -> AsyncGenerator[Tuple[AgentVariant, TestCaseResult], None]:
+        """Run pending test cases as tasks, yielding results as they complete.
+
+        Each task runs under its variant's span, if it has one.
         """
-        from .report import EvaluationReport
 
-        if self.observability:
-            span = await self.observability.create_span(
-                f"variant_{variant.name}",
-                attributes={
-                    "variant": variant.name,
-                    "num_test_cases": len(test_cases),
-                    **variant.metadata,
-                },
+        async def run(
+            variant: AgentVariant,
+            test_case: TestCase,
+            limit: Optional[asyncio.Semaphore],
+        ) -> Tuple[AgentVariant, TestCaseResult]:
+            if id(variant) in spans:
+                activate_span(spans[id(variant)])
+            if limit is None:
+                return variant, await self._run_single_test_case(
+                    variant.agent, test_case
+                )
+            async with limit:
+                return variant, await self._run_single_test_case(
+                    variant.agent, test_case
+                )
+
+        tasks: List[asyncio.Task[Tuple[AgentVariant, TestCaseResult]]] = []
+        for variant, cases in pending:
+            limit = (
+                asyncio.Semaphore(variant.max_concurrency)
+                if variant.max_concurrency
+                else None
+            )
+            tasks.extend(
+                asyncio.create_task(run(variant, case, limit)) for case in cases
             )
 
-        results = await self._run_test_cases_parallel(variant.agent, test_cases)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_in_processes(
+        self, pending: List[Tuple[AgentVariant, List[TestCase]]]
+    ) -> AsyncGenerator[Tuple[AgentVariant, TestCaseResult], None]:
+        """Run pending test cases in chunks on a process pool.
+
+        A variant's ``max_concurrency`` applies within each worker process.
+        """
+        for variant, _ in pending:
+            if variant.agent_factory is None:
+                raise ValueError(
+                    f"Variant '{variant.name}' needs an agent_factory to run in "
+                    "worker processes"
+                )
+
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(max_workers=self.num_processes)
+
+        async def run_chunk(
+            variant: AgentVariant, chunk: List[TestCase]
+        ) -> Tuple[AgentVariant, List[Dict[str, Any]]]:
+            agent_factory = variant.agent_factory
+            assert agent_factory is not None  # checked above
+            records = await loop.run_in_executor(
+                pool,
+                _run_chunk_in_process,
+                agent_factory,
+                self.evaluators,
+                [case.model_dump(mode="json") for case in chunk],
+                variant.max_concurrency or self.max_concurrency,
+            )
+            return variant, records
 
-        if self.observability:
-            await self.observability.end_span(span)
+        tasks = [
+            asyncio.create_task(
+                run_chunk(variant, cases[i : i + self.process_chunk_size])
+            )
+            for variant, cases in pending
+            for i in range(0, len(cases), self.process_chunk_size)
+        ]
 
-        return EvaluationReport(
-            agent_name=variant.name,
-            results=results,
-            evaluators=self.evaluators,
-            metadata=variant.metadata,
-            timestamp=datetime.now(),
-        )
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                variant, records = await next_done
+                for record in records:
+                    yield variant, deserialize_result(record)
+        finally:
+            for task in tasks:
+                task.cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
 
     async def _run_test_cases_parallel(
         self,
@@ -282,32 +467,59 @@ class EvaluationRunner:
         tool_calls: List[Dict[str, Any]] = []
         error: Optional[str] = None
 
-        try:
-            # Create request context with user info from test case
-            # This allows the agent's UserResolver to resolve the correct user
-            request_context = RequestContext(
-                cookies={"user_id": test_case.user.id},
-                headers={},
-                metadata={"test_case_user": test_case.user},
-            )
-
-            async for component in agent.send_message(
-                request_context=request_context,
-                message=test_case.message,
-                conversation_id=test_case.conversation_id,
-            ):
-                components.append(component)
-
-        except Exception as e:
-            error = str(e)
-
-        # TODO: Extract tool calls and LLM requests from observability
-        # For now, these will be empty unless we hook into observability
+        with capture_llm_usage() as usage_recorder:
+            try:
+                # Create request context with user info from test case
+                # This allows the agent's UserResolver to resolve the correct user
+                request_context = RequestContext(
+                    cookies={"user_id": test_case.user.id},
+                    headers={},
+                    metadata={"test_case_user": test_case.user},
+                )
+
+                async for component in agent.send_message(
+                    request_context=request_context,
+                    message=test_case.message,
+                    conversation_id=test_case.conversation_id,
+                ):
+                    components.append(component)
+
+            except Exception as e:
+                error = str(e)
+
+        # TODO: Extract tool calls from observability
+        usage = usage_recorder.summary
 
         return AgentResult(
             test_case_id=test_case.id,
             components=components,
             tool_calls=tool_calls,
-            llm_requests=[],
+            llm_requests=[record.model_dump() for record in usage_recorder.records],
+            total_tokens=usage.usage.total_tokens,
+            prompt_tokens=usage.usage.prompt_tokens,
+            completion_tokens=usage.usage.completion_tokens,
+            cached_tokens=usage.usage.cached_tokens,
+            estimated_cost_usd=usage.cost_usd,
             error=error,
         )
+
+
+def _run_chunk_in_process(
+    agent_factory: Callable[[], "Agent"],
+    evaluators: List[Evaluator],
+    test_cases: List[Dict[str, Any]],
+    max_concurrency: int,
+) -> List[Dict[str, Any]]:
+    """Run a chunk of test cases in a worker process.
+
+    Results are returned serialized, since UI components do not pickle.
+    """
+
+    async def run() -> List[Dict[str, Any]]:
+        runner = EvaluationRunner(evaluators, max_concurrency=max_concurrency)
+        results = await runner._run_test_cases_parallel(
+            agent_factory(), [TestCase.model_validate(c) for c in test_cases]
+        )
+        return [serialize_result(result) for result in results]
+
+    return asyncio.run(run())
@@ -6,5 +6,12 @@ history before it's sent to the LLM.
 """
 
 from .base import ConversationFilter
+from .token_budget import TokenBudgetFilter
+from .tokenizer import ApproximateTokenizer, Tokenizer
 
-__all__ = ["ConversationFilter"]
+__all__ = [
+    "ConversationFilter",
+    "TokenBudgetFilter",
+    "Tokenizer",
+    "ApproximateTokenizer",
+]
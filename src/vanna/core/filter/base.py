@@ -49,8 +49,17 @@ class ConversationFilter(ABC):
                 ContextWindowFilter(max_tokens=8000)
             ]
         )
+
+    Within a request, the agent normally re-filters the whole history after
+    each tool round. Filters that transform each message independently of
+    the others (redaction, for example) can set ``incremental = True``; the
+    agent then filters only the messages added since the previous round and
+    appends them to the previous result. Filters that look at the history
+    as a whole, such as the context window filter above, must not.
     """
 
+    incremental: bool = False
+
     async def filter_messages(self, messages: List["Message"]) -> List["Message"]:
         """Filter and transform conversation messages.
 
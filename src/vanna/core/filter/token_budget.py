@@ -0,0 +1,226 @@
+"""
+Token budget conversation filter.
+
+Keeps the conversation history sent to the LLM within a token budget, so
+long sessions neither overflow the model's context window nor pay latency
+for history that no longer matters.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple, TypeVar
+
+from .base import ConversationFilter
+from .tokenizer import ApproximateTokenizer, Tokenizer
+
+if TYPE_CHECKING:
+    from ..observability import ObservabilityProvider
+    from ..storage import Message
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ELISION_NOTE = "[... {lines} more lines ({tokens} tokens) elided from this output]"
+
+
+class TokenBudgetFilter(ConversationFilter):
+    """Keeps conversation history under a token budget.
+
+    The filter works in two steps:
+
+    1. Large tool outputs from earlier turns - query results, CSV previews -
+       are cut down to their first lines, followed by a note saying how much
+       was elided. Outputs of the current turn are kept whole.
+    2. If the history is still over budget, the oldest messages are dropped.
+       An assistant message with tool calls is dropped together with its
+       tool results, so the LLM never sees one without the other, and the
+       remaining history starts with a user message. The current turn, from
+       the latest user message on, is always kept.
+
+    Token counts come from a pluggable tokenizer and are cached by a digest
+    of the text, so messages are only tokenized once across requests without
+    the cache holding on to large tool outputs. The budget covers the
+    messages only; leave room for the system prompt, tools and response.
+
+    Example:
+        agent = Agent(
+            ...,
+            conversation_filters=[
+                TokenBudgetFilter(max_tokens=60_000, tokenizer=TiktokenTokenizer())
+            ],
+        )
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 32_000,
+        *,
+        tokenizer: Optional[Tokenizer] = None,
+        max_tool_output_tokens: int = 1_000,
+        tool_output_preview_tokens: int = 200,
+        message_overhead_tokens: int = 4,
+        cache_size: int = 4096,
+        observability_provider: Optional["ObservabilityProvider"] = None,
+    ):
+        """Initialize the filter.
+
+        Args:
+            max_tokens: Token budget for the filtered messages
+            tokenizer: Counts tokens; defaults to an ApproximateTokenizer
+            max_tool_output_tokens: Earlier tool outputs above this size are
+                elided
+            tool_output_preview_tokens: Tokens kept from the start of an
+                elided tool output
+            message_overhead_tokens: Tokens added per message for its role
+                and formatting
+            cache_size: Distinct texts whose token counts are cached
+            observability_provider: Optional provider for tokens saved
+        """
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        if tool_output_preview_tokens > max_tool_output_tokens:
+            raise ValueError(
+                "tool_output_preview_tokens must not exceed max_tool_output_tokens"
+            )
+
+        self.max_tokens = max_tokens
+        self.tokenizer = tokenizer or ApproximateTokenizer()
+        self.max_tool_output_tokens = max_tool_output_tokens
+        self.tool_output_preview_tokens = tool_output_preview_tokens
+        self.message_overhead_tokens = message_overhead_tokens
+        self.observability_provider = observability_provider
+        self.tokens_saved_total = 0
+
+        self.cache_size = cache_size
+        self._token_counts: "OrderedDict[bytes, int]" = OrderedDict()
+        # None when the text needs no eliding, so the text itself is not kept
+        self._elisions: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+
+    def _cached(
+        self,
+        cache: "OrderedDict[bytes, T]",
+        text: str,
+        compute: Callable[[str], T],
+    ) -> T:
+        """Look up ``text`` in an LRU cache keyed by its digest."""
+        key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        value = cache[key] = compute(text)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def _count_text(self, text: str) -> int:
+        return self._cached(self._token_counts, text, self.tokenizer.count_tokens)
+
+    def _elide(self, text: str) -> str:
+        elided = self._cached(self._elisions, text, self._elide_text)
+        return text if elided is None else elided
+
+    def count_message_tokens(self, message: "Message") -> int:
+        """Count the tokens a message takes up in a request."""
+        tokens = self.message_overhead_tokens + self._count_text(message.content or "")
+        for tool_call in message.tool_calls or []:
+            tokens += self._count_text(tool_call.name)
+            tokens += self._count_text(json.dumps(tool_call.arguments, sort_keys=True))
+        return tokens
+
+    def _elide_text(self, text: str) -> Optional[str]:
+        lines = text.splitlines()
+        kept = 0
+        tokens = 0
+        for line in lines:
+            line_tokens = self._count_text(line) + 1
+            if kept and tokens + line_tokens > self.tool_output_preview_tokens:
+                break
+            tokens += line_tokens
+            kept += 1
+        if kept == len(lines):
+            return None
+        elided_tokens = self._count_text(text) - self._count_text(
+            "\n".join(lines[:kept])
+        )
+        note = ELISION_NOTE.format(lines=len(lines) - kept, tokens=elided_tokens)
+        return "\n".join(lines[:kept] + [note])
+
+    async def filter_messages(self, messages: List["Message"]) -> List["Message"]:
+        """Elide old tool outputs and drop old messages to fit the budget."""
+        current_turn = next(
+            (i for i in range(len(messages) - 1, -1, -1) if messages[i].role == "user"),
+            0,
+        )
+        before = 0
+        kept: List["Message"] = []
+        counts: List[int] = []
+        for i, message in enumerate(messages):
+            tokens = self.count_message_tokens(message)
+            before += tokens
+            if (
+                message.role == "tool"
+                and i < current_turn
+                and tokens > self.max_tool_output_tokens
+            ):
+                content = self._elide(message.content)
+                if content != message.content:
+                    message = message.model_copy(update={"content": content})
+                    tokens = self.count_message_tokens(message)
+            kept.append(message)
+            counts.append(tokens)
+
+        total = sum(counts)
+        start = 0
+        if total > self.max_tokens:
+            for unit_start, unit_end in self._units(kept, current_turn):
+                if total <= self.max_tokens:
+                    break
+                total -= sum(counts[unit_start:unit_end])
+                start = unit_end
+            # Start the history with a user message, as providers require
+            while start < current_turn and kept[start].role != "user":
+                total -= counts[start]
+                start += 1
+            if total > self.max_tokens:
+                logger.warning(
+                    f"Current turn needs {total} tokens, over the "
+                    f"{self.max_tokens} token budget"
+                )
+
+        saved = before - total
+        if saved > 0:
+            self.tokens_saved_total += saved
+            if self.observability_provider:
+                await self.observability_provider.record_metric(
+                    "agent.filter.tokens_saved",
+                    saved,
+                    "tokens",
+                    tags={"filter": self.__class__.__name__},
+                )
+        return kept[start:]
+
+    @staticmethod
+    def _units(messages: List["Message"], end: int) -> List[Tuple[int, int]]:
+        """Split ``messages[:end]`` into ranges that must be dropped together.
+
+        A range is a single message, or an assistant message with tool calls
+        followed by the tool results answering them.
+        """
+        units = []
+        i = 0
+        while i < end:
+            j = i + 1
+            call_ids = {tc.id for tc in messages[i].tool_calls or []}
+            if call_ids:
+                while (
+                    j < len(messages)
+                    and messages[j].role == "tool"
+                    and messages[j].tool_call_id in call_ids
+                ):
+                    j += 1
+            units.append((i, j))
+            i = j
+        return units
@@ -71,6 +71,19 @@ class LifecycleHook(ABC):
         """
         pass
 
+    async def on_message_end(self, error: Optional[BaseException] = None) -> None:
+        """Called when message processing ends, whether or not it succeeded.
+
+        Unlike ``after_message``, this also runs when a hook rejected the
+        message, a workflow handled it without the LLM, processing failed or
+        the client went away, so it is the place to release resources
+        acquired in ``before_message``.
+
+        Args:
+            error: The exception that ended processing, or None on success
+        """
+        pass
+
     async def after_tool(self, result: "ToolResult") -> Optional["ToolResult"]:
         """Called after tool execution.
 
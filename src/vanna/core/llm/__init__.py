@@ -6,6 +6,25 @@ This module provides the core abstractions for LLM services in the Vanna Agents
 
 from .base import LlmService
 from .models import LlmMessage, LlmRequest, LlmResponse, LlmStreamChunk
+from .router import (
+    LlmRoute,
+    RouteCondition,
+    RoutingLlmService,
+    prompt_tokens_over,
+    user_in_groups,
+    uses_tools,
+)
+from .tool_payloads import ToolPayloadCache
+from .usage import (
+    LlmUsageRecord,
+    ModelPrice,
+    PriceTable,
+    TokenUsage,
+    UsageRecorder,
+    UsageSummary,
+    capture_llm_usage,
+    record_llm_usage,
+)
 
 __all__ = [
     "LlmService",
@@ -13,4 +32,19 @@ __all__ = [
     "LlmRequest",
     "LlmResponse",
     "LlmStreamChunk",
+    "ToolPayloadCache",
+    "LlmRoute",
+    "RouteCondition",
+    "RoutingLlmService",
+    "prompt_tokens_over",
+    "user_in_groups",
+    "uses_tools",
+    "TokenUsage",
+    "ModelPrice",
+    "PriceTable",
+    "LlmUsageRecord",
+    "UsageSummary",
+    "UsageRecorder",
+    "capture_llm_usage",
+    "record_llm_usage",
 ]
@@ -19,10 +19,20 @@ class LlmMessage(BaseModel):
     content: str = Field(description="Message content")
     tool_calls: Optional[List[ToolCall]] = Field(default=None)
     tool_call_id: Optional[str] = Field(default=None)
+    cache_breakpoint: bool = Field(
+        default=False,
+        description="Cache the prompt prefix ending with this message",
+    )
 
 
 class LlmRequest(BaseModel):
-    """Request to LLM service."""
+    """Request to LLM service.
+
+    The ``cache_*`` flags and ``LlmMessage.cache_breakpoint`` mark the stable
+    prefix of the prompt - tools, system prompt and earlier turns - that
+    providers with explicit prompt caching (Anthropic) should cache.
+    Providers that cache prompt prefixes automatically ignore them.
+    """
 
     messages: List[LlmMessage] = Field(description="Messages to send")
     tools: Optional[List[Any]] = Field(
@@ -35,6 +45,10 @@ class LlmRequest(BaseModel):
     system_prompt: Optional[str] = Field(
         default=None, description="System prompt for the LLM"
     )
+    cache_system_prompt: bool = Field(
+        default=False, description="Cache the system prompt"
+    )
+    cache_tools: bool = Field(default=False, description="Cache the tool definitions")
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -53,9 +67,13 @@ class LlmResponse(BaseModel):
 
 
 class LlmStreamChunk(BaseModel):
-    """Streaming chunk from LLM."""
+    """Streaming chunk from LLM.
+
+    Services report token usage on a single chunk, usually the last one.
+    """
 
     content: Optional[str] = None
     tool_calls: Optional[List[ToolCall]] = None
     finish_reason: Optional[str] = None
+    usage: Optional[Dict[str, int]] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
@@ -0,0 +1,390 @@
+"""
+Routing LLM service.
+
+``RoutingLlmService`` composes several LLM services behind the
+``LlmService`` interface: it routes each request to a cheap or strong
+model by request features, fails over to the next service of the route on
+errors and timeouts, and can hedge slow requests by racing a duplicate on
+a second service.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from ..errors import LlmServiceError
+from .base import LlmService
+from .models import LlmRequest, LlmResponse, LlmStreamChunk
+
+if TYPE_CHECKING:
+    from ..filter import Tokenizer
+    from ..observability import ObservabilityProvider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RouteCondition = Callable[[LlmRequest], bool]
+
+
+@dataclass
+class LlmRoute:
+    """A named list of LLM services serving the requests a condition matches.
+
+    Attributes:
+        name: Route name, used in metrics and response metadata
+        services: Services in order of preference; later ones are fallbacks
+            and hedges for the first
+        condition: Matches the requests this route serves; None matches any
+        timeout: Seconds an attempt may take - until the first chunk when
+            streaming - before failing over; None waits indefinitely
+    """
+
+    name: str
+    services: Sequence[LlmService]
+    condition: Optional[RouteCondition] = None
+    timeout: Optional[float] = None
+
+
+def prompt_tokens_over(
+    threshold: int, tokenizer: Optional["Tokenizer"] = None
+) -> RouteCondition:
+    """Match requests whose system prompt and messages exceed ``threshold`` tokens.
+
+    Args:
+        threshold: Token count above which the condition matches
+        tokenizer: Counts tokens; defaults to an ApproximateTokenizer
+    """
+    if tokenizer is None:
+        from ..filter import ApproximateTokenizer
+
+        tokenizer = ApproximateTokenizer()
+    counter = tokenizer
+
+    def condition(request: LlmRequest) -> bool:
+        tokens = counter.count_tokens(request.system_prompt or "")
+        for message in request.messages:
+            tokens += counter.count_tokens(message.content or "")
+            if tokens > threshold:
+                return True
+        return False
+
+    return condition
+
+
+def uses_tools(request: LlmRequest) -> bool:
+    """Match requests offering the LLM tools to call."""
+    return bool(request.tools)
+
+
+def user_in_groups(*groups: str) -> RouteCondition:
+    """Match requests from users belonging to any of ``groups``, e.g. a tenant."""
+    wanted = set(groups)
+
+    def condition(request: LlmRequest) -> bool:
+        return not wanted.isdisjoint(request.user.group_memberships)
+
+    return condition
+
+
+class _LatencyWindow:
+    """Recent latencies of one service, for hedging percentiles."""
+
+    def __init__(self, size: int) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> float:
+        ordered = sorted(self._samples)
+        index = round(percentile / 100 * (len(ordered) - 1))
+        return ordered[index]
+
+
+class RoutingLlmService(LlmService):
+    """LLM service routing requests across other LLM services.
+
+    Each request goes to the first route whose condition matches. Within a
+    route, services are tried in order: when one raises or exceeds the
+    route's timeout, the next one is tried. A streamed response can only
+    fail over until its first chunk arrives.
+
+    With ``hedge_percentile`` set, a request whose first service has not
+    answered - produced its first chunk, when streaming - within that
+    percentile of the service's recent latencies is duplicated to the next
+    service, and whichever answers first wins; the other is cancelled.
+    Until ``hedge_min_samples`` latencies are known, ``hedge_delay`` is
+    used instead.
+
+    Latencies are reported as the ``llm.router.latency`` histogram, tagged
+    with the route and service; failovers and hedges as counters. Responses
+    - the first chunk, when streaming - carry the route, service and model
+    that served them in their metadata.
+
+    Example:
+        llm = RoutingLlmService(
+            [
+                LlmRoute(
+                    "strong",
+                    [AnthropicLlmService(), OpenAILlmService(model="gpt-5")],
+                    condition=prompt_tokens_over(8_000),
+                    timeout=60,
+                ),
+                LlmRoute("fast", [OpenAILlmService(model="gpt-5-mini")]),
+            ],
+            hedge_percentile=95,
+        )
+        agent = Agent(llm_service=llm, ...)
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[LlmRoute],
+        *,
+        hedge_percentile: Optional[float] = None,
+        hedge_delay: float = 5.0,
+        hedge_min_samples: int = 20,
+        latency_window: int = 200,
+        observability_provider: Optional["ObservabilityProvider"] = None,
+    ):
+        """Initialize the service.
+
+        Args:
+            routes: Routes in order of precedence
+            hedge_percentile: Latency percentile of the first service after
+                which a request is hedged; None disables hedging
+            hedge_delay: Seconds before hedging while latencies are unknown
+            hedge_min_samples: Latencies needed before the percentile is used
+            latency_window: Recent latencies kept per service
+            observability_provider: Optional provider for latency metrics
+        """
+        if not routes:
+            raise ValueError("At least one route is required")
+        for route in routes:
+            if not route.services:
+                raise ValueError(f"Route '{route.name}' has no services")
+        if hedge_percentile is not None and not 0 < hedge_percentile <= 100:
+            raise ValueError("hedge_percentile must be in (0, 100]")
+
+        self.routes = list(routes)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.observability_provider = observability_provider
+        self._latencies: Dict[Tuple[str, int], _LatencyWindow] = {
+            (route.name, i): _LatencyWindow(latency_window)
+            for route in self.routes
+            for i in range(len(route.services))
+        }
+
+    def select_route(self, request: LlmRequest) -> LlmRoute:
+        """Get the route serving a request."""
+        for route in self.routes:
+            if route.condition is None or route.condition(request):
+                return route
+        raise LlmServiceError("No LLM route matches the request")
+
+    @staticmethod
+    def _service_name(service: LlmService) -> str:
+        model = getattr(service, "model", None)
+        name = type(service).__name__
+        return f"{name}:{model}" if isinstance(model, str) else name
+
+    def _hedge_after(self, route: LlmRoute) -> Optional[float]:
+        if self.hedge_percentile is None or len(route.services) < 2:
+            return None
+        window = self._latencies[(route.name, 0)]
+        if len(window) < self.hedge_min_samples:
+            return self.hedge_delay
+        return window.percentile(self.hedge_percentile)
+
+    async def _record(
+        self, name: str, value: float, unit: str, route: LlmRoute, index: int
+    ) -> None:
+        if self.observability_provider:
+            await self.observability_provider.record_metric(
+                name,
+                value,
+                unit,
+                tags={
+                    "route": route.name,
+                    "service": self._service_name(route.services[index]),
+                },
+            )
+
+    async def _attempt(
+        self,
+        route: LlmRoute,
+        index: int,
+        call: Callable[[LlmService], Awaitable[T]],
+    ) -> T:
+        start = time.perf_counter()
+        result = await asyncio.wait_for(call(route.services[index]), route.timeout)
+        elapsed = time.perf_counter() - start
+        self._latencies[(route.name, index)].add(elapsed)
+        await self._record("llm.router.latency", elapsed * 1000, "ms", route, index)
+        return result
+
+    async def _race(
+        self,
+        route: LlmRoute,
+        call: Callable[[LlmService], Awaitable[T]],
+        discard: Optional[Callable[[T], Awaitable[None]]] = None,
+    ) -> Tuple[T, int]:
+        """Run ``call`` on the route's services until one succeeds.
+
+        Returns:
+            The first result and the index of the service producing it
+        """
+        hedge_after = self._hedge_after(route)
+        pending: Dict["asyncio.Task[T]", int] = {}
+        errors: List[str] = []
+        next_index = 0
+        winner_index = 0
+        hedged = False
+
+        def launch() -> None:
+            nonlocal next_index
+            task = asyncio.ensure_future(self._attempt(route, next_index, call))
+            pending[task] = next_index
+            next_index += 1
+
+        launch()
+        try:
+            while pending:
+                can_hedge = (
+                    hedge_after is not None
+                    and not hedged
+                    and len(pending) == 1
+                    and next_index < len(route.services)
+                )
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    hedged = True
+                    await self._record(
+                        "llm.router.hedges", 1.0, "count", route, next_index
+                    )
+                    launch()
+                    continue
+
+                winner: Optional["asyncio.Task[T]"] = None
+                for task in done:
+                    index = pending.pop(task)
+                    error = task.exception()
+                    if error is None and winner is None:
+                        winner = task
+                        winner_index = index
+                    elif error is None:
+                        if discard is not None:
+                            await discard(task.result())
+                    else:
+                        message = str(error) or type(error).__name__
+                        logger.warning(
+                            f"LLM service {index} of route '{route.name}' "
+                            f"failed: {message}"
+                        )
+                        errors.append(message)
+                        await self._record(
+                            "llm.router.failures", 1.0, "count", route, index
+                        )
+                if winner is not None:
+                    return winner.result(), winner_index
+                if not pending and next_index < len(route.services):
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise LlmServiceError(
+            f"All LLM services of route '{route.name}' failed: " + "; ".join(errors)
+        )
+
+    def _tag(self, metadata: Dict[str, Any], route: LlmRoute, index: int) -> None:
+        service = route.services[index]
+        metadata["llm_route"] = route.name
+        metadata["llm_service"] = self._service_name(service)
+        # Lets usage accounting price the request by the model that served it
+        model = getattr(service, "model", None)
+        if isinstance(model, str):
+            metadata.setdefault("model", model)
+
+    async def send_request(self, request: LlmRequest) -> LlmResponse:
+        """Send a request to the services of the matching route."""
+        route = self.select_route(request)
+        response, index = await self._race(
+            route, lambda service: service.send_request(request)
+        )
+        response = response.model_copy(update={"metadata": dict(response.metadata)})
+        self._tag(response.metadata, route, index)
+        return response
+
+    async def stream_request(
+        self, request: LlmRequest
+    ) -> AsyncGenerator[LlmStreamChunk, None]:
+        """Stream a request from the first service of the route to respond."""
+        route = self.select_route(request)
+
+        async def open_stream(
+            service: LlmService,
+        ) -> Tuple[AsyncGenerator[LlmStreamChunk, None], Optional[LlmStreamChunk]]:
+            stream = service.stream_request(request)
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+            except BaseException:
+                await stream.aclose()
+                raise
+            return stream, first
+
+        async def close_stream(
+            opened: Tuple[AsyncGenerator[LlmStreamChunk, None], Any],
+        ) -> None:
+            await opened[0].aclose()
+
+        (stream, first), index = await self._race(route, open_stream, close_stream)
+        try:
+            if first is None:
+                return
+            self._tag(first.metadata, route, index)
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def validate_tools(self, tools: List[Any]) -> List[str]:
+        """Validate tool schemas against every service."""
+        errors: List[str] = []
+        for route in self.routes:
+            for service in route.services:
+                for error in await service.validate_tools(tools):
+                    if error not in errors:
+                        errors.append(error)
+        return errors
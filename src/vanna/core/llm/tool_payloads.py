@@ -0,0 +1,66 @@
+"""
+Cache of provider-specific tool payloads.
+
+LLM integrations convert the request's tool schemas to their provider's
+format on every request, although the list rarely changes between turns.
+The tool registry hands out the same schema objects each time, so converted
+payloads can be cached by the identity of those objects.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Generic, List, Tuple, TypeVar
+
+from ..tool import ToolSchema
+
+P = TypeVar("P")
+
+
+class ToolPayloadCache(Generic[P]):
+    """LRU cache of converted tool payloads, keyed by schema identity.
+
+    Entries hold references to the schemas they were built from, so the
+    object IDs in a key can not be reused while the entry is cached. Schemas
+    must not be modified in place once converted.
+
+    Example:
+        self._tool_payloads = ToolPayloadCache(self._convert_tools)
+        ...
+        payload["tools"] = self._tool_payloads.get(request.tools)
+    """
+
+    def __init__(
+        self, convert: Callable[[List[ToolSchema]], P], max_entries: int = 32
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            convert: Converts a list of schemas to the provider's format
+            max_entries: Distinct tool lists kept before the least recently
+                used one is evicted
+        """
+        self._convert = convert
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, ...], Tuple[List[ToolSchema], P]]" = (
+            OrderedDict()
+        )
+
+    def get(self, tools: List[ToolSchema]) -> P:
+        """Get the converted payload for a list of tool schemas."""
+        key = tuple(id(tool) for tool in tools)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        payload = self._convert(tools)
+        self._entries[key] = (list(tools), payload)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return payload
+
+    def clear(self) -> None:
+        """Remove all cached payloads."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,197 @@
+"""
+Token usage and cost accounting.
+
+Providers report usage under different keys (``prompt_tokens`` vs
+``input_tokens``, cache reads included in or added to the prompt count).
+This module normalizes usage, estimates cost from a pluggable price table
+and lets callers capture the LLM requests made on their behalf.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class TokenUsage(BaseModel):
+    """Normalized token counts for one or more LLM requests.
+
+    ``prompt_tokens`` includes ``cached_tokens``, the part of the prompt
+    served from the provider's prompt cache.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    total_tokens: int = 0
+
+    @classmethod
+    def from_dict(cls, usage: Optional[Dict[str, int]]) -> "TokenUsage":
+        """Normalize a provider's usage dictionary.
+
+        Understands OpenAI-style (``prompt_tokens``/``completion_tokens``),
+        Anthropic-style (``input_tokens``/``output_tokens`` with separate
+        ``cache_read_input_tokens`` and ``cache_creation_input_tokens``)
+        and ``cached_tokens`` for cache hits already counted in the prompt.
+        """
+        if not usage:
+            return cls()
+
+        prompt = usage.get("prompt_tokens", usage.get("input_tokens", 0)) or 0
+        completion = usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0
+        cached = usage.get("cached_tokens", 0) or 0
+
+        # Anthropic reports cache reads and writes next to, not within, input
+        cache_read = usage.get("cache_read_input_tokens", 0) or 0
+        cache_creation = usage.get("cache_creation_input_tokens", 0) or 0
+        prompt += cache_read + cache_creation
+        cached += cache_read
+
+        total = usage.get("total_tokens") or prompt + completion
+        return cls(
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            cached_tokens=cached,
+            total_tokens=total,
+        )
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            total_tokens=self.total_tokens + other.total_tokens,
+        )
+
+
+class ModelPrice(BaseModel):
+    """Prices for one model in USD per million tokens."""
+
+    input_per_million: float = Field(ge=0)
+    output_per_million: float = Field(ge=0)
+    cached_input_per_million: Optional[float] = Field(
+        default=None,
+        ge=0,
+        description="Price of cached prompt tokens; defaults to the input price",
+    )
+
+    def cost(self, usage: TokenUsage) -> float:
+        """Estimate the cost of ``usage`` in USD."""
+        cached_price = (
+            self.cached_input_per_million
+            if self.cached_input_per_million is not None
+            else self.input_per_million
+        )
+        uncached = max(usage.prompt_tokens - usage.cached_tokens, 0)
+        return (
+            uncached * self.input_per_million
+            + usage.cached_tokens * cached_price
+            + usage.completion_tokens * self.output_per_million
+        ) / 1_000_000
+
+
+class PriceTable:
+    """Maps model names to prices for cost estimation.
+
+    Lookups fall back to the longest registered prefix, so a price for
+    ``gpt-4o`` also covers dated variants such as ``gpt-4o-2024-08-06``.
+    No prices are bundled; register the ones for the models you use.
+
+    Example:
+        prices = PriceTable({
+            "claude-sonnet-4": ModelPrice(
+                input_per_million=3.0,
+                output_per_million=15.0,
+                cached_input_per_million=0.3,
+            ),
+        })
+        agent = Agent(..., price_table=prices)
+    """
+
+    def __init__(self, prices: Optional[Dict[str, ModelPrice]] = None):
+        self._prices: Dict[str, ModelPrice] = dict(prices or {})
+
+    def set_price(self, model: str, price: ModelPrice) -> None:
+        """Register or replace the price of a model."""
+        self._prices[model] = price
+
+    def get_price(self, model: str) -> Optional[ModelPrice]:
+        """Get the price for a model, falling back to the longest prefix match."""
+        price = self._prices.get(model)
+        if price is not None:
+            return price
+        matches = [name for name in self._prices if model.startswith(name)]
+        return self._prices[max(matches, key=len)] if matches else None
+
+    def estimate_cost(self, model: str, usage: TokenUsage) -> Optional[float]:
+        """Estimate the cost in USD, or None if the model has no price."""
+        price = self.get_price(model)
+        return price.cost(usage) if price is not None else None
+
+
+class LlmUsageRecord(BaseModel):
+    """Usage of a single LLM request."""
+
+    model: str
+    usage: TokenUsage
+    cost_usd: Optional[float] = None
+    stream: bool = False
+
+
+class UsageSummary(BaseModel):
+    """Usage aggregated over several LLM requests."""
+
+    usage: TokenUsage = Field(default_factory=TokenUsage)
+    cost_usd: Optional[float] = Field(
+        default=None, description="Estimated cost, None if no request was priced"
+    )
+    llm_requests: int = 0
+
+    def add(self, record: LlmUsageRecord) -> None:
+        """Add one request's usage to the summary."""
+        self.usage = self.usage + record.usage
+        if record.cost_usd is not None:
+            self.cost_usd = (self.cost_usd or 0.0) + record.cost_usd
+        self.llm_requests += 1
+
+
+class UsageRecorder:
+    """Collects the usage records of LLM requests made while it is active."""
+
+    def __init__(self) -> None:
+        self.records: List[LlmUsageRecord] = []
+        self.summary = UsageSummary()
+
+    def add(self, record: LlmUsageRecord) -> None:
+        self.records.append(record)
+        self.summary.add(record)
+
+
+_active_recorders: ContextVar[Tuple[UsageRecorder, ...]] = ContextVar(
+    "vanna_usage_recorders", default=()
+)
+
+
+@contextmanager
+def capture_llm_usage() -> Iterator[UsageRecorder]:
+    """Capture usage of the LLM requests made by agents in this context.
+
+    Example:
+        with capture_llm_usage() as recorder:
+            async for component in agent.send_message(...):
+                ...
+        print(recorder.summary.usage.total_tokens)
+    """
+    recorder = UsageRecorder()
+    token = _active_recorders.set(_active_recorders.get() + (recorder,))
+    try:
+        yield recorder
+    finally:
+        _active_recorders.reset(token)
+
+
+def record_llm_usage(record: LlmUsageRecord) -> None:
+    """Add a usage record to every recorder active in the current context."""
+    for recorder in _active_recorders.get():
+        recorder.add(record)
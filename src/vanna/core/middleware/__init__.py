@@ -6,5 +6,11 @@ LLM requests and responses.
 """
 
 from .base import LlmMiddleware
+from .cache import EmbeddingFunction, LlmResponseCache, ResponseCacheMiddleware
 
-__all__ = ["LlmMiddleware"]
+__all__ = [
+    "LlmMiddleware",
+    "LlmResponseCache",
+    "ResponseCacheMiddleware",
+    "EmbeddingFunction",
+]
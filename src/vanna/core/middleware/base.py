@@ -6,7 +6,7 @@ for caching, monitoring, content filtering, and more.
 """
 
 from abc import ABC
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from ..llm import LlmRequest, LlmResponse
@@ -22,14 +22,16 @@ class LlmMiddleware(ABC):
     - Track costs and usage
     - Implement fallback strategies
 
+    See ``ResponseCacheMiddleware`` for a complete caching middleware.
+
     Example:
         class CachingMiddleware(LlmMiddleware):
             def __init__(self):
                 self.cache = {}
 
-            async def before_llm_request(self, request: LlmRequest) -> LlmRequest:
-                # Could check cache here
-                return request
+            async def short_circuit_llm_request(self, request: LlmRequest) -> Optional[LlmResponse]:
+                # A cached response skips the LLM call
+                return self.cache.get(self._compute_key(request))
 
             async def after_llm_response(self, request: LlmRequest, response: LlmResponse) -> LlmResponse:
                 # Cache the response
@@ -54,6 +56,23 @@ class LlmMiddleware(ABC):
         """
         return request
 
+    async def short_circuit_llm_request(
+        self, request: "LlmRequest"
+    ) -> Optional["LlmResponse"]:
+        """Called after all ``before_llm_request`` hooks, before the LLM call.
+
+        Returning a response skips the LLM call, for example to serve it from
+        a cache; the first middleware to return one wins. ``after_llm_response``
+        hooks still run on it.
+
+        Args:
+            request: The LLM request about to be sent
+
+        Returns:
+            A response to use instead of calling the LLM, or None
+        """
+        return None
+
     async def after_llm_response(
         self, request: "LlmRequest", response: "LlmResponse"
     ) -> "LlmResponse":
@@ -0,0 +1,317 @@
+"""
+LLM response caching.
+
+``ResponseCacheMiddleware`` answers repeated LLM requests from a cache, so
+canned questions skip the LLM round trip. Cached responses are usually
+tool calls, such as the SQL to run, so tools still execute against current
+data.
+"""
+
+import hashlib
+import inspect
+import json
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .base import LlmMiddleware
+
+if TYPE_CHECKING:
+    from ..llm import LlmRequest, LlmResponse
+    from ..observability import ObservabilityProvider
+
+EmbeddingFunction = Callable[[str], Union[Sequence[float], Awaitable[Sequence[float]]]]
+
+
+class LlmResponseCache(ABC):
+    """Storage for cached LLM responses."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional["LlmResponse"]:
+        """Get an unexpired response, or None."""
+        pass
+
+    @abstractmethod
+    async def set(
+        self, key: str, response: "LlmResponse", expires_at: Optional[float]
+    ) -> None:
+        """Store a response until ``expires_at`` (a Unix time), or forever if None."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        pass
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ResponseCacheMiddleware(LlmMiddleware):
+    """Middleware answering repeated LLM requests from a cache.
+
+    Requests are looked up in two tiers:
+
+    - exact: a hash of the model, system prompt, messages, tools and
+      sampling parameters
+    - semantic (optional): first-turn requests, whose only message is the
+      user's question, also match earlier first-turn questions whose
+      embedding is at least ``similarity_threshold`` similar, given the
+      same model, system prompt, tools and parameters
+
+    Requests sampled above ``max_temperature`` are not cached, since their
+    responses are meant to vary. Entries are scoped to the requesting user
+    unless ``per_user`` is False. Lookups are reported as the
+    ``llm.cache.lookups`` counter, tagged with the result and tier.
+
+    Example:
+        cache = ResponseCacheMiddleware(
+            MemoryLlmResponseCache(max_entries=1000),
+            model="gpt-4o",
+            ttl_seconds=3600,
+        )
+        agent = Agent(
+            ...,
+            config=AgentConfig(temperature=0.0),
+            llm_middlewares=[cache],
+        )
+    """
+
+    def __init__(
+        self,
+        cache: Optional[LlmResponseCache] = None,
+        *,
+        model: Optional[str] = None,
+        ttl_seconds: Optional[float] = 3600.0,
+        per_user: bool = True,
+        max_temperature: float = 0.0,
+        embedding_function: Optional[EmbeddingFunction] = None,
+        similarity_threshold: float = 0.95,
+        max_semantic_entries: int = 1000,
+        observability_provider: Optional["ObservabilityProvider"] = None,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            cache: Response storage; defaults to a MemoryLlmResponseCache
+            model: Model name made part of the key, so switching models
+                does not serve the old model's responses
+            ttl_seconds: Lifetime of cached responses; None keeps them until
+                evicted
+            per_user: Scope entries to the requesting user
+            max_temperature: Requests with a higher temperature bypass the
+                cache
+            embedding_function: Embeds a question for the semantic tier;
+                may be sync or async. The tier is off without one.
+            similarity_threshold: Cosine similarity for a semantic match
+            max_semantic_entries: Questions kept in the semantic index
+            observability_provider: Optional provider for lookup metrics
+        """
+        if not 0.0 < similarity_threshold <= 1.0:
+            raise ValueError("similarity_threshold must be in (0, 1]")
+
+        if cache is None:
+            from vanna.integrations.local.llm_cache import MemoryLlmResponseCache
+
+            cache = MemoryLlmResponseCache()
+
+        self.cache = cache
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.per_user = per_user
+        self.max_temperature = max_temperature
+        self.embedding_function = embedding_function
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_entries = max_semantic_entries
+        self.observability_provider = observability_provider
+        self.hits = 0
+        self.misses = 0
+
+        # Exact key -> (context key, question embedding) of first-turn entries
+        self._semantic_index: "OrderedDict[str, Tuple[str, Sequence[float]]]" = (
+            OrderedDict()
+        )
+        # Embeddings computed on a miss, kept until the response is stored
+        self._pending_embeddings: "OrderedDict[str, Sequence[float]]" = OrderedDict()
+
+    def hit_rate(self) -> float:
+        """Fraction of cacheable lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _bypass(self, request: "LlmRequest") -> bool:
+        return request.temperature > self.max_temperature or bool(
+            request.metadata.get("no_cache")
+        )
+
+    def _context(self, request: "LlmRequest") -> Dict[str, Any]:
+        return {
+            "model": request.metadata.get("model", self.model),
+            "user": request.user.id if self.per_user else None,
+            "system_prompt": request.system_prompt,
+            "tools": [
+                {
+                    "name": t.name,
+                    "description": t.description,
+                    "parameters": t.parameters,
+                }
+                for t in request.tools or []
+            ],
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+        }
+
+    @staticmethod
+    def _hash(data: Any) -> str:
+        payload = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def compute_key(self, request: "LlmRequest") -> str:
+        """Canonical hash of everything that determines the response."""
+        messages = [
+            {
+                "role": m.role,
+                "content": m.content,
+                "tool_calls": [
+                    {"id": tc.id, "name": tc.name, "arguments": tc.arguments}
+                    for tc in m.tool_calls or []
+                ],
+                "tool_call_id": m.tool_call_id,
+            }
+            for m in request.messages
+        ]
+        return self._hash({**self._context(request), "messages": messages})
+
+    @staticmethod
+    def _question(request: "LlmRequest") -> Optional[str]:
+        """The user's question, if this is the first request of a turn."""
+        if len(request.messages) == 1 and request.messages[0].role == "user":
+            return request.messages[0].content
+        return None
+
+    async def _embed(self, text: str) -> Sequence[float]:
+        assert self.embedding_function is not None
+        result = self.embedding_function(text)
+        if inspect.isawaitable(result):
+            result = await result
+        return list(result)
+
+    async def _record(self, result: str, tier: Optional[str] = None) -> None:
+        if result == "hit":
+            self.hits += 1
+        elif result == "miss":
+            self.misses += 1
+        if self.observability_provider:
+            tags = {"result": result}
+            if tier:
+                tags["tier"] = tier
+            await self.observability_provider.record_metric(
+                "llm.cache.lookups", 1.0, "count", tags=tags
+            )
+
+    async def _semantic_lookup(
+        self, request: "LlmRequest", key: str
+    ) -> Optional["LlmResponse"]:
+        question = self._question(request)
+        if question is None or self.embedding_function is None:
+            return None
+
+        embedding = await self._embed(question)
+        self._pending_embeddings[key] = embedding
+        while len(self._pending_embeddings) > self.max_semantic_entries:
+            self._pending_embeddings.popitem(last=False)
+
+        context_key = self._hash(self._context(request))
+        best_key, best_score = None, self.similarity_threshold
+        for entry_key, (entry_context, entry_embedding) in self._semantic_index.items():
+            if entry_context != context_key:
+                continue
+            score = _cosine(embedding, entry_embedding)
+            if score >= best_score:
+                best_key, best_score = entry_key, score
+        if best_key is None:
+            return None
+
+        response = await self.cache.get(best_key)
+        if response is None:
+            # Expired or evicted from the cache
+            self._semantic_index.pop(best_key, None)
+            return None
+        self._semantic_index.move_to_end(best_key)
+        return response
+
+    async def short_circuit_llm_request(
+        self, request: "LlmRequest"
+    ) -> Optional["LlmResponse"]:
+        """Answer the request from the cache, if possible."""
+        if self._bypass(request):
+            await self._record("bypass")
+            return None
+
+        key = self.compute_key(request)
+        tier = "exact"
+        response = await self.cache.get(key)
+        if response is None:
+            tier = "semantic"
+            response = await self._semantic_lookup(request, key)
+        if response is None:
+            await self._record("miss")
+            return None
+
+        await self._record("hit", tier)
+        return response.model_copy(
+            update={
+                # A cached response costs no tokens
+                "usage": None,
+                "metadata": {
+                    **response.metadata,
+                    "cache_hit": True,
+                    "cache_tier": tier,
+                },
+            }
+        )
+
+    async def after_llm_response(
+        self, request: "LlmRequest", response: "LlmResponse"
+    ) -> "LlmResponse":
+        """Cache responses the LLM produced for cacheable requests."""
+        if (
+            response.metadata.get("cache_hit")
+            or self._bypass(request)
+            or not (response.content or response.tool_calls)
+        ):
+            return response
+
+        key = self.compute_key(request)
+        expires_at = (
+            time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+        )
+        await self.cache.set(key, response, expires_at)
+
+        embedding = self._pending_embeddings.pop(key, None)
+        if embedding is not None:
+            self._semantic_index[key] = (self._hash(self._context(request)), embedding)
+            while len(self._semantic_index) > self.max_semantic_entries:
+                self._semantic_index.popitem(last=False)
+        return response
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        await self.cache.clear()
+        self._semantic_index.clear()
+        self._pending_embeddings.clear()
@@ -6,6 +6,14 @@ monitoring agent behavior.
 """
 
 from .base import ObservabilityProvider
+from .context import activate_span, deactivate_span, get_current_span
 from .models import Span, Metric
 
-__all__ = ["ObservabilityProvider", "Span", "Metric"]
+__all__ = [
+    "ObservabilityProvider",
+    "Span",
+    "Metric",
+    "get_current_span",
+    "activate_span",
+    "deactivate_span",
+]
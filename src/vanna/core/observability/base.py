@@ -8,6 +8,7 @@ agent execution for monitoring and debugging.
 from abc import ABC
 from typing import Any, Dict, Optional
 
+from .context import activate_span, deactivate_span
 from .models import Span, Metric
 
 
@@ -75,9 +76,13 @@ class ObservabilityProvider(ABC):
             Span object to track the operation
 
         Note:
-            Call span.end() when the operation completes.
+            Call end_span() when the operation completes. The new span is
+            linked to the active span and becomes the active span itself, so
+            overrides should call super() to keep spans nested.
         """
-        return Span(name=name, attributes=attributes or {})
+        span = Span(name=name, attributes=attributes or {})
+        activate_span(span)
+        return span
 
     async def end_span(self, span: Span) -> None:
         """End a span and record it.
@@ -86,3 +91,4 @@ class ObservabilityProvider(ABC):
             span: The span to end
         """
         span.end()
+        deactivate_span(span)
@@ -0,0 +1,48 @@
+"""
+Span context propagation.
+
+The active span is tracked in a context variable so spans created further
+down the call stack - in hooks, tools, SQL runners or memory backends - are
+linked to their parent without passing spans around explicitly. Context
+variables are copied into new asyncio tasks, so spans created inside
+``asyncio.gather`` or ``create_task`` children are linked as well.
+"""
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .models import Span
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar(
+    "vanna_current_span", default=None
+)
+
+
+def get_current_span() -> Optional["Span"]:
+    """Get the innermost span that is active and not yet ended."""
+    span = _current_span.get()
+    while span is not None and span.end_time is not None:
+        span = span.parent
+    return span
+
+
+def activate_span(span: Optional["Span"]) -> None:
+    """Make ``span`` the parent of spans created from now on in this context.
+
+    Passing None clears the active span.
+    """
+    _current_span.set(span)
+
+
+def deactivate_span(span: "Span") -> None:
+    """Restore the parent of ``span`` if ``span`` is the active span.
+
+    Spans ended out of order leave the active span unchanged; ended spans are
+    skipped by ``get_current_span`` either way.
+    """
+    if _current_span.get() is span:
+        parent = span.parent
+        while parent is not None and parent.end_time is not None:
+            parent = parent.parent
+        _current_span.set(parent)
@@ -6,13 +6,22 @@ import time
 from typing import Any, Dict, Optional
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .context import get_current_span
 
 
 class Span(BaseModel):
-    """Represents a unit of work for distributed tracing."""
+    """Represents a unit of work for distributed tracing.
+
+    Unless ``parent_id`` is given explicitly, a new span becomes a child of the
+    active span (see ``get_current_span``) and inherits its ``trace_id``.
+    """
 
     id: str = Field(default_factory=lambda: str(uuid4()), description="Span ID")
+    trace_id: str = Field(
+        default_factory=lambda: uuid4().hex, description="ID of the span's trace"
+    )
     name: str = Field(description="Span name/operation")
     start_time: float = Field(default_factory=time.time, description="Start timestamp")
     end_time: Optional[float] = Field(default=None, description="End timestamp")
@@ -21,6 +30,24 @@ class Span(BaseModel):
     )
     parent_id: Optional[str] = Field(default=None, description="Parent span ID")
 
+    _parent: Optional["Span"] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        if "parent_id" in self.model_fields_set:
+            return
+
+        parent = get_current_span()
+        if parent is not None:
+            self._parent = parent
+            self.parent_id = parent.id
+            if "trace_id" not in self.model_fields_set:
+                self.trace_id = parent.trace_id
+
+    @property
+    def parent(self) -> Optional["Span"]:
+        """The parent span object, when it was linked in this process."""
+        return self._parent
+
     def end(self) -> None:
         """Mark span as ended."""
         if self.end_time is None:
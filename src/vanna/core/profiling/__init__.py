@@ -0,0 +1,20 @@
+"""
+Profiling domain.
+
+This module provides opt-in request profiling for the agent: a per-request
+timeline of every stage, optional cProfile statistics and stack samples for
+slow requests, and the store that keeps recent captures for inspection.
+"""
+
+from .base import ProfileStore
+from .models import ProfileStage, RequestProfile, StackSample
+from .profiler import ProfilingObservabilityProvider, RequestProfiler
+
+__all__ = [
+    "ProfileStage",
+    "ProfileStore",
+    "ProfilingObservabilityProvider",
+    "RequestProfile",
+    "RequestProfiler",
+    "StackSample",
+]
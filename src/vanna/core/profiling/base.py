@@ -0,0 +1,35 @@
+"""
+Profile store interface.
+
+Profile stores keep recent request profiles, bounded like a ring buffer:
+adding a profile to a full store evicts the oldest one.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from .models import RequestProfile
+
+
+class ProfileStore(ABC):
+    """Bounded storage for captured request profiles."""
+
+    @abstractmethod
+    async def add(self, profile: RequestProfile) -> None:
+        """Store a profile, evicting the oldest one if the store is full."""
+        pass
+
+    @abstractmethod
+    async def list_profiles(self, limit: int = 20) -> List[RequestProfile]:
+        """Get the most recent profiles, newest first."""
+        pass
+
+    @abstractmethod
+    async def get_profile(self, profile_id: str) -> Optional[RequestProfile]:
+        """Get a profile by ID, or None if it was evicted or never stored."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all profiles."""
+        pass
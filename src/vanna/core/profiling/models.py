@@ -0,0 +1,54 @@
+"""
+Profiling domain models.
+
+This module contains the models describing a captured request profile.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileStage(BaseModel):
+    """A timed stage of a request, such as a hook, LLM call or tool call."""
+
+    name: str = Field(description="Stage name (the span name)")
+    start_ms: float = Field(description="Start offset from the request start")
+    duration_ms: float = Field(description="Stage duration")
+    depth: int = Field(default=0, description="Nesting level within the request")
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+
+class StackSample(BaseModel):
+    """A call stack seen while sampling, outermost frame first."""
+
+    stack: List[str] = Field(description="Frames as 'file:line function'")
+    count: int = Field(description="Number of samples with this stack")
+
+
+class RequestProfile(BaseModel):
+    """Profile captured for one ``Agent.send_message`` call."""
+
+    id: str = Field(description="Profile ID")
+    started_at: float = Field(description="Request start timestamp")
+    duration_ms: float = Field(description="Total request duration")
+    user_id: Optional[str] = Field(default=None)
+    conversation_id: Optional[str] = Field(default=None)
+    message_preview: str = Field(default="", description="Start of the user message")
+    sampled: bool = Field(description="Captured because the request was sampled")
+    slow: bool = Field(description="Captured because it exceeded the threshold")
+    error: Optional[str] = Field(default=None, description="Error ending the request")
+    stages: List[ProfileStage] = Field(default_factory=list)
+    cprofile_stats: Optional[str] = Field(
+        default=None, description="cProfile statistics, by cumulative time"
+    )
+    stack_samples: List[StackSample] = Field(
+        default_factory=list, description="Most frequent stacks, most frequent first"
+    )
+    stack_interval_ms: Optional[float] = Field(
+        default=None, description="Interval between stack samples"
+    )
+
+    def slowest_stages(self, limit: int = 5) -> List[ProfileStage]:
+        """Get the longest stages, longest first."""
+        return sorted(self.stages, key=lambda s: s.duration_ms, reverse=True)[:limit]
@@ -0,0 +1,359 @@
+"""
+Request profiler.
+
+The profiler builds a request's timeline from the spans the agent already
+creates for each stage: the agent routes its spans through a
+``ProfilingObservabilityProvider`` wrapping its configured provider, which
+hands every ended span to the capture of the request it belongs to. Captures are tracked in a context
+variable, so concurrent requests are kept apart.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from vanna.core.observability import ObservabilityProvider, Span
+
+from .base import ProfileStore
+from .models import ProfileStage, RequestProfile, StackSample
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_PREVIEW_CHARS = 200
+MAX_STACK_DEPTH = 64
+
+_active_capture: ContextVar[Optional["ProfileCapture"]] = ContextVar(
+    "vanna_profile_capture", default=None
+)
+
+# cProfile can only profile one request of a thread at a time
+_cprofile_lock = threading.Lock()
+
+
+class _StackSampler(threading.Thread):
+    """Samples the call stack of one thread at a fixed interval.
+
+    Sampling starts after ``delay`` seconds, so only requests that run past
+    the slow threshold pay for it.
+    """
+
+    def __init__(self, thread_id: int, delay: float, interval: float):
+        super().__init__(name="vanna-stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.delay = delay
+        self.interval = interval
+        self.counts: Counter[Tuple[str, ...]] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        if self._stop_event.wait(self.delay):
+            return
+        while not self._stop_event.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack: List[str] = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append(
+                    f"{Path(code.co_filename).name}:{frame.f_lineno} {code.co_name}"
+                )
+                frame = frame.f_back
+            self.counts[tuple(reversed(stack))] += 1
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
+
+
+class ProfileCapture:
+    """In-progress profile of one request."""
+
+    def __init__(
+        self, *, sampled: bool, message: str, conversation_id: Optional[str]
+    ) -> None:
+        self.id = uuid4().hex
+        self.started_at = time.time()
+        self.sampled = sampled
+        self.message = message
+        self.conversation_id = conversation_id
+        self.spans: List[Span] = []
+        self.previous: Optional["ProfileCapture"] = None
+        self.cprofile: Optional[cProfile.Profile] = None
+        self.sampler: Optional[_StackSampler] = None
+
+
+class RequestProfiler:
+    """Opt-in profiling of ``Agent.send_message``.
+
+    A request is captured when it is sampled (with probability
+    ``sample_rate``) or when it takes at least ``slow_threshold_ms``. A
+    capture holds the timeline of the request's stages - user resolution,
+    hooks, enrichers, tool schemas, system prompt, memory enhancement, each
+    LLM and tool call and the conversation save - and optionally:
+
+    - cProfile statistics (``cprofile=True``), for sampled requests only,
+      since cProfile must run from the start of the request
+    - stack samples of the event loop thread (``sample_stacks=True``), taken
+      once a request has run for ``slow_threshold_ms``
+
+    Both profile the whole event loop thread, so they include work done for
+    other requests running at the same time.
+
+    Example:
+        profiler = RequestProfiler(
+            MemoryProfileStore(max_profiles=100),
+            sample_rate=0.01,
+            slow_threshold_ms=10_000,
+            sample_stacks=True,
+        )
+        agent = Agent(..., profiler=profiler)
+    """
+
+    def __init__(
+        self,
+        store: Optional[ProfileStore] = None,
+        *,
+        sample_rate: float = 0.0,
+        slow_threshold_ms: Optional[float] = None,
+        cprofile: bool = False,
+        sample_stacks: bool = False,
+        stack_interval_ms: float = 10.0,
+        max_stack_samples: int = 20,
+        cprofile_lines: int = 40,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            store: Where captured profiles are kept (defaults to a
+                MemoryProfileStore holding the last 100 profiles)
+            sample_rate: Fraction of requests captured regardless of duration
+            slow_threshold_ms: Requests taking at least this long are captured
+            cprofile: Run cProfile on sampled requests
+            sample_stacks: Sample stacks of requests running past the threshold
+            stack_interval_ms: Interval between stack samples
+            max_stack_samples: Distinct stacks kept per profile
+            cprofile_lines: Functions listed in the cProfile statistics
+
+        Raises:
+            ValueError: If sample_rate is not between 0 and 1, or stack
+                sampling is enabled without a slow threshold
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if sample_stacks and slow_threshold_ms is None:
+            raise ValueError("sample_stacks requires slow_threshold_ms")
+
+        if store is None:
+            from vanna.integrations.local.profile_store import MemoryProfileStore
+
+            store = MemoryProfileStore()
+
+        self.store = store
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.cprofile = cprofile
+        self.sample_stacks = sample_stacks
+        self.stack_interval_ms = stack_interval_ms
+        self.max_stack_samples = max_stack_samples
+        self.cprofile_lines = cprofile_lines
+
+    def wrap(
+        self, provider: Optional[ObservabilityProvider]
+    ) -> "ProfilingObservabilityProvider":
+        """Wrap an observability provider to also feed request timelines."""
+        return ProfilingObservabilityProvider(self, provider)
+
+    def start(
+        self, message: str, conversation_id: Optional[str] = None
+    ) -> Optional[ProfileCapture]:
+        """Start capturing the current request.
+
+        Returns:
+            The capture to pass to ``finish``, or None if the request can
+            not be captured
+        """
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled and self.slow_threshold_ms is None:
+            return None
+
+        capture = ProfileCapture(
+            sampled=sampled, message=message, conversation_id=conversation_id
+        )
+        capture.previous = _active_capture.get()
+        _active_capture.set(capture)
+
+        if sampled and self.cprofile and _cprofile_lock.acquire(blocking=False):
+            try:
+                capture.cprofile = cProfile.Profile()
+                capture.cprofile.enable()
+            except ValueError:
+                # Another profiler is active in this thread
+                capture.cprofile = None
+                _cprofile_lock.release()
+
+        if self.sample_stacks and self.slow_threshold_ms is not None:
+            capture.sampler = _StackSampler(
+                threading.get_ident(),
+                delay=self.slow_threshold_ms / 1000,
+                interval=self.stack_interval_ms / 1000,
+            )
+            capture.sampler.start()
+
+        return capture
+
+    def record_span(self, span: Span) -> None:
+        """Add an ended span to the current request's timeline."""
+        capture = _active_capture.get()
+        if capture is not None:
+            capture.spans.append(span)
+
+    async def finish(
+        self, capture: ProfileCapture, error: Optional[BaseException] = None
+    ) -> Optional[RequestProfile]:
+        """Stop capturing and store the profile if the request qualifies.
+
+        Returns:
+            The stored profile, or None if the request was neither sampled
+            nor slow
+        """
+        duration_ms = (time.time() - capture.started_at) * 1000
+        if _active_capture.get() is capture:
+            _active_capture.set(capture.previous)
+
+        cprofile_stats = None
+        if capture.cprofile is not None:
+            capture.cprofile.disable()
+            _cprofile_lock.release()
+            cprofile_stats = self._format_cprofile(capture.cprofile)
+
+        stack_samples: List[StackSample] = []
+        if capture.sampler is not None:
+            capture.sampler.stop()
+            stack_samples = [
+                StackSample(stack=list(stack), count=count)
+                for stack, count in capture.sampler.counts.most_common(
+                    self.max_stack_samples
+                )
+            ]
+
+        slow = (
+            self.slow_threshold_ms is not None and duration_ms >= self.slow_threshold_ms
+        )
+        if not (capture.sampled or slow):
+            return None
+
+        stages = self._build_stages(capture)
+        user_id = next(
+            (
+                str(span.attributes["user_id"])
+                for span in capture.spans
+                if "user_id" in span.attributes
+            ),
+            None,
+        )
+        profile = RequestProfile(
+            id=capture.id,
+            started_at=capture.started_at,
+            duration_ms=duration_ms,
+            user_id=user_id,
+            conversation_id=capture.conversation_id,
+            message_preview=capture.message[:MESSAGE_PREVIEW_CHARS],
+            sampled=capture.sampled,
+            slow=slow,
+            error=f"{type(error).__name__}: {error}" if error is not None else None,
+            stages=stages,
+            cprofile_stats=cprofile_stats,
+            stack_samples=stack_samples,
+            stack_interval_ms=self.stack_interval_ms if capture.sampler else None,
+        )
+
+        try:
+            await self.store.add(profile)
+        except Exception as e:
+            logger.error(f"Failed to store request profile: {e}", exc_info=True)
+        return profile
+
+    @staticmethod
+    def _build_stages(capture: ProfileCapture) -> List[ProfileStage]:
+        # Spans ended more than once are recorded once
+        unique = {s.id: s for s in capture.spans if s.end_time is not None}
+        spans = sorted(unique.values(), key=lambda s: s.start_time)
+        depths: Dict[str, int] = {}
+        stages = []
+        for span in spans:
+            depth = depths.get(span.parent_id, -1) + 1 if span.parent_id else 0
+            depths[span.id] = depth
+            attributes: Dict[str, Any] = dict(span.attributes)
+            stages.append(
+                ProfileStage(
+                    name=span.name,
+                    start_ms=(span.start_time - capture.started_at) * 1000,
+                    duration_ms=span.duration_ms() or 0.0,
+                    depth=depth,
+                    attributes=attributes,
+                )
+            )
+        return stages
+
+    def _format_cprofile(self, profile: cProfile.Profile) -> str:
+        output = io.StringIO()
+        stats = pstats.Stats(profile, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.cprofile_lines)
+        return output.getvalue()
+
+
+class ProfilingObservabilityProvider(ObservabilityProvider):
+    """Observability provider that feeds request timelines to a profiler.
+
+    Spans and metrics are forwarded to the wrapped provider, if any; the
+    agent uses this wrapper internally when it is given a profiler, leaving
+    its ``observability_provider`` as configured. Without a wrapped provider
+    the wrapper is falsy outside captured requests, so the agent skips its
+    spans and metrics there as it would with no provider at all.
+    """
+
+    def __init__(
+        self, profiler: RequestProfiler, inner: Optional[ObservabilityProvider] = None
+    ):
+        self.profiler = profiler
+        self.inner = inner
+
+    def __bool__(self) -> bool:
+        return self.inner is not None or _active_capture.get() is not None
+
+    async def record_metric(
+        self,
+        name: str,
+        value: float,
+        unit: str = "",
+        tags: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if self.inner is not None:
+            await self.inner.record_metric(name, value, unit, tags)
+
+    async def create_span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> Span:
+        if self.inner is not None:
+            return await self.inner.create_span(name, attributes)
+        return await super().create_span(name, attributes)
+
+    async def end_span(self, span: Span) -> None:
+        if self.inner is not None:
+            await self.inner.end_span(span)
+        else:
+            await super().end_span(span)
+        self.profiler.record_span(span)
@@ -0,0 +1,22 @@
+"""
+Quota domain.
+
+This module provides rate limiting and concurrency quotas for agent
+execution: token-bucket limits per user and group, a fair-queuing admission
+controller and the lifecycle hook that enforces them.
+"""
+
+from .admission import AdmissionController
+from .base import QuotaBackend, take_tokens
+from .hook import QuotaHook
+from .models import BucketResult, QuotaPolicy, RateLimit
+
+__all__ = [
+    "AdmissionController",
+    "BucketResult",
+    "QuotaBackend",
+    "QuotaHook",
+    "QuotaPolicy",
+    "RateLimit",
+    "take_tokens",
+]
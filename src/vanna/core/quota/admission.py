@@ -0,0 +1,208 @@
+"""
+Fair-queuing admission control.
+
+This module limits how many messages the agent processes at once. Requests
+over the limit wait in per-key queues that are served round-robin, so one
+key with many queued requests cannot starve the others.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+from ..errors import QuotaExceededError
+
+
+class _Waiter:
+    __slots__ = ("future", "max_in_flight")
+
+    def __init__(self, future: "asyncio.Future[None]", max_in_flight: Optional[int]):
+        self.future = future
+        self.max_in_flight = max_in_flight
+
+
+class AdmissionController:
+    """Global concurrency cap with fair queuing across keys.
+
+    A key (usually a user ID) is admitted immediately while fewer than
+    ``max_concurrent`` requests are in flight and its own in-flight limit is
+    not reached. Otherwise it waits in its key's FIFO queue; freed slots go
+    to the queued keys in turn, one request per key per round.
+
+    The controller lives in one process and must be used from one event
+    loop. With several workers, each enforces its own cap.
+
+    Example:
+        controller = AdmissionController(max_concurrent=16)
+        await controller.acquire(user.id, max_in_flight=2, timeout=30)
+        try:
+            ...
+        finally:
+            controller.release(user.id)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        *,
+        max_queue_size: Optional[int] = None,
+        max_queued_per_key: Optional[int] = None,
+    ):
+        """Initialize the admission controller.
+
+        Args:
+            max_concurrent: Requests processed at once across all keys
+            max_queue_size: Requests allowed to wait across all keys
+            max_queued_per_key: Requests allowed to wait per key
+
+        Raises:
+            ValueError: If max_concurrent is less than 1
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+
+        self.max_concurrent = max_concurrent
+        self.max_queue_size = max_queue_size
+        self.max_queued_per_key = max_queued_per_key
+        self._in_flight: Dict[str, int] = {}
+        self._total_in_flight = 0
+        # Keys with waiting requests, in round-robin order
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._total_queued = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of admitted requests not yet released."""
+        return self._total_in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for admission."""
+        return self._total_queued
+
+    def in_flight_for(self, key: str) -> int:
+        """Number of admitted requests of one key."""
+        return self._in_flight.get(key, 0)
+
+    async def acquire(
+        self,
+        key: str,
+        *,
+        max_in_flight: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Wait until a request of ``key`` may be processed.
+
+        Every successful call must be paired with ``release``.
+
+        Args:
+            key: Fairness key, e.g. the user ID
+            max_in_flight: Requests of this key processed at once
+            timeout: Seconds to wait in the queue, None to wait indefinitely
+
+        Raises:
+            QuotaExceededError: If the queue is full or the timeout expires
+        """
+        queue = self._queues.get(key)
+        if (
+            self.max_queue_size is not None
+            and self._total_queued >= self.max_queue_size
+        ) or (
+            self.max_queued_per_key is not None
+            and queue is not None
+            and len(queue) >= self.max_queued_per_key
+        ):
+            if self._can_admit(key, max_in_flight) and not queue:
+                self._admit(key)
+                return
+            raise QuotaExceededError(
+                "Too many requests are waiting to be processed.",
+                limit="concurrency",
+                scope=f"user:{key}",
+            )
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), max_in_flight)
+        if queue is None:
+            queue = self._queues[key] = deque()
+        queue.append(waiter)
+        self._total_queued += 1
+        self._dispatch()
+
+        if waiter.future.done():
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted while timing out or being cancelled
+                self.release(key)
+            else:
+                waiter.future.cancel()
+                self._remove(key, waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise QuotaExceededError(
+                    "The service is busy; your request waited too long to start.",
+                    limit="concurrency",
+                    scope=f"user:{key}",
+                ) from None
+            raise
+
+    def release(self, key: str) -> None:
+        """Release a slot acquired for ``key`` and admit waiting requests."""
+        count = self._in_flight.get(key, 0)
+        if count <= 0:
+            return
+        if count == 1:
+            del self._in_flight[key]
+        else:
+            self._in_flight[key] = count - 1
+        self._total_in_flight -= 1
+        self._dispatch()
+
+    def _can_admit(self, key: str, max_in_flight: Optional[int]) -> bool:
+        return self._total_in_flight < self.max_concurrent and (
+            max_in_flight is None or self._in_flight.get(key, 0) < max_in_flight
+        )
+
+    def _admit(self, key: str) -> None:
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        self._total_in_flight += 1
+
+    def _remove(self, key: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        self._total_queued -= 1
+        if not queue:
+            del self._queues[key]
+
+    def _dispatch(self) -> None:
+        """Admit queued requests round-robin until no slot or waiter is left."""
+        while self._total_in_flight < self.max_concurrent and self._queues:
+            admitted = False
+            for key in list(self._queues):
+                if self._total_in_flight >= self.max_concurrent:
+                    break
+                queue = self._queues[key]
+                waiter = queue[0]
+                if not self._can_admit(key, waiter.max_in_flight):
+                    continue
+
+                queue.popleft()
+                self._total_queued -= 1
+                # Served keys go to the back of the rotation
+                del self._queues[key]
+                if queue:
+                    self._queues[key] = queue
+
+                if not waiter.future.done():
+                    self._admit(key)
+                    waiter.future.set_result(None)
+                admitted = True
+            if not admitted:
+                break
@@ -0,0 +1,77 @@
+"""
+Quota backend interface.
+
+A quota backend stores token-bucket state. The in-memory backend keeps it in
+the process; shared backends let several workers enforce the same limits.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+from .models import BucketResult, RateLimit
+
+
+def take_tokens(
+    tokens: float,
+    elapsed: float,
+    limit: RateLimit,
+    amount: float,
+    force: bool = False,
+) -> Tuple[float, BucketResult]:
+    """Refill a bucket and try to take tokens from it.
+
+    Backends keep ``tokens`` and the time of the last update per key and
+    delegate the arithmetic here, so every backend behaves the same.
+
+    Args:
+        tokens: Tokens in the bucket at the last update
+        elapsed: Seconds since the last update
+        limit: The bucket's rate limit
+        amount: Tokens to take; zero only checks that the bucket is not empty
+        force: Take the tokens even if that leaves the bucket in debt
+
+    Returns:
+        The new token count and the outcome
+    """
+    tokens = min(limit.capacity, tokens + max(elapsed, 0.0) * limit.refill_per_second)
+
+    if force or (tokens >= amount and tokens > 0):
+        tokens = min(tokens - amount, limit.capacity)
+        return tokens, BucketResult(granted=True, remaining=tokens)
+
+    retry_after: Optional[float] = None
+    if amount <= limit.capacity and limit.refill_per_second > 0:
+        retry_after = (max(amount, 0.0) - tokens) / limit.refill_per_second
+    return tokens, BucketResult(
+        granted=False, remaining=tokens, retry_after=retry_after
+    )
+
+
+class QuotaBackend(ABC):
+    """Storage for token buckets, keyed by strings such as ``user:alice:messages``."""
+
+    @abstractmethod
+    async def take(
+        self, key: str, limit: RateLimit, amount: float = 1.0
+    ) -> BucketResult:
+        """Take ``amount`` tokens if the bucket holds enough of them.
+
+        Nothing is taken when the request is not granted. With ``amount`` of
+        zero this checks that the bucket is not empty or in debt.
+        """
+        pass
+
+    @abstractmethod
+    async def charge(self, key: str, limit: RateLimit, amount: float) -> BucketResult:
+        """Take ``amount`` tokens unconditionally.
+
+        Used for costs only known afterwards, such as LLM tokens; the bucket
+        may go into debt, which blocks further requests until it refills. A
+        negative amount refunds tokens, up to the bucket's capacity.
+        """
+        pass
+
+    @abstractmethod
+    async def reset(self, key: Optional[str] = None) -> None:
+        """Refill one bucket, or all buckets if no key is given."""
+        pass
@@ -0,0 +1,280 @@
+"""
+Quota lifecycle hook.
+
+This module provides the built-in hook that enforces rate limits and
+concurrency quotas per user and per group.
+"""
+
+import logging
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from ..errors import QuotaExceededError
+from ..lifecycle import LifecycleHook
+from ..llm.usage import UsageRecorder, capture_llm_usage
+from .admission import AdmissionController
+from .base import QuotaBackend
+from .models import QuotaPolicy, RateLimit
+
+if TYPE_CHECKING:
+    from ..observability import ObservabilityProvider
+    from ..tool import Tool
+    from ..tool.models import ToolContext
+    from ..user.models import User
+
+logger = logging.getLogger(__name__)
+
+_LIMIT_DESCRIPTIONS = {
+    "messages": "message",
+    "llm_tokens": "LLM token",
+    "sql_executions": "SQL execution",
+}
+
+
+class _MessageTicket:
+    """Quota state of one message, from before_message to on_message_end."""
+
+    def __init__(
+        self,
+        user_id: str,
+        scopes: List[Tuple[str, QuotaPolicy]],
+        admitted: bool,
+        usage_scope: Any,
+        recorder: UsageRecorder,
+    ) -> None:
+        self.user_id = user_id
+        self.scopes = scopes
+        self.admitted = admitted
+        self.usage_scope = usage_scope
+        self.recorder = recorder
+        self.token: Optional[Token[Optional["_MessageTicket"]]] = None
+
+
+class QuotaHook(LifecycleHook):
+    """Enforces rate limits and concurrency quotas.
+
+    Limits come from a ``QuotaPolicy`` per scope: every user is limited by
+    their entry in ``user_policies`` or else by ``default_policy``, and
+    additionally shares the bucket of each of their groups that has an
+    entry in ``group_policies`` (per-tenant limits). A request must pass
+    every applicable limit.
+
+    - ``messages`` is checked and taken in ``before_message``
+    - ``llm_tokens`` must not be exhausted when a message starts; the tokens
+      the message actually used are charged when it ends, so a large
+      message can leave the bucket in debt
+    - ``sql_executions`` is taken in ``before_tool`` for SQL tools; a
+      rejected call becomes a failed tool result the LLM can explain
+    - with an ``admission_controller``, messages additionally wait for a
+      slot under its global concurrency cap, queued fairly per user, and
+      at most ``max_concurrent_messages`` of a user run at once
+
+    Rejections raise ``QuotaExceededError``, which the agent renders as a
+    status card with the limit and retry time instead of a generic error.
+
+    Bucket state lives in ``backend``; the default in-memory backend is per
+    process, use a shared backend such as ``SqliteQuotaBackend`` to enforce
+    limits across workers.
+
+    Example:
+        hook = QuotaHook(
+            QuotaPolicy(
+                messages=RateLimit.per_minute(10),
+                llm_tokens=RateLimit.per_hour(200_000),
+                sql_executions=RateLimit.per_minute(30),
+                max_concurrent_messages=2,
+            ),
+            group_policies={"acme": QuotaPolicy(llm_tokens=RateLimit.per_day(5e6))},
+            admission_controller=AdmissionController(max_concurrent=32),
+        )
+        agent = Agent(..., lifecycle_hooks=[hook])
+    """
+
+    def __init__(
+        self,
+        default_policy: Optional[QuotaPolicy] = None,
+        *,
+        user_policies: Optional[Dict[str, QuotaPolicy]] = None,
+        group_policies: Optional[Dict[str, QuotaPolicy]] = None,
+        backend: Optional[QuotaBackend] = None,
+        admission_controller: Optional[AdmissionController] = None,
+        max_queue_wait: Optional[float] = 30.0,
+        sql_tool_names: Sequence[str] = ("run_sql",),
+        exempt_groups: Sequence[str] = (),
+        observability_provider: Optional["ObservabilityProvider"] = None,
+    ):
+        """Initialize the quota hook.
+
+        Args:
+            default_policy: Policy for users without an entry in user_policies
+            user_policies: Policies by user ID
+            group_policies: Policies shared by all members of a group
+            backend: Bucket storage; defaults to an in-memory backend
+            admission_controller: Optional global concurrency controller
+            max_queue_wait: Seconds a message may wait for admission
+            sql_tool_names: Tools whose executions count as SQL executions
+            exempt_groups: Members of these groups are not limited
+            observability_provider: Optional provider for rejection metrics
+        """
+        if backend is None:
+            from vanna.integrations.local.quota import MemoryQuotaBackend
+
+            backend = MemoryQuotaBackend()
+
+        self.default_policy = default_policy or QuotaPolicy()
+        self.user_policies = dict(user_policies or {})
+        self.group_policies = dict(group_policies or {})
+        self.backend = backend
+        self.admission_controller = admission_controller
+        self.max_queue_wait = max_queue_wait
+        self.sql_tool_names = set(sql_tool_names)
+        self.exempt_groups = set(exempt_groups)
+        self.observability_provider = observability_provider
+        self._ticket: ContextVar[Optional[_MessageTicket]] = ContextVar(
+            f"vanna_quota_ticket_{id(self)}", default=None
+        )
+
+    def _scopes(self, user: "User") -> List[Tuple[str, QuotaPolicy]]:
+        """Get the quota scopes and policies that apply to a user."""
+        if self.exempt_groups.intersection(user.group_memberships):
+            return []
+        scopes = [
+            (f"user:{user.id}", self.user_policies.get(user.id, self.default_policy))
+        ]
+        for group in user.group_memberships:
+            policy = self.group_policies.get(group)
+            if policy is not None:
+                scopes.append((f"group:{group}", policy))
+        return scopes
+
+    async def _record_rejection(self, error: QuotaExceededError) -> None:
+        if self.observability_provider:
+            await self.observability_provider.record_metric(
+                "quota.rejected",
+                1.0,
+                "count",
+                tags={"limit": error.limit, "scope": error.scope.split(":", 1)[0]},
+            )
+
+    async def _reject(
+        self, limit: str, scope: str, retry_after: Optional[float]
+    ) -> QuotaExceededError:
+        owner = "your group's" if scope.startswith("group:") else "your"
+        message = f"You have reached {owner} {_LIMIT_DESCRIPTIONS[limit]} limit."
+        if retry_after is not None:
+            message += f" Please try again in {max(1, round(retry_after))} seconds."
+        error = QuotaExceededError(
+            message, limit=limit, scope=scope, retry_after=retry_after
+        )
+        await self._record_rejection(error)
+        return error
+
+    async def _take(
+        self, scopes: List[Tuple[str, QuotaPolicy]], limit_name: str, amount: float
+    ) -> List[Tuple[str, RateLimit]]:
+        """Take tokens from a limit in every scope, all or nothing.
+
+        Returns:
+            The buckets taken from, for refunds
+
+        Raises:
+            QuotaExceededError: If any scope's bucket lacks the tokens
+        """
+        taken: List[Tuple[str, RateLimit]] = []
+        for scope, policy in scopes:
+            limit: Optional[RateLimit] = getattr(policy, limit_name)
+            if limit is None:
+                continue
+            key = f"{scope}:{limit_name}"
+            result = await self.backend.take(key, limit, amount)
+            if not result.granted:
+                await self._refund(taken, amount)
+                raise await self._reject(limit_name, scope, result.retry_after)
+            taken.append((key, limit))
+        return taken
+
+    async def _refund(self, taken: List[Tuple[str, RateLimit]], amount: float) -> None:
+        for key, limit in taken:
+            if amount:
+                await self.backend.charge(key, limit, -amount)
+
+    async def before_message(self, user: "User", message: str) -> Optional[str]:
+        """Check message and token budgets, then wait for admission.
+
+        Raises:
+            QuotaExceededError: If a limit is exhausted or admission fails
+        """
+        scopes = self._scopes(user)
+        if not scopes:
+            return None
+
+        await self._take(scopes, "llm_tokens", 0)
+        taken = await self._take(scopes, "messages", 1)
+
+        admitted = False
+        if self.admission_controller is not None:
+            user_policy = scopes[0][1]
+            try:
+                await self.admission_controller.acquire(
+                    user.id,
+                    max_in_flight=user_policy.max_concurrent_messages,
+                    timeout=self.max_queue_wait,
+                )
+            except QuotaExceededError as e:
+                # The message never ran, so it does not count against the user
+                await self._refund(taken, 1)
+                await self._record_rejection(e)
+                raise
+            admitted = True
+
+        usage_scope = capture_llm_usage()
+        ticket = _MessageTicket(
+            user.id, scopes, admitted, usage_scope, usage_scope.__enter__()
+        )
+        ticket.token = self._ticket.set(ticket)
+        return None
+
+    async def before_tool(self, tool: "Tool[Any]", context: "ToolContext") -> None:
+        """Take an SQL execution from the user's budgets for SQL tools.
+
+        Raises:
+            QuotaExceededError: If an SQL execution limit is exhausted
+        """
+        if tool.name not in self.sql_tool_names:
+            return
+        scopes = self._scopes(context.user)
+        if scopes:
+            await self._take(scopes, "sql_executions", 1)
+
+    async def on_message_end(self, error: Optional[BaseException] = None) -> None:
+        """Release the message's admission slot and charge its LLM tokens."""
+        ticket = self._ticket.get()
+        if ticket is None:
+            return
+
+        try:
+            if ticket.token is not None:
+                self._ticket.reset(ticket.token)
+        except ValueError:
+            # Ended from a different context than it started in
+            self._ticket.set(None)
+
+        if ticket.admitted and self.admission_controller is not None:
+            self.admission_controller.release(ticket.user_id)
+
+        try:
+            ticket.usage_scope.__exit__(None, None, None)
+        except ValueError:
+            pass
+
+        tokens = ticket.recorder.summary.usage.total_tokens
+        if not tokens:
+            return
+        for scope, policy in ticket.scopes:
+            if policy.llm_tokens is not None:
+                try:
+                    await self.backend.charge(
+                        f"{scope}:llm_tokens", policy.llm_tokens, tokens
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to charge LLM tokens to {scope}: {e}")
@@ -0,0 +1,68 @@
+"""
+Quota domain models.
+
+This module contains the rate limit and policy models used by the quota
+subsystem.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class RateLimit(BaseModel):
+    """Token-bucket rate limit.
+
+    The bucket holds up to ``capacity`` tokens and regains
+    ``refill_per_second`` tokens per second, so ``capacity`` is the burst
+    size and ``refill_per_second`` the sustained rate.
+    """
+
+    capacity: float = Field(gt=0, description="Maximum tokens (burst size)")
+    refill_per_second: float = Field(ge=0, description="Tokens regained per second")
+
+    @classmethod
+    def per_minute(cls, amount: float, burst: Optional[float] = None) -> "RateLimit":
+        """Allow ``amount`` per minute, with bursts of up to ``burst``."""
+        return cls(capacity=burst or amount, refill_per_second=amount / 60)
+
+    @classmethod
+    def per_hour(cls, amount: float, burst: Optional[float] = None) -> "RateLimit":
+        """Allow ``amount`` per hour, with bursts of up to ``burst``."""
+        return cls(capacity=burst or amount, refill_per_second=amount / 3600)
+
+    @classmethod
+    def per_day(cls, amount: float, burst: Optional[float] = None) -> "RateLimit":
+        """Allow ``amount`` per day, with bursts of up to ``burst``."""
+        return cls(capacity=burst or amount, refill_per_second=amount / 86400)
+
+
+class QuotaPolicy(BaseModel):
+    """Limits applied to a user or a group.
+
+    Unset limits are not enforced.
+    """
+
+    messages: Optional[RateLimit] = Field(
+        default=None, description="Messages sent to the agent"
+    )
+    llm_tokens: Optional[RateLimit] = Field(
+        default=None, description="LLM tokens (prompt and completion) consumed"
+    )
+    sql_executions: Optional[RateLimit] = Field(
+        default=None, description="Executions of SQL tools"
+    )
+    max_concurrent_messages: Optional[int] = Field(
+        default=None, ge=1, description="Messages of one user processed at once"
+    )
+
+
+class BucketResult(BaseModel):
+    """Outcome of taking tokens from a bucket."""
+
+    granted: bool
+    remaining: float = Field(description="Tokens left after the operation")
+    retry_after: Optional[float] = Field(
+        default=None,
+        description="Seconds until the request could be granted, None if never",
+    )
@@ -5,7 +5,17 @@ This module provides the ToolRegistry class for managing and executing tools.
 """
 
 import time
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from .tool import Tool, ToolCall, ToolContext, ToolRejection, ToolResult, ToolSchema
 from .user import User
@@ -16,6 +26,9 @@ if TYPE_CHECKING:
 
 T = TypeVar("T")
 
+# Distinct user group sets whose schema lists are memoized
+MAX_CACHED_SCHEMA_LISTS = 256
+
 
 class _LocalToolWrapper(Tool[T]):
     """Wrapper for tools with configurable access groups."""
@@ -44,7 +57,14 @@ class _LocalToolWrapper(Tool[T]):
 
 
 class ToolRegistry:
-    """Registry for managing tools."""
+    """Registry for managing tools.
+
+    Tool schemas are generated once, when a tool is registered, and the
+    schema list for each distinct set of user groups is memoized, so
+    ``get_schemas`` is a dictionary lookup on every turn. Both caches are
+    cleared when tools are registered or unregistered; tools whose schema
+    changes after registration should call ``invalidate_schema_cache``.
+    """
 
     def __init__(
         self,
@@ -52,6 +72,9 @@ class ToolRegistry:
         audit_config: Optional["AuditConfig"] = None,
     ) -> None:
         self._tools: Dict[str, Tool[Any]] = {}
+        self._schemas: Dict[str, ToolSchema] = {}
+        # Accessible schemas per user group set; None is the unfiltered list
+        self._schema_lists: Dict[Optional[FrozenSet[str]], List[ToolSchema]] = {}
         self.audit_logger = audit_logger
         if audit_config is not None:
             self.audit_config = audit_config
@@ -78,6 +101,28 @@ class ToolRegistry:
         else:
             # No access restrictions, register as-is
             self._tools[tool.name] = tool
+        self._schemas[tool.name] = self._tools[tool.name].get_schema()
+        self._schema_lists.clear()
+
+    def unregister_tool(self, name: str) -> bool:
+        """Unregister a tool.
+
+        Args:
+            name: Name of the tool to remove
+
+        Returns:
+            True if the tool was registered
+        """
+        if self._tools.pop(name, None) is None:
+            return False
+        self._schemas.pop(name, None)
+        self._schema_lists.clear()
+        return True
+
+    def invalidate_schema_cache(self) -> None:
+        """Regenerate cached tool schemas, e.g. after a tool's args changed."""
+        self._schemas = {name: tool.get_schema() for name, tool in self._tools.items()}
+        self._schema_lists.clear()
 
     async def get_tool(self, name: str) -> Optional[Tool[Any]]:
         """Get a tool by name."""
@@ -88,12 +133,38 @@ class ToolRegistry:
         return list(self._tools.keys())
 
     async def get_schemas(self, user: Optional[User] = None) -> List[ToolSchema]:
-        """Get schemas for all tools accessible to user."""
-        schemas = []
-        for tool in self._tools.values():
-            if user is None or await self._validate_tool_permissions(tool, user):
-                schemas.append(tool.get_schema())
-        return schemas
+        """Get schemas for all tools accessible to user.
+
+        Access only depends on the user's groups, so results are memoized
+        per group set. Subclasses overriding ``_validate_tool_permissions``
+        are checked per call instead.
+        """
+        if (
+            user is not None
+            and type(self)._validate_tool_permissions
+            is not ToolRegistry._validate_tool_permissions
+        ):
+            return [
+                self._schemas[name]
+                for name, tool in self._tools.items()
+                if await self._validate_tool_permissions(tool, user)
+            ]
+
+        key = frozenset(user.group_memberships) if user is not None else None
+        schemas = self._schema_lists.get(key)
+        if schemas is None:
+            schemas = [
+                self._schemas[name]
+                for name, tool in self._tools.items()
+                if key is None
+                or not tool.access_groups
+                or not key.isdisjoint(tool.access_groups)
+            ]
+            if len(self._schema_lists) >= MAX_CACHED_SCHEMA_LISTS:
+                self._schema_lists.clear()
+            self._schema_lists[key] = schemas
+        # Callers may modify the list they get, but not the cached one
+        return list(schemas)
 
     async def _validate_tool_permissions(self, tool: Tool[Any], user: User) -> bool:
         """Validate if user has access to tool based on group membership.
@@ -42,5 +42,9 @@ class ConversationStore(ABC):
     async def list_conversations(
         self, user: User, limit: int = 50, offset: int = 0
     ) -> List[Conversation]:
-        """List conversations for user."""
+        """List conversations for user, most recently updated first.
+
+        Stores may leave out the messages of listed conversations to keep
+        listing cheap; ``get_conversation`` returns them.
+        """
         pass
@@ -39,6 +39,10 @@ class Conversation(BaseModel):
     metadata: Dict[str, Any] = Field(
         default_factory=dict, description="Additional conversation metadata"
     )
+    version: int = Field(
+        default=0,
+        description="Stored revision, used by stores with optimistic concurrency",
+    )
 
     def add_message(self, message: Message) -> None:
         """Add a message to the conversation."""
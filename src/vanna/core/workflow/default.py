@@ -5,6 +5,7 @@ This module provides a default implementation of the WorkflowHandler interface
 that provides a smart starter UI based on available tools and setup status.
 """
 
+from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional, Dict, Any
 import traceback
 import uuid
@@ -76,6 +77,11 @@ class DefaultWorkflowHandler(WorkflowHandler):
                     "- `/memories` - View and manage recent memories\n"
                     "- `/delete [id]` - Delete a memory by ID\n"
                 )
+                if getattr(agent, "profiler", None) is not None:
+                    help_content += (
+                        "- `/profiles` - List recent request profiles\n"
+                        "- `/profile [id]` - Show a request profile\n"
+                    )
 
             help_content += "\n\nJust ask me anything about your data in plain English!"
 
@@ -158,6 +164,29 @@ class DefaultWorkflowHandler(WorkflowHandler):
             memory_id = message.strip()[8:].strip()  # Extract ID after "/delete "
             return await self._delete_memory(agent, user, conversation, memory_id)
 
+        # Handle request profile commands (admin-only)
+        command = message.strip().lower()
+        if command in ["/profiles", "/profile"] or command.startswith("/profile "):
+            # Check if user is admin
+            if "admin" not in user.group_memberships:
+                return WorkflowResult(
+                    should_skip_llm=True,
+                    components=[
+                        UiComponent(
+                            rich_component=RichTextComponent(
+                                content="# 🔒 Access Denied\n\n"
+                                "The `/profiles` command is only available to administrators.\n\n"
+                                "If you need access to request profiles, please contact your system administrator.",
+                                markdown=True,
+                            ),
+                            simple_component=None,
+                        )
+                    ],
+                )
+            if command.startswith("/profile "):
+                return await self._show_profile(agent, message.strip()[9:].strip())
+            return await self._list_profiles(agent)
+
         # Don't handle other messages, pass to LLM
         return WorkflowResult(should_skip_llm=False)
 
@@ -787,3 +816,99 @@ class DefaultWorkflowHandler(WorkflowHandler):
                     )
                 ],
             )
+
+    @staticmethod
+    def _markdown_result(content: str) -> WorkflowResult:
+        return WorkflowResult(
+            should_skip_llm=True,
+            components=[
+                UiComponent(
+                    rich_component=RichTextComponent(content=content, markdown=True),
+                    simple_component=None,
+                )
+            ],
+        )
+
+    async def _list_profiles(self, agent: "Agent") -> WorkflowResult:
+        """List recent request profiles captured by the agent's profiler."""
+        profiler = getattr(agent, "profiler", None)
+        if profiler is None:
+            return self._markdown_result(
+                "# ⚠️ Profiling Disabled\n\n"
+                "Request profiling is not enabled. Pass a `RequestProfiler` "
+                "to the agent to capture sampled and slow requests."
+            )
+
+        profiles = await profiler.store.list_profiles(limit=20)
+        if not profiles:
+            return self._markdown_result(
+                "# ⏱️ Request Profiles\n\nNo requests have been captured yet."
+            )
+
+        content = "# ⏱️ Request Profiles\n\n"
+        content += "| ID | Started | Duration | User | Reason | Slowest stage |\n"
+        content += "|---|---|---:|---|---|---|\n"
+        for profile in profiles:
+            started = datetime.fromtimestamp(profile.started_at).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            reason = "slow" if profile.slow else "sampled"
+            if profile.error:
+                reason += ", error"
+            slowest = profile.slowest_stages(1)
+            slowest_text = (
+                f"{slowest[0].name} ({slowest[0].duration_ms:.0f} ms)"
+                if slowest
+                else "-"
+            )
+            content += (
+                f"| `{profile.id}` | {started} | {profile.duration_ms:.0f} ms "
+                f"| {profile.user_id or '-'} | {reason} | {slowest_text} |\n"
+            )
+        content += "\nUse `/profile [id]` to see a request's timeline."
+        return self._markdown_result(content)
+
+    async def _show_profile(self, agent: "Agent", profile_id: str) -> WorkflowResult:
+        """Show the stage timeline and samples of one request profile."""
+        profiler = getattr(agent, "profiler", None)
+        if profiler is None:
+            return await self._list_profiles(agent)
+
+        profile = await profiler.store.get_profile(profile_id)
+        if profile is None:
+            return self._markdown_result(
+                f"# ❌ Profile Not Found\n\n"
+                f"Could not find profile with ID: `{profile_id}`\n\n"
+                f"Use `/profiles` to see recent profiles."
+            )
+
+        content = f"# ⏱️ Request Profile `{profile.id}`\n\n"
+        content += f"**Duration:** {profile.duration_ms:.0f} ms\n\n"
+        content += f"**User:** {profile.user_id or '-'}\n\n"
+        if profile.message_preview:
+            content += f"**Message:** {profile.message_preview}\n\n"
+        if profile.error:
+            content += f"**Error:** {profile.error}\n\n"
+
+        content += "## Timeline\n\n| Start | Duration | Stage |\n|---:|---:|---|\n"
+        for stage in profile.stages:
+            indent = "&nbsp;&nbsp;" * stage.depth
+            content += (
+                f"| {stage.start_ms:.0f} ms | {stage.duration_ms:.1f} ms "
+                f"| {indent}{stage.name} |\n"
+            )
+
+        if profile.stack_samples:
+            content += (
+                f"\n## Stack Samples\n\nEvery {profile.stack_interval_ms:g} ms "
+                "after the slow threshold; innermost frames of the most frequent "
+                "stacks:\n\n"
+            )
+            for sample in profile.stack_samples[:5]:
+                frames = "\n".join(sample.stack[-8:])
+                content += f"**{sample.count} samples**\n```\n{frames}\n```\n"
+
+        if profile.cprofile_stats:
+            content += f"\n## cProfile\n\n```\n{profile.cprofile_stats}\n```\n"
+
+        return self._markdown_result(content)
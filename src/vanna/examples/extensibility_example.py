@@ -189,13 +189,13 @@ class LoggingObservabilityProvider(ObservabilityProvider):
         self, name: str, attributes: Optional[Dict[str, Any]] = None
     ) -> Span:
         """Create a span for tracing."""
-        span = Span(name=name, attributes=attributes or {})
+        span = await super().create_span(name, attributes)
         print(f"[SPAN START] {name}")
         return span
 
     async def end_span(self, span: Span) -> None:
         """End and record a span."""
-        span.end()
+        await super().end_span(span)
         self.spans.append(span)
         duration = span.duration_ms() or 0
         print(f"[SPAN END] {span.name}: {duration:.2f}ms")
@@ -4,7 +4,8 @@ Anthropic LLM service implementation.
 Implements the LlmService interface using Anthropic's Messages API
 (anthropic>=0.8.0). Supports non-streaming and streaming text output.
 Tool-calls (tool_use blocks) are surfaced at the end of a stream or after a
-non-streaming call as ToolCall entries.
+non-streaming call as ToolCall entries. Prompt segments marked cacheable on
+the request are sent with ``cache_control`` breakpoints.
 """
 
 from __future__ import annotations
@@ -20,9 +21,14 @@ from vanna.core.llm import (
     LlmRequest,
     LlmResponse,
     LlmStreamChunk,
+    ToolPayloadCache,
 )
 from vanna.core.tool import ToolCall, ToolSchema
 
+# Anthropic accepts at most four cache breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
 
 class AnthropicLlmService(LlmService):
     """Anthropic Messages-backed LLM service.
@@ -61,6 +67,7 @@ class AnthropicLlmService(LlmService):
             client_kwargs["base_url"] = base_url
 
         self._client = anthropic.Anthropic(**client_kwargs)
+        self._tool_payloads = ToolPayloadCache(self._convert_tools)
 
     async def send_request(self, request: LlmRequest) -> LlmResponse:
         """Send a non-streaming request to Anthropic and return the response."""
@@ -72,15 +79,7 @@ class AnthropicLlmService(LlmService):
 
         text_content, tool_calls = self._parse_message_content(resp)
 
-        usage: Dict[str, int] = {}
-        if getattr(resp, "usage", None):
-            try:
-                usage = {
-                    "input_tokens": int(resp.usage.input_tokens),
-                    "output_tokens": int(resp.usage.output_tokens),
-                }
-            except Exception:
-                pass
+        usage = self._extract_usage(resp)
 
         return LlmResponse(
             content=text_content or None,
@@ -110,14 +109,17 @@ class AnthropicLlmService(LlmService):
             final = stream.get_final_message()
             logger.info(f"Anthropic stream response: {final}")
             _, tool_calls = self._parse_message_content(final)
+            usage = self._extract_usage(final)
             if tool_calls:
                 yield LlmStreamChunk(
                     tool_calls=tool_calls,
                     finish_reason=getattr(final, "stop_reason", None),
+                    usage=usage or None,
                 )
             else:
                 yield LlmStreamChunk(
-                    finish_reason=getattr(final, "stop_reason", None) or "stop"
+                    finish_reason=getattr(final, "stop_reason", None) or "stop",
+                    usage=usage or None,
                 )
 
     async def validate_tools(self, tools: List[ToolSchema]) -> List[str]:
@@ -129,10 +131,41 @@ class AnthropicLlmService(LlmService):
         return errors
 
     # Internal helpers
+    def _extract_usage(self, message: Any) -> Dict[str, int]:
+        """Read token usage, including prompt cache reads and writes."""
+        usage = getattr(message, "usage", None)
+        if not usage:
+            return {}
+        try:
+            result = {
+                "input_tokens": int(usage.input_tokens),
+                "output_tokens": int(usage.output_tokens),
+            }
+        except Exception:
+            return {}
+        for key in ("cache_read_input_tokens", "cache_creation_input_tokens"):
+            value = getattr(usage, key, None)
+            if value:
+                result[key] = int(value)
+        return result
+
+    @staticmethod
+    def _convert_tools(tools: List[ToolSchema]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": t.name,
+                "description": t.description,
+                "input_schema": t.parameters,
+            }
+            for t in tools
+        ]
+
     def _build_payload(self, request: LlmRequest) -> Dict[str, Any]:
         # Anthropic requires messages content as list of content blocks per message
         # We need to group consecutive tool messages into single user messages
         messages: List[Dict[str, Any]] = []
+        # Last content blocks of messages marked as cache breakpoints
+        breakpoint_blocks: List[Dict[str, Any]] = []
         i = 0
 
         while i < len(request.messages):
@@ -141,8 +174,10 @@ class AnthropicLlmService(LlmService):
             if m.role == "tool":
                 # Group consecutive tool messages into one user message
                 tool_content_blocks = []
+                cache_breakpoint = False
                 while i < len(request.messages) and request.messages[i].role == "tool":
                     tool_msg = request.messages[i]
+                    cache_breakpoint = cache_breakpoint or tool_msg.cache_breakpoint
                     if tool_msg.tool_call_id:
                         tool_content_blocks.append(
                             {
@@ -154,6 +189,8 @@ class AnthropicLlmService(LlmService):
                     i += 1
 
                 if tool_content_blocks:
+                    if cache_breakpoint:
+                        breakpoint_blocks.append(tool_content_blocks[-1])
                     messages.append(
                         {
                             "role": "user",
@@ -185,6 +222,11 @@ class AnthropicLlmService(LlmService):
                     content_blocks.append({"type": "text", "text": m.content or ""})
 
                 if content_blocks:
+                    if m.cache_breakpoint and (
+                        content_blocks[-1]["type"] != "text"
+                        or content_blocks[-1]["text"]
+                    ):
+                        breakpoint_blocks.append(content_blocks[-1])
                     role = m.role if m.role in {"user", "assistant"} else "user"
                     messages.append(
                         {
@@ -197,14 +239,7 @@ class AnthropicLlmService(LlmService):
 
         tools_payload: Optional[List[Dict[str, Any]]] = None
         if request.tools:
-            tools_payload = [
-                {
-                    "name": t.name,
-                    "description": t.description,
-                    "input_schema": t.parameters,
-                }
-                for t in request.tools
-            ]
+            tools_payload = self._tool_payloads.get(request.tools)
 
         payload: Dict[str, Any] = {
             "model": self.model,
@@ -213,13 +248,35 @@ class AnthropicLlmService(LlmService):
             "max_tokens": request.max_tokens if request.max_tokens is not None else 512,
             "temperature": request.temperature,
         }
+        breakpoints_left = MAX_CACHE_BREAKPOINTS
         if tools_payload:
+            if request.cache_tools:
+                # Copy the last tool, the converted payload is shared
+                tools_payload = tools_payload[:-1] + [
+                    {**tools_payload[-1], "cache_control": EPHEMERAL_CACHE}
+                ]
+                breakpoints_left -= 1
             payload["tools"] = tools_payload
             payload["tool_choice"] = {"type": "auto"}
 
         # Add system prompt if provided
         if request.system_prompt:
-            payload["system"] = request.system_prompt
+            if request.cache_system_prompt:
+                payload["system"] = [
+                    {
+                        "type": "text",
+                        "text": request.system_prompt,
+                        "cache_control": EPHEMERAL_CACHE,
+                    }
+                ]
+                breakpoints_left -= 1
+            else:
+                payload["system"] = request.system_prompt
+
+        # Keep the latest message breakpoints, which cover the longest prefixes
+        if breakpoints_left > 0:
+            for block in breakpoint_blocks[-breakpoints_left:]:
+                block["cache_control"] = EPHEMERAL_CACHE
 
         return payload
 
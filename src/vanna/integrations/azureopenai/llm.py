@@ -35,6 +35,10 @@ REASONING_MODELS: Set[str] = {
 }
 
 
+# First API version accepting `stream_options` on streamed chat completions
+STREAM_USAGE_MIN_API_VERSION = "2024-09-01"
+
+
 def _is_reasoning_model(model: str) -> bool:
     """Return True when the deployment targets a reasoning-only model."""
     model_lower = model.lower()
@@ -55,6 +59,9 @@ class AzureOpenAILlmService(LlmService):
         api_version: API version; defaults to "2024-10-21" or
             `AZURE_OPENAI_API_VERSION`.
         azure_ad_token_provider: Optional bearer token provider for Entra ID.
+        stream_usage: Request token usage on streamed responses via
+            `stream_options`. Defaults to on for API versions from
+            2024-09-01, which are the first to accept it.
         **extra_client_kwargs: Additional keyword arguments forwarded to the
             underlying client.
     """
@@ -66,6 +73,7 @@ class AzureOpenAILlmService(LlmService):
         azure_endpoint: Optional[str] = None,
         api_version: Optional[str] = None,
         azure_ad_token_provider: Optional[Any] = None,
+        stream_usage: Optional[bool] = None,
         **extra_client_kwargs: Any,
     ) -> None:
         try:
@@ -114,6 +122,11 @@ class AzureOpenAILlmService(LlmService):
                 )
             client_kwargs["api_key"] = api_key
 
+        if stream_usage is None:
+            # Versions are dates, optionally with a "-preview" suffix
+            stream_usage = api_version[:10] >= STREAM_USAGE_MIN_API_VERSION
+        self.stream_usage = stream_usage
+
         self._client = AzureOpenAI(**client_kwargs)
         self._is_reasoning_model = _is_reasoning_model(self.model)
 
@@ -131,16 +144,7 @@ class AzureOpenAILlmService(LlmService):
         content: Optional[str] = getattr(choice.message, "content", None)
         tool_calls = self._extract_tool_calls_from_message(choice.message)
 
-        usage: Dict[str, int] = {}
-        if getattr(resp, "usage", None):
-            usage = {
-                k: int(v)
-                for k, v in {
-                    "prompt_tokens": getattr(resp.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(resp.usage, "completion_tokens", 0),
-                    "total_tokens": getattr(resp.usage, "total_tokens", 0),
-                }.items()
-            }
+        usage = self._extract_usage(getattr(resp, "usage", None))
 
         return LlmResponse(
             content=content,
@@ -161,13 +165,21 @@ class AzureOpenAILlmService(LlmService):
         payload = self._build_payload(request)
 
         # Synchronous streaming iterator; iterate within async context.
+        if self.stream_usage:
+            payload["stream_options"] = {"include_usage": True}
         stream = self._client.chat.completions.create(**payload, stream=True)
 
         # Builders for streamed tool-calls (index -> partial)
         tc_builders: Dict[int, Dict[str, Optional[str]]] = {}
         last_finish: Optional[str] = None
 
+        usage: Dict[str, int] = {}
+
         for event in stream:
+            # With include_usage the last event carries usage and no choices
+            if getattr(event, "usage", None):
+                usage = self._extract_usage(event.usage)
+
             if not getattr(event, "choices", None):
                 continue
 
@@ -225,10 +237,28 @@ class AzureOpenAILlmService(LlmService):
             )
 
         if final_tool_calls:
-            yield LlmStreamChunk(tool_calls=final_tool_calls, finish_reason=last_finish)
+            yield LlmStreamChunk(
+                tool_calls=final_tool_calls,
+                finish_reason=last_finish,
+                usage=usage or None,
+            )
         else:
             # Still emit a terminal chunk to signal completion
-            yield LlmStreamChunk(finish_reason=last_finish or "stop")
+            yield LlmStreamChunk(
+                finish_reason=last_finish or "stop", usage=usage or None
+            )
+
+    def _extract_usage(self, usage: Any) -> Dict[str, int]:
+        """Convert the SDK usage object, including prompt cache hits."""
+        if not usage:
+            return {}
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "prompt_tokens": int(getattr(usage, "prompt_tokens", 0) or 0),
+            "completion_tokens": int(getattr(usage, "completion_tokens", 0) or 0),
+            "total_tokens": int(getattr(usage, "total_tokens", 0) or 0),
+            "cached_tokens": int(getattr(details, "cached_tokens", 0) or 0),
+        }
 
     async def validate_tools(self, tools: List[ToolSchema]) -> List[str]:
         """Validate tool schemas. Returns a list of error messages."""
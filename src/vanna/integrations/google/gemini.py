@@ -20,6 +20,7 @@ from vanna.core.llm import (
     LlmRequest,
     LlmResponse,
     LlmStreamChunk,
+    ToolPayloadCache,
 )
 from vanna.core.tool import ToolCall, ToolSchema
 
@@ -72,6 +73,7 @@ class GeminiLlmService(LlmService):
         # Store generation config
         self.temperature = temperature
         self.extra_config = extra_config
+        self._tool_payloads = ToolPayloadCache(self._convert_tools)
 
     async def send_request(self, request: LlmRequest) -> LlmResponse:
         """Send a non-streaming request to Gemini and return the response."""
@@ -91,20 +93,7 @@ class GeminiLlmService(LlmService):
             text_content, tool_calls = self._parse_response(response)
 
             # Extract usage information
-            usage: Dict[str, int] = {}
-            if hasattr(response, "usage_metadata"):
-                try:
-                    usage = {
-                        "prompt_tokens": int(
-                            response.usage_metadata.prompt_token_count
-                        ),
-                        "completion_tokens": int(
-                            response.usage_metadata.candidates_token_count
-                        ),
-                        "total_tokens": int(response.usage_metadata.total_token_count),
-                    }
-                except Exception:
-                    pass
+            usage = self._extract_usage(response)
 
             # Get finish reason
             finish_reason = None
@@ -160,18 +149,41 @@ class GeminiLlmService(LlmService):
                 if final_chunk.candidates:
                     finish_reason = str(final_chunk.candidates[0].finish_reason).lower()
 
+                # The last chunk's usage metadata covers the whole response
+                usage = self._extract_usage(final_chunk)
+
                 if tool_calls:
                     yield LlmStreamChunk(
                         tool_calls=tool_calls,
                         finish_reason=finish_reason,
+                        usage=usage or None,
                     )
                 else:
-                    yield LlmStreamChunk(finish_reason=finish_reason or "stop")
+                    yield LlmStreamChunk(
+                        finish_reason=finish_reason or "stop", usage=usage or None
+                    )
 
         except Exception as e:
             logger.error(f"Error streaming from Gemini API: {e}")
             raise
 
+    def _extract_usage(self, response: Any) -> Dict[str, int]:
+        """Read token usage, including context cache hits."""
+        metadata = getattr(response, "usage_metadata", None)
+        if not metadata:
+            return {}
+        try:
+            return {
+                "prompt_tokens": int(metadata.prompt_token_count or 0),
+                "completion_tokens": int(metadata.candidates_token_count or 0),
+                "total_tokens": int(metadata.total_token_count or 0),
+                "cached_tokens": int(
+                    getattr(metadata, "cached_content_token_count", 0) or 0
+                ),
+            }
+        except Exception:
+            return {}
+
     async def validate_tools(self, tools: List[ToolSchema]) -> List[str]:
         """Basic validation of tool schemas for Gemini."""
         errors: List[str] = []
@@ -183,6 +195,24 @@ class GeminiLlmService(LlmService):
         return errors
 
     # Internal helpers
+    def _convert_tools(self, tools: List[ToolSchema]) -> Optional[List[Any]]:
+        function_declarations = []
+        for tool in tools:
+            # Clean schema to remove unsupported fields
+            cleaned_parameters = self._clean_schema_for_gemini(tool.parameters)
+
+            function_declarations.append(
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": cleaned_parameters,
+                }
+            )
+
+        if not function_declarations:
+            return None
+        return [self._types.Tool(function_declarations=function_declarations)]
+
     def _build_payload(self, request: LlmRequest) -> tuple[List[Any], Any]:
         """Build the payload for Gemini API.
 
@@ -254,21 +284,7 @@ class GeminiLlmService(LlmService):
         # Build tools configuration if tools are provided
         tools = None
         if request.tools:
-            function_declarations = []
-            for tool in request.tools:
-                # Clean schema to remove unsupported fields
-                cleaned_parameters = self._clean_schema_for_gemini(tool.parameters)
-
-                function_declarations.append(
-                    {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": cleaned_parameters,
-                    }
-                )
-
-            if function_declarations:
-                tools = [self._types.Tool(function_declarations=function_declarations)]
+            tools = self._tool_payloads.get(request.tools)
 
         # Build generation config
         config_dict = {
@@ -6,6 +6,11 @@ This module provides built-in local implementations.
 
 from .audit import LoggingAuditLogger
 from .file_system import LocalFileSystem
+from .llm_cache import FileLlmResponseCache, MemoryLlmResponseCache
+from .metrics import InMemoryMetricsProvider
+from .otlp import OtlpJsonObservabilityProvider
+from .profile_store import FileProfileStore, MemoryProfileStore
+from .quota import MemoryQuotaBackend
 from .storage import MemoryConversationStore
 from .file_system_conversation_store import FileSystemConversationStore
 
@@ -14,4 +19,11 @@ __all__ = [
     "FileSystemConversationStore",
     "LocalFileSystem",
     "LoggingAuditLogger",
+    "OtlpJsonObservabilityProvider",
+    "InMemoryMetricsProvider",
+    "MemoryQuotaBackend",
+    "MemoryProfileStore",
+    "FileProfileStore",
+    "MemoryLlmResponseCache",
+    "FileLlmResponseCache",
 ]
@@ -0,0 +1,452 @@
+"""
+Search index for local workspaces.
+
+This module provides the per-user index behind ``LocalFileSystem.search_files``:
+a trie over file name substrings and an inverted token index over text
+content, with a trigram index over the token vocabulary for substring
+lookups. The index is kept up to date from ``write_file``; other changes are
+found by checking directory modification times on each search and by
+re-checking every file's modification time at most once per interval. It is
+persisted next to the workspace, debounced, so it survives restarts.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from stat import S_ISDIR
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from vanna.capabilities.file_system import FileSearchMatch
+
+from .io_utils import atomic_write_text
+
+INDEX_FORMAT_VERSION = 1
+FILENAME_MATCH_SNIPPET = "[filename match]"
+SNIPPET_CONTEXT_CHARS = 60
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Length of the substrings indexing the token vocabulary
+GRAM_SIZE = 3
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into the lowercase word tokens used by the content index."""
+    return set(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def grams(token: str) -> Set[str]:
+    """Return the ``GRAM_SIZE`` character substrings of a token."""
+    return {token[i : i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1)}
+
+
+def make_snippet(content: str, query: str) -> Optional[str]:
+    """Return the text surrounding the first case-insensitive match of query."""
+    index = content.lower().find(query.lower())
+    if index == -1:
+        return None
+
+    start = max(0, index - SNIPPET_CONTEXT_CHARS)
+    end = min(len(content), index + len(query) + SNIPPET_CONTEXT_CHARS)
+    snippet = content[start:end].replace("\n", " ").strip()
+    if start > 0:
+        snippet = f"…{snippet}"
+    if end < len(content):
+        snippet = f"{snippet}…"
+    return snippet
+
+
+class _TrieNode:
+    __slots__ = ("children", "paths")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.paths: Set[str] = set()
+
+
+class FilenameTrie:
+    """Trie over every suffix of each file name.
+
+    Each node holds the paths whose name contains the node's prefix, so a
+    substring lookup is a single walk of ``len(query)`` steps.
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    def _suffixes(self, name: str) -> Iterable[str]:
+        name = name.lower()
+        return (name[i:] for i in range(len(name)))
+
+    def add(self, name: str, path: str) -> None:
+        for suffix in self._suffixes(name):
+            node = self._root
+            for char in suffix:
+                node = node.children.setdefault(char, _TrieNode())
+                node.paths.add(path)
+
+    def remove(self, name: str, path: str) -> None:
+        for suffix in self._suffixes(name):
+            node = self._root
+            for char in suffix:
+                child = node.children.get(char)
+                if child is None:
+                    break
+                child.paths.discard(path)
+                if not child.paths:
+                    # Nothing below an empty node can still hold this path
+                    del node.children[char]
+                    break
+                node = child
+
+    def find(self, query: str) -> Set[str]:
+        """Return paths whose file name contains ``query`` (case-insensitive)."""
+        node = self._root
+        for char in query.lower():
+            child = node.children.get(char)
+            if child is None:
+                return set()
+            node = child
+        return set(node.paths)
+
+
+class _IndexedFile:
+    __slots__ = ("mtime_ns", "size", "tokens")
+
+    def __init__(
+        self, mtime_ns: int, size: int, tokens: Optional[Set[str]] = None
+    ) -> None:
+        self.mtime_ns = mtime_ns
+        self.size = size
+        # None when the content is not indexed (binary or oversized files)
+        self.tokens = tokens
+
+
+class FileSearchIndex:
+    """Incrementally maintained search index for one user's workspace.
+
+    Content tokens only narrow the candidate set; candidates are still read
+    to confirm the exact substring match and build the snippet, so results
+    are identical to a full scan while unrelated files are never opened.
+
+    Searches do not walk the workspace on every query. Files written through
+    ``update_file`` are indexed as they are written. A search rescans the
+    workspace - re-reading only files whose modification time or size
+    changed - when:
+
+    - a directory's modification time changed, i.e. a file was created,
+      deleted or renamed in it, e.g. by another process
+    - ``revalidate_interval`` seconds passed since the last rescan, to find
+      files edited in place
+    - ``mark_stale`` was called, or the index was just loaded
+
+    Changes are persisted ``persist_delay`` seconds after the first unsaved
+    one, so a burst of writes is saved once; ``flush`` saves immediately.
+
+    All methods are blocking and thread-safe; ``LocalFileSystem`` calls them
+    from its I/O executor.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index_path: Path,
+        max_content_bytes: int,
+        persist_delay: float = 1.0,
+        revalidate_interval: float = 5.0,
+    ) -> None:
+        """Initialize the index, loading any previously persisted state.
+
+        Args:
+            root: The user's workspace directory
+            index_path: File the index is persisted to
+            max_content_bytes: Files larger than this are only indexed by name
+            persist_delay: Seconds changes are batched before being persisted
+            revalidate_interval: Seconds after which a search re-checks the
+                modification time of every file
+        """
+        self.root = root
+        self.index_path = index_path
+        self.max_content_bytes = max_content_bytes
+        self.persist_delay = persist_delay
+        self.revalidate_interval = revalidate_interval
+        self._files: Dict[str, _IndexedFile] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        # Trigram -> indexed tokens containing it
+        self._grams: Dict[str, Set[str]] = {}
+        self._names = FilenameTrie()
+        self._lock = threading.Lock()
+        self._stale = True
+        self._last_refresh = 0.0
+        # Directory -> modification time at the last rescan
+        self._directories: Dict[Path, int] = {}
+        self._dirty = False
+        self._persist_timer: Optional[threading.Timer] = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_FORMAT_VERSION:
+            return
+
+        for path, (mtime_ns, size, tokens) in data.get("files", {}).items():
+            self._add(
+                path,
+                _IndexedFile(
+                    mtime_ns, size, set(tokens) if tokens is not None else None
+                ),
+            )
+
+    def _persist(self) -> None:
+        files = {
+            path: [
+                entry.mtime_ns,
+                entry.size,
+                sorted(entry.tokens) if entry.tokens is not None else None,
+            ]
+            for path, entry in self._files.items()
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(
+            self.index_path,
+            json.dumps(
+                {"version": INDEX_FORMAT_VERSION, "files": files},
+                separators=(",", ":"),
+            ),
+        )
+
+    def _schedule_persist(self) -> None:
+        """Persist the index after ``persist_delay``; call with the lock held."""
+        self._dirty = True
+        if self._persist_timer is None:
+            self._persist_timer = threading.Timer(self.persist_delay, self.flush)
+            self._persist_timer.daemon = True
+            self._persist_timer.start()
+
+    def flush(self) -> None:
+        """Persist unsaved changes now."""
+        with self._lock:
+            if self._persist_timer is not None:
+                self._persist_timer.cancel()
+                self._persist_timer = None
+            if self._dirty:
+                self._persist()
+                self._dirty = False
+
+    def _add(self, path: str, entry: _IndexedFile) -> None:
+        self._files[path] = entry
+        self._names.add(path.rsplit("/", 1)[-1], path)
+        for token in entry.tokens or ():
+            paths = self._postings.get(token)
+            if paths is None:
+                paths = self._postings[token] = set()
+                for gram in grams(token):
+                    self._grams.setdefault(gram, set()).add(token)
+            paths.add(path)
+
+    def _remove(self, path: str) -> None:
+        entry = self._files.pop(path, None)
+        if entry is None:
+            return
+        self._names.remove(path.rsplit("/", 1)[-1], path)
+        for token in entry.tokens or ():
+            paths = self._postings.get(token)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._postings[token]
+                    for gram in grams(token):
+                        tokens = self._grams[gram]
+                        tokens.discard(token)
+                        if not tokens:
+                            del self._grams[gram]
+
+    def _read_tokens(self, file_path: Path, size: int) -> Optional[Set[str]]:
+        if size > self.max_content_bytes:
+            return None
+        try:
+            return tokenize(file_path.read_text(encoding="utf-8"))
+        except (UnicodeDecodeError, OSError):
+            return None
+
+    def _scan(self) -> Dict[str, Tuple[Path, os.stat_result]]:
+        found: Dict[str, Tuple[Path, os.stat_result]] = {}
+        directories: Dict[Path, int] = {}
+        try:
+            directories[self.root] = self.root.stat().st_mtime_ns
+        except OSError:
+            pass
+        for file_path in self.root.rglob("*"):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            if S_ISDIR(stat.st_mode):
+                directories[file_path] = stat.st_mtime_ns
+            elif file_path.is_file():
+                found[file_path.relative_to(self.root).as_posix()] = (file_path, stat)
+        self._directories = directories
+        return found
+
+    def _directories_changed(self) -> bool:
+        for directory, mtime_ns in list(self._directories.items()):
+            try:
+                if directory.stat().st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _needs_refresh(self) -> bool:
+        return (
+            self._stale
+            or time.monotonic() - self._last_refresh >= self.revalidate_interval
+            or self._directories_changed()
+        )
+
+    def mark_stale(self) -> None:
+        """Rescan the workspace on the next search, e.g. after running a command."""
+        self._stale = True
+
+    def refresh(self) -> None:
+        """Re-index files whose modification time or size changed on disk."""
+        with self._lock:
+            self._stale = False
+            self._last_refresh = time.monotonic()
+            found = self._scan()
+            changed = False
+
+            for path in list(self._files):
+                if path not in found:
+                    self._remove(path)
+                    changed = True
+
+            for path, (file_path, stat) in found.items():
+                entry = self._files.get(path)
+                if (
+                    entry is not None
+                    and entry.mtime_ns == stat.st_mtime_ns
+                    and entry.size == stat.st_size
+                ):
+                    continue
+                self._remove(path)
+                self._add(
+                    path,
+                    _IndexedFile(
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                        self._read_tokens(file_path, stat.st_size),
+                    ),
+                )
+                changed = True
+
+            if changed:
+                self._schedule_persist()
+
+    def update_file(self, path: str, content: str) -> None:
+        """Index a file that was just written, without re-reading it."""
+        file_path = self.root / path
+        with self._lock:
+            try:
+                stat = file_path.stat()
+            except OSError:
+                return
+            tokens = (
+                tokenize(content)
+                if len(content.encode("utf-8")) <= self.max_content_bytes
+                else None
+            )
+            self._remove(path)
+            self._add(path, _IndexedFile(stat.st_mtime_ns, stat.st_size, tokens))
+            self._schedule_persist()
+            # Creating the file changed its directory; that change is indexed
+            directory = file_path.parent
+            if directory in self._directories:
+                try:
+                    self._directories[directory] = directory.stat().st_mtime_ns
+                except OSError:
+                    pass
+
+    def _content_candidates(self, query: str) -> Set[str]:
+        candidates = {
+            path for path, entry in self._files.items() if entry.tokens is not None
+        }
+        # Every word run in the query lies inside a word run of any matching
+        # file, so each query token must be a substring of an indexed token.
+        for query_token in tokenize(query):
+            matching: Set[str] = set()
+            for token in self._tokens_containing(query_token):
+                matching |= self._postings[token]
+            candidates &= matching
+            if not candidates:
+                break
+        return candidates
+
+    def _tokens_containing(self, query_token: str) -> Iterable[str]:
+        """Indexed tokens that contain ``query_token``."""
+        if len(query_token) < GRAM_SIZE:
+            # Too short for a trigram; such tokens match much of the
+            # vocabulary anyway
+            return [token for token in self._postings if query_token in token]
+
+        # Tokens holding every trigram of the query token, smallest set first
+        gram_sets = sorted(
+            (self._grams.get(gram, set()) for gram in grams(query_token)), key=len
+        )
+        tokens = set(gram_sets[0])
+        for gram_set in gram_sets[1:]:
+            tokens &= gram_set
+            if not tokens:
+                break
+        return [token for token in tokens if query_token in token]
+
+    def search(
+        self, query: str, max_results: int, include_content: bool
+    ) -> List[FileSearchMatch]:
+        """Search the workspace, rescanning it first if it may have changed.
+
+        Args:
+            query: Non-empty search string, matched case-insensitively
+            max_results: Maximum number of matches to return
+            include_content: Whether to match file contents as well as names
+
+        Returns:
+            Matches ordered by path
+        """
+        if self._needs_refresh():
+            self.refresh()
+
+        with self._lock:
+            name_matches = self._names.find(query)
+            content_candidates = (
+                self._content_candidates(query) if include_content else set()
+            )
+
+        query_lower = query.lower()
+        matches: List[FileSearchMatch] = []
+        for path in sorted(name_matches | content_candidates):
+            if len(matches) >= max_results:
+                break
+
+            snippet: Optional[str] = None
+            if path in content_candidates:
+                try:
+                    content = (self.root / path).read_text(encoding="utf-8")
+                except (UnicodeDecodeError, OSError):
+                    content = ""
+                if query_lower in content.lower():
+                    snippet = make_snippet(content, query)
+
+            if snippet is None and path in name_matches:
+                snippet = FILENAME_MATCH_SNIPPET
+
+            if snippet is not None:
+                matches.append(FileSearchMatch(path=path, snippet=snippet))
+
+        return matches
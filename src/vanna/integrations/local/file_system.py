@@ -6,25 +6,84 @@ This module provides a local file system implementation with per-user isolation.
 
 import asyncio
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, TextIO, TypeVar
 
 from vanna.capabilities.file_system import CommandResult, FileSearchMatch, FileSystem
 from vanna.core.tool import ToolContext
 
+from .file_index import FileSearchIndex
+from .io_utils import atomic_write_text, run_blocking_io
+
+T = TypeVar("T")
+
 MAX_SEARCH_FILE_BYTES = 1_000_000
+SEARCH_INDEX_DIR_NAME = ".search_index"
+SEARCH_INDEX_PERSIST_DELAY = 1.0
+SEARCH_INDEX_REVALIDATE_INTERVAL = 5.0
+
+# Search indexes of the process by index file. Every LocalFileSystem on the
+# same working directory shares them, so files written through one instance
+# are found through the others and the instances never save over each other.
+_search_indexes: Dict[Path, FileSearchIndex] = {}
+_search_indexes_lock = threading.Lock()
 
 
 class LocalFileSystem(FileSystem):
-    """Local file system implementation with per-user isolation."""
+    """Local file system implementation with per-user isolation.
+
+    Disk operations run on a dedicated thread pool rather than the event loop.
+    Their durations are recorded as ``file_system.io.duration`` through the
+    tool context's observability provider, when one is configured.
+
+    ``search_files`` is answered from a per-user ``FileSearchIndex`` persisted
+    under ``<working_directory>/.search_index`` and shared by every instance
+    on that working directory. The index is updated by ``write_file``; files
+    created, deleted or edited otherwise - by ``run_bash``, other processes
+    or other tools - are found by the rescans ``FileSearchIndex`` runs when
+    directory or file modification times change, so only changed files are
+    re-read.
 
-    def __init__(self, working_directory: str = "."):
+    Call ``close`` to save the search indexes and stop the I/O thread pool.
+    """
+
+    def __init__(self, working_directory: str = ".", max_io_workers: int = 4):
         """Initialize with a working directory.
 
         Args:
             working_directory: Base directory where user-specific folders will be created
+            max_io_workers: Threads used to run blocking disk operations
         """
         self.working_directory = Path(working_directory)
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=max_io_workers, thread_name_prefix="vanna-fs"
+        )
+        # Shared indexes this instance used, to save on close
+        self._search_indexes: Dict[Path, FileSearchIndex] = {}
+        self._search_indexes_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Wait for pending disk operations, save the search indexes and shut
+        down the I/O executor."""
+        self._io_executor.shutdown(wait=True)
+        with self._search_indexes_lock:
+            indexes = list(self._search_indexes.values())
+        for index in indexes:
+            index.flush()
+
+    async def _run_io(
+        self, operation: str, fn: Callable[[], T], context: ToolContext
+    ) -> T:
+        """Run a blocking disk operation on the I/O executor."""
+        return await run_blocking_io(
+            self._io_executor,
+            fn,
+            metric_name="file_system.io.duration",
+            operation=operation,
+            observability_provider=context.observability_provider,
+        )
 
     def _get_user_directory(self, context: ToolContext) -> Path:
         """Get the user-specific directory by hashing the user ID.
@@ -44,6 +103,30 @@ class LocalFileSystem(FileSystem):
 
         return user_dir
 
+    def _search_index_path(self, user_dir: Path) -> Path:
+        return (
+            self.working_directory / SEARCH_INDEX_DIR_NAME / f"{user_dir.name}.json"
+        ).resolve()
+
+    def _get_search_index(self, context: ToolContext) -> FileSearchIndex:
+        """Get the search index for the user's directory, loading it on first use."""
+        user_dir = self._get_user_directory(context)
+        index_path = self._search_index_path(user_dir)
+        with _search_indexes_lock:
+            index = _search_indexes.get(index_path)
+            if index is None:
+                index = FileSearchIndex(
+                    user_dir,
+                    index_path,
+                    max_content_bytes=MAX_SEARCH_FILE_BYTES,
+                    persist_delay=SEARCH_INDEX_PERSIST_DELAY,
+                    revalidate_interval=SEARCH_INDEX_REVALIDATE_INTERVAL,
+                )
+                _search_indexes[index_path] = index
+        with self._search_indexes_lock:
+            self._search_indexes[index_path] = index
+        return index
+
     def _resolve_path(self, path: str, context: ToolContext) -> Path:
         """Resolve a path relative to the user's directory.
 
@@ -69,64 +152,110 @@ class LocalFileSystem(FileSystem):
 
     async def list_files(self, directory: str, context: ToolContext) -> List[str]:
         """List files in a directory within the user's isolated space."""
-        directory_path = self._resolve_path(directory, context)
 
-        if not directory_path.exists():
-            raise FileNotFoundError(f"Directory '{directory}' does not exist")
+        def _list() -> List[str]:
+            directory_path = self._resolve_path(directory, context)
+
+            if not directory_path.exists():
+                raise FileNotFoundError(f"Directory '{directory}' does not exist")
 
-        if not directory_path.is_dir():
-            raise NotADirectoryError(f"'{directory}' is not a directory")
+            if not directory_path.is_dir():
+                raise NotADirectoryError(f"'{directory}' is not a directory")
 
-        files = []
-        for item in directory_path.iterdir():
-            if item.is_file():
-                files.append(item.name)
+            files = []
+            for item in directory_path.iterdir():
+                if item.is_file():
+                    files.append(item.name)
 
-        return sorted(files)
+            return sorted(files)
+
+        return await self._run_io("list_files", _list, context)
 
     async def read_file(self, filename: str, context: ToolContext) -> str:
         """Read the contents of a file within the user's isolated space."""
-        file_path = self._resolve_path(filename, context)
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File '{filename}' does not exist")
+        def _read() -> str:
+            file_path = self._resolve_path(filename, context)
+
+            if not file_path.exists():
+                raise FileNotFoundError(f"File '{filename}' does not exist")
+
+            if not file_path.is_file():
+                raise IsADirectoryError(f"'{filename}' is a directory, not a file")
+
+            return file_path.read_text(encoding="utf-8")
+
+        return await self._run_io("read_file", _read, context)
+
+    async def open_file(self, filename: str, context: ToolContext) -> TextIO:
+        """Open a file within the user's isolated space for streamed reading."""
 
-        if not file_path.is_file():
-            raise IsADirectoryError(f"'{filename}' is a directory, not a file")
+        def _open() -> TextIO:
+            file_path = self._resolve_path(filename, context)
 
-        return file_path.read_text(encoding="utf-8")
+            if not file_path.exists():
+                raise FileNotFoundError(f"File '{filename}' does not exist")
+
+            if not file_path.is_file():
+                raise IsADirectoryError(f"'{filename}' is a directory, not a file")
+
+            return file_path.open(encoding="utf-8", newline="")
+
+        return await self._run_io("open_file", _open, context)
 
     async def write_file(
         self, filename: str, content: str, context: ToolContext, overwrite: bool = False
     ) -> None:
-        """Write content to a file within the user's isolated space."""
-        file_path = self._resolve_path(filename, context)
+        """Write content to a file within the user's isolated space.
+
+        The file is replaced atomically, so concurrent readers see either the
+        previous or the new content, never a partial write.
+        """
 
-        # Create parent directories if they don't exist
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        def _write() -> None:
+            file_path = self._resolve_path(filename, context)
 
-        if file_path.exists() and not overwrite:
-            raise FileExistsError(
-                f"File '{filename}' already exists. Use overwrite=True to replace it."
+            # Create parent directories if they don't exist
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            if file_path.exists() and not overwrite:
+                raise FileExistsError(
+                    f"File '{filename}' already exists. Use overwrite=True to replace it."
+                )
+
+            atomic_write_text(file_path, content)
+
+            user_dir = self._get_user_directory(context)
+            self._get_search_index(context).update_file(
+                file_path.resolve().relative_to(user_dir.resolve()).as_posix(),
+                content,
             )
 
-        file_path.write_text(content, encoding="utf-8")
+        await self._run_io("write_file", _write, context)
 
     async def exists(self, path: str, context: ToolContext) -> bool:
         """Check if a file or directory exists within the user's isolated space."""
-        try:
-            resolved_path = self._resolve_path(path, context)
-            return resolved_path.exists()
-        except PermissionError:
-            return False
+
+        def _exists() -> bool:
+            try:
+                resolved_path = self._resolve_path(path, context)
+                return resolved_path.exists()
+            except PermissionError:
+                return False
+
+        return await self._run_io("exists", _exists, context)
 
     async def is_directory(self, path: str, context: ToolContext) -> bool:
         """Check if a path is a directory within the user's isolated space."""
-        try:
-            resolved_path = self._resolve_path(path, context)
-            return resolved_path.exists() and resolved_path.is_dir()
-        except PermissionError:
-            return False
+
+        def _is_directory() -> bool:
+            try:
+                resolved_path = self._resolve_path(path, context)
+                return resolved_path.exists() and resolved_path.is_dir()
+            except PermissionError:
+                return False
+
+        return await self._run_io("is_directory", _is_directory, context)
 
     async def search_files(
         self,
@@ -142,67 +271,13 @@ class LocalFileSystem(FileSystem):
         if not trimmed_query:
             raise ValueError("Search query must not be empty")
 
-        user_dir = self._get_user_directory(context)
-        matches: List[FileSearchMatch] = []
-        query_lower = trimmed_query.lower()
-
-        for path in user_dir.rglob("*"):
-            if len(matches) >= max_results:
-                break
-
-            if not path.is_file():
-                continue
-
-            relative_path = path.relative_to(user_dir).as_posix()
-            include_entry = False
-            snippet: Optional[str] = None
-
-            if query_lower in path.name.lower():
-                include_entry = True
-                snippet = "[filename match]"
-
-            content: Optional[str] = None
-            if include_content:
-                try:
-                    size = path.stat().st_size
-                except OSError:
-                    if include_entry:
-                        matches.append(
-                            FileSearchMatch(path=relative_path, snippet=snippet)
-                        )
-                    continue
-
-                if size <= MAX_SEARCH_FILE_BYTES:
-                    try:
-                        content = path.read_text(encoding="utf-8")
-                    except (UnicodeDecodeError, OSError):
-                        content = None
-                elif not include_entry:
-                    # Skip oversized files if they do not match by name
-                    continue
-
-            if include_content and content is not None:
-                if query_lower in content.lower():
-                    # Create snippet
-                    lowered = content.lower()
-                    index = lowered.find(query_lower)
-                    if index != -1:
-                        context_window = 60
-                        start = max(0, index - context_window)
-                        end = min(len(content), index + len(query) + context_window)
-                        snippet = content[start:end].replace("\n", " ").strip()
-                        if start > 0:
-                            snippet = f"…{snippet}"
-                        if end < len(content):
-                            snippet = f"{snippet}…"
-                    include_entry = True
-                elif not include_entry:
-                    continue
-
-            if include_entry:
-                matches.append(FileSearchMatch(path=relative_path, snippet=snippet))
-
-        return matches
+        return await self._run_io(
+            "search_files",
+            lambda: self._get_search_index(context).search(
+                trimmed_query, max_results, include_content
+            ),
+            context,
+        )
 
     async def run_bash(
         self,
@@ -216,7 +291,9 @@ class LocalFileSystem(FileSystem):
         if not command.strip():
             raise ValueError("Command must not be empty")
 
-        user_dir = self._get_user_directory(context)
+        user_dir = await self._run_io(
+            "user_directory", lambda: self._get_user_directory(context), context
+        )
 
         process = await asyncio.create_subprocess_shell(
             command,
@@ -233,6 +310,12 @@ class LocalFileSystem(FileSystem):
             process.kill()
             await process.wait()
             raise TimeoutError(f"Command timed out after {timeout} seconds") from exc
+        finally:
+            # The command may have changed any file in the user's directory
+            with _search_indexes_lock:
+                index = _search_indexes.get(self._search_index_path(user_dir))
+            if index is not None:
+                index.mark_stale()
 
         stdout = stdout_bytes.decode("utf-8", errors="replace")
         stderr = stderr_bytes.decode("utf-8", errors="replace")
@@ -5,16 +5,54 @@ This module provides a file-based implementation of the ConversationStore
 interface that persists conversations to disk as a directory structure.
 """
 
+import bisect
+import hashlib
 import json
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from datetime import datetime
 import time
 
+from vanna.core.observability import ObservabilityProvider
 from vanna.core.storage import ConversationStore, Conversation, Message
 from vanna.core.user import User
 
+from .io_utils import KeyedLock, atomic_write_text, file_lock, run_blocking_io
+
+T = TypeVar("T")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class _UserIndex:
+    """In-memory copy of one user's append-only index file."""
+
+    def __init__(self, inode: Optional[int]) -> None:
+        # Identifies the file read, which compaction replaces
+        self.inode = inode
+        # Bytes of the file read so far
+        self.offset = 0
+        # Lines read, including superseded ones
+        self.records = 0
+        # conversation_id -> updated_at key
+        self.keys: Dict[str, str] = {}
+        # Ascending (updated_at key, conversation_id) entries
+        self.order: List[Tuple[str, str]] = []
+
+    def apply(self, key: Optional[str], conversation_id: str) -> None:
+        """Apply one index line: move the conversation, or remove it."""
+        old_key = self.keys.pop(conversation_id, None)
+        if old_key is not None:
+            del self.order[bisect.bisect_left(self.order, (old_key, conversation_id))]
+        if key is not None:
+            self.keys[conversation_id] = key
+            bisect.insort(self.order, (key, conversation_id))
+        self.records += 1
+
 
 class FileSystemConversationStore(ConversationStore):
     """File system-based conversation store.
@@ -24,16 +62,67 @@ class FileSystemConversationStore(ConversationStore):
         metadata.json - conversation metadata (id, user info, timestamps)
         messages/
             {timestamp}_{index}.json - individual message files
+
+    A per-user index is kept in ``conversations/.index/{user_hash}.jsonl`` so
+    listing a user's recent conversations does not scan every conversation
+    directory. The index is append-only: each update adds one
+    ``[updated_at, conversation_id]`` line (``updated_at`` is null for a
+    deleted conversation), and only the lines appended since the last read
+    are parsed. Once most lines are superseded, the file is compacted. A
+    store created before indexing existed is indexed by a single scan of the
+    conversation directories on first use.
+
+    Disk operations run on a dedicated thread pool rather than the event loop,
+    files are replaced atomically, and operation durations are recorded as
+    ``conversation_store.io.duration`` when an observability provider is set.
+    Writes to one conversation are serialised, so concurrent updates never
+    write the same message index twice. Call ``close`` to stop the pool.
     """
 
-    def __init__(self, base_dir: str = "conversations") -> None:
+    INDEX_DIR_NAME = ".index"
+    # Marks a store whose conversations have all been indexed
+    INDEX_COMPLETE_MARKER = "complete.marker"
+    # Index files are compacted once they hold this many lines and more
+    # than twice as many lines as conversations
+    INDEX_COMPACT_MIN_RECORDS = 1000
+
+    def __init__(
+        self,
+        base_dir: str = "conversations",
+        observability_provider: Optional[ObservabilityProvider] = None,
+        max_io_workers: int = 4,
+    ) -> None:
         """Initialize the file system conversation store.
 
         Args:
             base_dir: Base directory for storing conversations
+            observability_provider: Optional provider to record I/O durations with
+            max_io_workers: Threads used to run blocking disk operations
         """
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.observability_provider = observability_provider
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=max_io_workers, thread_name_prefix="vanna-conversations"
+        )
+        self._index_cache: Dict[str, _UserIndex] = {}
+        self._indexed = False
+        self._index_lock = threading.Lock()
+        self._conversation_locks = KeyedLock()
+
+    def close(self) -> None:
+        """Wait for pending disk operations and shut down the I/O executor."""
+        self._io_executor.shutdown(wait=True)
+
+    async def _run_io(self, operation: str, fn: Callable[[], T]) -> T:
+        """Run a blocking disk operation on the I/O executor."""
+        return await run_blocking_io(
+            self._io_executor,
+            fn,
+            metric_name="conversation_store.io.duration",
+            operation=operation,
+            observability_provider=self.observability_provider,
+        )
 
     def _get_conversation_dir(self, conversation_id: str) -> Path:
         """Get the directory path for a conversation."""
@@ -47,6 +136,122 @@ class FileSystemConversationStore(ConversationStore):
         """Get the messages directory for a conversation."""
         return self._get_conversation_dir(conversation_id) / "messages"
 
+    def _get_index_path(self, user_id: str) -> Path:
+        """Get the index file path for a user's conversations."""
+        user_hash = hashlib.sha256(user_id.encode()).hexdigest()[:16]
+        return self.base_dir / self.INDEX_DIR_NAME / f"{user_hash}.jsonl"
+
+    @staticmethod
+    def _index_key(updated_at: datetime) -> str:
+        # Fixed-width ISO timestamps keep lexicographic order equal to time order
+        return updated_at.isoformat(timespec="microseconds")
+
+    def _ensure_indexed(self) -> None:
+        """Index every conversation once, for stores created before indexing.
+
+        Afterwards a user without an index file has no conversations, so no
+        lookup ever scans the conversation directories again.
+        """
+        index_dir = self.base_dir / self.INDEX_DIR_NAME
+        marker = index_dir / self.INDEX_COMPLETE_MARKER
+        if self._indexed or marker.exists():
+            self._indexed = True
+            return
+
+        entries: Dict[str, List[Tuple[str, str]]] = {}
+        for conv_dir in self.base_dir.iterdir():
+            metadata_path = conv_dir / "metadata.json"
+            if not conv_dir.is_dir() or not metadata_path.exists():
+                continue
+            try:
+                with open(metadata_path, "r") as f:
+                    metadata = json.load(f)
+                updated_at = datetime.fromisoformat(metadata["updated_at"])
+                entries.setdefault(metadata["user"]["id"], []).append(
+                    (self._index_key(updated_at), metadata["id"])
+                )
+            except (json.JSONDecodeError, ValueError, KeyError) as e:
+                print(f"Failed to index conversation from {conv_dir}: {e}")
+
+        index_dir.mkdir(parents=True, exist_ok=True)
+        for user_id, user_entries in entries.items():
+            index_path = self._get_index_path(user_id)
+            with file_lock(index_path.with_suffix(".lock")):
+                # Already written by a worker that finished indexing first,
+                # and possibly appended to since
+                if index_path.exists():
+                    continue
+                atomic_write_text(
+                    index_path,
+                    "".join(_dumps(entry) + "\n" for entry in sorted(user_entries)),
+                )
+        marker.touch()
+        self._indexed = True
+
+    def _load_index(self, user_id: str) -> "_UserIndex":
+        """Bring the cached copy of a user's index up to date with its file.
+
+        Only lines appended since the last call are read; the file is read
+        in full again only if it was replaced (i.e. compacted).
+        """
+        self._ensure_indexed()
+        index_path = self._get_index_path(user_id)
+        index = self._index_cache.get(user_id)
+        try:
+            stat = index_path.stat()
+        except FileNotFoundError:
+            if index is None or index.inode is not None:
+                index = self._index_cache[user_id] = _UserIndex(None)
+            return index
+
+        if index is None or index.inode != stat.st_ino or stat.st_size < index.offset:
+            index = self._index_cache[user_id] = _UserIndex(stat.st_ino)
+
+        if stat.st_size > index.offset:
+            with open(index_path, "rb") as f:
+                f.seek(index.offset)
+                data = f.read()
+            # A line still being written by another process is read next time
+            complete = data.rfind(b"\n") + 1
+            for line in data[:complete].splitlines():
+                try:
+                    key, conversation_id = json.loads(line)
+                    index.apply(key, conversation_id)
+                except (json.JSONDecodeError, ValueError, TypeError) as e:
+                    print(f"Skipping corrupt line in {index_path}: {e}")
+            index.offset += complete
+        return index
+
+    def _update_index(
+        self, user_id: str, conversation_id: str, updated_at: Optional[datetime]
+    ) -> None:
+        """Move a conversation within its user's index, or remove it if
+        ``updated_at`` is None."""
+        key = None if updated_at is None else self._index_key(updated_at)
+        with self._index_lock:
+            index = self._load_index(user_id)
+            if index.keys.get(conversation_id) == key:
+                return
+
+            index_path = self._get_index_path(user_id)
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            # Other workers append to and compact the same file; compacting
+            # must not drop a line appended after it was read
+            with file_lock(index_path.with_suffix(".lock")):
+                with open(index_path, "a", encoding="utf-8") as f:
+                    f.write(_dumps([key, conversation_id]) + "\n")
+                index = self._load_index(user_id)
+
+                if index.records > max(
+                    self.INDEX_COMPACT_MIN_RECORDS, 2 * len(index.order)
+                ):
+                    # Keep only the latest line of each live conversation
+                    atomic_write_text(
+                        index_path,
+                        "".join(_dumps(list(entry)) + "\n" for entry in index.order),
+                    )
+                    del self._index_cache[user_id]
+
     def _save_metadata(self, conversation: Conversation) -> None:
         """Save conversation metadata to disk."""
         conv_dir = self._get_conversation_dir(conversation.id)
@@ -59,9 +264,7 @@ class FileSystemConversationStore(ConversationStore):
             "updated_at": conversation.updated_at.isoformat(),
         }
 
-        metadata_path = self._get_metadata_path(conversation.id)
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        atomic_write_text(self._get_metadata_path(conversation.id), _dumps(metadata))
 
     def _load_messages(self, conversation_id: str) -> List[Message]:
         """Load all messages for a conversation."""
@@ -96,10 +299,16 @@ class FileSystemConversationStore(ConversationStore):
         # Use timestamp + index to ensure unique, ordered filenames
         timestamp = int(time.time() * 1000000)  # microseconds
         filename = f"{timestamp}_{index:06d}.json"
-        file_path = messages_dir / filename
+        atomic_write_text(
+            messages_dir / filename, _dumps(message.model_dump(mode="json"))
+        )
 
-        with open(file_path, "w") as f:
-            json.dump(message.model_dump(mode="json"), f, indent=2)
+    def _count_messages(self, conversation_id: str) -> int:
+        """Count stored messages without parsing them."""
+        messages_dir = self._get_messages_dir(conversation_id)
+        if not messages_dir.exists():
+            return 0
+        return sum(1 for _ in messages_dir.glob("*.json"))
 
     async def create_conversation(
         self, conversation_id: str, user: User, initial_message: str
@@ -111,18 +320,32 @@ class FileSystemConversationStore(ConversationStore):
             messages=[Message(role="user", content=initial_message)],
         )
 
-        # Save metadata
-        self._save_metadata(conversation)
+        def _create() -> None:
+            with self._conversation_locks.hold(conversation_id):
+                # Save metadata
+                self._save_metadata(conversation)
+
+                # Save initial message
+                self._append_message(conversation_id, conversation.messages[0], 0)
 
-        # Save initial message
-        self._append_message(conversation_id, conversation.messages[0], 0)
+                self._update_index(user.id, conversation_id, conversation.updated_at)
 
+        await self._run_io("create_conversation", _create)
         return conversation
 
     async def get_conversation(
         self, conversation_id: str, user: User
     ) -> Optional[Conversation]:
         """Get conversation by ID, scoped to user."""
+        return await self._run_io(
+            "get_conversation", lambda: self._load_conversation(conversation_id, user)
+        )
+
+    def _load_conversation(
+        self, conversation_id: str, user: User, include_messages: bool = True
+    ) -> Optional[Conversation]:
+        """Load a conversation and, unless ``include_messages`` is False, its
+        messages from disk, scoped to user."""
         metadata_path = self._get_metadata_path(conversation_id)
 
         if not metadata_path.exists():
@@ -138,7 +361,7 @@ class FileSystemConversationStore(ConversationStore):
                 return None
 
             # Load all messages
-            messages = self._load_messages(conversation_id)
+            messages = self._load_messages(conversation_id) if include_messages else []
 
             # Reconstruct conversation
             conversation = Conversation(
@@ -156,31 +379,51 @@ class FileSystemConversationStore(ConversationStore):
 
     async def update_conversation(self, conversation: Conversation) -> None:
         """Update conversation with new messages."""
-        # Update the updated_at timestamp
-        conversation.updated_at = datetime.now()
 
-        # Save updated metadata
-        self._save_metadata(conversation)
+        def _update() -> None:
+            # Counting and appending must not interleave with another update
+            with self._conversation_locks.hold(conversation.id):
+                # Update the updated_at timestamp
+                conversation.updated_at = datetime.now()
 
-        # Get existing messages count to determine new message indices
-        existing_messages = self._load_messages(conversation.id)
-        existing_count = len(existing_messages)
+                # Save updated metadata
+                self._save_metadata(conversation)
 
-        # Only append new messages (ones not already saved)
-        for i, message in enumerate(
-            conversation.messages[existing_count:], start=existing_count
-        ):
-            self._append_message(conversation.id, message, i)
+                # Get existing messages count to determine new message indices
+                existing_count = self._count_messages(conversation.id)
+
+                # Only append new messages (ones not already saved)
+                for i, message in enumerate(
+                    conversation.messages[existing_count:], start=existing_count
+                ):
+                    self._append_message(conversation.id, message, i)
+
+                self._update_index(
+                    conversation.user.id, conversation.id, conversation.updated_at
+                )
+
+        await self._run_io("update_conversation", _update)
 
     async def delete_conversation(self, conversation_id: str, user: User) -> bool:
         """Delete conversation."""
+        return await self._run_io(
+            "delete_conversation",
+            lambda: self._delete_conversation_sync(conversation_id, user),
+        )
+
+    def _delete_conversation_sync(self, conversation_id: str, user: User) -> bool:
+        """Delete a conversation's files; runs on the I/O executor."""
+        with self._conversation_locks.hold(conversation_id):
+            return self._delete_conversation_locked(conversation_id, user)
+
+    def _delete_conversation_locked(self, conversation_id: str, user: User) -> bool:
         conv_dir = self._get_conversation_dir(conversation_id)
 
         if not conv_dir.exists():
             return False
 
         # Verify ownership before deleting
-        conversation = await self.get_conversation(conversation_id, user)
+        conversation = self._load_conversation(conversation_id, user)
         if not conversation:
             return False
 
@@ -200,6 +443,8 @@ class FileSystemConversationStore(ConversationStore):
             # Delete conversation directory
             conv_dir.rmdir()
 
+            self._update_index(user.id, conversation_id, None)
+
             return True
         except OSError as e:
             print(f"Failed to delete conversation {conversation_id}: {e}")
@@ -208,48 +453,36 @@ class FileSystemConversationStore(ConversationStore):
     async def list_conversations(
         self, user: User, limit: int = 50, offset: int = 0
     ) -> List[Conversation]:
-        """List conversations for user."""
-        if not self.base_dir.exists():
-            return []
-
-        conversations = []
-
-        # Iterate through all conversation directories
-        for conv_dir in self.base_dir.iterdir():
-            if not conv_dir.is_dir():
-                continue
+        """List conversations for user, most recently updated first.
 
-            metadata_path = conv_dir / "metadata.json"
-            if not metadata_path.exists():
-                continue
-
-            try:
-                # Load metadata
-                with open(metadata_path, "r") as f:
-                    metadata = json.load(f)
+        Only the metadata of the conversations on the requested page is read
+        from disk; the listed conversations have no messages. Use
+        ``get_conversation`` to load a conversation's messages.
+        """
+        return await self._run_io(
+            "list_conversations",
+            lambda: self._list_conversations_sync(user, limit, offset),
+        )
 
-                # Skip conversations not owned by this user
-                if metadata["user"]["id"] != user.id:
-                    continue
+    def _list_conversations_sync(
+        self, user: User, limit: int, offset: int
+    ) -> List[Conversation]:
+        """Read one page of a user's conversations; runs on the I/O executor."""
+        if not self.base_dir.exists():
+            return []
 
-                # Load messages
-                messages = self._load_messages(conv_dir.name)
+        with self._index_lock:
+            entries = self._load_index(user.id).order[:]
+        # Walk the ascending index from the end to read updated_at desc
+        end = max(len(entries) - offset, 0)
+        start = max(end - limit, 0)
 
-                # Reconstruct conversation
-                conversation = Conversation(
-                    id=metadata["id"],
-                    user=User.model_validate(metadata["user"]),
-                    messages=messages,
-                    created_at=datetime.fromisoformat(metadata["created_at"]),
-                    updated_at=datetime.fromisoformat(metadata["updated_at"]),
-                )
+        conversations = []
+        for _, conversation_id in reversed(entries[start:end]):
+            conversation = self._load_conversation(
+                conversation_id, user, include_messages=False
+            )
+            if conversation is not None:
                 conversations.append(conversation)
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
-                print(f"Failed to load conversation from {conv_dir}: {e}")
-                continue
-
-        # Sort by updated_at desc
-        conversations.sort(key=lambda x: x.updated_at, reverse=True)
 
-        # Apply pagination
-        return conversations[offset : offset + limit]
+        return conversations
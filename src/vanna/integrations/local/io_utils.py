@@ -0,0 +1,147 @@
+"""
+Blocking I/O helpers for local integrations.
+
+Local file-backed implementations run their disk operations on a dedicated
+thread pool so slow or networked disks do not stall the event loop.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from vanna.core.observability import ObservabilityProvider
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+T = TypeVar("T")
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write text to ``path`` atomically.
+
+    The content is written to a temporary file in the same directory and
+    renamed over the target, so readers never observe a partially written
+    file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+async def run_blocking_io(
+    executor: Executor,
+    fn: Callable[[], T],
+    *,
+    metric_name: str,
+    operation: str,
+    observability_provider: Optional[ObservabilityProvider] = None,
+    tags: Optional[Dict[str, str]] = None,
+) -> T:
+    """Run a blocking disk operation on ``executor`` and record its duration.
+
+    Args:
+        executor: Executor dedicated to disk I/O
+        fn: Blocking callable to run
+        metric_name: Name of the duration metric (recorded in ms)
+        operation: Operation name added to the metric tags
+        observability_provider: Optional provider to record the metric with
+        tags: Additional metric tags
+
+    Returns:
+        The callable's result
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    success = False
+    try:
+        result = await loop.run_in_executor(executor, fn)
+        success = True
+        return result
+    finally:
+        if observability_provider:
+            await observability_provider.record_metric(
+                metric_name,
+                (time.perf_counter() - start) * 1000,
+                "ms",
+                tags={"operation": operation, "success": str(success), **(tags or {})},
+            )
+
+
+class KeyedLock:
+    """Thread locks per key, such as a conversation ID.
+
+    Operations holding the same key run one at a time, while operations on
+    different keys run concurrently. A key's lock is dropped once no thread
+    holds or waits for it, so the map only grows with the keys in use.
+    """
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        # key -> (lock, number of threads holding or waiting for it)
+        self._locks: Dict[str, Tuple[threading.Lock, int]] = {}
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        """Hold the lock for ``key`` for the duration of the block."""
+        with self._guard:
+            lock, users = self._locks.get(key, (threading.Lock(), 0))
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                lock, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive OS lock on ``path`` for the duration of the block.
+
+    The lock is advisory and excludes other processes (and other open handles
+    in this process) locking the same file, e.g. workers sharing a volume.
+    The lock file is created if missing and never removed.
+    """
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about ten seconds
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,182 @@
+"""
+Local LLM response caches.
+
+This module provides response caches for ``ResponseCacheMiddleware``: an
+LRU cache in memory and one persisting each response as a JSON file, so
+cached answers survive a restart of the server.
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+from vanna.core.llm import LlmResponse
+from vanna.core.middleware import LlmResponseCache
+
+from .io_utils import atomic_write_text, run_blocking_io
+
+
+class MemoryLlmResponseCache(LlmResponseCache):
+    """LRU cache of LLM responses in memory."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Responses kept before the least recently used one
+                is evicted
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[LlmResponse, Optional[float]]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[LlmResponse]:
+        """Get an unexpired response, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        response, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def set(
+        self, key: str, response: LlmResponse, expires_at: Optional[float]
+    ) -> None:
+        """Store a response, evicting the least recently used if full."""
+        self._entries[key] = (response, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+
+class FileLlmResponseCache(LlmResponseCache):
+    """LLM response cache writing each response to a JSON file.
+
+    Files are named after the cache key and touched when read, so their
+    modification times order them by last use; once the directory holds
+    more than ``max_entries`` files, the least recently used are deleted.
+    Disk operations run on a single background thread.
+    """
+
+    def __init__(self, directory: str = "llm_cache", max_entries: int = 10_000) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Directory the response files are written to
+            max_entries: Responses kept before the least recently used are
+                evicted
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._count = len(list(self.directory.glob("*.json")))
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vanna-llm-cache"
+        )
+
+    def _path(self, key: str) -> Optional[Path]:
+        # Keys are hex digests; anything else can not name a cache file
+        if not key.isalnum():
+            return None
+        return self.directory / f"{key}.json"
+
+    def _get(self, key: str) -> Optional[LlmResponse]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            record = json.loads(path.read_text("utf-8"))
+            expires_at = record.get("expires_at")
+            if expires_at is not None and expires_at <= time.time():
+                path.unlink(missing_ok=True)
+                self._count -= 1
+                return None
+            response = LlmResponse.model_validate(record["response"])
+            os.utime(path)
+            return response
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _set(
+        self, key: str, response: LlmResponse, expires_at: Optional[float]
+    ) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        if not path.exists():
+            self._count += 1
+        record = {
+            "expires_at": expires_at,
+            "response": response.model_dump(mode="json"),
+        }
+        atomic_write_text(path, json.dumps(record))
+        if self._count > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        # Evict a tenth at once, so full caches do not list the directory
+        # on every write
+        target = self.max_entries - self.max_entries // 10
+        for _, path in files[: max(0, len(files) - target)]:
+            path.unlink(missing_ok=True)
+        self._count = min(len(files), target)
+
+    def _clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        self._count = 0
+
+    async def get(self, key: str) -> Optional[LlmResponse]:
+        """Get an unexpired response, or None."""
+        return await run_blocking_io(
+            self._executor,
+            lambda: self._get(key),
+            metric_name="llm_cache.io.duration",
+            operation="get",
+        )
+
+    async def set(
+        self, key: str, response: LlmResponse, expires_at: Optional[float]
+    ) -> None:
+        """Write a response, evicting the least recently used if full."""
+        await run_blocking_io(
+            self._executor,
+            lambda: self._set(key, response, expires_at),
+            metric_name="llm_cache.io.duration",
+            operation="set",
+        )
+
+    async def clear(self) -> None:
+        """Delete all cached responses."""
+        await run_blocking_io(
+            self._executor,
+            self._clear,
+            metric_name="llm_cache.io.duration",
+            operation="clear",
+        )
@@ -0,0 +1,296 @@
+"""
+In-process metrics provider.
+
+This module provides an observability provider that aggregates metrics in
+memory - counters and fixed-bucket histograms - and renders them in the
+Prometheus text exposition format for a ``/metrics`` endpoint.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from typing import AbstractSet, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from vanna.core.observability import ObservabilityProvider, get_current_span
+
+# Upper bounds in milliseconds, from sub-millisecond hook calls to slow LLM requests
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    30_000,
+    60_000,
+    120_000,
+)
+
+# Per-user and per-conversation tags would create a series for every user or
+# conversation, growing memory and /metrics output without bound
+DEFAULT_DROP_LABELS: AbstractSet[str] = frozenset({"user_id", "conversation_id"})
+
+_SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+_UNIT_SUFFIXES = {"ms": "milliseconds", "s": "seconds"}
+
+
+def _metric_name(prefix: str, name: str, suffix: str) -> str:
+    return _INVALID_NAME_CHARS.sub("_", f"{prefix}{name}_{suffix}")
+
+
+def _labels(tags: Iterable[Tuple[str, str]], extra: str = "") -> str:
+    parts = [
+        '{}="{}"'.format(
+            _INVALID_NAME_CHARS.sub("_", key),
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in tags
+    ]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Fixed-bucket histogram with approximate quantiles."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        # One extra slot for observations above the last bound (+Inf)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by interpolating within its bucket.
+
+        Observations above the last bound are reported as the last bound.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.bounds[-1]
+
+
+class InMemoryMetricsProvider(ObservabilityProvider):
+    """Observability provider that aggregates metrics in process.
+
+    Metrics recorded with a time unit (``ms`` or ``s``) feed fixed-bucket
+    histograms, from which p50/p95/p99 are estimated; all other metrics are
+    summed into counters. Updates happen on the event loop thread and are
+    plain dictionary operations, so no locks are taken on the request path.
+
+    With ``sample_rate`` below 1.0, whole traces are sampled by their trace
+    ID: metrics recorded while a span of an excluded trace is active return
+    immediately. Metrics recorded outside any span are always kept.
+
+    Tags named in ``drop_labels`` are removed before a measurement is
+    recorded, so unbounded identifiers such as ``user_id`` do not create a
+    series per value.
+
+    Example:
+        metrics = InMemoryMetricsProvider()
+        agent = Agent(
+            llm_service=...,
+            observability_provider=metrics
+        )
+        VannaFastAPIServer(agent).create_app()  # serves /metrics
+    """
+
+    def __init__(
+        self,
+        *,
+        buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS,
+        sample_rate: float = 1.0,
+        prefix: str = "vanna_",
+        drop_labels: Iterable[str] = DEFAULT_DROP_LABELS,
+    ):
+        """Initialize the metrics provider.
+
+        Args:
+            buckets_ms: Histogram bucket upper bounds in milliseconds
+            sample_rate: Fraction of traces whose metrics are recorded
+            prefix: Prefix added to metric names in the Prometheus output
+            drop_labels: Tag names left out of the recorded series
+
+        Raises:
+            ValueError: If sample_rate is not between 0 and 1
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self.sample_rate = sample_rate
+        self.prefix = prefix
+        self.drop_labels = frozenset(drop_labels)
+        self._sample_threshold = int(sample_rate * 0xFFFFFFFF)
+        self._counters: Dict[_SeriesKey, float] = {}
+        self._histograms: Dict[_SeriesKey, Histogram] = {}
+        self._units: Dict[str, str] = {}
+
+    def _is_sampled(self) -> bool:
+        span = get_current_span()
+        if span is None:
+            return True
+        try:
+            return int(span.trace_id[:8], 16) <= self._sample_threshold
+        except ValueError:
+            return True
+
+    async def record_metric(
+        self,
+        name: str,
+        value: float,
+        unit: str = "",
+        tags: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Add a measurement to the metric's histogram or counter."""
+        if self.sample_rate < 1.0 and not self._is_sampled():
+            return
+
+        series_tags = tuple(
+            sorted(
+                (label, tag_value)
+                for label, tag_value in (tags or {}).items()
+                if label not in self.drop_labels
+            )
+        )
+        key: _SeriesKey = (name, series_tags)
+        if unit in _UNIT_SUFFIXES:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                buckets = (
+                    self.buckets_ms
+                    if unit == "ms"
+                    else tuple(b / 1000 for b in self.buckets_ms)
+                )
+                histogram = self._histograms[key] = Histogram(buckets)
+                self._units[name] = unit
+            histogram.observe(value)
+        else:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def get_counter(self, name: str, tags: Optional[Dict[str, str]] = None) -> float:
+        """Get a counter's total, summed over all series matching ``tags``."""
+        return sum(
+            value
+            for (series_name, series_tags), value in list(self._counters.items())
+            if series_name == name and self._matches(series_tags, tags)
+        )
+
+    def get_histogram(
+        self, name: str, tags: Optional[Dict[str, str]] = None
+    ) -> Optional[Histogram]:
+        """Get a histogram merged over all series matching ``tags``."""
+        merged: Optional[Histogram] = None
+        for (series_name, series_tags), histogram in list(self._histograms.items()):
+            if series_name == name and self._matches(series_tags, tags):
+                if merged is None:
+                    merged = Histogram(histogram.bounds)
+                merged.merge(histogram)
+        return merged
+
+    def histogram_names(self) -> List[str]:
+        """Get the names of all recorded histogram metrics."""
+        return sorted({name for name, _ in list(self._histograms)})
+
+    def summary(
+        self, name: str, tags: Optional[Dict[str, str]] = None
+    ) -> Dict[str, float]:
+        """Get count, sum and p50/p95/p99 for a histogram metric."""
+        histogram = self.get_histogram(name, tags)
+        if histogram is None:
+            return {"count": 0, "sum": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+        return {
+            "count": histogram.count,
+            "sum": histogram.sum,
+            "p50": histogram.quantile(0.50),
+            "p95": histogram.quantile(0.95),
+            "p99": histogram.quantile(0.99),
+        }
+
+    @staticmethod
+    def _matches(
+        series_tags: Tuple[Tuple[str, str], ...], tags: Optional[Dict[str, str]]
+    ) -> bool:
+        if not tags:
+            return True
+        series = dict(series_tags)
+        return all(series.get(key) == value for key, value in tags.items())
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        counters: Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], float]]] = {}
+        for (name, tags), value in list(self._counters.items()):
+            counters.setdefault(name, []).append((tags, value))
+        for name in sorted(counters):
+            metric = _metric_name(self.prefix, name, "total")
+            lines.append(f"# TYPE {metric} counter")
+            for tags, value in sorted(counters[name]):
+                lines.append(f"{metric}{_labels(tags)} {_format_value(value)}")
+
+        histograms: Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], Histogram]]] = {}
+        for (name, tags), histogram in list(self._histograms.items()):
+            histograms.setdefault(name, []).append((tags, histogram))
+        for name in sorted(histograms):
+            metric = _metric_name(
+                self.prefix, name, _UNIT_SUFFIXES[self._units.get(name, "ms")]
+            )
+            lines.append(f"# TYPE {metric} histogram")
+            for tags, histogram in sorted(histograms[name], key=lambda item: item[0]):
+                cumulative = 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{metric}_bucket{_labels(tags, le)} {cumulative}")
+                inf = 'le="+Inf"'
+                lines.append(f"{metric}_bucket{_labels(tags, inf)} {histogram.count}")
+                lines.append(
+                    f"{metric}_sum{_labels(tags)} {_format_value(histogram.sum)}"
+                )
+                lines.append(f"{metric}_count{_labels(tags)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,233 @@
+"""
+OTLP/JSON span exporter.
+
+This module provides an observability provider that batches finished spans
+and exports them in the OpenTelemetry protocol's JSON encoding, either to an
+OTLP/HTTP collector (e.g. ``http://localhost:4318/v1/traces``) or to a file
+with one export request per line.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from vanna.core.observability import ObservabilityProvider, Span
+
+logger = logging.getLogger(__name__)
+
+SPAN_KIND_INTERNAL = 1
+STATUS_CODE_ERROR = 2
+
+
+def _hex_id(value: str, length: int) -> str:
+    """Convert a span or trace ID to the fixed-length hex form OTLP expects."""
+    try:
+        hex_value = uuid.UUID(value).hex
+    except ValueError:
+        hex_value = value.lower()
+        if len(hex_value) < length or any(
+            c not in "0123456789abcdef" for c in hex_value
+        ):
+            hex_value = hashlib.sha256(value.encode()).hexdigest()
+    return hex_value[:length]
+
+
+def _any_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _any_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def span_to_otlp(span: Span) -> Dict[str, Any]:
+    """Convert a finished span to an OTLP/JSON span object."""
+    end_time = span.end_time if span.end_time is not None else time.time()
+    otlp_span: Dict[str, Any] = {
+        "traceId": _hex_id(span.trace_id, 32),
+        "spanId": _hex_id(span.id, 16),
+        "name": span.name,
+        "kind": SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(int(span.start_time * 1e9)),
+        "endTimeUnixNano": str(int(end_time * 1e9)),
+        "attributes": _attributes(span.attributes),
+        "status": {},
+    }
+    if span.parent_id:
+        otlp_span["parentSpanId"] = _hex_id(span.parent_id, 16)
+    error = span.attributes.get("error")
+    if error:
+        otlp_span["status"] = {"code": STATUS_CODE_ERROR, "message": str(error)}
+    return otlp_span
+
+
+class OtlpJsonObservabilityProvider(ObservabilityProvider):
+    """Observability provider that exports spans as OTLP/JSON in batches.
+
+    Finished spans are converted and queued by ``end_span``; a background
+    thread exports them once ``max_batch_size`` spans are waiting or every
+    ``flush_interval`` seconds, so the request path never waits on the
+    collector or the disk. When the queue is full new spans are dropped and
+    counted in ``dropped_spans``.
+
+    Example:
+        provider = OtlpJsonObservabilityProvider(
+            endpoint="http://localhost:4318/v1/traces"
+        )
+        agent = Agent(
+            llm_service=...,
+            observability_provider=provider
+        )
+    """
+
+    def __init__(
+        self,
+        *,
+        endpoint: Optional[str] = None,
+        file_path: Optional[str] = None,
+        service_name: str = "vanna",
+        headers: Optional[Dict[str, str]] = None,
+        max_batch_size: int = 512,
+        max_queue_size: int = 2048,
+        flush_interval: float = 5.0,
+        timeout: float = 10.0,
+    ):
+        """Initialize the exporter.
+
+        Args:
+            endpoint: OTLP/HTTP traces endpoint to POST batches to
+            file_path: File to append batches to, one JSON request per line
+            service_name: Value of the ``service.name`` resource attribute
+            headers: Extra HTTP headers, e.g. for collector authentication
+            max_batch_size: Maximum number of spans per export request
+            max_queue_size: Maximum number of spans waiting to be exported
+            flush_interval: Seconds between exports of partial batches
+            timeout: HTTP request timeout in seconds
+
+        Raises:
+            ValueError: If neither or both of endpoint and file_path are given
+        """
+        if (endpoint is None) == (file_path is None):
+            raise ValueError("Provide exactly one of endpoint or file_path")
+
+        self.endpoint = endpoint
+        self.file_path = Path(file_path) if file_path else None
+        self.service_name = service_name
+        self.headers = headers or {}
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.dropped_spans = 0
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(max_queue_size)
+        self._export_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="vanna-otlp-exporter", daemon=True
+        )
+        self._worker.start()
+        atexit.register(self.shutdown)
+
+    async def end_span(self, span: Span) -> None:
+        """End a span and queue it for export."""
+        await super().end_span(span)
+        try:
+            self._queue.put_nowait(span_to_otlp(span))
+        except queue.Full:
+            self.dropped_spans += 1
+
+    def _drain(self, first: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        batch = [first] if first is not None else []
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if self._queue.qsize() + 1 < self.max_batch_size:
+                # Give a partial batch time to fill before exporting it
+                self._stopped.wait(self.flush_interval)
+            self._export(self._drain(first))
+
+    def _export(self, spans: List[Dict[str, Any]]) -> None:
+        if not spans:
+            return
+
+        payload = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": _attributes(
+                                {"service.name": self.service_name}
+                            )
+                        },
+                        "scopeSpans": [{"scope": {"name": "vanna"}, "spans": spans}],
+                    }
+                ]
+            },
+            separators=(",", ":"),
+        )
+
+        with self._export_lock:
+            try:
+                if self.file_path is not None:
+                    self.file_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.file_path, "a", encoding="utf-8") as f:
+                        f.write(payload + "\n")
+                else:
+                    assert self.endpoint is not None
+                    request = urllib.request.Request(
+                        self.endpoint,
+                        data=payload.encode("utf-8"),
+                        headers={"Content-Type": "application/json", **self.headers},
+                        method="POST",
+                    )
+                    with urllib.request.urlopen(request, timeout=self.timeout):
+                        pass
+            except Exception as e:
+                self.dropped_spans += len(spans)
+                logger.error(f"Failed to export {len(spans)} spans: {e}")
+
+    def flush(self) -> None:
+        """Export all queued spans now, blocking until they are written."""
+        while True:
+            batch = self._drain()
+            if not batch:
+                return
+            self._export(batch)
+
+    def shutdown(self) -> None:
+        """Stop the background exporter and flush any remaining spans."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._worker.join(timeout=self.timeout)
+        self.flush()
@@ -0,0 +1,149 @@
+"""
+Local profile stores.
+
+This module provides ring-buffer stores for request profiles: one in memory
+and one persisting each profile as a JSON file, so captures survive a
+restart of the server.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+from vanna.core.profiling import ProfileStore, RequestProfile
+
+from .io_utils import atomic_write_text, run_blocking_io
+
+
+class MemoryProfileStore(ProfileStore):
+    """Profile store keeping the most recent profiles in memory."""
+
+    def __init__(self, max_profiles: int = 100) -> None:
+        """Initialize the store.
+
+        Args:
+            max_profiles: Profiles kept before the oldest is evicted
+        """
+        if max_profiles < 1:
+            raise ValueError("max_profiles must be at least 1")
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+
+    async def add(self, profile: RequestProfile) -> None:
+        """Store a profile, evicting the oldest one if the store is full."""
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    async def list_profiles(self, limit: int = 20) -> List[RequestProfile]:
+        """Get the most recent profiles, newest first."""
+        return list(reversed(self._profiles.values()))[:limit]
+
+    async def get_profile(self, profile_id: str) -> Optional[RequestProfile]:
+        """Get a profile by ID."""
+        return self._profiles.get(profile_id)
+
+    async def clear(self) -> None:
+        """Remove all profiles."""
+        self._profiles.clear()
+
+
+class FileProfileStore(ProfileStore):
+    """Profile store writing each profile to a JSON file.
+
+    Files are named ``{start time in ms}_{profile id}.json``, so sorting the
+    names orders profiles by age; the oldest files are deleted once the
+    directory holds more than ``max_profiles`` of them. Disk operations run
+    on a single background thread, which also serializes evictions.
+    """
+
+    def __init__(self, directory: str = "profiles", max_profiles: int = 100) -> None:
+        """Initialize the store.
+
+        Args:
+            directory: Directory the profile files are written to
+            max_profiles: Profiles kept before the oldest is evicted
+        """
+        if max_profiles < 1:
+            raise ValueError("max_profiles must be at least 1")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_profiles = max_profiles
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="vanna-profiles"
+        )
+
+    def _files(self) -> List[Path]:
+        return sorted(self.directory.glob("*_*.json"))
+
+    def _add(self, profile: RequestProfile) -> None:
+        name = f"{int(profile.started_at * 1000):015d}_{profile.id}.json"
+        atomic_write_text(self.directory / name, profile.model_dump_json())
+        files = self._files()
+        for path in files[: max(0, len(files) - self.max_profiles)]:
+            path.unlink(missing_ok=True)
+
+    def _list(self, limit: int) -> List[RequestProfile]:
+        profiles: List[RequestProfile] = []
+        for path in reversed(self._files()):
+            if len(profiles) >= limit:
+                break
+            try:
+                profiles.append(
+                    RequestProfile.model_validate_json(path.read_text("utf-8"))
+                )
+            except (OSError, ValueError):
+                # Evicted while listing, or not a profile
+                continue
+        return profiles
+
+    def _get(self, profile_id: str) -> Optional[RequestProfile]:
+        for path in self.directory.glob(f"*_{profile_id}.json"):
+            try:
+                return RequestProfile.model_validate_json(path.read_text("utf-8"))
+            except (OSError, ValueError):
+                return None
+        return None
+
+    def _clear(self) -> None:
+        for path in self._files():
+            path.unlink(missing_ok=True)
+
+    async def add(self, profile: RequestProfile) -> None:
+        """Write a profile, deleting the oldest ones beyond ``max_profiles``."""
+        await run_blocking_io(
+            self._executor,
+            lambda: self._add(profile),
+            metric_name="profile_store.io.duration",
+            operation="add",
+        )
+
+    async def list_profiles(self, limit: int = 20) -> List[RequestProfile]:
+        """Get the most recent profiles, newest first."""
+        return await run_blocking_io(
+            self._executor,
+            lambda: self._list(limit),
+            metric_name="profile_store.io.duration",
+            operation="list",
+        )
+
+    async def get_profile(self, profile_id: str) -> Optional[RequestProfile]:
+        """Get a profile by ID."""
+        if not profile_id.isalnum():
+            return None
+        return await run_blocking_io(
+            self._executor,
+            lambda: self._get(profile_id),
+            metric_name="profile_store.io.duration",
+            operation="get",
+        )
+
+    async def clear(self) -> None:
+        """Delete all profile files."""
+        await run_blocking_io(
+            self._executor,
+            self._clear,
+            metric_name="profile_store.io.duration",
+            operation="clear",
+        )
@@ -0,0 +1,50 @@
+"""
+In-memory quota backend.
+
+This module provides a quota backend that keeps token buckets in the
+process. Limits are enforced per worker; use a shared backend to enforce
+them across workers.
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+from vanna.core.quota import BucketResult, QuotaBackend, RateLimit, take_tokens
+
+
+class MemoryQuotaBackend(QuotaBackend):
+    """Quota backend storing token buckets in a dictionary.
+
+    Bucket updates do not await, so they are atomic on the event loop and
+    need no locks.
+    """
+
+    def __init__(self) -> None:
+        # key -> (tokens, monotonic time of last update)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _update(
+        self, key: str, limit: RateLimit, amount: float, force: bool
+    ) -> BucketResult:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+        tokens, result = take_tokens(tokens, now - updated_at, limit, amount, force)
+        self._buckets[key] = (tokens, now)
+        return result
+
+    async def take(
+        self, key: str, limit: RateLimit, amount: float = 1.0
+    ) -> BucketResult:
+        """Take tokens if the bucket holds enough of them."""
+        return self._update(key, limit, amount, force=False)
+
+    async def charge(self, key: str, limit: RateLimit, amount: float) -> BucketResult:
+        """Take tokens unconditionally, possibly leaving the bucket in debt."""
+        return self._update(key, limit, amount, force=True)
+
+    async def reset(self, key: Optional[str] = None) -> None:
+        """Refill one bucket, or all buckets if no key is given."""
+        if key is None:
+            self._buckets.clear()
+        else:
+            self._buckets.pop(key, None)
@@ -5,7 +5,9 @@ This module provides a simple in-memory implementation of the ConversationStore
 interface, useful for testing and development.
 """
 
-from typing import Dict, List, Optional
+import bisect
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 from vanna.core.storage import ConversationStore, Conversation, Message
 from vanna.core.user import User
@@ -16,6 +18,30 @@ class MemoryConversationStore(ConversationStore):
 
     def __init__(self) -> None:
         self._conversations: Dict[str, Conversation] = {}
+        # Per-user (updated_at, conversation_id) keys in ascending order, so
+        # listing the most recent conversations only touches the tail
+        self._user_index: Dict[str, List[Tuple[datetime, str]]] = {}
+        self._index_keys: Dict[str, Tuple[str, Tuple[datetime, str]]] = {}
+
+    def _reindex(self, conversation: Conversation) -> None:
+        """Move a conversation to its current position in its user's index."""
+        self._unindex(conversation.id)
+        key = (conversation.updated_at, conversation.id)
+        bisect.insort(self._user_index.setdefault(conversation.user.id, []), key)
+        self._index_keys[conversation.id] = (conversation.user.id, key)
+
+    def _unindex(self, conversation_id: str) -> None:
+        """Remove a conversation from its user's index."""
+        entry = self._index_keys.pop(conversation_id, None)
+        if entry is None:
+            return
+        user_id, key = entry
+        keys = self._user_index[user_id]
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+        if not keys:
+            del self._user_index[user_id]
 
     async def create_conversation(
         self, conversation_id: str, user: User, initial_message: str
@@ -27,6 +53,7 @@ class MemoryConversationStore(ConversationStore):
             messages=[Message(role="user", content=initial_message)],
         )
         self._conversations[conversation_id] = conversation
+        self._reindex(conversation)
         return conversation
 
     async def get_conversation(
@@ -41,22 +68,26 @@ class MemoryConversationStore(ConversationStore):
     async def update_conversation(self, conversation: Conversation) -> None:
         """Update conversation with new messages."""
         self._conversations[conversation.id] = conversation
+        self._reindex(conversation)
 
     async def delete_conversation(self, conversation_id: str, user: User) -> bool:
         """Delete conversation."""
         conversation = await self.get_conversation(conversation_id, user)
         if conversation:
             del self._conversations[conversation_id]
+            self._unindex(conversation_id)
             return True
         return False
 
     async def list_conversations(
         self, user: User, limit: int = 50, offset: int = 0
     ) -> List[Conversation]:
-        """List conversations for user."""
-        user_conversations = [
-            conv for conv in self._conversations.values() if conv.user.id == user.id
+        """List conversations for user, most recently updated first."""
+        keys = self._user_index.get(user.id, [])
+        # Walk the ascending index from the end to read updated_at desc
+        end = max(len(keys) - offset, 0)
+        start = max(end - limit, 0)
+        return [
+            self._conversations[conversation_id]
+            for _, conversation_id in reversed(keys[start:end])
         ]
-        # Sort by updated_at desc
-        user_conversations.sort(key=lambda x: x.updated_at, reverse=True)
-        return user_conversations[offset : offset + limit]
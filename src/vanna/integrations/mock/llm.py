@@ -6,31 +6,84 @@ useful for testing and development without requiring actual LLM API calls.
 """
 
 import asyncio
-from typing import AsyncGenerator, List
+from typing import AsyncGenerator, List, Optional, Sequence
 
 from vanna.core.llm import LlmService, LlmRequest, LlmResponse, LlmStreamChunk
-from vanna.core.tool import ToolSchema
+from vanna.core.tool import ToolCall, ToolSchema
 
+_MOCK_USAGE = {"prompt_tokens": 50, "completion_tokens": 20, "total_tokens": 70}
 
-class MockLlmService(LlmService):
-    """Mock LLM service that returns predefined responses."""
 
-    def __init__(self, response_content: str = "Hello! This is a mock response."):
+class MockLlmService(LlmService):
+    """Mock LLM service that returns predefined responses.
+
+    With a ``tool_call_script``, each user message is answered by calling
+    the scripted tools in order - one entry per LLM request - before the
+    final text response. The step is derived from the request's messages,
+    so concurrent conversations each follow the script independently.
+
+    Example:
+        MockLlmService(
+            tool_call_script=[
+                [ToolCall(id="1", name="run_sql", arguments={"sql": "SELECT 1"})],
+            ],
+            latency=0.0,
+        )
+    """
+
+    def __init__(
+        self,
+        response_content: str = "Hello! This is a mock response.",
+        *,
+        tool_call_script: Optional[Sequence[Sequence[ToolCall]]] = None,
+        latency: float = 0.1,
+        chunk_latency: float = 0.05,
+    ):
+        """Initialize the mock LLM service.
+
+        Args:
+            response_content: Content of the final text response
+            tool_call_script: Tool calls to make for each user message, one
+                list of calls per LLM request
+            latency: Simulated seconds per non-streaming request
+            chunk_latency: Simulated seconds per streamed chunk
+        """
         self.response_content = response_content
+        self.tool_call_script = [list(calls) for calls in tool_call_script or []]
+        self.latency = latency
+        self.chunk_latency = chunk_latency
         self.call_count = 0
 
+    def _scripted_tool_calls(self, request: LlmRequest) -> Optional[List[ToolCall]]:
+        """Get the scripted tool calls for this step of the current turn."""
+        step = 0
+        for message in reversed(request.messages):
+            if message.role == "user":
+                break
+            if message.role == "assistant":
+                step += 1
+        if step < len(self.tool_call_script):
+            return self.tool_call_script[step]
+        return None
+
     async def send_request(self, request: LlmRequest) -> LlmResponse:
         """Send a request to the mock LLM."""
         self.call_count += 1
 
         # Simulate processing delay
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(self.latency)
+
+        tool_calls = self._scripted_tool_calls(request)
+        if tool_calls:
+            return LlmResponse(
+                tool_calls=tool_calls, finish_reason="tool_calls", usage=_MOCK_USAGE
+            )
 
         # Return a simple response
         return LlmResponse(
             content=f"{self.response_content} (Request #{self.call_count})",
             finish_reason="stop",
-            usage={"prompt_tokens": 50, "completion_tokens": 20, "total_tokens": 70},
+            usage=_MOCK_USAGE,
         )
 
     async def stream_request(
@@ -39,16 +92,26 @@ class MockLlmService(LlmService):
         """Stream a request to the mock LLM."""
         self.call_count += 1
 
+        tool_calls = self._scripted_tool_calls(request)
+        if tool_calls:
+            await asyncio.sleep(self.chunk_latency)
+            yield LlmStreamChunk(
+                tool_calls=tool_calls, finish_reason="tool_calls", usage=_MOCK_USAGE
+            )
+            return
+
         # Split response into chunks
         words = f"{self.response_content} (Streamed #{self.call_count})".split()
 
         for i, word in enumerate(words):
-            await asyncio.sleep(0.05)  # Simulate streaming delay
+            await asyncio.sleep(self.chunk_latency)  # Simulate streaming delay
 
             chunk_content = word + (" " if i < len(words) - 1 else "")
+            is_last = i == len(words) - 1
             yield LlmStreamChunk(
                 content=chunk_content,
-                finish_reason="stop" if i == len(words) - 1 else None,
+                finish_reason="stop" if is_last else None,
+                usage=_MOCK_USAGE if is_last else None,
             )
 
     async def validate_tools(self, tools: List[ToolSchema]) -> List[str]:
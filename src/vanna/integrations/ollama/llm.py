@@ -78,14 +78,7 @@ class OllamaLlmService(LlmService):
         tool_calls = self._extract_tool_calls_from_message(message)
 
         # Extract usage information if available
-        usage: Dict[str, int] = {}
-        if "prompt_eval_count" in resp or "eval_count" in resp:
-            usage = {
-                "prompt_tokens": resp.get("prompt_eval_count", 0),
-                "completion_tokens": resp.get("eval_count", 0),
-                "total_tokens": resp.get("prompt_eval_count", 0)
-                + resp.get("eval_count", 0),
-            }
+        usage = self._extract_usage(resp)
 
         return LlmResponse(
             content=content,
@@ -114,6 +107,7 @@ class OllamaLlmService(LlmService):
         # Accumulate tool calls if present
         accumulated_tool_calls: List[ToolCall] = []
         last_finish: Optional[str] = None
+        usage: Dict[str, int] = {}
 
         for chunk in stream:
             message = chunk.get("message", {})
@@ -131,15 +125,33 @@ class OllamaLlmService(LlmService):
             # Track finish reason
             if chunk.get("done"):
                 last_finish = chunk.get("done_reason", "stop")
+                # The final chunk carries the token counts for the request
+                usage = self._extract_usage(chunk)
 
         # Emit final chunk with tool calls if any
         if accumulated_tool_calls:
             yield LlmStreamChunk(
-                tool_calls=accumulated_tool_calls, finish_reason=last_finish or "stop"
+                tool_calls=accumulated_tool_calls,
+                finish_reason=last_finish or "stop",
+                usage=usage or None,
             )
         else:
             # Emit terminal chunk to signal completion
-            yield LlmStreamChunk(finish_reason=last_finish or "stop")
+            yield LlmStreamChunk(
+                finish_reason=last_finish or "stop", usage=usage or None
+            )
+
+    def _extract_usage(self, resp: Any) -> Dict[str, int]:
+        """Read token counts from a response or final stream chunk."""
+        if "prompt_eval_count" not in resp and "eval_count" not in resp:
+            return {}
+        prompt_tokens = resp.get("prompt_eval_count") or 0
+        completion_tokens = resp.get("eval_count") or 0
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
 
     async def validate_tools(self, tools: List[ToolSchema]) -> List[str]:
         """Validate tool schemas. Returns a list of error messages."""
@@ -1,10 +1,12 @@
 """
 OpenAI integration.
 
-This module provides OpenAI LLM service implementations.
+This module provides OpenAI LLM service implementations and a tiktoken
+tokenizer for token budgeting.
 """
 
 from .llm import OpenAILlmService
 from .responses import OpenAIResponsesService
+from .tokenizer import TiktokenTokenizer
 
-__all__ = ["OpenAILlmService", "OpenAIResponsesService"]
+__all__ = ["OpenAILlmService", "OpenAIResponsesService", "TiktokenTokenizer"]
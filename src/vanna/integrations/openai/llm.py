@@ -20,6 +20,7 @@ from vanna.core.llm import (
     LlmRequest,
     LlmResponse,
     LlmStreamChunk,
+    ToolPayloadCache,
 )
 from vanna.core.tool import ToolCall, ToolSchema
 
@@ -32,6 +33,9 @@ class OpenAILlmService(LlmService):
         api_key: API key; falls back to env `OPENAI_API_KEY`.
         organization: Optional org; env `OPENAI_ORG` if unset.
         base_url: Optional custom base URL; env `OPENAI_BASE_URL` if unset.
+        stream_usage: Request token usage on streamed responses via
+            `stream_options`. Defaults to on for api.openai.com and off for
+            other base URLs, since some OpenAI-compatible servers reject it.
         extra_client_kwargs: Extra kwargs forwarded to `openai.OpenAI()`.
     """
 
@@ -41,6 +45,7 @@ class OpenAILlmService(LlmService):
         api_key: Optional[str] = None,
         organization: Optional[str] = None,
         base_url: Optional[str] = None,
+        stream_usage: Optional[bool] = None,
         **extra_client_kwargs: Any,
     ) -> None:
         try:
@@ -63,7 +68,12 @@ class OpenAILlmService(LlmService):
         if base_url:
             client_kwargs["base_url"] = base_url
 
+        if stream_usage is None:
+            stream_usage = not base_url or "api.openai.com" in base_url
+        self.stream_usage = stream_usage
+
         self._client = OpenAI(**client_kwargs)
+        self._tool_payloads = ToolPayloadCache(self._convert_tools)
 
     async def send_request(self, request: LlmRequest) -> LlmResponse:
         """Send a non-streaming request to OpenAI and return the response."""
@@ -79,16 +89,7 @@ class OpenAILlmService(LlmService):
         content: Optional[str] = getattr(choice.message, "content", None)
         tool_calls = self._extract_tool_calls_from_message(choice.message)
 
-        usage: Dict[str, int] = {}
-        if getattr(resp, "usage", None):
-            usage = {
-                k: int(v)
-                for k, v in {
-                    "prompt_tokens": getattr(resp.usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(resp.usage, "completion_tokens", 0),
-                    "total_tokens": getattr(resp.usage, "total_tokens", 0),
-                }.items()
-            }
+        usage = self._extract_usage(getattr(resp, "usage", None))
 
         return LlmResponse(
             content=content,
@@ -108,13 +109,21 @@ class OpenAILlmService(LlmService):
         payload = self._build_payload(request)
 
         # Synchronous streaming iterator; iterate within async context.
+        if self.stream_usage:
+            payload["stream_options"] = {"include_usage": True}
         stream = self._client.chat.completions.create(**payload, stream=True)
 
         # Builders for streamed tool-calls (index -> partial)
         tc_builders: Dict[int, Dict[str, Optional[str]]] = {}
         last_finish: Optional[str] = None
 
+        usage: Dict[str, int] = {}
+
         for event in stream:
+            # With include_usage the last event carries usage and no choices
+            if getattr(event, "usage", None):
+                usage = self._extract_usage(event.usage)
+
             if not getattr(event, "choices", None):
                 continue
 
@@ -172,10 +181,28 @@ class OpenAILlmService(LlmService):
             )
 
         if final_tool_calls:
-            yield LlmStreamChunk(tool_calls=final_tool_calls, finish_reason=last_finish)
+            yield LlmStreamChunk(
+                tool_calls=final_tool_calls,
+                finish_reason=last_finish,
+                usage=usage or None,
+            )
         else:
             # Still emit a terminal chunk to signal completion
-            yield LlmStreamChunk(finish_reason=last_finish or "stop")
+            yield LlmStreamChunk(
+                finish_reason=last_finish or "stop", usage=usage or None
+            )
+
+    def _extract_usage(self, usage: Any) -> Dict[str, int]:
+        """Convert the SDK usage object, including prompt cache hits."""
+        if not usage:
+            return {}
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "prompt_tokens": int(getattr(usage, "prompt_tokens", 0) or 0),
+            "completion_tokens": int(getattr(usage, "completion_tokens", 0) or 0),
+            "total_tokens": int(getattr(usage, "total_tokens", 0) or 0),
+            "cached_tokens": int(getattr(details, "cached_tokens", 0) or 0),
+        }
 
     async def validate_tools(self, tools: List[ToolSchema]) -> List[str]:
         """Validate tool schemas. Returns a list of error messages."""
@@ -187,6 +214,20 @@ class OpenAILlmService(LlmService):
         return errors
 
     # Internal helpers
+    @staticmethod
+    def _convert_tools(tools: List[ToolSchema]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": t.name,
+                    "description": t.description,
+                    "parameters": t.parameters,
+                },
+            }
+            for t in tools
+        ]
+
     def _build_payload(self, request: LlmRequest) -> Dict[str, Any]:
         messages: List[Dict[str, Any]] = []
 
@@ -217,17 +258,7 @@ class OpenAILlmService(LlmService):
 
         tools_payload: Optional[List[Dict[str, Any]]] = None
         if request.tools:
-            tools_payload = [
-                {
-                    "type": "function",
-                    "function": {
-                        "name": t.name,
-                        "description": t.description,
-                        "parameters": t.parameters,
-                    },
-                }
-                for t in request.tools
-            ]
+            tools_payload = self._tool_payloads.get(request.tools)
 
         payload: Dict[str, Any] = {
             "model": self.model,
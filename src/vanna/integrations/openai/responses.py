@@ -54,8 +54,10 @@ class OpenAIResponsesService(LlmService):
             final: Response = await stream.get_final_response()
             self._debug_print("final_response", final)
 
-        _text, tools, status, _usage = self._extract(final)
-        yield LlmStreamChunk(tool_calls=tools or None, finish_reason=status)
+        _text, tools, status, usage = self._extract(final)
+        yield LlmStreamChunk(
+            tool_calls=tools or None, finish_reason=status, usage=usage or None
+        )
 
     async def validate_tools(self, tools: List[Any]) -> List[str]:
         return []  # minimal: accept whatever's passed through
@@ -117,6 +119,12 @@ class OpenAIResponsesService(LlmService):
                     (getattr(resp.usage, "input_tokens", 0) or 0)
                     + (getattr(resp.usage, "output_tokens", 0) or 0)
                 ),
+                "cached_tokens": getattr(
+                    getattr(resp.usage, "input_tokens_details", None),
+                    "cached_tokens",
+                    0,
+                )
+                or 0,
             }
 
         status = getattr(resp, "status", None)  # e.g. "completed"
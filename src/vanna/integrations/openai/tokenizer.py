@@ -0,0 +1,40 @@
+"""
+tiktoken tokenizer.
+
+Exact token counts for OpenAI models, for filters that budget tokens such
+as ``TokenBudgetFilter``.
+"""
+
+from typing import Any, Optional
+
+from vanna.core.filter import Tokenizer
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Counts tokens with tiktoken.
+
+    Args:
+        model: Model whose encoding is used (e.g., "gpt-4o")
+        encoding: Encoding name, used instead of the model's (e.g.,
+            "o200k_base")
+    """
+
+    def __init__(self, model: Optional[str] = None, encoding: Optional[str] = None):
+        try:
+            import tiktoken
+        except ImportError as e:
+            raise ImportError(
+                "tiktoken package is required. Install with: pip install tiktoken"
+            ) from e
+
+        if encoding:
+            self._encoding: Any = tiktoken.get_encoding(encoding)
+        elif model:
+            self._encoding = tiktoken.encoding_for_model(model)
+        else:
+            self._encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens in ``text``."""
+        # Special tokens in conversation text are counted as plain text
+        return len(self._encoding.encode(text, disallowed_special=()))
@@ -1,9 +1,12 @@
 """
 SQLite integration.
 
-This module provides SQLite runner implementation.
+This module provides SQLite runner, conversation store and quota backend
+implementations.
 """
 
+from .conversation_store import SqliteConversationStore
+from .quota_backend import SqliteQuotaBackend
 from .sql_runner import SqliteRunner
 
-__all__ = ["SqliteRunner"]
+__all__ = ["SqliteRunner", "SqliteConversationStore", "SqliteQuotaBackend"]
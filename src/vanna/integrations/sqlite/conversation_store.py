@@ -0,0 +1,294 @@
+"""
+SQLite conversation store implementation.
+
+This module provides a ConversationStore backed by a single SQLite database
+in WAL mode. Several worker processes (uvicorn workers, pods sharing a
+volume) can point at the same database file, so requests for a conversation
+no longer need to be routed to the worker that created it.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from vanna.core.errors import ConversationConflictError
+from vanna.core.storage import ConversationStore, Conversation, Message
+from vanna.core.user import User
+
+from .pool import SqliteConnectionPool
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    user_json TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    message_count INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_updated
+    ON conversations (user_id, updated_at DESC);
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, idx)
+) WITHOUT ROWID;
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _timestamp(value: datetime) -> str:
+    # Fixed-width ISO timestamps keep lexicographic order equal to time order
+    return value.isoformat(timespec="microseconds")
+
+
+class SqliteConversationStore(ConversationStore):
+    """SQLite-backed conversation store for multi-worker deployments.
+
+    Conversations are stored in a ``conversations`` table indexed on
+    ``(user_id, updated_at)`` and messages in an append-only ``messages``
+    table. Writes use optimistic concurrency: ``update_conversation`` only
+    succeeds if the stored ``version`` still matches the version the
+    conversation was loaded with, otherwise ``ConversationConflictError`` is
+    raised so the caller can reload and retry.
+
+    Call ``close`` to release the database connections and thread pool.
+    """
+
+    def __init__(
+        self,
+        database_path: str = "conversations.db",
+        busy_timeout: float = 30.0,
+        max_workers: int = 4,
+    ) -> None:
+        """Initialize the SQLite conversation store.
+
+        Args:
+            database_path: Path to the SQLite database file shared by all workers
+            busy_timeout: Seconds to wait for a competing writer's lock
+            max_workers: Threads used to run blocking database calls
+        """
+        self.database_path = database_path
+        self.busy_timeout = busy_timeout
+        self._pool = SqliteConnectionPool(
+            database_path,
+            busy_timeout=busy_timeout,
+            max_workers=max_workers,
+            schema=_SCHEMA,
+            row_factory=sqlite3.Row,
+        )
+
+    def close(self) -> None:
+        """Wait for pending database calls and close the store's connections."""
+        self._pool.close()
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a blocking database call on the store's executor."""
+        return await self._pool.run(fn)
+
+    def _insert_messages(
+        self,
+        conn: sqlite3.Connection,
+        conversation_id: str,
+        messages: Sequence[Message],
+        start: int,
+    ) -> None:
+        conn.executemany(
+            "INSERT INTO messages (conversation_id, idx, payload) VALUES (?, ?, ?)",
+            [
+                (conversation_id, idx, _dumps(message.model_dump(mode="json")))
+                for idx, message in enumerate(messages, start=start)
+            ],
+        )
+
+    def _load_messages(
+        self, conn: sqlite3.Connection, conversation_ids: List[str]
+    ) -> Dict[str, List[Message]]:
+        messages: Dict[str, List[Message]] = {cid: [] for cid in conversation_ids}
+        if not conversation_ids:
+            return messages
+
+        placeholders = ",".join("?" for _ in conversation_ids)
+        rows = conn.execute(
+            f"SELECT conversation_id, payload FROM messages "
+            f"WHERE conversation_id IN ({placeholders}) "
+            f"ORDER BY conversation_id, idx",
+            conversation_ids,
+        )
+        for row in rows:
+            messages[row["conversation_id"]].append(
+                Message.model_validate_json(row["payload"])
+            )
+        return messages
+
+    def _row_to_conversation(
+        self, row: sqlite3.Row, messages: List[Message]
+    ) -> Conversation:
+        return Conversation(
+            id=row["id"],
+            user=User.model_validate_json(row["user_json"]),
+            messages=messages,
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            metadata=json.loads(row["metadata"]),
+            version=row["version"],
+        )
+
+    async def create_conversation(
+        self, conversation_id: str, user: User, initial_message: str
+    ) -> Conversation:
+        """Create a new conversation with the specified ID."""
+        conversation = Conversation(
+            id=conversation_id,
+            user=user,
+            messages=[Message(role="user", content=initial_message)],
+        )
+        await self.update_conversation(conversation)
+        return conversation
+
+    async def get_conversation(
+        self, conversation_id: str, user: User
+    ) -> Optional[Conversation]:
+        """Get conversation by ID, scoped to user."""
+
+        def _get(conn: sqlite3.Connection) -> Optional[Conversation]:
+            row = conn.execute(
+                "SELECT * FROM conversations WHERE id = ? AND user_id = ?",
+                (conversation_id, user.id),
+            ).fetchone()
+            if row is None:
+                return None
+            messages = self._load_messages(conn, [conversation_id])
+            return self._row_to_conversation(row, messages[conversation_id])
+
+        return await self._run(_get)
+
+    async def update_conversation(self, conversation: Conversation) -> None:
+        """Update conversation with new messages.
+
+        Raises:
+            ConversationConflictError: If another writer updated the
+                conversation since it was loaded, or it belongs to another user
+        """
+
+        def _update(conn: sqlite3.Connection) -> None:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT user_id, message_count, version FROM conversations "
+                    "WHERE id = ?",
+                    (conversation.id,),
+                ).fetchone()
+
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO conversations (id, user_id, user_json, "
+                        "created_at, updated_at, metadata, message_count, version) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, 1)",
+                        (
+                            conversation.id,
+                            conversation.user.id,
+                            conversation.user.model_dump_json(),
+                            _timestamp(conversation.created_at),
+                            _timestamp(conversation.updated_at),
+                            _dumps(conversation.metadata),
+                            len(conversation.messages),
+                        ),
+                    )
+                    self._insert_messages(
+                        conn, conversation.id, conversation.messages, 0
+                    )
+                else:
+                    if row["user_id"] != conversation.user.id:
+                        raise ConversationConflictError(
+                            f"Conversation {conversation.id} belongs to another user"
+                        )
+                    if row["version"] != conversation.version:
+                        raise ConversationConflictError(
+                            f"Conversation {conversation.id} was modified "
+                            f"concurrently (expected version {conversation.version}, "
+                            f"found {row['version']})"
+                        )
+
+                    stored_count = row["message_count"]
+                    if len(conversation.messages) < stored_count:
+                        # History was rewritten, replace it entirely
+                        conn.execute(
+                            "DELETE FROM messages WHERE conversation_id = ?",
+                            (conversation.id,),
+                        )
+                        stored_count = 0
+                    self._insert_messages(
+                        conn,
+                        conversation.id,
+                        conversation.messages[stored_count:],
+                        stored_count,
+                    )
+                    conn.execute(
+                        "UPDATE conversations SET user_json = ?, updated_at = ?, "
+                        "metadata = ?, message_count = ?, version = version + 1 "
+                        "WHERE id = ?",
+                        (
+                            conversation.user.model_dump_json(),
+                            _timestamp(conversation.updated_at),
+                            _dumps(conversation.metadata),
+                            len(conversation.messages),
+                            conversation.id,
+                        ),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        await self._run(_update)
+        conversation.version += 1
+
+    async def delete_conversation(self, conversation_id: str, user: User) -> bool:
+        """Delete conversation."""
+
+        def _delete(conn: sqlite3.Connection) -> bool:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.execute(
+                    "DELETE FROM conversations WHERE id = ? AND user_id = ?",
+                    (conversation_id, user.id),
+                )
+                deleted = cursor.rowcount > 0
+                if deleted:
+                    conn.execute(
+                        "DELETE FROM messages WHERE conversation_id = ?",
+                        (conversation_id,),
+                    )
+                conn.execute("COMMIT")
+                return deleted
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        return await self._run(_delete)
+
+    async def list_conversations(
+        self, user: User, limit: int = 50, offset: int = 0
+    ) -> List[Conversation]:
+        """List conversations for user, most recently updated first."""
+
+        def _list(conn: sqlite3.Connection) -> List[Conversation]:
+            rows = conn.execute(
+                "SELECT * FROM conversations WHERE user_id = ? "
+                "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                (user.id, limit, offset),
+            ).fetchall()
+            messages = self._load_messages(conn, [row["id"] for row in rows])
+            return [self._row_to_conversation(row, messages[row["id"]]) for row in rows]
+
+        return await self._run(_list)
@@ -0,0 +1,86 @@
+"""
+SQLite connection pool.
+
+This module provides the per-thread connections and executor shared by the
+SQLite conversation store and quota backend.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SqliteConnectionPool:
+    """Per-thread SQLite connections and the executor their calls run on.
+
+    SQLite connections are cheap but not safe to share between threads, so
+    each executor thread opens its own connection on first use. The database
+    is put in WAL mode and ``schema`` is applied when the pool is created.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        *,
+        busy_timeout: float = 30.0,
+        max_workers: int = 4,
+        schema: str = "",
+        row_factory: Optional[Callable[..., object]] = None,
+    ) -> None:
+        """Initialize the pool and prepare the database.
+
+        Args:
+            database_path: Path to the SQLite database file
+            busy_timeout: Seconds to wait for a competing writer's lock
+            max_workers: Threads used to run blocking database calls
+            schema: SQL script creating the tables, run on creation
+            row_factory: Row factory set on every connection
+        """
+        self.database_path = database_path
+        self.busy_timeout = busy_timeout
+        self.row_factory = row_factory
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        if schema:
+            conn.executescript(schema)
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.database_path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            if self.row_factory is not None:
+                conn.row_factory = self.row_factory
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    async def run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a blocking database call on the pool's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(self.connection()))
+
+    def close(self) -> None:
+        """Wait for pending calls, then shut down the executor and close every
+        connection."""
+        self._executor.shutdown(wait=True)
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
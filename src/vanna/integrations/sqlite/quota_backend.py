@@ -0,0 +1,115 @@
+"""
+SQLite quota backend implementation.
+
+This module provides a quota backend that keeps token buckets in a SQLite
+database, so several worker processes sharing the database file enforce the
+same per-user and per-group limits.
+"""
+
+import sqlite3
+import time
+from typing import Callable, Optional, TypeVar
+
+from vanna.core.quota import BucketResult, QuotaBackend, RateLimit, take_tokens
+
+from .pool import SqliteConnectionPool
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SqliteQuotaBackend(QuotaBackend):
+    """Quota backend shared by all workers using the same SQLite database.
+
+    Each update reads, refills and writes a bucket inside ``BEGIN
+    IMMEDIATE``, so concurrent workers never both spend the same tokens.
+    Refills are computed from wall-clock time, which must agree between
+    the workers.
+    """
+
+    def __init__(
+        self,
+        database_path: str = "quotas.db",
+        busy_timeout: float = 30.0,
+        max_workers: int = 2,
+    ) -> None:
+        """Initialize the SQLite quota backend.
+
+        Args:
+            database_path: Path to the SQLite database file shared by all workers
+            busy_timeout: Seconds to wait for a competing writer's lock
+            max_workers: Threads used to run blocking database calls
+        """
+        self.database_path = database_path
+        self.busy_timeout = busy_timeout
+        self._pool = SqliteConnectionPool(
+            database_path,
+            busy_timeout=busy_timeout,
+            max_workers=max_workers,
+            schema=_SCHEMA,
+        )
+
+    def close(self) -> None:
+        """Wait for pending database calls and close the backend's connections."""
+        self._pool.close()
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a blocking database call on the backend's executor."""
+        return await self._pool.run(fn)
+
+    async def _update(
+        self, key: str, limit: RateLimit, amount: float, force: bool
+    ) -> BucketResult:
+        def _apply(conn: sqlite3.Connection) -> BucketResult:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM quota_buckets WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                tokens, updated_at = row if row is not None else (limit.capacity, now)
+                tokens, result = take_tokens(
+                    tokens, now - updated_at, limit, amount, force
+                )
+                conn.execute(
+                    "INSERT INTO quota_buckets (key, tokens, updated_at) "
+                    "VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    (key, tokens, now),
+                )
+                conn.execute("COMMIT")
+                return result
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        return await self._run(_apply)
+
+    async def take(
+        self, key: str, limit: RateLimit, amount: float = 1.0
+    ) -> BucketResult:
+        """Take tokens if the bucket holds enough of them."""
+        return await self._update(key, limit, amount, force=False)
+
+    async def charge(self, key: str, limit: RateLimit, amount: float) -> BucketResult:
+        """Take tokens unconditionally, possibly leaving the bucket in debt."""
+        return await self._update(key, limit, amount, force=True)
+
+    async def reset(self, key: Optional[str] = None) -> None:
+        """Refill one bucket, or all buckets if no key is given."""
+
+        def _reset(conn: sqlite3.Connection) -> None:
+            if key is None:
+                conn.execute("DELETE FROM quota_buckets")
+            else:
+                conn.execute("DELETE FROM quota_buckets WHERE key = ?", (key,))
+
+        await self._run(_reset)
@@ -52,11 +52,15 @@ import json
 import os
 import re
 import sqlite3
+import threading
 import traceback
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple, Union
 from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
 import plotly
 import plotly.express as px
@@ -99,11 +103,7 @@ class VannaBase(ABC):
 
         Uses the LLM to generate a SQL query that answers a question. It runs the following methods:
 
-        - [`get_similar_question_sql`][vanna.base.base.VannaBase.get_similar_question_sql]
-
-        - [`get_related_ddl`][vanna.base.base.VannaBase.get_related_ddl]
-
-        - [`get_related_documentation`][vanna.base.base.VannaBase.get_related_documentation]
+        - [`get_related_context`][vanna.base.base.VannaBase.get_related_context], which runs [`get_similar_question_sql`][vanna.base.base.VannaBase.get_similar_question_sql], [`get_related_ddl`][vanna.base.base.VannaBase.get_related_ddl] and [`get_related_documentation`][vanna.base.base.VannaBase.get_related_documentation]
 
         - [`get_sql_prompt`][vanna.base.base.VannaBase.get_sql_prompt]
 
@@ -121,9 +121,9 @@ class VannaBase(ABC):
             initial_prompt = self.config.get("initial_prompt", None)
         else:
             initial_prompt = None
-        question_sql_list = self.get_similar_question_sql(question, **kwargs)
-        ddl_list = self.get_related_ddl(question, **kwargs)
-        doc_list = self.get_related_documentation(question, **kwargs)
+        question_sql_list, ddl_list, doc_list = self.get_related_context(
+            question, **kwargs
+        )
         prompt = self.get_sql_prompt(
             initial_prompt=initial_prompt,
             question=question,
@@ -402,6 +402,26 @@ class VannaBase(ABC):
     def generate_embedding(self, data: str, **kwargs) -> List[float]:
         pass
 
+    def generate_embeddings(self, data: List[str], **kwargs) -> List[List[float]]:
+        """
+        Generate the embeddings of several texts, as used when training in batches.
+
+        The default embeds them one at a time with `generate_embedding`. Embedding backends that can embed several texts in one call override this method.
+
+        Args:
+            data (List[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: The embeddings, in order.
+        """
+        return [self.generate_embedding(text, **kwargs) for text in data]
+
+    def _embedding_overridden(self, store_class) -> bool:
+        """
+        Whether a subclass of `store_class` overrides its `generate_embedding`, in which case the store's batch embedding must not bypass it.
+        """
+        return type(self).generate_embedding is not store_class.generate_embedding
+
     # ----------------- Use Any Database to Store and Retrieve Context ----------------- #
     @abstractmethod
     def get_similar_question_sql(self, question: str, **kwargs) -> list:
@@ -442,6 +462,66 @@ class VannaBase(ABC):
         """
         pass
 
+    def get_related_context(self, question: str, **kwargs) -> Tuple[list, list, list]:
+        """
+        Example:
+        ```python
+        question_sql_list, ddl_list, doc_list = vn.get_related_context("What are the top 10 customers by sales?")
+        ```
+
+        Gets the similar questions and their SQL, the related DDL and the related documentation for a question, as used in the SQL prompt.
+
+        The three retrievals run concurrently on a thread pool. Vector stores that can embed the question once, or query all their collections together, override this method. Set `parallel_retrieval` to False in the config to run them one after another, e.g. if the vector store's client is not thread-safe.
+
+        Args:
+            question (str): The question to get the context for.
+
+        Returns:
+            Tuple[list, list, list]: The similar question-SQL pairs, the related DDL statements and the related documentation.
+        """
+        return self._run_retrievals(
+            lambda: self.get_similar_question_sql(question, **kwargs),
+            lambda: self.get_related_ddl(question, **kwargs),
+            lambda: self.get_related_documentation(question, **kwargs),
+        )
+
+    def _retrieval_overridden(self, store_class) -> bool:
+        """
+        Whether a subclass of `store_class` overrides its retrieval methods, in which case the store's combined retrieval must not bypass them.
+        """
+        return any(
+            getattr(type(self), name) is not getattr(store_class, name)
+            for name in (
+                "get_similar_question_sql",
+                "get_related_ddl",
+                "get_related_documentation",
+            )
+        )
+
+    _retrieval_executor = None
+    _retrieval_executor_lock = threading.Lock()
+
+    def _run_retrievals(self, *retrievals) -> tuple:
+        """
+        Run retrieval functions, concurrently unless `parallel_retrieval` is False in the config, and return their results in order.
+        """
+        config = getattr(self, "config", None) or {}
+        if not config.get("parallel_retrieval", True) or len(retrievals) < 2:
+            return tuple(retrieval() for retrieval in retrievals)
+
+        if self._retrieval_executor is None:
+            with VannaBase._retrieval_executor_lock:
+                if self._retrieval_executor is None:
+                    self._retrieval_executor = ThreadPoolExecutor(
+                        max_workers=config.get("retrieval_workers", 3),
+                        thread_name_prefix="vanna-retrieval",
+                    )
+
+        futures = [
+            self._retrieval_executor.submit(retrieval) for retrieval in retrievals
+        ]
+        return tuple(future.result() for future in futures)
+
     @abstractmethod
     def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
         """
@@ -482,6 +562,68 @@ class VannaBase(ABC):
         """
         pass
 
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        """
+        Add several questions and their corresponding SQL queries to the training data.
+
+        The default adds them one at a time. Vector stores that can embed and write several records at once override this method.
+
+        Args:
+            question_sqls (List[Tuple[str, str]]): The (question, SQL query) pairs to add.
+
+        Returns:
+            List[str]: The IDs of the training data that was added, in order.
+        """
+        return [
+            self.add_question_sql(question=question, sql=sql, **kwargs)
+            for question, sql in question_sqls
+        ]
+
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        """
+        Add several DDL statements to the training data.
+
+        The default adds them one at a time. Vector stores that can embed and write several records at once override this method.
+
+        Args:
+            ddls (List[str]): The DDL statements to add.
+
+        Returns:
+            List[str]: The IDs of the training data that was added, in order.
+        """
+        return [self.add_ddl(ddl, **kwargs) for ddl in ddls]
+
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        """
+        Add several pieces of documentation to the training data.
+
+        The default adds them one at a time. Vector stores that can embed and write several records at once override this method.
+
+        Args:
+            documentations (List[str]): The documentation to add.
+
+        Returns:
+            List[str]: The IDs of the training data that was added, in order.
+        """
+        return [
+            self.add_documentation(documentation, **kwargs)
+            for documentation in documentations
+        ]
+
+    def _batch_add(self, batch_name: str, single_name: str):
+        """
+        The batch add method `batch_name`, or the one-at-a-time default of VannaBase if a subclass overrides the single-add method `single_name` below the class implementing the batch method, so that the override is not bypassed.
+        """
+        mro = type(self).__mro__
+        batch_owner = next(cls for cls in mro if batch_name in vars(cls))
+        single_owner = next(cls for cls in mro if single_name in vars(cls))
+        if single_owner is not batch_owner and issubclass(single_owner, batch_owner):
+            batch_method = getattr(VannaBase, batch_name)
+            return lambda values: batch_method(self, values)
+        return getattr(self, batch_name)
+
     @abstractmethod
     def get_training_data(self, **kwargs) -> pd.DataFrame:
         """
@@ -497,6 +639,56 @@ class VannaBase(ABC):
         """
         pass
 
+    def get_training_data_page(
+        self,
+        training_data_type: str = None,
+        search: str = None,
+        limit: int = None,
+        offset: int = 0,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Example:
+        ```python
+        vn.get_training_data_page(training_data_type="sql", search="customers", limit=50)
+        ```
+
+        This method is used to get a filtered page of the training data from the retrieval layer.
+
+        The default filters the result of `get_training_data`. Vector stores that can filter and page in the database override this method.
+
+        Args:
+            training_data_type (str): Only return training data of this type: "sql", "ddl" or "documentation".
+            search (str): Only return training data whose question or content contains this text, ignoring case.
+            limit (int): The maximum number of rows to return, or None for all of them.
+            offset (int): The number of rows to skip.
+
+        Returns:
+            pd.DataFrame: The page of training data.
+        """
+        df = self.get_training_data(**kwargs)
+        if df is None or len(df) == 0:
+            return df
+
+        mask = pd.Series(True, index=df.index)
+        if training_data_type is not None:
+            mask &= df["training_data_type"] == training_data_type
+        if search:
+            found = pd.Series(False, index=df.index)
+            for column in ["question", "content"]:
+                found |= (
+                    df[column]
+                    .astype("string")
+                    .str.contains(search, case=False, regex=False)
+                    .fillna(False)
+                    .astype(bool)
+                )
+            mask &= found
+
+        df = df[mask.to_numpy()]
+        end = None if limit is None else offset + limit
+        return df.iloc[offset:end]
+
     @abstractmethod
     def remove_training_data(self, id: str, **kwargs) -> bool:
         """
@@ -1824,6 +2016,7 @@ class VannaBase(ABC):
         If you call it with the ddl argument, it's equivalent to [`vn.add_ddl()`][vanna.base.base.VannaBase.add_ddl].
         If you call it with the documentation argument, it's equivalent to [`vn.add_documentation()`][vanna.base.base.VannaBase.add_documentation].
         Additionally, you can pass a [`TrainingPlan`][vanna.types.TrainingPlan] object. Get a training plan with [`vn.get_training_plan_generic()`][vanna.base.base.VannaBase.get_training_plan_generic].
+        Plan items are added in batches of `training_batch_size` items (100 by default), with up to `training_workers` batches (1 by default) written at once; both are read from the config.
 
         Args:
             question (str): The question to train on.
@@ -1851,13 +2044,80 @@ class VannaBase(ABC):
             return self.add_ddl(ddl)
 
         if plan:
-            for item in plan._plan:
-                if item.item_type == TrainingPlanItem.ITEM_TYPE_DDL:
-                    self.add_ddl(item.item_value)
-                elif item.item_type == TrainingPlanItem.ITEM_TYPE_IS:
-                    self.add_documentation(item.item_value)
-                elif item.item_type == TrainingPlanItem.ITEM_TYPE_SQL:
-                    self.add_question_sql(question=item.item_name, sql=item.item_value)
+            self._train_plan(plan)
+
+    def _train_plan(self, plan: Iterable[TrainingPlanItem]) -> int:
+        """
+        Train on the items of a training plan in batches, using the `add_ddls`, `add_documentations` and `add_question_sqls` batch methods. Where a subclass overrides `add_ddl`, `add_documentation` or `add_question_sql` instead, that type is added one item at a time through the override.
+
+        Items are batched by type as the plan is iterated, so a lazy plan is trained while it is being built. The config sets the items per batch (`training_batch_size`, 100 by default) and the batches written at once (`training_workers`, 1 by default). Progress is logged after each batch.
+
+        Returns:
+            int: The number of items trained on.
+        """
+        config = getattr(self, "config", None) or {}
+        batch_size = max(1, config.get("training_batch_size", 100))
+        workers = max(1, config.get("training_workers", 1))
+
+        add_ddls = self._batch_add("add_ddls", "add_ddl")
+        add_documentations = self._batch_add("add_documentations", "add_documentation")
+        add_question_sqls = self._batch_add("add_question_sqls", "add_question_sql")
+        add_batch = {
+            TrainingPlanItem.ITEM_TYPE_DDL: lambda items: add_ddls(
+                [item.item_value for item in items]
+            ),
+            TrainingPlanItem.ITEM_TYPE_IS: lambda items: add_documentations(
+                [item.item_value for item in items]
+            ),
+            TrainingPlanItem.ITEM_TYPE_SQL: lambda items: add_question_sqls(
+                [(item.item_name, item.item_value) for item in items]
+            ),
+        }
+        batches = {item_type: [] for item_type in add_batch}
+        trained = 0
+        in_flight = deque()
+        executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vanna-train")
+            if workers > 1
+            else None
+        )
+
+        def record(count: int) -> None:
+            nonlocal trained
+            trained += count
+            self.log(title="Training", message=f"Trained {trained} plan items")
+
+        def submit(item_type: str) -> None:
+            items, batches[item_type] = batches[item_type], []
+            if executor is None:
+                record(len(add_batch[item_type](items)))
+                return
+            # Bound the batches held in memory while the writes catch up
+            while len(in_flight) >= workers * 2:
+                record(len(in_flight.popleft().result()))
+            in_flight.append(executor.submit(add_batch[item_type], items))
+
+        try:
+            for item in plan:
+                if item.item_type not in batches:
+                    continue
+                batches[item.item_type].append(item)
+                if len(batches[item.item_type]) >= batch_size:
+                    submit(item.item_type)
+
+            for item_type, items in batches.items():
+                if items:
+                    submit(item_type)
+
+            while in_flight:
+                record(len(in_flight.popleft().result()))
+        finally:
+            if executor is not None:
+                for future in in_flight:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
+        return trained
 
     def _get_databases(self) -> List[str]:
         try:
@@ -1879,12 +2139,20 @@ class VannaBase(ABC):
 
         return df_tables
 
+    @staticmethod
+    def _information_schema_doc(database, table, df_table: pd.DataFrame) -> str:
+        doc = f"The following columns are in the {table} table in the {database} database:\n\n"
+        doc += df_table.to_markdown()
+        return doc
+
     def get_training_plan_generic(self, df) -> TrainingPlan:
         """
         This method is used to generate a training plan from an information schema dataframe.
 
         Basically what it does is breaks up INFORMATION_SCHEMA.COLUMNS into groups of table/column descriptions that can be used to pass to the LLM.
 
+        The dataframe is grouped by table in a single pass, and the plan is built lazily: iterating over it, e.g. in `vn.train(plan=plan)`, yields each table's item as soon as it is rendered.
+
         Args:
             df (pd.DataFrame): The dataframe to generate the training plan from.
 
@@ -1907,37 +2175,89 @@ class VannaBase(ABC):
         matches = df.columns.str.lower().str.contains("|".join(candidates), regex=True)
         columns += df.columns[matches].to_list()
 
-        plan = TrainingPlan([])
+        keys = [database_column, schema_column, table_column]
+        df = df.dropna(subset=keys)
+
+        # Order tables as nested loops over databases, their schemas and their
+        # tables would, each in order of first appearance
+        database_rank = pd.factorize(df[database_column])[0]
+        schema_rank = df.groupby(keys[:2], sort=False).ngroup().to_numpy()
+        table_rank = df.groupby(keys, sort=False).ngroup().to_numpy()
+        df = df.iloc[np.lexsort((table_rank, schema_rank, database_rank))]
+
+        def items():
+            for (database, schema, table), df_table in df.groupby(keys, sort=False):
+                yield TrainingPlanItem(
+                    item_type=TrainingPlanItem.ITEM_TYPE_IS,
+                    item_group=f"{database}.{schema}",
+                    item_name=table,
+                    item_value=self._information_schema_doc(
+                        database, table, df_table[columns]
+                    ),
+                )
 
-        for database in df[database_column].unique().tolist():
-            for schema in (
-                df.query(f'{database_column} == "{database}"')[schema_column]
-                .unique()
-                .tolist()
+        return TrainingPlan(items())
+
+    def _get_training_plan_snowflake_database(
+        self,
+        database: str,
+        filter_schemas: Union[List[str], None],
+        include_information_schema: bool,
+    ) -> List[TrainingPlanItem]:
+        try:
+            df_tables = self._get_information_schema_tables(database=database)
+
+            print(f"Trying INFORMATION_SCHEMA.COLUMNS for {database}")
+            df_columns = self.run_sql(
+                f"SELECT * FROM {database}.INFORMATION_SCHEMA.COLUMNS"
+            )
+        except Exception as e:
+            print(e)
+            return []
+
+        schemas = [
+            schema
+            for schema in df_tables["TABLE_SCHEMA"].unique().tolist()
+            if (filter_schemas is None or schema in filter_schemas)
+            and (include_information_schema or schema != "INFORMATION_SCHEMA")
+        ]
+
+        try:
+            df_columns = df_columns[df_columns["TABLE_SCHEMA"].isin(schemas)]
+            tables_by_schema = {schema: [] for schema in schemas}
+            for (schema, table), df_table in df_columns.groupby(
+                ["TABLE_SCHEMA", "TABLE_NAME"], sort=False
             ):
-                for table in (
-                    df.query(
-                        f'{database_column} == "{database}" and {schema_column} == "{schema}"'
-                    )[table_column]
-                    .unique()
-                    .tolist()
-                ):
-                    df_columns_filtered_to_table = df.query(
-                        f'{database_column} == "{database}" and {schema_column} == "{schema}" and {table_column} == "{table}"'
-                    )
-                    doc = f"The following columns are in the {table} table in the {database} database:\n\n"
-                    doc += df_columns_filtered_to_table[columns].to_markdown()
-
-                    plan._plan.append(
-                        TrainingPlanItem(
-                            item_type=TrainingPlanItem.ITEM_TYPE_IS,
-                            item_group=f"{database}.{schema}",
-                            item_name=table,
-                            item_value=doc,
-                        )
+                tables_by_schema[schema].append((table, df_table))
+        except Exception as e:
+            print(e)
+            return []
+
+        items = []
+        for schema in schemas:
+            for table, df_table in tables_by_schema[schema]:
+                items.append(
+                    TrainingPlanItem(
+                        item_type=TrainingPlanItem.ITEM_TYPE_IS,
+                        item_group=f"{database}.{schema}",
+                        item_name=table,
+                        item_value=self._information_schema_doc(
+                            database,
+                            table,
+                            df_table[
+                                [
+                                    "TABLE_CATALOG",
+                                    "TABLE_SCHEMA",
+                                    "TABLE_NAME",
+                                    "COLUMN_NAME",
+                                    "DATA_TYPE",
+                                    "COMMENT",
+                                ]
+                            ],
+                        ),
                     )
-
-        return plan
+                )
+        return items
 
     def get_training_plan_snowflake(
         self,
@@ -1945,13 +2265,27 @@ class VannaBase(ABC):
         filter_schemas: Union[List[str], None] = None,
         include_information_schema: bool = False,
         use_historical_queries: bool = True,
+        max_workers: int = 8,
     ) -> TrainingPlan:
-        plan = TrainingPlan([])
+        """
+        Generate a training plan from a Snowflake account's query history and information schema.
 
+        The plan is built lazily: iterating over it, e.g. in `vn.train(plan=plan)`, fetches the metadata of up to `max_workers` databases concurrently and yields each database's items, in order, as soon as they are ready.
+
+        Args:
+            filter_databases (List[str]): Only include these databases.
+            filter_schemas (List[str]): Only include these schemas.
+            include_information_schema (bool): Whether to include INFORMATION_SCHEMA.
+            use_historical_queries (bool): Whether to train on sample queries from the query history.
+            max_workers (int): Databases whose metadata is fetched at once.
+
+        Returns:
+            TrainingPlan: The training plan.
+        """
         if self.run_sql_is_set is False:
             raise ImproperlyConfigured("Please connect to a database first.")
 
-        if use_historical_queries:
+        def history_items():
             try:
                 print("Trying query history")
                 df_history = self.run_sql(
@@ -1986,88 +2320,57 @@ class VannaBase(ABC):
                 if len(df_history_filtered) > 10:
                     df_history_filtered = df_history_filtered.sample(10)
 
-                for query in df_history_filtered["QUERY_TEXT"].unique().tolist():
-                    plan._plan.append(
-                        TrainingPlanItem(
-                            item_type=TrainingPlanItem.ITEM_TYPE_SQL,
-                            item_group="",
-                            item_name=self.generate_question(query),
-                            item_value=query,
-                        )
-                    )
-
+                queries = df_history_filtered["QUERY_TEXT"].unique().tolist()
             except Exception as e:
                 print(e)
+                return
 
-        databases = self._get_databases()
-
-        for database in databases:
-            if filter_databases is not None and database not in filter_databases:
-                continue
-
-            try:
-                df_tables = self._get_information_schema_tables(database=database)
-
-                print(f"Trying INFORMATION_SCHEMA.COLUMNS for {database}")
-                df_columns = self.run_sql(
-                    f"SELECT * FROM {database}.INFORMATION_SCHEMA.COLUMNS"
+            for query in queries:
+                try:
+                    question = self.generate_question(query)
+                except Exception as e:
+                    print(e)
+                    return
+                yield TrainingPlanItem(
+                    item_type=TrainingPlanItem.ITEM_TYPE_SQL,
+                    item_group="",
+                    item_name=question,
+                    item_value=query,
                 )
 
-                for schema in df_tables["TABLE_SCHEMA"].unique().tolist():
-                    if filter_schemas is not None and schema not in filter_schemas:
-                        continue
-
-                    if (
-                        not include_information_schema
-                        and schema == "INFORMATION_SCHEMA"
-                    ):
-                        continue
+        def items():
+            if use_historical_queries:
+                yield from history_items()
 
-                    df_columns_filtered_to_schema = df_columns.query(
-                        f"TABLE_SCHEMA == '{schema}'"
+            databases = [
+                database
+                for database in self._get_databases()
+                if filter_databases is None or database in filter_databases
+            ]
+            if not databases:
+                return
+
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(databases))),
+                thread_name_prefix="vanna-training-plan",
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self._get_training_plan_snowflake_database,
+                        database,
+                        filter_schemas,
+                        include_information_schema,
                     )
+                    for database in databases
+                ]
+                try:
+                    for future in futures:
+                        yield from future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
 
-                    try:
-                        tables = (
-                            df_columns_filtered_to_schema["TABLE_NAME"]
-                            .unique()
-                            .tolist()
-                        )
-
-                        for table in tables:
-                            df_columns_filtered_to_table = (
-                                df_columns_filtered_to_schema.query(
-                                    f"TABLE_NAME == '{table}'"
-                                )
-                            )
-                            doc = f"The following columns are in the {table} table in the {database} database:\n\n"
-                            doc += df_columns_filtered_to_table[
-                                [
-                                    "TABLE_CATALOG",
-                                    "TABLE_SCHEMA",
-                                    "TABLE_NAME",
-                                    "COLUMN_NAME",
-                                    "DATA_TYPE",
-                                    "COMMENT",
-                                ]
-                            ].to_markdown()
-
-                            plan._plan.append(
-                                TrainingPlanItem(
-                                    item_type=TrainingPlanItem.ITEM_TYPE_IS,
-                                    item_group=f"{database}.{schema}",
-                                    item_name=table,
-                                    item_value=doc,
-                                )
-                            )
-
-                    except Exception as e:
-                        print(e)
-                        pass
-            except Exception as e:
-                print(e)
-
-        return plan
+        return TrainingPlan(items())
 
     def get_plotly_figure(
         self, plotly_code: str, df: pd.DataFrame, dark_mode: bool = True
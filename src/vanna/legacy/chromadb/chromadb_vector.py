@@ -1,5 +1,5 @@
 import json
-from typing import List
+from typing import List, Tuple
 
 import chromadb
 import pandas as pd
@@ -64,6 +64,11 @@ class ChromaDB_VectorStore(VannaBase):
             return embedding[0]
         return embedding
 
+    def generate_embeddings(self, data: List[str], **kwargs) -> List[List[float]]:
+        if self._embedding_overridden(ChromaDB_VectorStore):
+            return VannaBase.generate_embeddings(self, data, **kwargs)
+        return self.embedding_function(data)
+
     def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
         question_sql_json = json.dumps(
             {
@@ -99,6 +104,37 @@ class ChromaDB_VectorStore(VannaBase):
         )
         return id
 
+    def _upsert_documents(
+        self, collection, documents: List[str], suffix: str
+    ) -> List[str]:
+        ids = [deterministic_uuid(document) + suffix for document in documents]
+        # Chroma rejects duplicate ids within one request
+        unique = dict(zip(ids, documents))
+        if unique:
+            collection.upsert(
+                documents=list(unique.values()),
+                embeddings=self.generate_embeddings(list(unique.values())),
+                ids=list(unique.keys()),
+            )
+        return ids
+
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        documents = [
+            json.dumps({"question": question, "sql": sql}, ensure_ascii=False)
+            for question, sql in question_sqls
+        ]
+        return self._upsert_documents(self.sql_collection, documents, "-sql")
+
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        return self._upsert_documents(self.ddl_collection, ddls, "-ddl")
+
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        return self._upsert_documents(
+            self.documentation_collection, documentations, "-doc"
+        )
+
     def get_training_data(self, **kwargs) -> pd.DataFrame:
         sql_data = self.sql_collection.get()
 
@@ -257,3 +293,21 @@ class ChromaDB_VectorStore(VannaBase):
                 n_results=self.n_results_documentation,
             )
         )
+
+    def get_related_context(self, question: str, **kwargs) -> Tuple[list, list, list]:
+        if self._retrieval_overridden(ChromaDB_VectorStore):
+            return VannaBase.get_related_context(self, question, **kwargs)
+
+        # Embed the question once, rather than once per collection
+        embedding = self.generate_embedding(question)
+
+        def query(collection, n_results):
+            return ChromaDB_VectorStore._extract_documents(
+                collection.query(query_embeddings=[embedding], n_results=n_results)
+            )
+
+        return self._run_retrievals(
+            lambda: query(self.sql_collection, self.n_results_sql),
+            lambda: query(self.ddl_collection, self.n_results_ddl),
+            lambda: query(self.documentation_collection, self.n_results_documentation),
+        )
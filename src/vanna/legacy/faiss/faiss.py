@@ -1,7 +1,6 @@
 import os
 import json
-import uuid
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 import faiss
 import numpy as np
@@ -9,6 +8,7 @@ import pandas as pd
 
 from ..base import VannaBase
 from ..exceptions import DependencyError
+from ..utils import deterministic_uuid
 
 
 class FAISS(VannaBase):
@@ -40,6 +40,7 @@ class FAISS(VannaBase):
             "n_results_documentation", config.get("n_results", 10)
         )
         self.curr_client = config.get("client", "persistent")
+        self.embedding_batch_size = config.get("embedding_batch_size", 32)
 
         if self.curr_client == "persistent":
             self.sql_index = self._load_or_create_index("sql_index.faiss")
@@ -106,45 +107,87 @@ class FAISS(VannaBase):
         )
         return embedding.tolist()
 
+    def generate_embeddings(self, data: List[str], **kwargs) -> List[List[float]]:
+        if self._embedding_overridden(FAISS):
+            return VannaBase.generate_embeddings(self, data, **kwargs)
+        embeddings = self.embedding_model.encode(
+            data, batch_size=self.embedding_batch_size
+        )
+        assert embeddings.shape[1] == self.embedding_dim, (
+            f"Embedding dimension mismatch: expected {self.embedding_dim}, got {embeddings.shape[1]}"
+        )
+        return embeddings.tolist()
+
     def _add_to_index(self, index, metadata_list, text, extra_metadata=None) -> str:
-        embedding = self.generate_embedding(text)
-        index.add(np.array([embedding], dtype=np.float32))
-        entry_id = str(uuid.uuid4())
-        metadata_list.append({"id": entry_id, **(extra_metadata or {})})
-        return entry_id
+        return self._add_batch_to_index(
+            index, metadata_list, [text], [extra_metadata or {}]
+        )[0]
+
+    def _add_batch_to_index(
+        self, index, metadata_list, texts: List[str], extra_metadata: List[Dict]
+    ) -> List[str]:
+        # Content-hash ids make adding the same content again a no-op
+        ids = [deterministic_uuid(text) for text in texts]
+        existing = {metadata["id"] for metadata in metadata_list}
+        new = {}
+        for entry_id, text, metadata in zip(ids, texts, extra_metadata):
+            if entry_id not in existing and entry_id not in new:
+                new[entry_id] = (text, metadata)
+
+        if new:
+            embeddings = self.generate_embeddings([text for text, _ in new.values()])
+            index.add(np.asarray(embeddings, dtype=np.float32).reshape(len(new), -1))
+            metadata_list.extend(
+                {"id": entry_id, **metadata} for entry_id, (_, metadata) in new.items()
+            )
+        return ids
 
     def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
-        entry_id = self._add_to_index(
+        return self.add_question_sqls([(question, sql)], **kwargs)[0]
+
+    def add_ddl(self, ddl: str, **kwargs) -> str:
+        return self.add_ddls([ddl], **kwargs)[0]
+
+    def add_documentation(self, documentation: str, **kwargs) -> str:
+        return self.add_documentations([documentation], **kwargs)[0]
+
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        ids = self._add_batch_to_index(
             self.sql_index,
             self.sql_metadata,
-            question + " " + sql,
-            {"question": question, "sql": sql},
+            [question + " " + sql for question, sql in question_sqls],
+            [{"question": question, "sql": sql} for question, sql in question_sqls],
         )
         self._save_index(self.sql_index, "sql_index.faiss")
         self._save_metadata(self.sql_metadata, "sql_metadata.json")
-        return entry_id
+        return ids
 
-    def add_ddl(self, ddl: str, **kwargs) -> str:
-        entry_id = self._add_to_index(
-            self.ddl_index, self.ddl_metadata, ddl, {"ddl": ddl}
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        ids = self._add_batch_to_index(
+            self.ddl_index, self.ddl_metadata, ddls, [{"ddl": ddl} for ddl in ddls]
         )
         self._save_index(self.ddl_index, "ddl_index.faiss")
         self._save_metadata(self.ddl_metadata, "ddl_metadata.json")
-        return entry_id
+        return ids
 
-    def add_documentation(self, documentation: str, **kwargs) -> str:
-        entry_id = self._add_to_index(
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        ids = self._add_batch_to_index(
             self.doc_index,
             self.doc_metadata,
-            documentation,
-            {"documentation": documentation},
+            documentations,
+            [{"documentation": documentation} for documentation in documentations],
         )
         self._save_index(self.doc_index, "doc_index.faiss")
         self._save_metadata(self.doc_metadata, "doc_metadata.json")
-        return entry_id
+        return ids
 
-    def _get_similar(self, index, metadata_list, text, n_results) -> list:
-        embedding = self.generate_embedding(text)
+    def _get_similar(
+        self, index, metadata_list, text, n_results, embedding=None
+    ) -> list:
+        if embedding is None:
+            embedding = self.generate_embedding(text)
         D, I = index.search(np.array([embedding], dtype=np.float32), k=n_results)
         return (
             [] if len(I[0]) == 0 or I[0][0] == -1 else [metadata_list[i] for i in I[0]]
@@ -228,3 +271,35 @@ class FAISS(VannaBase):
 
             return True
         return False
+
+    def get_related_context(self, question: str, **kwargs) -> Tuple[list, list, list]:
+        if self._retrieval_overridden(FAISS):
+            return VannaBase.get_related_context(self, question, **kwargs)
+
+        # Embedding dominates; the in-process searches are fast enough to run
+        # one after another once the question is embedded
+        embedding = self.generate_embedding(question)
+        question_sql_list = self._get_similar(
+            self.sql_index, self.sql_metadata, question, self.n_results_sql, embedding
+        )
+        ddl_list = [
+            metadata["ddl"]
+            for metadata in self._get_similar(
+                self.ddl_index,
+                self.ddl_metadata,
+                question,
+                self.n_results_ddl,
+                embedding,
+            )
+        ]
+        doc_list = [
+            metadata["documentation"]
+            for metadata in self._get_similar(
+                self.doc_index,
+                self.doc_metadata,
+                question,
+                self.n_results_documentation,
+                embedding,
+            )
+        ]
+        return question_sql_list, ddl_list, doc_list
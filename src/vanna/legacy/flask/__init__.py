@@ -2,8 +2,6 @@ import json
 import logging
 import os
 import sys
-import uuid
-from abc import ABC, abstractmethod
 from functools import wraps
 import importlib.metadata
 
@@ -16,80 +14,7 @@ from flask_sock import Sock
 from ..base import VannaBase
 from .assets import css_content, html_content, js_content
 from .auth import AuthInterface, NoAuth
-
-
-class Cache(ABC):
-    """
-    Define the interface for a cache that can be used to store data in a Flask app.
-    """
-
-    @abstractmethod
-    def generate_id(self, *args, **kwargs):
-        """
-        Generate a unique ID for the cache.
-        """
-        pass
-
-    @abstractmethod
-    def get(self, id, field):
-        """
-        Get a value from the cache.
-        """
-        pass
-
-    @abstractmethod
-    def get_all(self, field_list) -> list:
-        """
-        Get all values from the cache.
-        """
-        pass
-
-    @abstractmethod
-    def set(self, id, field, value):
-        """
-        Set a value in the cache.
-        """
-        pass
-
-    @abstractmethod
-    def delete(self, id):
-        """
-        Delete a value from the cache.
-        """
-        pass
-
-
-class MemoryCache(Cache):
-    def __init__(self):
-        self.cache = {}
-
-    def generate_id(self, *args, **kwargs):
-        return str(uuid.uuid4())
-
-    def set(self, id, field, value):
-        if id not in self.cache:
-            self.cache[id] = {}
-
-        self.cache[id][field] = value
-
-    def get(self, id, field):
-        if id not in self.cache:
-            return None
-
-        if field not in self.cache[id]:
-            return None
-
-        return self.cache[id][field]
-
-    def get_all(self, field_list) -> list:
-        return [
-            {"id": id, **{field: self.get(id=id, field=field) for field in field_list}}
-            for id in self.cache
-        ]
-
-    def delete(self, id):
-        if id in self.cache:
-            del self.cache[id]
+from .cache import Cache, MemoryCache
 
 
 class VannaFlaskAPI:
@@ -743,11 +668,27 @@ class VannaFlaskAPI:
         @self.requires_auth
         def get_training_data(user: any):
             """
-            Get all training data
+            Get all training data, or a filtered page of it
             ---
             parameters:
               - name: user
                 in: query
+              - name: training_data_type
+                in: query
+                type: string
+                required: false
+              - name: search
+                in: query
+                type: string
+                required: false
+              - name: limit
+                in: query
+                type: integer
+                required: false
+              - name: offset
+                in: query
+                type: integer
+                required: false
             responses:
               200:
                 schema:
@@ -762,7 +703,19 @@ class VannaFlaskAPI:
                     df:
                       type: object
             """
-            df = vn.get_training_data()
+            args = flask.request.args
+            if any(
+                key in args
+                for key in ["training_data_type", "search", "limit", "offset"]
+            ):
+                df = vn.get_training_data_page(
+                    training_data_type=args.get("training_data_type"),
+                    search=args.get("search"),
+                    limit=args.get("limit", type=int),
+                    offset=args.get("offset", 0, type=int),
+                )
+            else:
+                df = vn.get_training_data()
 
             if df is None or len(df) == 0:
                 return jsonify(
@@ -0,0 +1,307 @@
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from importlib.util import find_spec
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class Cache(ABC):
+    """
+    Define the interface for a cache that can be used to store data in a Flask app.
+    """
+
+    @abstractmethod
+    def generate_id(self, *args, **kwargs):
+        """
+        Generate a unique ID for the cache.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, id, field):
+        """
+        Get a value from the cache.
+        """
+        pass
+
+    @abstractmethod
+    def get_all(self, field_list) -> list:
+        """
+        Get all values from the cache.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, id, field, value):
+        """
+        Set a value in the cache.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, id):
+        """
+        Delete a value from the cache.
+        """
+        pass
+
+
+class _SpilledDataFrame:
+    """
+    Placeholder for a DataFrame written to a Parquet file.
+    """
+
+    __slots__ = ("path",)
+
+    def __init__(self, path):
+        self.path = path
+
+
+def _sizeof(value) -> int:
+    """
+    Approximate the memory used by a cached value, in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, _SpilledDataFrame):
+        return sys.getsizeof(value.path)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _sizeof(k) + _sizeof(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class MemoryCache(Cache):
+    """
+    In-memory cache bounded by entry count and memory.
+
+    Each id - one question, with its sql, df, fig_json, summary and so on -
+    is an entry. Once there are more than ``max_entries`` entries, or they
+    take up more than ``max_bytes``, the least recently used entries are
+    evicted. Entries also expire ``ttl_seconds`` after they are created.
+
+    DataFrames larger than ``spill_threshold_bytes`` are written to Parquet
+    files in ``spill_directory`` (a temporary directory by default) and read
+    back on access. Spilling needs pyarrow or fastparquet; without either,
+    DataFrames stay in memory.
+
+    Entries are also indexed in creation order, so ``get_all`` lists the
+    question history oldest first without sorting.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float = 24 * 60 * 60,
+        spill_threshold_bytes: int = 16 * 1024 * 1024,
+        spill_directory: str = None,
+    ):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted.
+            max_bytes: Approximate memory the entries may take up. Spilled DataFrames do not count.
+            ttl_seconds: Seconds after creation an entry expires, or None to keep entries until evicted.
+            spill_threshold_bytes: DataFrames larger than this are spilled to Parquet, or None to never spill.
+            spill_directory: Directory for spilled DataFrames. Defaults to a temporary directory.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.spill_directory = spill_directory
+
+        self._can_spill = bool(find_spec("pyarrow") or find_spec("fastparquet"))
+
+        # id -> {field: value}, least recently used first
+        self.cache = OrderedDict()
+        # id -> creation time, oldest first; the question history index
+        self._created = OrderedDict()
+        # id -> {field: approximate size in bytes}
+        self._sizes = {}
+        self._bytes = 0
+        self._temp_directory = None
+        self._warned_spill = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.cache)
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Approximate memory used by the cached values, in bytes.
+        """
+        return self._bytes
+
+    def generate_id(self, *args, **kwargs):
+        return str(uuid.uuid4())
+
+    def _spill_path(self):
+        directory = self.spill_directory
+        if directory is None:
+            if self._temp_directory is None:
+                self._temp_directory = tempfile.mkdtemp(prefix="vanna-flask-cache-")
+            directory = self._temp_directory
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{uuid.uuid4().hex}.parquet")
+
+    def _maybe_spill(self, value):
+        if (
+            self.spill_threshold_bytes is None
+            or not isinstance(value, pd.DataFrame)
+            or _sizeof(value) <= self.spill_threshold_bytes
+        ):
+            return value
+
+        if not self._can_spill:
+            if not self._warned_spill:
+                logger.warning(
+                    "Neither pyarrow nor fastparquet is installed, so large "
+                    "DataFrames are kept in memory. Install with: pip install pyarrow"
+                )
+                self._warned_spill = True
+            return value
+
+        path = self._spill_path()
+        try:
+            value.to_parquet(path)
+        except Exception as e:
+            # E.g. non-string column names, which Parquet can not store
+            logger.debug(f"Could not spill DataFrame to {path}: {e}")
+            if os.path.exists(path):
+                os.remove(path)
+            return value
+        return _SpilledDataFrame(path)
+
+    @staticmethod
+    def _discard(value):
+        if isinstance(value, _SpilledDataFrame):
+            try:
+                os.remove(value.path)
+            except OSError:
+                pass
+
+    def _remove(self, id):
+        fields = self.cache.pop(id, None)
+        if fields is None:
+            return
+        for value in fields.values():
+            self._discard(value)
+        self._bytes -= sum(self._sizes.pop(id, {}).values())
+        self._created.pop(id, None)
+
+    def _expired(self, id, now) -> bool:
+        return (
+            self.ttl_seconds is not None and now - self._created[id] >= self.ttl_seconds
+        )
+
+    def _expire(self):
+        # Entries expire in creation order, so only the oldest need checking
+        now = time.time()
+        while self._created:
+            id = next(iter(self._created))
+            if not self._expired(id, now):
+                break
+            self._remove(id)
+
+    def _evict(self, keep):
+        while len(self.cache) > self.max_entries or (
+            self._bytes > self.max_bytes and len(self.cache) > 1
+        ):
+            id = next(iter(self.cache))
+            if id == keep:
+                # The entry being written is never evicted by its own write
+                self.cache.move_to_end(id)
+                id = next(iter(self.cache))
+            self._remove(id)
+
+    def set(self, id, field, value):
+        with self._lock:
+            self._expire()
+
+            if id not in self.cache:
+                self.cache[id] = {}
+                self._created[id] = time.time()
+                self._sizes[id] = {}
+            self.cache.move_to_end(id)
+
+            fields = self.cache[id]
+            if field in fields:
+                self._discard(fields[field])
+                self._bytes -= self._sizes[id].pop(field, 0)
+
+            stored = self._maybe_spill(value)
+            fields[field] = stored
+            self._sizes[id][field] = _sizeof(stored)
+            self._bytes += self._sizes[id][field]
+
+            self._evict(keep=id)
+
+    @staticmethod
+    def _load(value):
+        if isinstance(value, _SpilledDataFrame):
+            try:
+                return pd.read_parquet(value.path)
+            except OSError:
+                # Evicted by another request while being read
+                return None
+        return value
+
+    def get(self, id, field):
+        with self._lock:
+            if id not in self.cache:
+                return None
+
+            if self._expired(id, time.time()):
+                self._remove(id)
+                return None
+
+            self.cache.move_to_end(id)
+            value = self.cache[id].get(field)
+
+        return self._load(value)
+
+    def get_all(self, field_list) -> list:
+        # Listing the history does not count as using the entries
+        with self._lock:
+            self._expire()
+            rows = [
+                {"id": id, **{field: self.cache[id].get(field) for field in field_list}}
+                for id in self._created
+            ]
+        for row in rows:
+            for field in field_list:
+                row[field] = self._load(row[field])
+        return rows
+
+    def delete(self, id):
+        with self._lock:
+            self._remove(id)
+
+    def clear(self):
+        """
+        Remove all entries and their spilled DataFrames.
+        """
+        with self._lock:
+            for id in list(self.cache):
+                self._remove(id)
+            if self._temp_directory is not None:
+                shutil.rmtree(self._temp_directory, ignore_errors=True)
+                self._temp_directory = None
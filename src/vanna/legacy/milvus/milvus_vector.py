@@ -1,10 +1,11 @@
-import uuid
-from typing import List
+import json
+from typing import List, Tuple
 
 import pandas as pd
 from pymilvus import DataType, MilvusClient, model
 
 from ..base import VannaBase
+from ..utils import deterministic_uuid
 
 # Setting the URI as a local file, e.g.`./milvus.db`,
 # is the most convenient method, as it automatically utilizes Milvus Lite
@@ -168,38 +169,69 @@ class Milvus_VectorStore(VannaBase):
                 consistency_level="Strong",
             )
 
+    def _upsert(
+        self, collection_name: str, rows: List[dict], texts: List[str]
+    ) -> List[str]:
+        # Ids are content hashes, so re-adding the same content overwrites it
+        unique = {row["id"]: (row, text) for row, text in zip(rows, texts)}
+        if unique:
+            # Embedded with the same function as the encode_queries retrieval,
+            # even when a subclass overrides generate_embedding
+            embeddings = self.embedding_function.encode_documents(
+                [text for _, text in unique.values()]
+            )
+            self.milvus_client.upsert(
+                collection_name=collection_name,
+                data=[
+                    {**row, "vector": embedding}
+                    for (row, _), embedding in zip(unique.values(), embeddings)
+                ],
+            )
+        return [row["id"] for row in rows]
+
     def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
-        if len(question) == 0 or len(sql) == 0:
+        return self.add_question_sqls([(question, sql)], **kwargs)[0]
+
+    def add_ddl(self, ddl: str, **kwargs) -> str:
+        return self.add_ddls([ddl], **kwargs)[0]
+
+    def add_documentation(self, documentation: str, **kwargs) -> str:
+        return self.add_documentations([documentation], **kwargs)[0]
+
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        if any(len(question) == 0 or len(sql) == 0 for question, sql in question_sqls):
             raise Exception("pair of question and sql can not be null")
-        _id = str(uuid.uuid4()) + "-sql"
-        embedding = self.embedding_function.encode_documents([question])[0]
-        self.milvus_client.insert(
-            collection_name="vannasql",
-            data={"id": _id, "text": question, "sql": sql, "vector": embedding},
+        rows = [
+            {
+                "id": deterministic_uuid(
+                    json.dumps({"question": question, "sql": sql}, ensure_ascii=False)
+                )
+                + "-sql",
+                "text": question,
+                "sql": sql,
+            }
+            for question, sql in question_sqls
+        ]
+        return self._upsert(
+            "vannasql", rows, [question for question, _ in question_sqls]
         )
-        return _id
 
-    def add_ddl(self, ddl: str, **kwargs) -> str:
-        if len(ddl) == 0:
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        if any(len(ddl) == 0 for ddl in ddls):
             raise Exception("ddl can not be null")
-        _id = str(uuid.uuid4()) + "-ddl"
-        embedding = self.embedding_function.encode_documents([ddl])[0]
-        self.milvus_client.insert(
-            collection_name="vannaddl",
-            data={"id": _id, "ddl": ddl, "vector": embedding},
-        )
-        return _id
+        rows = [{"id": deterministic_uuid(ddl) + "-ddl", "ddl": ddl} for ddl in ddls]
+        return self._upsert("vannaddl", rows, ddls)
 
-    def add_documentation(self, documentation: str, **kwargs) -> str:
-        if len(documentation) == 0:
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        if any(len(documentation) == 0 for documentation in documentations):
             raise Exception("documentation can not be null")
-        _id = str(uuid.uuid4()) + "-doc"
-        embedding = self.embedding_function.encode_documents([documentation])[0]
-        self.milvus_client.insert(
-            collection_name="vannadoc",
-            data={"id": _id, "doc": documentation, "vector": embedding},
-        )
-        return _id
+        rows = [
+            {"id": deterministic_uuid(documentation) + "-doc", "doc": documentation}
+            for documentation in documentations
+        ]
+        return self._upsert("vannadoc", rows, documentations)
 
     def get_training_data(self, **kwargs) -> pd.DataFrame:
         sql_data = self.milvus_client.query(
@@ -1,11 +1,12 @@
 import base64
-import uuid
-from typing import List
+import json
+from typing import List, Tuple
 
 import pandas as pd
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, helpers
 
 from ..base import VannaBase
+from ..utils import deterministic_uuid
 
 
 class OpenSearch_VectorStore(VannaBase):
@@ -239,7 +240,7 @@ class OpenSearch_VectorStore(VannaBase):
 
     def add_ddl(self, ddl: str, **kwargs) -> str:
         # Assuming that you have a DDL index in your OpenSearch
-        id = str(uuid.uuid4()) + "-ddl"
+        id = deterministic_uuid(ddl) + "-ddl"
         ddl_dict = {"ddl": ddl}
         response = self.client.index(
             index=self.ddl_index, body=ddl_dict, id=id, **kwargs
@@ -248,7 +249,7 @@ class OpenSearch_VectorStore(VannaBase):
 
     def add_documentation(self, doc: str, **kwargs) -> str:
         # Assuming you have a documentation index in your OpenSearch
-        id = str(uuid.uuid4()) + "-doc"
+        id = deterministic_uuid(doc) + "-doc"
         doc_dict = {"doc": doc}
         response = self.client.index(
             index=self.document_index, id=id, body=doc_dict, **kwargs
@@ -257,13 +258,55 @@ class OpenSearch_VectorStore(VannaBase):
 
     def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
         # Assuming you have a Questions and SQL index in your OpenSearch
-        id = str(uuid.uuid4()) + "-sql"
         question_sql_dict = {"question": question, "sql": sql}
+        id = (
+            deterministic_uuid(json.dumps(question_sql_dict, ensure_ascii=False))
+            + "-sql"
+        )
         response = self.client.index(
             index=self.question_sql_index, body=question_sql_dict, id=id, **kwargs
         )
         return response["_id"]
 
+    def _bulk_index(self, index: str, sources: List[dict], ids: List[str]) -> List[str]:
+        # Content-hash ids make re-indexing the same content an overwrite
+        actions = [
+            {"_index": index, "_id": id, "_source": source}
+            for id, source in dict(zip(ids, sources)).items()
+        ]
+        if actions:
+            helpers.bulk(self.client, actions)
+        return ids
+
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        return self._bulk_index(
+            self.ddl_index,
+            [{"ddl": ddl} for ddl in ddls],
+            [deterministic_uuid(ddl) + "-ddl" for ddl in ddls],
+        )
+
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        return self._bulk_index(
+            self.document_index,
+            [{"doc": doc} for doc in documentations],
+            [deterministic_uuid(doc) + "-doc" for doc in documentations],
+        )
+
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        sources = [
+            {"question": question, "sql": sql} for question, sql in question_sqls
+        ]
+        return self._bulk_index(
+            self.question_sql_index,
+            sources,
+            [
+                deterministic_uuid(json.dumps(source, ensure_ascii=False)) + "-sql"
+                for source in sources
+            ],
+        )
+
     def get_related_ddl(self, question: str, **kwargs) -> List[str]:
         # Assume you have some vector search mechanism associated with your data
         query = {"query": {"match": {"ddl": question}}}
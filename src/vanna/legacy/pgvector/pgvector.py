@@ -1,7 +1,7 @@
 import ast
 import json
 import logging
-import uuid
+from typing import List, Tuple
 
 import pandas as pd
 from langchain_core.documents import Document
@@ -11,6 +11,7 @@ from sqlalchemy import create_engine, text
 from .. import ValidationError
 from ..base import VannaBase
 from ..types import TrainingPlan, TrainingPlanItem
+from ..utils import deterministic_uuid
 
 
 class PG_VectorStore(VannaBase):
@@ -26,6 +27,13 @@ class PG_VectorStore(VannaBase):
             self.connection_string = config.get("connection_string")
             self.n_results = config.get("n_results", 10)
 
+        # One pooled engine shared by the collections and the training data queries
+        self.engine = create_engine(
+            self.connection_string,
+            pool_size=config.get("pool_size", 5),
+            pool_pre_ping=True,
+        )
+
         if config and "embedding_function" in config:
             self.embedding_function = config.get("embedding_function")
         else:
@@ -38,54 +46,80 @@ class PG_VectorStore(VannaBase):
         self.sql_collection = PGVector(
             embeddings=self.embedding_function,
             collection_name="sql",
-            connection=self.connection_string,
+            connection=self.engine,
         )
         self.ddl_collection = PGVector(
             embeddings=self.embedding_function,
             collection_name="ddl",
-            connection=self.connection_string,
+            connection=self.engine,
         )
         self.documentation_collection = PGVector(
             embeddings=self.embedding_function,
             collection_name="documentation",
-            connection=self.connection_string,
+            connection=self.engine,
         )
 
-    def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
-        question_sql_json = json.dumps(
+    @staticmethod
+    def _question_sql_document(question: str, sql: str) -> str:
+        return json.dumps(
             {
                 "question": question,
                 "sql": sql,
             },
             ensure_ascii=False,
         )
-        id = str(uuid.uuid4()) + "-sql"
-        createdat = kwargs.get("createdat")
-        doc = Document(
-            page_content=question_sql_json,
-            metadata={"id": id, "createdat": createdat},
-        )
-        self.sql_collection.add_documents([doc], ids=[doc.metadata["id"]])
 
-        return id
+    @staticmethod
+    def _add_documents(collection, contents: List[str], suffix: str, **metadata):
+        # Content-hash ids make adding the same content again an upsert
+        ids = [deterministic_uuid(content) + suffix for content in contents]
+        unique = dict(zip(ids, contents))
+        if unique:
+            collection.add_documents(
+                [
+                    Document(page_content=content, metadata={"id": id, **metadata})
+                    for id, content in unique.items()
+                ],
+                ids=list(unique.keys()),
+            )
+        return ids
+
+    def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
+        return self._add_documents(
+            self.sql_collection,
+            [self._question_sql_document(question, sql)],
+            "-sql",
+            createdat=kwargs.get("createdat"),
+        )[0]
 
     def add_ddl(self, ddl: str, **kwargs) -> str:
-        _id = str(uuid.uuid4()) + "-ddl"
-        doc = Document(
-            page_content=ddl,
-            metadata={"id": _id},
-        )
-        self.ddl_collection.add_documents([doc], ids=[doc.metadata["id"]])
-        return _id
+        return self._add_documents(self.ddl_collection, [ddl], "-ddl")[0]
 
     def add_documentation(self, documentation: str, **kwargs) -> str:
-        _id = str(uuid.uuid4()) + "-doc"
-        doc = Document(
-            page_content=documentation,
-            metadata={"id": _id},
+        return self._add_documents(
+            self.documentation_collection, [documentation], "-doc"
+        )[0]
+
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        return self._add_documents(
+            self.sql_collection,
+            [
+                self._question_sql_document(question, sql)
+                for question, sql in question_sqls
+            ],
+            "-sql",
+            createdat=kwargs.get("createdat"),
+        )
+
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        return self._add_documents(self.ddl_collection, ddls, "-ddl")
+
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        return self._add_documents(
+            self.documentation_collection, documentations, "-doc"
         )
-        self.documentation_collection.add_documents([doc], ids=[doc.metadata["id"]])
-        return _id
 
     def get_collection(self, collection_name):
         match collection_name:
@@ -116,6 +150,27 @@ class PG_VectorStore(VannaBase):
         )
         return [document.page_content for document in documents]
 
+    def get_related_context(self, question: str, **kwargs) -> tuple[list, list, list]:
+        if self._retrieval_overridden(PG_VectorStore):
+            return VannaBase.get_related_context(self, question, **kwargs)
+
+        # Embed the question once, rather than once per collection
+        embedding = self.embedding_function.embed_query(question)
+
+        def query(collection):
+            return collection.similarity_search_by_vector(embedding, k=self.n_results)
+
+        sql_documents, ddl_documents, documentation_documents = self._run_retrievals(
+            lambda: query(self.sql_collection),
+            lambda: query(self.ddl_collection),
+            lambda: query(self.documentation_collection),
+        )
+        return (
+            [ast.literal_eval(document.page_content) for document in sql_documents],
+            [document.page_content for document in ddl_documents],
+            [document.page_content for document in documentation_documents],
+        )
+
     def train(
         self,
         question: str | None = None,
@@ -142,75 +197,110 @@ class PG_VectorStore(VannaBase):
             return self.add_ddl(ddl)
 
         if plan:
-            for item in plan._plan:
-                if item.item_type == TrainingPlanItem.ITEM_TYPE_DDL:
-                    self.add_ddl(item.item_value)
-                elif item.item_type == TrainingPlanItem.ITEM_TYPE_IS:
-                    self.add_documentation(item.item_value)
-                elif (
-                    item.item_type == TrainingPlanItem.ITEM_TYPE_SQL and item.item_name
-                ):
-                    self.add_question_sql(question=item.item_name, sql=item.item_value)
+            self._train_plan(
+                item
+                for item in plan
+                if item.item_type != TrainingPlanItem.ITEM_TYPE_SQL or item.item_name
+            )
+
+    # Suffix of the training data ids -> training data type
+    _training_data_types = {"sql": "sql", "ddl": "ddl", "doc": "documentation"}
 
     def get_training_data(self, **kwargs) -> pd.DataFrame:
-        # Establishing the connection
-        engine = create_engine(self.connection_string)
-
-        # Querying the 'langchain_pg_embedding' table
-        query_embedding = "SELECT cmetadata, document FROM langchain_pg_embedding"
-        df_embedding = pd.read_sql(query_embedding, engine)
-
-        # List to accumulate the processed rows
-        processed_rows = []
-
-        # Process each row in the DataFrame
-        for _, row in df_embedding.iterrows():
-            custom_id = row["cmetadata"]["id"]
-            document = row["document"]
-            training_data_type = (
-                "documentation" if custom_id[-3:] == "doc" else custom_id[-3:]
+        return self.get_training_data_page(**kwargs)
+
+    def get_training_data_page(
+        self,
+        training_data_type: str | None = None,
+        search: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        **kwargs,
+    ) -> pd.DataFrame:
+        # Filter and page in the database rather than reading the whole table
+        suffixes = [
+            suffix
+            for suffix, data_type in self._training_data_types.items()
+            if training_data_type is None or data_type == training_data_type
+        ]
+        params = {f"suffix_{i}": f"%-{suffix}" for i, suffix in enumerate(suffixes)}
+        id_matches = " OR ".join(f"cmetadata ->> 'id' LIKE :{name}" for name in params)
+        conditions = [f"({id_matches or 'FALSE'})"]
+        if search:
+            # Match the question and SQL of question-SQL pairs rather than
+            # their JSON; older rows that are not JSON are matched as text
+            conditions.append(
+                """CASE WHEN cmetadata ->> 'id' LIKE :sql_suffix
+                    AND left(document, 2) = '{"'
+                THEN strpos(lower(document::jsonb ->> 'question'), lower(:search)) > 0
+                    OR strpos(lower(document::jsonb ->> 'sql'), lower(:search)) > 0
+                ELSE strpos(lower(document), lower(:search)) > 0 END"""
             )
+            params["search"] = search
+            params["sql_suffix"] = "%-sql"
 
-            if training_data_type == "sql":
-                # Convert the document string to a dictionary
-                try:
-                    doc_dict = ast.literal_eval(document)
-                    question = doc_dict.get("question")
-                    content = doc_dict.get("sql")
-                except (ValueError, SyntaxError):
-                    logging.info(
-                        f"Skipping row with custom_id {custom_id} due to parsing error."
-                    )
-                    continue
-            elif training_data_type in ["documentation", "ddl"]:
-                question = None  # Default value for question
-                content = document
-            else:
-                # If the suffix is not recognized, skip this row
+        query = (
+            "SELECT cmetadata ->> 'id' AS id, document FROM langchain_pg_embedding "
+            f"WHERE {' AND '.join(conditions)} ORDER BY langchain_pg_embedding.id"
+        )
+        if limit is not None:
+            query += " LIMIT :limit"
+            params["limit"] = limit
+        if offset:
+            query += " OFFSET :offset"
+            params["offset"] = offset
+
+        df = pd.read_sql(text(query), self.engine, params=params)
+        return self._expand_training_data(df)
+
+    @classmethod
+    def _expand_training_data(cls, df: pd.DataFrame) -> pd.DataFrame:
+        df["training_data_type"] = df["id"].str[-3:].map(cls._training_data_types)
+        df["question"] = None
+        df["content"] = df["document"]
+
+        is_sql = (df["training_data_type"] == "sql").to_numpy()
+        if is_sql.any():
+            documents = df.loc[is_sql, "document"].tolist()
+            try:
+                # Parse all the question-SQL pairs in one go
+                pairs = json.loads("[" + ",".join(documents) + "]")
+            except ValueError:
+                pairs = None
+            if pairs is None or len(pairs) != len(documents):
+                pairs = [cls._parse_question_sql(document) for document in documents]
+            # Anything but a question-SQL object is a parsing failure
+            pairs = [pair if isinstance(pair, dict) else None for pair in pairs]
+            parsed = pd.DataFrame(
+                [pair or {} for pair in pairs], columns=["question", "sql"]
+            )
+            df.loc[is_sql, "question"] = parsed["question"].to_numpy()
+            df.loc[is_sql, "content"] = parsed["sql"].to_numpy()
+
+            failed = df.index[is_sql][[pair is None for pair in pairs]]
+            for custom_id in df.loc[failed, "id"]:
                 logging.info(
-                    f"Skipping row with custom_id {custom_id} due to unrecognized training data type."
+                    f"Skipping row with custom_id {custom_id} due to parsing error."
                 )
-                continue
-
-            # Append the processed data to the list
-            processed_rows.append(
-                {
-                    "id": custom_id,
-                    "question": question,
-                    "content": content,
-                    "training_data_type": training_data_type,
-                }
-            )
+            df = df.drop(index=failed)
 
-        # Create a DataFrame from the list of processed rows
-        df_processed = pd.DataFrame(processed_rows)
+        return df[["id", "question", "content", "training_data_type"]].reset_index(
+            drop=True
+        )
 
-        return df_processed
+    @staticmethod
+    def _parse_question_sql(document: str) -> dict | None:
+        # Documents are JSON, but older rows may not be
+        try:
+            return json.loads(document)
+        except ValueError:
+            pass
+        try:
+            return ast.literal_eval(document)
+        except (ValueError, SyntaxError):
+            return None
 
     def remove_training_data(self, id: str, **kwargs) -> bool:
-        # Create the database engine
-        engine = create_engine(self.connection_string)
-
         # SQL DELETE statement
         delete_statement = text(
             """
@@ -220,7 +310,7 @@ class PG_VectorStore(VannaBase):
         )
 
         # Connect to the database and execute the delete statement
-        with engine.connect() as connection:
+        with self.engine.connect() as connection:
             # Start a transaction
             with connection.begin() as transaction:
                 try:
@@ -236,8 +326,6 @@ class PG_VectorStore(VannaBase):
                     return False
 
     def remove_collection(self, collection_name: str) -> bool:
-        engine = create_engine(self.connection_string)
-
         # Determine the suffix to look for based on the collection name
         suffix_map = {"ddl": "ddl", "sql": "sql", "documentation": "doc"}
         suffix = suffix_map.get(collection_name)
@@ -250,17 +338,17 @@ class PG_VectorStore(VannaBase):
 
         # SQL query to delete rows based on the condition
         query = text(
-            f"""
+            """
             DELETE FROM langchain_pg_embedding
-            WHERE cmetadata->>'id' LIKE '%{suffix}'
+            WHERE cmetadata->>'id' LIKE :pattern
         """
         )
 
         # Execute the deletion within a transaction block
-        with engine.connect() as connection:
+        with self.engine.connect() as connection:
             with connection.begin() as transaction:
                 try:
-                    result = connection.execute(query)
+                    result = connection.execute(query, {"pattern": f"%{suffix}"})
                     transaction.commit()  # Explicitly commit the transaction
                     if result.rowcount > 0:
                         logging.info(
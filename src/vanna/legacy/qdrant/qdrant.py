@@ -136,6 +136,49 @@ class Qdrant_VectorStore(VannaBase):
 
         return self._format_point_id(id, self.documentation_collection_name)
 
+    def _upsert_texts(
+        self, collection_name: str, texts: List[str], payloads: List[dict]
+    ) -> List[str]:
+        ids = [deterministic_uuid(text) for text in texts]
+        # Keep the last of duplicate points, as a single upsert would
+        unique = {
+            id: (text, payload) for id, text, payload in zip(ids, texts, payloads)
+        }
+        if unique:
+            embeddings = self.generate_embeddings([text for text, _ in unique.values()])
+            self._client.upsert(
+                collection_name,
+                points=[
+                    models.PointStruct(id=id, vector=embedding, payload=payload)
+                    for (id, (_, payload)), embedding in zip(unique.items(), embeddings)
+                ],
+            )
+        return [self._format_point_id(id, collection_name) for id in ids]
+
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        return self._upsert_texts(
+            self.sql_collection_name,
+            [
+                "Question: {0}\n\nSQL: {1}".format(question, sql)
+                for question, sql in question_sqls
+            ],
+            [{"question": question, "sql": sql} for question, sql in question_sqls],
+        )
+
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        return self._upsert_texts(
+            self.ddl_collection_name, ddls, [{"ddl": ddl} for ddl in ddls]
+        )
+
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        return self._upsert_texts(
+            self.documentation_collection_name,
+            documentations,
+            [{"documentation": documentation} for documentation in documentations],
+        )
+
     def get_training_data(self, **kwargs) -> pd.DataFrame:
         df = pd.DataFrame()
 
@@ -258,6 +301,32 @@ class Qdrant_VectorStore(VannaBase):
 
         return [result.payload["documentation"] for result in results]
 
+    def get_related_context(self, question: str, **kwargs) -> Tuple[list, list, list]:
+        if self._retrieval_overridden(Qdrant_VectorStore):
+            return VannaBase.get_related_context(self, question, **kwargs)
+
+        # Embed the question once, rather than once per collection
+        embedding = self.generate_embedding(question)
+
+        def query(collection_name):
+            return self._client.query_points(
+                collection_name,
+                query=embedding,
+                limit=self.n_results,
+                with_payload=True,
+            ).points
+
+        sql_points, ddl_points, documentation_points = self._run_retrievals(
+            lambda: query(self.sql_collection_name),
+            lambda: query(self.ddl_collection_name),
+            lambda: query(self.documentation_collection_name),
+        )
+        return (
+            [dict(point.payload) for point in sql_points],
+            [point.payload["ddl"] for point in ddl_points],
+            [point.payload["documentation"] for point in documentation_points],
+        )
+
     def generate_embedding(self, data: str, **kwargs) -> List[float]:
         embedding_model = self._client._get_or_init_model(
             model_name=self.fastembed_model
@@ -266,6 +335,14 @@ class Qdrant_VectorStore(VannaBase):
 
         return embedding.tolist()
 
+    def generate_embeddings(self, data: List[str], **kwargs) -> List[List[float]]:
+        if self._embedding_overridden(Qdrant_VectorStore):
+            return VannaBase.generate_embeddings(self, data, **kwargs)
+        embedding_model = self._client._get_or_init_model(
+            model_name=self.fastembed_model
+        )
+        return [embedding.tolist() for embedding in embedding_model.embed(data)]
+
     def _get_all_points(self, collection_name: str):
         results: List[models.Record] = []
         next_offset = None
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Union
+from typing import Dict, Iterable, Iterator, List, Union
 
 
 @dataclass
@@ -235,6 +235,8 @@ class TrainingPlan:
     """
     A class representing a training plan. You can see what's in it, and remove items from it that you don't want trained.
 
+    A plan can be built lazily from an iterator of items. Iterating over the plan yields items as they are produced, so `vn.train(plan=plan)` can start training before the whole plan is built; the items are kept, so the plan can be iterated again.
+
     **Example:**
     ```python
     plan = vn.get_training_plan()
@@ -244,10 +246,41 @@ class TrainingPlan:
 
     """
 
-    _plan: List[TrainingPlanItem]
-
-    def __init__(self, plan: List[TrainingPlanItem]):
-        self._plan = plan
+    def __init__(self, plan: Iterable[TrainingPlanItem]):
+        if isinstance(plan, list):
+            self._items = plan
+            self._pending = None
+        else:
+            self._items = []
+            self._pending = iter(plan)
+
+    @property
+    def _plan(self) -> List[TrainingPlanItem]:
+        # Build the rest of a lazy plan
+        if self._pending is not None:
+            self._items.extend(self._pending)
+            self._pending = None
+        return self._items
+
+    @_plan.setter
+    def _plan(self, plan: List[TrainingPlanItem]):
+        self._items = plan
+        self._pending = None
+
+    def __iter__(self) -> Iterator[TrainingPlanItem]:
+        index = 0
+        while True:
+            if index < len(self._items):
+                yield self._items[index]
+                index += 1
+            elif self._pending is not None:
+                item = next(self._pending, None)
+                if item is None:
+                    self._pending = None
+                else:
+                    self._items.append(item)
+            else:
+                return
 
     def __str__(self):
         return "\n".join(self.get_summary())
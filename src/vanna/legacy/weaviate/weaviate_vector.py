@@ -1,9 +1,14 @@
+import json
+from typing import List, Tuple
+
 import weaviate
 import weaviate.classes as wvc
 from fastembed import TextEmbedding
 
 from vanna.base import VannaBase
 
+from ..utils import deterministic_uuid
+
 
 class WeaviateDatabase(VannaBase):
     def __init__(self, config=None):
@@ -18,6 +23,7 @@ class WeaviateDatabase(VannaBase):
         weaviate_port (num): Weaviate port while using local weaviate,
         weaviate_grpc (num): Weaviate gRPC port while using local weaviate,
         fastembed_model (str): Fastembed model name for text embeddings. BAAI/bge-small-en-v1.5 by default.
+        batch_size (num): Objects sent to weaviate per request when training in bulk. 100 by default.
 
         """
         super().__init__(config=config)
@@ -31,6 +37,7 @@ class WeaviateDatabase(VannaBase):
         self.weaviate_url = config.get("weaviate_url")
         self.weaviate_port = config.get("weaviate_port")
         self.weaviate_grpc_port = config.get("weaviate_grpc", 50051)
+        self.batch_size = config.get("batch_size", 100)
 
         if not self.weaviate_api_key and not self.weaviate_port:
             raise ValueError("Add proper credentials to connect to weaviate")
@@ -93,6 +100,11 @@ class WeaviateDatabase(VannaBase):
         embedding = next(embedding_model.embed(data))
         return embedding.tolist()
 
+    def generate_embeddings(self, data: List[str], **kwargs) -> List[List[float]]:
+        if self._embedding_overridden(WeaviateDatabase):
+            return VannaBase.generate_embeddings(self, data, **kwargs)
+        return [embedding.tolist() for embedding in self.embeddings.embed(data)]
+
     def _insert_data(self, cluster_key: str, data_object: dict, vector: list) -> str:
         self.weaviate_client.connect()
         response = self.weaviate_client.collections.get(
@@ -101,29 +113,71 @@ class WeaviateDatabase(VannaBase):
         self.weaviate_client.close()
         return response
 
-    def add_ddl(self, ddl: str, **kwargs) -> str:
-        data_object = {
-            "description": ddl,
+    def _insert_batch(
+        self, cluster_key: str, data_objects: List[dict], texts: List[str]
+    ) -> List[str]:
+        # Objects are keyed by a hash of their content, so adding the same
+        # content again replaces the object instead of duplicating it
+        uuids = [
+            deterministic_uuid(json.dumps(data_object, sort_keys=True))
+            for data_object in data_objects
+        ]
+        unique = {
+            uuid: (data_object, text)
+            for uuid, data_object, text in zip(uuids, data_objects, texts)
         }
-        response = self._insert_data("ddl", data_object, self.generate_embedding(ddl))
-        return f"{response}-ddl"
+        if unique:
+            vectors = self.generate_embeddings([text for _, text in unique.values()])
+            self.weaviate_client.connect()
+            try:
+                collection = self.weaviate_client.collections.get(
+                    self.training_data_cluster[cluster_key]
+                )
+                with collection.batch.fixed_size(batch_size=self.batch_size) as batch:
+                    for (uuid, (data_object, _)), vector in zip(
+                        unique.items(), vectors
+                    ):
+                        batch.add_object(
+                            properties=data_object, vector=vector, uuid=uuid
+                        )
+                # Batching does not raise on objects that failed to insert
+                failed = collection.batch.failed_objects
+                if failed:
+                    raise RuntimeError(
+                        f"Failed to insert {len(failed)} of {len(unique)} objects "
+                        f"into Weaviate: {failed[0].message}"
+                    )
+            finally:
+                self.weaviate_client.close()
+        return [f"{uuid}-{cluster_key}" for uuid in uuids]
+
+    def add_ddl(self, ddl: str, **kwargs) -> str:
+        return self.add_ddls([ddl], **kwargs)[0]
 
     def add_documentation(self, doc: str, **kwargs) -> str:
-        data_object = {
-            "description": doc,
-        }
-        response = self._insert_data("doc", data_object, self.generate_embedding(doc))
-        return f"{response}-doc"
+        return self.add_documentations([doc], **kwargs)[0]
 
     def add_question_sql(self, question: str, sql: str, **kwargs) -> str:
-        data_object = {
-            "sql": sql,
-            "natural_language_question": question,
-        }
-        response = self._insert_data(
-            "sql", data_object, self.generate_embedding(question)
+        return self.add_question_sqls([(question, sql)], **kwargs)[0]
+
+    def add_ddls(self, ddls: List[str], **kwargs) -> List[str]:
+        return self._insert_batch("ddl", [{"description": ddl} for ddl in ddls], ddls)
+
+    def add_documentations(self, documentations: List[str], **kwargs) -> List[str]:
+        return self._insert_batch(
+            "doc", [{"description": doc} for doc in documentations], documentations
+        )
+
+    def add_question_sqls(
+        self, question_sqls: List[Tuple[str, str]], **kwargs
+    ) -> List[str]:
+        data_objects = [
+            {"sql": sql, "natural_language_question": question}
+            for question, sql in question_sqls
+        ]
+        return self._insert_batch(
+            "sql", data_objects, [question for question, _ in question_sqls]
         )
-        return f"{response}-sql"
 
     def _query_collection(
         self, cluster_key: str, vector_input: list, return_properties: list
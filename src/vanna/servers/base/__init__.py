@@ -6,7 +6,14 @@ requests and responses.
 """
 
 from .chat_handler import ChatHandler
-from .models import ChatRequest, ChatStreamChunk, ChatResponse
+from .dataframe_handler import DataFrameHandler
+from .models import (
+    ChatRequest,
+    ChatStreamChunk,
+    ChatResponse,
+    DataFramePageRequest,
+    DataFramePageResponse,
+)
 from .templates import INDEX_HTML
 
 __all__ = [
@@ -14,5 +21,8 @@ __all__ = [
     "ChatRequest",
     "ChatStreamChunk",
     "ChatResponse",
+    "DataFrameHandler",
+    "DataFramePageRequest",
+    "DataFramePageResponse",
     "INDEX_HTML",
 ]
@@ -0,0 +1,283 @@
+"""
+Framework-agnostic paging of large DataFrame results.
+
+Large query results are streamed to the UI as a server-paginated
+``DataFrameComponent`` that only carries the first page. This handler serves
+further pages, sorting and filtering from the stored result artifact.
+"""
+
+import asyncio
+import functools
+import io
+import json
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+import pandas as pd
+
+from ...capabilities.file_system import FileSystem
+from ...core import Agent
+from ...core.tool import ToolContext
+from .models import DataFramePageRequest, DataFramePageResponse
+
+# Rows parsed per chunk while scanning a result artifact
+CHUNK_ROWS = 10_000
+
+# Dtype a column is widened to when a later chunk does not fit its schema
+_WIDER_DTYPES = {"boolean": "string", "Int64": "Float64", "Float64": "string"}
+
+
+class _SchemaWidened(Exception):
+    """A chunk did not fit the schema, which was widened; scan again."""
+
+
+def _infer_schema(chunk: pd.DataFrame) -> Dict[str, str]:
+    """Nullable dtypes for the columns of the first chunk."""
+    schema = {}
+    for column, dtype in chunk.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            schema[column] = "boolean"
+        elif pd.api.types.is_integer_dtype(dtype):
+            schema[column] = "Int64"
+        elif pd.api.types.is_float_dtype(dtype):
+            schema[column] = "Float64"
+        else:
+            schema[column] = "string"
+    return schema
+
+
+def _apply_schema(chunk: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """Cast a chunk to the schema, widening the schema if it does not fit."""
+    converted = {}
+    for column, dtype in schema.items():
+        try:
+            converted[column] = chunk[column].astype(dtype)
+        except (TypeError, ValueError):
+            # Widen to the first dtype this chunk fits; "string" always does
+            while True:
+                dtype = _WIDER_DTYPES[dtype]
+                try:
+                    chunk[column].astype(dtype)
+                    break
+                except (TypeError, ValueError):
+                    pass
+            schema[column] = dtype
+            raise _SchemaWidened(column)
+    return chunk.assign(**converted)
+
+
+def _read_chunks(stream: TextIO, schema: Dict[str, str]) -> Iterator[pd.DataFrame]:
+    """Read the CSV from the start in chunks cast to one schema.
+
+    An empty ``schema`` is filled in from the first chunk, so that every
+    chunk gets the same dtypes regardless of what pandas infers for it.
+    """
+    stream.seek(0)
+    for chunk in pd.read_csv(stream, chunksize=CHUNK_ROWS):
+        if not schema:
+            schema.update(_infer_schema(chunk))
+        yield _apply_schema(chunk, schema)
+
+
+def _matches(chunk: pd.DataFrame, needle: str) -> "pd.Series[bool]":
+    """Rows with a cell containing ``needle``, ignoring case; nulls never match."""
+    found = pd.Series(False, index=chunk.index)
+    for column in chunk.columns:
+        found |= (
+            chunk[column]
+            .astype("string")
+            .str.lower()
+            .str.contains(needle, regex=False)
+            .fillna(False)
+            .astype(bool)
+        )
+    return found
+
+
+def paginate_csv(
+    source: Union[str, TextIO],
+    *,
+    page: int,
+    page_size: int,
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+    search: Optional[str] = None,
+) -> Tuple[List[str], List[Dict[str, Any]], int]:
+    """Extract a single page from CSV content or a seekable text stream.
+
+    The CSV is scanned in chunks, so only one chunk is held as a DataFrame
+    at a time. Unsorted pages are collected during the scan. For sorted
+    pages the scan keeps just the sort keys of the rows that can still land
+    on or before the requested page, and a second scan reads back the rows
+    on the page.
+
+    All chunks are cast to the dtypes inferred from the first one. When a
+    later chunk does not fit (e.g. text in a numeric column), the column is
+    widened and the scan starts over.
+
+    Returns:
+        Tuple of (columns, rows on the page, total rows matching ``search``)
+    """
+    stream = io.StringIO(source) if isinstance(source, str) else source
+    schema: Dict[str, str] = {}
+    while True:
+        try:
+            return _paginate(
+                stream, schema, page, page_size, sort_by, ascending, search
+            )
+        except _SchemaWidened:
+            continue
+        except pd.errors.EmptyDataError:
+            return [], [], 0
+
+
+def _paginate(
+    stream: TextIO,
+    schema: Dict[str, str],
+    page: int,
+    page_size: int,
+    sort_by: Optional[str],
+    ascending: bool,
+    search: Optional[str],
+) -> Tuple[List[str], List[Dict[str, Any]], int]:
+    start = page * page_size
+    end = start + page_size
+    needle = search.strip().lower() if search and search.strip() else None
+
+    columns: List[str] = []
+    # Rows on the page when unsorted; the best sort keys so far when sorted
+    window: Optional[pd.DataFrame] = None
+    total = 0
+
+    for chunk in _read_chunks(stream, schema):
+        if not columns:
+            columns = chunk.columns.tolist()
+            if sort_by is not None and sort_by not in columns:
+                raise ValueError(f"Unknown sort column '{sort_by}'")
+
+        if needle is not None:
+            chunk = chunk[_matches(chunk, needle)]
+
+        seen = total
+        total += len(chunk)
+
+        if sort_by is not None:
+            # Stable sorts keep ties in file order, as earlier keys come first
+            keys = (
+                chunk[[sort_by]]
+                .sort_values(
+                    sort_by, ascending=ascending, kind="mergesort", na_position="last"
+                )
+                .head(end)
+            )
+            merged = keys if window is None else pd.concat([window, keys])
+            window = merged.sort_values(
+                sort_by, ascending=ascending, kind="mergesort", na_position="last"
+            ).head(end)
+        elif seen < end and total > start:
+            part = chunk.iloc[max(0, start - seen) : end - seen]
+            window = part if window is None else pd.concat([window, part])
+
+    if window is None:
+        return columns, [], total
+
+    if sort_by is not None:
+        # The index of a chunk is the row number in the file
+        positions = window.index[start:end]
+        if len(positions) == 0:
+            return columns, [], total
+        last = positions.max()
+        parts = []
+        for chunk in _read_chunks(stream, schema):
+            parts.append(chunk[chunk.index.isin(positions)])
+            if chunk.index[-1] >= last:
+                break
+        page_df = pd.concat(parts).loc[positions]
+    else:
+        page_df = window
+
+    rows = json.loads(page_df.to_json(orient="records", date_format="iso"))
+    return columns, rows, total
+
+
+class DataFrameHandler:
+    """Serves pages of server-paginated DataFrame results - framework agnostic."""
+
+    def __init__(
+        self,
+        agent: Agent,
+        file_system: Optional[FileSystem] = None,
+        max_page_size: int = 1000,
+    ):
+        """Initialize DataFrame handler.
+
+        Args:
+            agent: The agent whose user resolver scopes access to result files
+            file_system: FileSystem the result artifacts were written to
+                (defaults to LocalFileSystem, matching RunSqlTool)
+            max_page_size: Upper bound on rows returned for a single page
+        """
+        if file_system is None:
+            from ...integrations.local import LocalFileSystem
+
+            file_system = LocalFileSystem()
+
+        self.agent = agent
+        self.file_system = file_system
+        self.max_page_size = max_page_size
+
+    async def handle_page(self, request: DataFramePageRequest) -> DataFramePageResponse:
+        """Return one page of a stored result.
+
+        Args:
+            request: DataFrame page request
+
+        Returns:
+            Requested page of rows
+
+        Raises:
+            FileNotFoundError: If the result artifact does not exist for this user
+            PermissionError: If the source resolves outside the user's files
+            ValueError: If the sort column is unknown
+        """
+        user = await self.agent.user_resolver.resolve_user(request.request_context)
+        context = ToolContext(
+            user=user,
+            conversation_id=request.conversation_id or "",
+            request_id=str(uuid.uuid4()),
+            agent_memory=self.agent.agent_memory,
+            observability_provider=self.agent.observability_provider,
+            metadata=request.metadata,
+        )
+
+        if not await self.file_system.exists(request.source, context):
+            raise FileNotFoundError(f"Result '{request.source}' does not exist")
+
+        page_size = min(request.page_size, self.max_page_size)
+
+        # Parsing blocks, so it runs off the event loop on the streamed file
+        stream = await self.file_system.open_file(request.source, context)
+        try:
+            columns, rows, total = await asyncio.get_running_loop().run_in_executor(
+                None,
+                functools.partial(
+                    paginate_csv,
+                    stream,
+                    page=request.page,
+                    page_size=page_size,
+                    sort_by=request.sort_by,
+                    ascending=request.sort_direction == "asc",
+                    search=request.search,
+                ),
+            )
+        finally:
+            stream.close()
+
+        return DataFramePageResponse(
+            source=request.source,
+            columns=columns,
+            rows=rows,
+            page=request.page,
+            page_size=page_size,
+            total_rows=total,
+        )
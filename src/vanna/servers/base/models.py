@@ -4,7 +4,7 @@ Request and response models for server endpoints.
 
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -109,3 +109,37 @@ class ChatResponse(BaseModel):
             request_id=chunks[0].request_id,
             total_chunks=len(chunks),
         )
+
+
+class DataFramePageRequest(BaseModel):
+    """Request model for fetching a page of a server-paginated DataFrame."""
+
+    source: str = Field(description="Result artifact reference from the component")
+    page: int = Field(default=0, ge=0, description="Zero-based page index")
+    page_size: int = Field(default=25, ge=1, description="Rows per page")
+    sort_by: Optional[str] = Field(default=None, description="Column to sort by")
+    sort_direction: Literal["asc", "desc"] = Field(
+        default="asc", description="Sort direction"
+    )
+    search: Optional[str] = Field(
+        default=None, description="Case-insensitive substring filter across columns"
+    )
+    conversation_id: Optional[str] = Field(default=None, description="Conversation ID")
+    request_context: RequestContext = Field(
+        default_factory=RequestContext,
+        description="Request context for user resolution",
+    )
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict, description="Additional metadata"
+    )
+
+
+class DataFramePageResponse(BaseModel):
+    """A single page of rows from a server-paginated DataFrame."""
+
+    source: str = Field(description="Result artifact reference")
+    columns: List[str] = Field(description="Column names in display order")
+    rows: List[Dict[str, Any]] = Field(description="Rows on this page")
+    page: int = Field(description="Zero-based page index")
+    page_size: int = Field(description="Rows per page")
+    total_rows: int = Field(description="Total rows matching the search filter")
@@ -8,24 +8,51 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from ...capabilities.file_system import FileSystem
 from ...core import Agent
-from ..base import ChatHandler
-from .routes import register_chat_routes
+from ...integrations.local.metrics import InMemoryMetricsProvider
+from ..base import ChatHandler, DataFrameHandler
+from .routes import (
+    register_chat_routes,
+    register_dataframe_routes,
+    register_metrics_routes,
+    register_profile_routes,
+)
 
 
 class VannaFastAPIServer:
     """FastAPI server factory for Vanna Agents."""
 
-    def __init__(self, agent: Agent, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        agent: Agent,
+        config: Optional[Dict[str, Any]] = None,
+        file_system: Optional[FileSystem] = None,
+        metrics_provider: Optional[InMemoryMetricsProvider] = None,
+    ):
         """Initialize FastAPI server.
 
         Args:
             agent: The agent to serve (must have user_resolver configured)
             config: Optional server configuration
+            file_system: FileSystem that query results are written to, used to
+                serve pages of large results (defaults to LocalFileSystem)
+            metrics_provider: Metrics to expose on the ``metrics_path`` route
+                (default ``/metrics``); defaults to the agent's observability
+                provider when it is an InMemoryMetricsProvider
+
+        When the agent has a profiler, its captures are served to admins on
+        the ``profiles_path`` route (default ``/api/vanna/v2/profiles``).
         """
         self.agent = agent
         self.config = config or {}
         self.chat_handler = ChatHandler(agent)
+        self.dataframe_handler = DataFrameHandler(agent, file_system=file_system)
+        if metrics_provider is None and isinstance(
+            agent.observability_provider, InMemoryMetricsProvider
+        ):
+            metrics_provider = agent.observability_provider
+        self.metrics_provider = metrics_provider
 
     def create_app(self) -> FastAPI:
         """Create configured FastAPI app.
@@ -71,6 +98,20 @@ class VannaFastAPIServer:
 
         # Register routes
         register_chat_routes(app, self.chat_handler, self.config)
+        register_dataframe_routes(app, self.dataframe_handler)
+        if self.metrics_provider is not None:
+            register_metrics_routes(
+                app,
+                self.metrics_provider,
+                path=self.config.get("metrics_path", "/metrics"),
+            )
+        if self.agent.profiler is not None:
+            register_profile_routes(
+                app,
+                self.agent,
+                self.agent.profiler.store,
+                path=self.config.get("profiles_path", "/api/vanna/v2/profiles"),
+            )
 
         # Add health check
         @app.get("/health")
@@ -4,14 +4,24 @@ FastAPI route implementations for Vanna Agents.
 
 import json
 import traceback
-from typing import Any, AsyncGenerator, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, Optional, Sequence
 
 from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse, HTMLResponse
+from fastapi.responses import StreamingResponse, HTMLResponse, PlainTextResponse
 
-from ..base import ChatHandler, ChatRequest, ChatResponse
+from ..base import (
+    ChatHandler,
+    ChatRequest,
+    ChatResponse,
+    DataFrameHandler,
+    DataFramePageRequest,
+    DataFramePageResponse,
+)
 from ..base.templates import get_index_html
+from ...core import Agent
+from ...core.profiling import ProfileStore
 from ...core.user.request_context import RequestContext
+from ...integrations.local.metrics import InMemoryMetricsProvider
 
 
 def register_chat_routes(
@@ -181,3 +191,109 @@ def register_chat_routes(
             traceback.print_stack()
             traceback.print_exc()
             raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+
+def register_dataframe_routes(
+    app: FastAPI, dataframe_handler: DataFrameHandler
+) -> None:
+    """Register server-side DataFrame pagination routes on FastAPI app.
+
+    Args:
+        app: FastAPI application
+        dataframe_handler: DataFrame handler instance
+    """
+
+    @app.post("/api/vanna/v2/dataframe_page")
+    async def dataframe_page(
+        page_request: DataFramePageRequest, http_request: Request
+    ) -> DataFramePageResponse:
+        """Serve a page of a large query result."""
+        # Extract request context for user resolution
+        page_request.request_context = RequestContext(
+            cookies=dict(http_request.cookies),
+            headers=dict(http_request.headers),
+            remote_addr=http_request.client.host if http_request.client else None,
+            query_params=dict(http_request.query_params),
+            metadata=page_request.metadata,
+        )
+
+        try:
+            return await dataframe_handler.handle_page(page_request)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+def register_metrics_routes(
+    app: FastAPI, metrics_provider: InMemoryMetricsProvider, path: str = "/metrics"
+) -> None:
+    """Register the Prometheus metrics route on FastAPI app.
+
+    Args:
+        app: FastAPI application
+        metrics_provider: Metrics provider whose metrics are exposed
+        path: Route path to serve the metrics on
+    """
+
+    @app.get(path, response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        """Serve metrics in the Prometheus text exposition format."""
+        return PlainTextResponse(
+            metrics_provider.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+# Fields left out of profile listings; fetch a single profile to see them
+_PROFILE_DETAIL_FIELDS = {"stages", "cprofile_stats", "stack_samples"}
+
+
+def register_profile_routes(
+    app: FastAPI,
+    agent: Agent,
+    profile_store: ProfileStore,
+    path: str = "/api/vanna/v2/profiles",
+    access_groups: Sequence[str] = ("admin",),
+) -> None:
+    """Register admin-only routes serving captured request profiles.
+
+    Args:
+        app: FastAPI application
+        agent: Agent whose user resolver authenticates the caller
+        profile_store: Store holding the profiles
+        path: Route path of the profile listing
+        access_groups: Groups allowed to read profiles
+    """
+
+    async def require_access(http_request: Request) -> None:
+        user = await agent.user_resolver.resolve_user(
+            RequestContext(
+                cookies=dict(http_request.cookies),
+                headers=dict(http_request.headers),
+                remote_addr=http_request.client.host if http_request.client else None,
+                query_params=dict(http_request.query_params),
+            )
+        )
+        if not set(access_groups) & set(user.group_memberships):
+            raise HTTPException(status_code=403, detail="Profiles are admin-only")
+
+    @app.get(path)
+    async def list_profiles(http_request: Request, limit: int = 20) -> Dict[str, Any]:
+        """List the most recent profiles, newest first, without their details."""
+        await require_access(http_request)
+        profiles = await profile_store.list_profiles(max(1, min(limit, 100)))
+        return {
+            "profiles": [p.model_dump(exclude=_PROFILE_DETAIL_FIELDS) for p in profiles]
+        }
+
+    @app.get(path + "/{profile_id}")
+    async def get_profile(http_request: Request, profile_id: str) -> Dict[str, Any]:
+        """Get a profile with its stage timeline and samples."""
+        await require_access(http_request)
+        profile = await profile_store.get_profile(profile_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return profile.model_dump()
@@ -8,24 +8,33 @@ from typing import Any, Dict, Optional
 from flask import Flask
 from flask_cors import CORS
 
+from ...capabilities.file_system import FileSystem
 from ...core import Agent
-from ..base import ChatHandler
-from .routes import register_chat_routes
+from ..base import ChatHandler, DataFrameHandler
+from .routes import register_chat_routes, register_dataframe_routes
 
 
 class VannaFlaskServer:
     """Flask server factory for Vanna Agents."""
 
-    def __init__(self, agent: Agent, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        agent: Agent,
+        config: Optional[Dict[str, Any]] = None,
+        file_system: Optional[FileSystem] = None,
+    ):
         """Initialize Flask server.
 
         Args:
             agent: The agent to serve (must have user_resolver configured)
             config: Optional server configuration
+            file_system: FileSystem that query results are written to, used to
+                serve pages of large results (defaults to LocalFileSystem)
         """
         self.agent = agent
         self.config = config or {}
         self.chat_handler = ChatHandler(agent)
+        self.dataframe_handler = DataFrameHandler(agent, file_system=file_system)
 
     def create_app(self) -> Flask:
         """Create configured Flask app.
@@ -49,6 +58,7 @@ class VannaFlaskServer:
 
         # Register routes
         register_chat_routes(app, self.chat_handler, self.config)
+        register_dataframe_routes(app, self.dataframe_handler)
 
         # Add health check
         @app.route("/health")
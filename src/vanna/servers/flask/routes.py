@@ -9,7 +9,7 @@ from typing import Any, AsyncGenerator, Dict, Generator, Optional, Union
 
 from flask import Flask, Response, jsonify, request
 
-from ..base import ChatHandler, ChatRequest
+from ..base import ChatHandler, ChatRequest, DataFrameHandler, DataFramePageRequest
 from ..base.templates import get_index_html
 from ...core.user.request_context import RequestContext
 
@@ -135,3 +135,49 @@ def register_chat_routes(
             return jsonify({"error": f"Chat failed: {str(e)}"}), 500
         finally:
             loop.close()
+
+
+def register_dataframe_routes(app: Flask, dataframe_handler: DataFrameHandler) -> None:
+    """Register server-side DataFrame pagination routes on Flask app.
+
+    Args:
+        app: Flask application
+        dataframe_handler: DataFrame handler instance
+    """
+
+    @app.route("/api/vanna/v2/dataframe_page", methods=["POST"])
+    def dataframe_page() -> Union[Response, tuple[Response, int]]:
+        """Serve a page of a large query result."""
+        try:
+            data = request.get_json()
+            if not data:
+                return jsonify({"error": "JSON body required"}), 400
+
+            # Extract request context for user resolution
+            data["request_context"] = RequestContext(
+                cookies=dict(request.cookies),
+                headers=dict(request.headers),
+                remote_addr=request.remote_addr,
+                query_params=dict(request.args),
+                metadata=data.get("metadata", {}),
+            )
+
+            page_request = DataFramePageRequest(**data)
+        except Exception as e:
+            return jsonify({"error": f"Invalid request: {str(e)}"}), 400
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(
+                dataframe_handler.handle_page(page_request)
+            )
+            return jsonify(result.model_dump())
+        except FileNotFoundError as e:
+            return jsonify({"error": str(e)}), 404
+        except PermissionError as e:
+            return jsonify({"error": str(e)}), 403
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        finally:
+            loop.close()
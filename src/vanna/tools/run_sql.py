@@ -14,6 +14,8 @@ from vanna.capabilities.sql_runner import SqlRunner, RunSqlToolArgs
 from vanna.capabilities.file_system import FileSystem
 from vanna.integrations.local import LocalFileSystem
 
+DATAFRAME_PAGE_ENDPOINT = "/api/vanna/v2/dataframe_page"
+
 
 class RunSqlTool(Tool[RunSqlToolArgs]):
     """Tool that executes SQL queries using an injected SqlRunner implementation."""
@@ -24,6 +26,9 @@ class RunSqlTool(Tool[RunSqlToolArgs]):
         file_system: Optional[FileSystem] = None,
         custom_tool_name: Optional[str] = None,
         custom_tool_description: Optional[str] = None,
+        max_inline_rows: int = 1000,
+        page_size: int = 100,
+        page_endpoint: str = DATAFRAME_PAGE_ENDPOINT,
     ):
         """Initialize the tool with a SqlRunner implementation.
 
@@ -32,11 +37,18 @@ class RunSqlTool(Tool[RunSqlToolArgs]):
             file_system: FileSystem implementation for saving results (defaults to LocalFileSystem)
             custom_tool_name: Optional custom name for the tool (overrides default "run_sql")
             custom_tool_description: Optional custom description for the tool (overrides default description)
+            max_inline_rows: Results with more rows than this are sent to the UI as a
+                server-paginated DataFrame instead of embedding every row
+            page_size: Number of rows embedded in a server-paginated DataFrame
+            page_endpoint: Endpoint the UI uses to fetch further pages of large results
         """
         self.sql_runner = sql_runner
         self.file_system = file_system or LocalFileSystem()
         self._custom_name = custom_tool_name
         self._custom_description = custom_tool_description
+        self.max_inline_rows = max_inline_rows
+        self.page_size = page_size
+        self.page_endpoint = page_endpoint
 
     @property
     def name(self) -> str:
@@ -82,10 +94,16 @@ class RunSqlTool(Tool[RunSqlToolArgs]):
                         "results": [],
                     }
                 else:
-                    # Convert DataFrame to records
-                    results_data = df.to_dict("records")
                     columns = df.columns.tolist()
                     row_count = len(df)
+                    is_paginated = row_count > self.max_inline_rows
+
+                    # Large results are paginated server-side, so only the first
+                    # page is converted to records for the UI and metadata
+                    preview_df = df.head(self.page_size) if is_paginated else df
+                    results_data = cast(
+                        List[Dict[str, Any]], preview_df.to_dict("records")
+                    )
 
                     # Write DataFrame to CSV file for downstream tools
                     file_id = str(uuid.uuid4())[:8]
@@ -106,11 +124,23 @@ class RunSqlTool(Tool[RunSqlToolArgs]):
                     result = f"{results_preview}\n\nResults saved to file: {filename}\n\n**IMPORTANT: FOR VISUALIZE_DATA USE FILENAME: {filename}**"
 
                     # Create DataFrame component for UI
-                    dataframe_component = DataFrameComponent.from_records(
-                        records=cast(List[Dict[str, Any]], results_data),
-                        title="Query Results",
-                        description=f"SQL query returned {row_count} rows with {len(columns)} columns",
-                    )
+                    description = f"SQL query returned {row_count} rows with {len(columns)} columns"
+                    if is_paginated:
+                        dataframe_component = DataFrameComponent.from_first_page(
+                            records=results_data,
+                            columns=columns,
+                            total_rows=row_count,
+                            source=filename,
+                            page_endpoint=self.page_endpoint,
+                            title="Query Results",
+                            description=description,
+                        )
+                    else:
+                        dataframe_component = DataFrameComponent.from_records(
+                            records=results_data,
+                            title="Query Results",
+                            description=description,
+                        )
 
                     ui_component = UiComponent(
                         rich_component=dataframe_component,
@@ -122,6 +152,7 @@ class RunSqlTool(Tool[RunSqlToolArgs]):
                         "columns": columns,
                         "query_type": query_type,
                         "results": results_data,
+                        "results_truncated": is_paginated,
                         "output_file": filename,
                     }
             else:
@@ -157,6 +157,26 @@ class TestAzureOpenAILlmServiceInitialization:
         call_kwargs = mock_azure_openai.call_args[1]
         assert call_kwargs["api_version"] == "2024-10-21"
 
+    @patch("vanna.integrations.azureopenai.llm.AzureOpenAI")
+    def test_stream_usage_follows_api_version(self, mock_azure_openai):
+        """Test that stream usage is only requested from versions supporting it."""
+        kwargs = {
+            "model": "gpt-4o",
+            "api_key": "test-key",
+            "azure_endpoint": "https://test.openai.azure.com",
+        }
+
+        assert AzureOpenAILlmService(**kwargs).stream_usage
+        assert AzureOpenAILlmService(
+            api_version="2024-09-01-preview", **kwargs
+        ).stream_usage
+        assert not AzureOpenAILlmService(
+            api_version="2024-06-01", **kwargs
+        ).stream_usage
+        assert AzureOpenAILlmService(
+            api_version="2024-06-01", stream_usage=True, **kwargs
+        ).stream_usage
+
 
 class TestAzureOpenAILlmServicePayloadBuilding:
     """Test payload building for API requests."""
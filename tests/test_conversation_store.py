@@ -0,0 +1,327 @@
+"""
+Tests for ConversationStore implementations.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from vanna.core.errors import ConversationConflictError
+from vanna.core.observability import ObservabilityProvider
+from vanna.core.storage import Conversation, Message
+from vanna.core.user import User
+from vanna.integrations.local import (
+    FileSystemConversationStore,
+    MemoryConversationStore,
+)
+from vanna.integrations.sqlite import SqliteConversationStore
+
+
+class RecordingObservabilityProvider(ObservabilityProvider):
+    def __init__(self):
+        self.metrics = []
+
+    async def record_metric(self, name, value, unit="", tags=None):
+        self.metrics.append((name, value, unit, tags or {}))
+
+
+@pytest.fixture
+def alice():
+    return User(id="alice", email="alice@example.com")
+
+
+@pytest.fixture
+def bob():
+    return User(id="bob", email="bob@example.com")
+
+
+@pytest.fixture(params=["memory", "file_system", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryConversationStore()
+    if request.param == "file_system":
+        return FileSystemConversationStore(base_dir=str(tmp_path / "conversations"))
+    return SqliteConversationStore(database_path=str(tmp_path / "conversations.db"))
+
+
+async def save_conversations(store, user, count, start=None):
+    """Save ``count`` conversations with strictly increasing updated_at."""
+    start = start or datetime(2024, 1, 1)
+    for i in range(count):
+        conversation = Conversation(
+            id=f"{user.id}-{i}",
+            user=user,
+            messages=[Message(role="user", content=f"question {i}")],
+            updated_at=start + timedelta(minutes=i),
+        )
+        await store.update_conversation(conversation)
+
+
+class TestConversationStoreContract:
+    """Behaviour shared by all conversation stores."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_append(self, store, alice):
+        conversation = await store.create_conversation("c1", alice, "hello")
+
+        conversation.add_message(Message(role="assistant", content="hi"))
+        await store.update_conversation(conversation)
+
+        loaded = await store.get_conversation("c1", alice)
+        assert [m.content for m in loaded.messages] == ["hello", "hi"]
+
+    @pytest.mark.asyncio
+    async def test_scoped_to_user(self, store, alice, bob):
+        await store.create_conversation("c1", alice, "hello")
+
+        assert await store.get_conversation("c1", bob) is None
+        assert await store.delete_conversation("c1", bob) is False
+        assert await store.delete_conversation("c1", alice) is True
+        assert await store.get_conversation("c1", alice) is None
+
+    @pytest.mark.asyncio
+    async def test_list_orders_by_updated_at_and_pages(self, store, alice, bob):
+        await save_conversations(store, alice, 7)
+        await save_conversations(store, bob, 3)
+
+        first = await store.list_conversations(alice, limit=3)
+        assert [c.id for c in first] == ["alice-6", "alice-5", "alice-4"]
+
+        second = await store.list_conversations(alice, limit=3, offset=3)
+        assert [c.id for c in second] == ["alice-3", "alice-2", "alice-1"]
+
+        loaded = await store.get_conversation(second[0].id, alice)
+        assert [m.content for m in loaded.messages] == ["question 3"]
+
+    @pytest.mark.asyncio
+    async def test_list_reflects_reordering_and_deletes(self, store, alice):
+        await save_conversations(store, alice, 3)
+
+        oldest = await store.get_conversation("alice-0", alice)
+        oldest.add_message(Message(role="assistant", content="bumped"))
+        oldest.updated_at = datetime(2030, 1, 1)
+        await store.update_conversation(oldest)
+        await store.delete_conversation("alice-1", alice)
+
+        listed = await store.list_conversations(alice)
+        assert [c.id for c in listed] == ["alice-0", "alice-2"]
+
+
+class TestSqliteConversationStore:
+    @pytest.mark.asyncio
+    async def test_shared_database_between_instances(self, tmp_path, alice):
+        path = str(tmp_path / "shared.db")
+        worker_a = SqliteConversationStore(database_path=path)
+        worker_b = SqliteConversationStore(database_path=path)
+
+        conversation = await worker_a.create_conversation("c1", alice, "hello")
+        conversation.add_message(Message(role="assistant", content="hi"))
+        await worker_a.update_conversation(conversation)
+
+        loaded = await worker_b.get_conversation("c1", alice)
+        assert [m.content for m in loaded.messages] == ["hello", "hi"]
+        assert loaded.version == conversation.version == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_update_conflicts(self, tmp_path, alice):
+        path = str(tmp_path / "shared.db")
+        worker_a = SqliteConversationStore(database_path=path)
+        worker_b = SqliteConversationStore(database_path=path)
+        await worker_a.create_conversation("c1", alice, "hello")
+
+        copy_a = await worker_a.get_conversation("c1", alice)
+        copy_b = await worker_b.get_conversation("c1", alice)
+
+        copy_a.add_message(Message(role="assistant", content="from a"))
+        await worker_a.update_conversation(copy_a)
+
+        copy_b.add_message(Message(role="assistant", content="from b"))
+        with pytest.raises(ConversationConflictError):
+            await worker_b.update_conversation(copy_b)
+
+        loaded = await worker_b.get_conversation("c1", alice)
+        assert [m.content for m in loaded.messages] == ["hello", "from a"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_other_users_conversation_id(self, tmp_path, alice, bob):
+        store = SqliteConversationStore(database_path=str(tmp_path / "c.db"))
+        await store.create_conversation("c1", alice, "hello")
+
+        with pytest.raises(ConversationConflictError):
+            await store.update_conversation(Conversation(id="c1", user=bob))
+
+    @pytest.mark.asyncio
+    async def test_rewritten_history_replaces_messages(self, tmp_path, alice):
+        store = SqliteConversationStore(database_path=str(tmp_path / "c.db"))
+        conversation = await store.create_conversation("c1", alice, "hello")
+        conversation.add_message(Message(role="assistant", content="hi"))
+        await store.update_conversation(conversation)
+
+        conversation.messages = [Message(role="user", content="summary")]
+        await store.update_conversation(conversation)
+
+        loaded = await store.get_conversation("c1", alice)
+        assert [m.content for m in loaded.messages] == ["summary"]
+
+    @pytest.mark.asyncio
+    async def test_close_releases_connections(self, tmp_path, alice):
+        store = SqliteConversationStore(database_path=str(tmp_path / "c.db"))
+        await store.create_conversation("c1", alice, "hello")
+        connections = list(store._pool._connections)
+
+        store.close()
+
+        assert len(connections) == 2
+        for conn in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+
+class TestFileSystemConversationIndex:
+    @pytest.mark.asyncio
+    async def test_missing_index_is_rebuilt(self, tmp_path, alice, bob):
+        base_dir = tmp_path / "conversations"
+        store = FileSystemConversationStore(base_dir=str(base_dir))
+        await save_conversations(store, alice, 4)
+        await save_conversations(store, bob, 2)
+
+        # Simulate a store written before indexing existed
+        for index_file in (base_dir / ".index").iterdir():
+            index_file.unlink()
+
+        reopened = FileSystemConversationStore(base_dir=str(base_dir))
+        listed = await reopened.list_conversations(alice, limit=2)
+        assert [c.id for c in listed] == ["alice-3", "alice-2"]
+        assert len(await reopened.list_conversations(bob)) == 2
+
+    @pytest.mark.asyncio
+    async def test_new_user_does_not_scan_conversations(
+        self, tmp_path, alice, monkeypatch
+    ):
+        store = FileSystemConversationStore(base_dir=str(tmp_path / "conversations"))
+        await save_conversations(store, alice, 3)
+
+        scanned = []
+        original = Path.iterdir
+
+        def tracking_iterdir(path):
+            scanned.append(path)
+            return original(path)
+
+        monkeypatch.setattr(Path, "iterdir", tracking_iterdir)
+        reopened = FileSystemConversationStore(base_dir=str(tmp_path / "conversations"))
+        carol = User(id="carol", email="carol@example.com")
+        assert await reopened.list_conversations(carol) == []
+        await reopened.create_conversation("carol-0", carol, "hello")
+        assert [c.id for c in await reopened.list_conversations(carol)] == ["carol-0"]
+        assert scanned == []
+
+    @pytest.mark.asyncio
+    async def test_index_is_appended_and_compacted(self, tmp_path, alice):
+        base_dir = tmp_path / "conversations"
+        store = FileSystemConversationStore(base_dir=str(base_dir))
+        store.INDEX_COMPACT_MIN_RECORDS = 10
+        await save_conversations(store, alice, 3)
+        (index_file,) = (base_dir / ".index").glob("*.jsonl")
+        assert len(index_file.read_text().splitlines()) == 3
+
+        conversation = await store.get_conversation("alice-0", alice)
+        for _ in range(12):
+            await store.update_conversation(conversation)
+        await store.delete_conversation("alice-1", alice)
+
+        assert len(index_file.read_text().splitlines()) <= 10
+        reopened = FileSystemConversationStore(base_dir=str(base_dir))
+        listed = await reopened.list_conversations(alice)
+        assert [c.id for c in listed] == ["alice-0", "alice-2"]
+
+    @pytest.mark.asyncio
+    async def test_list_only_loads_metadata_of_requested_page(
+        self, tmp_path, alice, monkeypatch
+    ):
+        store = FileSystemConversationStore(base_dir=str(tmp_path / "conversations"))
+        await save_conversations(store, alice, 10)
+
+        loaded = []
+        original = store._load_conversation
+
+        def tracking_load(conversation_id, user, **kwargs):
+            loaded.append(conversation_id)
+            return original(conversation_id, user, **kwargs)
+
+        def fail_load_messages(conversation_id):
+            raise AssertionError("listing must not read messages")
+
+        monkeypatch.setattr(store, "_load_conversation", tracking_load)
+        monkeypatch.setattr(store, "_load_messages", fail_load_messages)
+
+        listed = await store.list_conversations(alice, limit=2, offset=1)
+        assert [c.id for c in listed] == ["alice-8", "alice-7"]
+        assert loaded == ["alice-8", "alice-7"]
+        assert [c.messages for c in listed] == [[], []]
+
+
+class TestFileSystemConversationIO:
+    @pytest.mark.asyncio
+    async def test_writes_compact_json_without_temp_files(self, tmp_path, alice):
+        base_dir = tmp_path / "conversations"
+        store = FileSystemConversationStore(base_dir=str(base_dir))
+        conversation = await store.create_conversation("c1", alice, "hello")
+        conversation.add_message(Message(role="assistant", content="hi"))
+        await store.update_conversation(conversation)
+
+        metadata_text = (base_dir / "c1" / "metadata.json").read_text()
+        assert "\n" not in metadata_text
+        assert json.loads(metadata_text)["id"] == "c1"
+
+        message_files = sorted((base_dir / "c1" / "messages").iterdir())
+        assert len(message_files) == 2
+        assert not [p for p in base_dir.rglob(".*") if p.name != ".index"]
+
+    @pytest.mark.asyncio
+    async def test_records_io_duration(self, tmp_path, alice):
+        provider = RecordingObservabilityProvider()
+        store = FileSystemConversationStore(
+            base_dir=str(tmp_path / "conversations"), observability_provider=provider
+        )
+        await store.create_conversation("c1", alice, "hello")
+        await store.list_conversations(alice)
+
+        operations = [
+            tags["operation"]
+            for name, _, unit, tags in provider.metrics
+            if name == "conversation_store.io.duration" and unit == "ms"
+        ]
+        assert operations == ["create_conversation", "list_conversations"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_do_not_duplicate_messages(
+        self, tmp_path, alice, monkeypatch
+    ):
+        store = FileSystemConversationStore(base_dir=str(tmp_path / "conversations"))
+        await store.create_conversation("c1", alice, "hello")
+
+        # Widen the window between counting and appending messages
+        original = store._count_messages
+
+        def slow_count(conversation_id):
+            count = original(conversation_id)
+            time.sleep(0.05)
+            return count
+
+        monkeypatch.setattr(store, "_count_messages", slow_count)
+
+        copies = [await store.get_conversation("c1", alice) for _ in range(2)]
+        for conversation in copies:
+            conversation.add_message(Message(role="assistant", content="hi"))
+            conversation.add_message(Message(role="user", content="thanks"))
+        await asyncio.gather(*(store.update_conversation(c) for c in copies))
+
+        loaded = await store.get_conversation("c1", alice)
+        assert [m.content for m in loaded.messages] == ["hello", "hi", "thanks"]
+        store.close()
@@ -0,0 +1,257 @@
+"""
+Tests for server-side pagination of large DataFrame results.
+"""
+
+import asyncio
+import sqlite3
+import uuid
+
+import pytest
+
+from vanna.capabilities.sql_runner import RunSqlToolArgs
+from vanna.core.registry import ToolRegistry
+from vanna.core.tool import ToolContext
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import LocalFileSystem
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+from vanna.integrations.sqlite import SqliteRunner
+from vanna.servers.base import DataFrameHandler, DataFramePageRequest
+from vanna.servers.base.dataframe_handler import paginate_csv
+from vanna.tools import RunSqlTool
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        user_id = request_context.get_header("X-User-Id") or "alice"
+        return User(id=user_id, email=f"{user_id}@example.com")
+
+
+@pytest.fixture
+def numbers_db(tmp_path):
+    """SQLite database with a 500-row table."""
+    db_path = tmp_path / "numbers.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE numbers (n INTEGER, label TEXT)")
+    conn.executemany(
+        "INSERT INTO numbers VALUES (?, ?)",
+        [(i, f"row-{i}") for i in range(500)],
+    )
+    conn.commit()
+    conn.close()
+    return str(db_path)
+
+
+@pytest.fixture
+def file_system(tmp_path):
+    return LocalFileSystem(working_directory=str(tmp_path / "workspace"))
+
+
+def make_context(user_id="alice"):
+    return ToolContext(
+        user=User(id=user_id, email=f"{user_id}@example.com"),
+        conversation_id=str(uuid.uuid4()),
+        request_id=str(uuid.uuid4()),
+        agent_memory=DemoAgentMemory(),
+    )
+
+
+def make_agent():
+    from vanna import Agent
+
+    return Agent(
+        llm_service=MockLlmService(),
+        tool_registry=ToolRegistry(),
+        user_resolver=SimpleUserResolver(),
+        agent_memory=DemoAgentMemory(),
+    )
+
+
+CSV = "n,label\n" + "".join(f"{i},row-{i}\n" for i in range(50))
+
+
+class TestPaginateCsv:
+    def test_first_and_middle_pages(self):
+        columns, rows, total = paginate_csv(CSV, page=0, page_size=10)
+        assert columns == ["n", "label"]
+        assert [r["n"] for r in rows] == list(range(10))
+        assert total == 50
+
+        _, rows, _ = paginate_csv(CSV, page=3, page_size=10)
+        assert [r["n"] for r in rows] == list(range(30, 40))
+
+    def test_page_spanning_chunks(self, monkeypatch):
+        monkeypatch.setattr("vanna.servers.base.dataframe_handler.CHUNK_ROWS", 7)
+        _, rows, total = paginate_csv(CSV, page=1, page_size=10)
+        assert [r["n"] for r in rows] == list(range(10, 20))
+        assert total == 50
+
+    def test_sort_descending(self, monkeypatch):
+        monkeypatch.setattr("vanna.servers.base.dataframe_handler.CHUNK_ROWS", 7)
+        _, rows, _ = paginate_csv(
+            CSV, page=1, page_size=5, sort_by="n", ascending=False
+        )
+        assert [r["n"] for r in rows] == [44, 43, 42, 41, 40]
+
+    def test_search_filters_total(self):
+        _, rows, total = paginate_csv(CSV, page=0, page_size=10, search="ROW-4")
+        assert total == 11  # row-4 and row-40..row-49
+        assert rows[0]["label"] == "row-4"
+
+    def test_sort_column_with_mixed_types_across_chunks(self, monkeypatch):
+        monkeypatch.setattr("vanna.servers.base.dataframe_handler.CHUNK_ROWS", 7)
+        csv = "code,k\n" + "".join(f"{i},1\n" for i in range(10)) + "x9,1\n,1\n"
+        _, rows, total = paginate_csv(csv, page=0, page_size=3, sort_by="code")
+        assert [r["code"] for r in rows] == ["0", "1", "2"]
+        assert total == 12
+
+        _, rows, _ = paginate_csv(
+            csv, page=0, page_size=2, sort_by="code", ascending=False
+        )
+        assert [r["code"] for r in rows] == ["x9", "9"]
+
+    def test_integer_column_with_nulls_in_later_chunk(self, monkeypatch):
+        monkeypatch.setattr("vanna.servers.base.dataframe_handler.CHUNK_ROWS", 7)
+        csv = "n,k\n" + "".join(f"{i},1\n" for i in range(10)) + ",1\n"
+        _, rows, _ = paginate_csv(csv, page=1, page_size=5, sort_by="n")
+        assert [r["n"] for r in rows] == [5, 6, 7, 8, 9]
+
+    def test_search_does_not_match_nulls(self):
+        csv = "n,label\n1,\n2,nano\n"
+        _, rows, total = paginate_csv(csv, page=0, page_size=10, search="nan")
+        assert total == 1
+        assert rows[0]["n"] == 2
+
+    def test_unknown_sort_column(self):
+        with pytest.raises(ValueError):
+            paginate_csv(CSV, page=0, page_size=10, sort_by="missing")
+
+    def test_past_last_page(self):
+        _, rows, total = paginate_csv(CSV, page=10, page_size=10)
+        assert rows == []
+        assert total == 50
+
+
+class TestRunSqlToolPagination:
+    @pytest.mark.asyncio
+    async def test_small_result_is_inlined(self, numbers_db, file_system):
+        tool = RunSqlTool(SqliteRunner(numbers_db), file_system=file_system)
+        result = await tool.execute(
+            make_context(), RunSqlToolArgs(sql="SELECT * FROM numbers LIMIT 20")
+        )
+
+        component = result.ui_component.rich_component
+        assert component.server_paginated is False
+        assert len(component.rows) == 20
+        assert result.metadata["results_truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_large_result_carries_first_page_only(self, numbers_db, file_system):
+        tool = RunSqlTool(
+            SqliteRunner(numbers_db),
+            file_system=file_system,
+            max_inline_rows=100,
+            page_size=25,
+        )
+        result = await tool.execute(
+            make_context(), RunSqlToolArgs(sql="SELECT * FROM numbers")
+        )
+
+        component = result.ui_component.rich_component
+        assert component.server_paginated is True
+        assert component.row_count == 500
+        assert len(component.rows) == 25
+        assert component.source == result.metadata["output_file"]
+        assert component.page_endpoint == "/api/vanna/v2/dataframe_page"
+        assert len(result.metadata["results"]) == 25
+        assert result.metadata["results_truncated"] is True
+
+        payload = component.serialize_for_frontend()
+        assert len(payload["data"]["data"]) == 25
+
+
+class TestDataFrameHandler:
+    @pytest.mark.asyncio
+    async def test_serves_pages_scoped_to_user(self, numbers_db, file_system):
+        tool = RunSqlTool(
+            SqliteRunner(numbers_db), file_system=file_system, max_inline_rows=10
+        )
+        result = await tool.execute(
+            make_context("alice"), RunSqlToolArgs(sql="SELECT * FROM numbers")
+        )
+        source = result.metadata["output_file"]
+
+        handler = DataFrameHandler(make_agent(), file_system=file_system)
+        page = await handler.handle_page(
+            DataFramePageRequest(
+                source=source,
+                page=2,
+                page_size=50,
+                sort_by="n",
+                sort_direction="desc",
+                request_context=RequestContext(headers={"X-User-Id": "alice"}),
+            )
+        )
+        assert page.total_rows == 500
+        assert page.rows[0]["n"] == 399
+        assert len(page.rows) == 50
+
+        # Pages are parsed from a stream rather than the whole file content
+        async def read_file(*args, **kwargs):
+            raise AssertionError("read_file should not be used")
+
+        file_system.read_file = read_file
+        page = await handler.handle_page(
+            DataFramePageRequest(
+                source=source,
+                page=1,
+                page_size=10,
+                request_context=RequestContext(headers={"X-User-Id": "alice"}),
+            )
+        )
+        assert [r["n"] for r in page.rows] == list(range(10, 20))
+
+        with pytest.raises(FileNotFoundError):
+            await handler.handle_page(
+                DataFramePageRequest(
+                    source=source,
+                    request_context=RequestContext(headers={"X-User-Id": "mallory"}),
+                )
+            )
+
+    def test_fastapi_route(self, numbers_db, file_system):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from vanna.servers.fastapi import VannaFastAPIServer
+
+        context = make_context("alice")
+        asyncio.run(file_system.write_file("results.csv", CSV, context, overwrite=True))
+
+        app = VannaFastAPIServer(make_agent(), file_system=file_system).create_app()
+        client = TestClient(app)
+
+        response = client.post(
+            "/api/vanna/v2/dataframe_page",
+            json={"source": "results.csv", "page": 1, "page_size": 20},
+            headers={"X-User-Id": "alice"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total_rows"] == 50
+        assert [r["n"] for r in body["rows"]] == list(range(20, 40))
+
+        missing = client.post(
+            "/api/vanna/v2/dataframe_page",
+            json={"source": "nope.csv"},
+            headers={"X-User-Id": "alice"},
+        )
+        assert missing.status_code == 404
+
+        bad_sort = client.post(
+            "/api/vanna/v2/dataframe_page",
+            json={"source": "results.csv", "sort_by": "missing"},
+            headers={"X-User-Id": "alice"},
+        )
+        assert bad_sort.status_code == 400
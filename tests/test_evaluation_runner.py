@@ -0,0 +1,210 @@
+"""
+Tests for checkpointed, parallel evaluation runs.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from vanna import Agent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.evaluation import (
+    AgentVariant,
+    EvaluationCheckpoint,
+    EvaluationRunner,
+    ExpectedOutcome,
+    OutputEvaluator,
+)
+from vanna.core.evaluation import TestCase as EvalCase
+from vanna.core.observability import ObservabilityProvider
+from vanna.core.registry import ToolRegistry
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return User(id="alice", email="alice@example.com")
+
+
+class TrackingLlm(MockLlmService):
+    """Mock LLM tracking how many requests run at once."""
+
+    def __init__(self) -> None:
+        super().__init__("Revenue was 42", latency=0.01, chunk_latency=0)
+        self.active = 0
+        self.max_active = 0
+
+    async def send_request(self, request):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            return await super().send_request(request)
+        finally:
+            self.active -= 1
+
+
+class SpanRecorder(ObservabilityProvider):
+    """Observability provider recording the spans that end."""
+
+    def __init__(self) -> None:
+        self.ended = []
+
+    async def end_span(self, span):
+        await super().end_span(span)
+        self.ended.append(span)
+
+
+def build_agent(llm=None) -> Agent:
+    return Agent(
+        llm_service=llm or MockLlmService("Revenue was 42", latency=0),
+        tool_registry=ToolRegistry(),
+        user_resolver=SimpleUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        config=AgentConfig(stream_responses=False),
+    )
+
+
+def make_cases(count: int):
+    return [
+        EvalCase(
+            id=f"t{i}",
+            user=User(id="alice", email="alice@example.com"),
+            message=f"revenue question {i}",
+            expected_outcome=ExpectedOutcome(final_answer_contains=["revenue"]),
+        )
+        for i in range(count)
+    ]
+
+
+class TestCheckpointedRuns:
+    @pytest.mark.asyncio
+    async def test_rerun_skips_cached_pairs(self, tmp_path):
+        path = str(tmp_path / "checkpoint.jsonl")
+        cases = make_cases(3)
+        first, second = TrackingLlm(), TrackingLlm()
+        variants = [
+            AgentVariant("a", build_agent(first), metadata={"model": "a-1"}),
+            AgentVariant("b", build_agent(second), metadata={"model": "b-1"}),
+        ]
+        runner = EvaluationRunner([OutputEvaluator()], checkpoint_path=path)
+
+        report = await runner.compare_agents(variants, cases)
+        assert first.call_count == 3 and second.call_count == 3
+        assert len(EvaluationCheckpoint(path)) == 6
+
+        # Changing a variant's config reruns only that variant
+        variants[1].metadata["model"] = "b-2"
+        rerun = await runner.compare_agents(variants, cases)
+        assert first.call_count == 3
+        assert second.call_count == 6
+
+        cached = rerun.reports["a"].results
+        assert [r.test_case.id for r in cached] == ["t0", "t1", "t2"]
+        assert [r.overall_score() for r in cached] == [
+            r.overall_score() for r in report.reports["a"].results
+        ]
+        assert "Revenue was 42" in cached[0].agent_result.get_final_answer()
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_truncated_line(self, tmp_path):
+        path = tmp_path / "checkpoint.jsonl"
+        cases = make_cases(2)
+        llm = TrackingLlm()
+        variant = AgentVariant("a", build_agent(llm))
+        runner = EvaluationRunner([OutputEvaluator()], checkpoint_path=str(path))
+
+        await runner.compare_agents([variant], cases)
+        # Simulate a run killed while writing the second result
+        lines = path.read_text().splitlines()
+        path.write_text(lines[0] + "\n" + lines[1][:40])
+
+        await runner.compare_agents([variant], cases)
+        assert llm.call_count == 3
+
+        records = [json.loads(line) for line in path.read_text().splitlines()[::2]]
+        assert {r["test_case_id"] for r in records} == {"t0", "t1"}
+        assert len(EvaluationCheckpoint(str(path))) == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_evaluators_rerun_cases(self, tmp_path):
+        path = str(tmp_path / "checkpoint.jsonl")
+        llm = TrackingLlm()
+        variant = AgentVariant("a", build_agent(llm))
+
+        await EvaluationRunner([], checkpoint_path=path).compare_agents(
+            [variant], make_cases(1)
+        )
+        await EvaluationRunner(
+            [OutputEvaluator()], checkpoint_path=path
+        ).compare_agents([variant], make_cases(1))
+        assert llm.call_count == 2
+
+
+class TestParallelRuns:
+    @pytest.mark.asyncio
+    async def test_streaming_progress_and_variant_concurrency(self):
+        slow, fast = TrackingLlm(), TrackingLlm()
+        variants = [
+            AgentVariant("slow", build_agent(slow), max_concurrency=1),
+            AgentVariant("fast", build_agent(fast)),
+        ]
+        runner = EvaluationRunner([OutputEvaluator()], max_concurrency=10)
+
+        progress = [
+            (name, completed, total)
+            async for name, _, completed, total in runner.compare_agents_streaming(
+                variants, make_cases(4)
+            )
+        ]
+
+        assert [completed for _, completed, _ in progress] == list(range(1, 9))
+        assert {total for _, _, total in progress} == {8}
+        assert slow.max_active == 1
+        assert fast.max_active > 1
+
+    @pytest.mark.asyncio
+    async def test_worker_processes(self, tmp_path):
+        path = str(tmp_path / "checkpoint.jsonl")
+        variant = AgentVariant("a", None, agent_factory=build_agent)
+        runner = EvaluationRunner(
+            [OutputEvaluator()],
+            checkpoint_path=path,
+            num_processes=2,
+            process_chunk_size=2,
+        )
+
+        report = await asyncio.wait_for(
+            runner.compare_agents([variant], make_cases(5)), 60
+        )
+        results = report.reports["a"].results
+        assert [r.test_case.id for r in results] == ["t0", "t1", "t2", "t3", "t4"]
+        assert all(r.overall_passed() for r in results)
+        assert len(EvaluationCheckpoint(path)) == 5
+
+    @pytest.mark.asyncio
+    async def test_worker_processes_need_agent_factory(self):
+        runner = EvaluationRunner([OutputEvaluator()], num_processes=2)
+        with pytest.raises(ValueError):
+            await runner.compare_agents(
+                [AgentVariant("a", build_agent())], make_cases(1)
+            )
+
+    @pytest.mark.asyncio
+    async def test_each_variant_gets_a_span(self):
+        recorder = SpanRecorder()
+        runner = EvaluationRunner([OutputEvaluator()], observability_provider=recorder)
+
+        await runner.compare_agents(
+            [AgentVariant("a", build_agent()), AgentVariant("b", build_agent())],
+            make_cases(2),
+        )
+
+        spans = {span.name: span for span in recorder.ended}
+        comparison = spans["agent_comparison"]
+        assert spans["variant_a"].parent_id == comparison.id
+        assert spans["variant_b"].parent_id == comparison.id
+        assert spans["variant_a"].attributes["num_test_cases"] == 2
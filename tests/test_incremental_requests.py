@@ -0,0 +1,146 @@
+"""
+Tests for incremental LLM request construction across tool rounds.
+"""
+
+from typing import List, Type
+
+import pytest
+from pydantic import BaseModel
+
+from vanna import Agent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.filter import ConversationFilter
+from vanna.core.registry import ToolRegistry
+from vanna.core.storage import Message
+from vanna.core.tool import Tool, ToolCall, ToolContext, ToolResult
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return User(id="alice", email="alice@example.com")
+
+
+class SqlArgs(BaseModel):
+    sql: str
+
+
+class SqlTool(Tool[SqlArgs]):
+    @property
+    def name(self) -> str:
+        return "run_sql"
+
+    @property
+    def description(self) -> str:
+        return "Run SQL"
+
+    def get_args_schema(self) -> Type[SqlArgs]:
+        return SqlArgs
+
+    async def execute(self, context: ToolContext, args: SqlArgs) -> ToolResult:
+        return ToolResult(success=True, result_for_llm="secret: 42 rows")
+
+
+class RecordingLlm(MockLlmService):
+    def __init__(self, rounds: int = 3) -> None:
+        super().__init__(
+            "done",
+            tool_call_script=[
+                [ToolCall(id=f"c{i}", name="run_sql", arguments={"sql": "SELECT 1"})]
+                for i in range(rounds)
+            ],
+            latency=0,
+            chunk_latency=0,
+        )
+        self.requests = []
+
+    async def send_request(self, request):
+        self.requests.append(request)
+        return await super().send_request(request)
+
+
+class RedactingFilter(ConversationFilter):
+    """Filters each message on its own."""
+
+    incremental = True
+
+    def __init__(self) -> None:
+        self.batch_sizes: List[int] = []
+
+    async def filter_messages(self, messages: List[Message]) -> List[Message]:
+        self.batch_sizes.append(len(messages))
+        return [
+            m.model_copy(update={"content": m.content.replace("secret", "[redacted]")})
+            for m in messages
+        ]
+
+
+class ElideOldResultsFilter(ConversationFilter):
+    """Elides all but the latest tool result, so it needs the whole history."""
+
+    def __init__(self) -> None:
+        self.batch_sizes: List[int] = []
+
+    async def filter_messages(self, messages: List[Message]) -> List[Message]:
+        self.batch_sizes.append(len(messages))
+        tool_indexes = [i for i, m in enumerate(messages) if m.role == "tool"]
+        return [
+            m.model_copy(update={"content": "[elided]"})
+            if i in tool_indexes[:-1]
+            else m
+            for i, m in enumerate(messages)
+        ]
+
+
+def make_agent(llm, filters) -> Agent:
+    registry = ToolRegistry()
+    registry.register_local_tool(SqlTool(), access_groups=[])
+    return Agent(
+        llm_service=llm,
+        tool_registry=registry,
+        user_resolver=SimpleUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        config=AgentConfig(stream_responses=False),
+        conversation_filters=filters,
+    )
+
+
+async def send(agent: Agent) -> None:
+    [_ async for _ in agent.send_message(RequestContext(), "how many orders?")]
+
+
+class TestIncrementalRequests:
+    @pytest.mark.asyncio
+    async def test_incremental_filter_sees_only_new_messages(self):
+        llm = RecordingLlm(rounds=3)
+        redactor = RedactingFilter()
+        await send(make_agent(llm, [redactor]))
+
+        # Whole history once, then each round's assistant and tool message
+        assert redactor.batch_sizes == [1, 2, 2, 2]
+        assert [len(r.messages) for r in llm.requests] == [1, 3, 5, 7]
+
+        last = llm.requests[-1].messages
+        tool_messages = [m for m in last if m.role == "tool"]
+        assert [m.content for m in tool_messages] == ["[redacted]: 42 rows"] * 3
+        # Earlier rounds' messages are reused, not rebuilt
+        assert llm.requests[1].messages[0] is last[0]
+        assert [m.cache_breakpoint for m in last] == [False] * 6 + [True]
+
+    @pytest.mark.asyncio
+    async def test_non_incremental_filter_sees_whole_history(self):
+        llm = RecordingLlm(rounds=3)
+        redactor, elider = RedactingFilter(), ElideOldResultsFilter()
+        await send(make_agent(llm, [redactor, elider]))
+
+        assert redactor.batch_sizes == [1, 3, 5, 7]
+        assert elider.batch_sizes == [1, 3, 5, 7]
+        tool_messages = [m for m in llm.requests[-1].messages if m.role == "tool"]
+        assert [m.content for m in tool_messages] == [
+            "[elided]",
+            "[elided]",
+            "[redacted]: 42 rows",
+        ]
@@ -0,0 +1,67 @@
+"""
+Tests for the bounded MemoryCache of the legacy Flask app.
+"""
+
+import time
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("flask")
+pytest.importorskip("flasgger")
+pytest.importorskip("flask_sock")
+
+from vanna.legacy.flask import MemoryCache  # noqa: E402
+
+
+def test_evicts_least_recently_used_entries():
+    cache = MemoryCache(max_entries=2)
+    first, second, third = (cache.generate_id() for _ in range(3))
+    cache.set(id=first, field="question", value="first")
+    cache.set(id=second, field="question", value="second")
+    cache.get(id=first, field="question")
+    cache.set(id=third, field="question", value="third")
+
+    assert cache.get(id=second, field="question") is None
+    assert [row["question"] for row in cache.get_all(field_list=["question"])] == [
+        "first",
+        "third",
+    ]
+
+
+def test_evicts_to_stay_under_memory_budget():
+    df = pd.DataFrame({"value": range(100_000)})
+    cache = MemoryCache(max_bytes=1_000_000, spill_threshold_bytes=None)
+    old, new = cache.generate_id(), cache.generate_id()
+    cache.set(id=old, field="df", value=df)
+    cache.set(id=new, field="df", value=df)
+
+    assert len(cache) == 1
+    assert cache.get(id=old, field="df") is None
+    assert cache.size_bytes <= 1_000_000
+
+
+def test_entries_expire():
+    cache = MemoryCache(ttl_seconds=0.05)
+    id = cache.generate_id()
+    cache.set(id=id, field="sql", value="SELECT 1")
+    time.sleep(0.06)
+
+    assert cache.get(id=id, field="sql") is None
+    assert cache.get_all(field_list=["question"]) == []
+    assert cache.size_bytes == 0
+
+
+def test_large_dataframes_are_spilled_to_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"value": range(10_000)})
+    cache = MemoryCache(spill_threshold_bytes=1_000, spill_directory=str(tmp_path))
+    id = cache.generate_id()
+    cache.set(id=id, field="df", value=df)
+
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+    assert cache.size_bytes < 1_000
+    pd.testing.assert_frame_equal(cache.get(id=id, field="df"), df)
+
+    cache.delete(id)
+    assert list(tmp_path.glob("*.parquet")) == []
@@ -0,0 +1,65 @@
+"""
+Tests for the concurrent context retrieval of the legacy VannaBase.
+"""
+
+import threading
+import time
+
+from vanna.legacy.base import VannaBase
+from vanna.legacy.mock import MockEmbedding, MockLLM, MockVectorDB
+
+
+class SlowVectorDB(MockVectorDB, MockEmbedding, MockLLM):
+    """Mock vector store whose retrievals each take 0.2 seconds."""
+
+    def __init__(self, config=None):
+        VannaBase.__init__(self, config=config)
+        self.threads = set()
+        self.prompts = []
+
+    def _retrieve(self, value):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.2)
+        return [value]
+
+    def get_similar_question_sql(self, question: str, **kwargs) -> list:
+        return self._retrieve({"question": question, "sql": "SELECT 1"})
+
+    def get_related_ddl(self, question: str, **kwargs) -> list:
+        return self._retrieve("CREATE TABLE customers (id INT)")
+
+    def get_related_documentation(self, question: str, **kwargs) -> list:
+        return self._retrieve("Customers are billed monthly")
+
+    def log(self, message: str, title: str = "Info"):
+        pass
+
+    def submit_prompt(self, prompt, **kwargs) -> str:
+        self.prompts.append(prompt)
+        return "SELECT COUNT(*) FROM customers"
+
+
+def test_generate_sql_retrieves_context_concurrently():
+    vn = SlowVectorDB()
+
+    start = time.perf_counter()
+    sql = vn.generate_sql("How many customers?")
+    elapsed = time.perf_counter() - start
+
+    assert sql == "SELECT COUNT(*) FROM customers"
+    assert elapsed < 0.5
+    assert len(vn.threads) == 3
+    prompt = str(vn.prompts[0])
+    assert "CREATE TABLE customers" in prompt
+    assert "Customers are billed monthly" in prompt
+
+
+def test_related_context_can_run_sequentially():
+    vn = SlowVectorDB(config={"parallel_retrieval": False})
+
+    question_sql_list, ddl_list, doc_list = vn.get_related_context("How many?")
+
+    assert question_sql_list == [{"question": "How many?", "sql": "SELECT 1"}]
+    assert ddl_list == ["CREATE TABLE customers (id INT)"]
+    assert doc_list == ["Customers are billed monthly"]
+    assert vn.threads == {threading.current_thread().name}
@@ -0,0 +1,121 @@
+"""
+Tests for the batched training of the legacy VannaBase.
+"""
+
+import threading
+import time
+
+from vanna.legacy.base import VannaBase
+from vanna.legacy.mock import MockEmbedding, MockLLM, MockVectorDB
+from vanna.legacy.types import TrainingPlan, TrainingPlanItem
+
+
+class BatchingVanna(MockVectorDB, MockEmbedding, MockLLM):
+    """Mock Vanna recording the batches it is trained on."""
+
+    def __init__(self, config=None, latency: float = 0.0):
+        VannaBase.__init__(self, config=config)
+        self.latency = latency
+        self.batches = []
+        self.threads = set()
+        self.logs = []
+
+    def _add(self, item_type, values):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.latency)
+        self.batches.append((item_type, list(values)))
+        return [str(value) for value in values]
+
+    def add_ddls(self, ddls, **kwargs):
+        return self._add("ddl", ddls)
+
+    def add_documentations(self, documentations, **kwargs):
+        return self._add("doc", documentations)
+
+    def add_question_sqls(self, question_sqls, **kwargs):
+        return self._add("sql", question_sqls)
+
+    def log(self, message: str, title: str = "Info"):
+        self.logs.append(message)
+
+
+def make_plan(count: int) -> TrainingPlan:
+    return TrainingPlan(
+        TrainingPlanItem(
+            item_type=TrainingPlanItem.ITEM_TYPE_IS,
+            item_group="db.schema",
+            item_name=f"table_{i}",
+            item_value=f"doc {i}",
+        )
+        for i in range(count)
+    )
+
+
+def test_plan_is_trained_in_batches():
+    vn = BatchingVanna(config={"training_batch_size": 2})
+    sql = TrainingPlanItem(
+        item_type=TrainingPlanItem.ITEM_TYPE_SQL,
+        item_group="",
+        item_name="How many?",
+        item_value="SELECT 1",
+    )
+    plan = make_plan(5)
+    plan._plan.append(sql)
+
+    vn.train(plan=plan)
+
+    assert vn.batches == [
+        ("doc", ["doc 0", "doc 1"]),
+        ("doc", ["doc 2", "doc 3"]),
+        ("doc", ["doc 4"]),
+        ("sql", [("How many?", "SELECT 1")]),
+    ]
+    assert vn.logs[-1] == "Trained 6 plan items"
+
+
+def test_batches_are_written_concurrently():
+    vn = BatchingVanna(
+        config={"training_batch_size": 1, "training_workers": 4}, latency=0.2
+    )
+
+    start = time.perf_counter()
+    vn.train(plan=make_plan(4))
+
+    assert time.perf_counter() - start < 0.6
+    assert len(vn.threads) == 4
+    assert sorted(values[0] for _, values in vn.batches) == [
+        f"doc {i}" for i in range(4)
+    ]
+
+
+def test_batch_methods_default_to_single_adds():
+    vn = BatchingVanna()
+
+    assert VannaBase.add_documentations(vn, ["a", "b"]) == [
+        vn.add_documentation("a"),
+        vn.add_documentation("b"),
+    ]
+    assert VannaBase.add_question_sqls(vn, [("q", "s")]) == [
+        vn.add_question_sql("q", "s")
+    ]
+
+
+def test_overridden_single_adds_are_not_bypassed():
+    class CustomVanna(BatchingVanna):
+        def add_documentation(self, documentation, **kwargs):
+            self.batches.append(("custom", [documentation]))
+            return documentation
+
+    vn = CustomVanna(config={"training_batch_size": 2})
+    vn.train(plan=make_plan(3))
+
+    assert vn.batches == [("custom", [f"doc {i}"]) for i in range(3)]
+
+
+def test_batch_embeddings_default_to_single_embeddings():
+    vn = BatchingVanna()
+
+    assert vn.generate_embeddings(["a", "b"]) == [
+        vn.generate_embedding("a"),
+        vn.generate_embedding("b"),
+    ]
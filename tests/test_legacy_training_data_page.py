@@ -0,0 +1,32 @@
+"""
+Tests for the filtered, paged training data of the legacy VannaBase.
+"""
+
+from vanna.legacy.base import VannaBase
+from vanna.legacy.mock import MockEmbedding, MockLLM, MockVectorDB
+
+
+class MockVanna(MockVectorDB, MockEmbedding, MockLLM):
+    def __init__(self, config=None):
+        VannaBase.__init__(self, config=config)
+
+
+def test_page_filters_by_type_and_search():
+    vn = MockVanna()
+
+    sql = vn.get_training_data_page(training_data_type="sql")
+    assert list(sql["id"]) == ["91597-sql", "133976-sql", "73046-sql"]
+
+    # Matches questions and content, ignoring case
+    assert list(vn.get_training_data_page(search="ARTISTS")["id"]) == ["133976-sql"]
+    assert list(vn.get_training_data_page(search="sqlite")["id"]) == ["59851-doc"]
+    assert vn.get_training_data_page(training_data_type="ddl", search="genre").empty
+
+
+def test_page_limits_and_offsets():
+    vn = MockVanna()
+
+    page = vn.get_training_data_page(limit=2, offset=1)
+    assert list(page["id"]) == ["91597-sql", "133976-sql"]
+    assert len(vn.get_training_data_page(offset=4)) == 1
+    assert len(vn.get_training_data_page()) == len(vn.get_training_data())
@@ -0,0 +1,118 @@
+"""
+Tests for training plan generation in the legacy VannaBase.
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+from vanna.legacy.base import VannaBase
+from vanna.legacy.mock import MockEmbedding, MockLLM, MockVectorDB
+from vanna.legacy.types import TrainingPlan, TrainingPlanItem
+
+
+class RecordingVanna(MockVectorDB, MockEmbedding, MockLLM):
+    """Mock Vanna recording the documentation it is trained on."""
+
+    def __init__(self, config=None):
+        VannaBase.__init__(self, config=config)
+        self.documentation = []
+
+    def add_documentation(self, documentation: str, **kwargs) -> str:
+        self.documentation.append(documentation)
+        return str(len(self.documentation))
+
+
+def information_schema() -> pd.DataFrame:
+    # Rows of databases, schemas and tables are interleaved
+    rows = [
+        ("db1", "public", "orders", "id", "INT"),
+        ("db2", "sales", "invoices", "id", "INT"),
+        ("db1", "public", "customers", "id", "INT"),
+        ("db1", "audit", "log", "ts", "TIMESTAMP"),
+        ("db1", "public", "orders", "total", "FLOAT"),
+        ("db2", "sales", "invoices", "amount", "FLOAT"),
+    ]
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "TABLE_CATALOG",
+            "TABLE_SCHEMA",
+            "TABLE_NAME",
+            "COLUMN_NAME",
+            "DATA_TYPE",
+        ],
+    )
+
+
+def test_generic_plan_groups_columns_by_table():
+    plan = RecordingVanna().get_training_plan_generic(information_schema())
+
+    assert [(item.item_group, item.item_name) for item in plan] == [
+        ("db1.public", "orders"),
+        ("db1.public", "customers"),
+        ("db1.audit", "log"),
+        ("db2.sales", "invoices"),
+    ]
+    orders = plan._plan[0].item_value
+    assert orders.startswith(
+        "The following columns are in the orders table in the db1 database:"
+    )
+    assert "total" in orders and "invoices" not in orders
+
+
+def test_plan_is_built_lazily_and_kept():
+    produced = []
+
+    def items():
+        for name in ["a", "b"]:
+            produced.append(name)
+            yield TrainingPlanItem(
+                item_type=TrainingPlanItem.ITEM_TYPE_IS,
+                item_group="db.schema",
+                item_name=name,
+                item_value=f"doc {name}",
+            )
+
+    plan = TrainingPlan(items())
+    assert produced == []
+
+    vn = RecordingVanna()
+    iterator = iter(plan)
+    next(iterator)
+    assert produced == ["a"]
+
+    vn.train(plan=plan)
+    assert vn.documentation == ["doc a", "doc b"]
+    assert len(plan.get_summary()) == 2
+
+
+def test_snowflake_plan_fetches_databases_concurrently():
+    vn = RecordingVanna()
+    threads = set()
+    schema = information_schema()
+
+    def run_sql(sql: str) -> pd.DataFrame:
+        if "INFORMATION_SCHEMA.DATABASES" in sql:
+            return pd.DataFrame({"DATABASE_NAME": ["db1", "db2"]})
+        threads.add(threading.current_thread().name)
+        time.sleep(0.2)
+        database = sql.split()[-1].split(".")[0]
+        df = schema[schema["TABLE_CATALOG"] == database].assign(COMMENT=None)
+        if sql.endswith("TABLES"):
+            return df.drop_duplicates(["TABLE_SCHEMA", "TABLE_NAME"])
+        return df
+
+    vn.run_sql = run_sql
+    vn.run_sql_is_set = True
+
+    start = time.perf_counter()
+    plan = vn.get_training_plan_snowflake(
+        filter_schemas=["public", "sales"], use_historical_queries=False
+    )
+    names = [item.item_name for item in plan]
+
+    assert names == ["orders", "customers", "invoices"]
+    assert time.perf_counter() - start < 0.7
+    assert len(threads) == 2
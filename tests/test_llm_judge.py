@@ -0,0 +1,161 @@
+"""
+Tests for batched and cached LLM-as-judge evaluation.
+"""
+
+import asyncio
+import json
+import pickle
+import re
+from typing import List
+
+import pytest
+
+from vanna.components import RichTextComponent
+from vanna.core import UiComponent
+from vanna.core.evaluation import AgentResult, LLMAsJudgeEvaluator
+from vanna.core.evaluation import TestCase as EvalCase
+from vanna.core.llm import LlmRequest, LlmResponse, LlmService, LlmStreamChunk
+from vanna.core.quota import RateLimit
+from vanna.core.user import User
+
+
+class FakeJudge(LlmService):
+    """Judge answering batch prompts with JSON and single prompts with text."""
+
+    def __init__(self, batch_reply: str = None) -> None:
+        self.prompts: List[str] = []
+        self.batch_reply = batch_reply
+        self.active = 0
+        self.max_active = 0
+
+    async def send_request(self, request: LlmRequest) -> LlmResponse:
+        prompt = request.messages[-1].content
+        self.prompts.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+
+        if "### Item" in prompt:
+            if self.batch_reply is not None:
+                return LlmResponse(content=self.batch_reply)
+            items = len(re.findall(r"### Item \d+", prompt))
+            verdicts = [
+                {"item": i, "score": 0.8, "passed": True, "reasoning": f"batch {i}"}
+                for i in range(1, items + 1)
+            ]
+            return LlmResponse(content=f"Verdicts:\n{json.dumps(verdicts)}")
+        return LlmResponse(content="SCORE: 0.9\nPASSED: yes\nREASONING: single")
+
+    async def stream_request(self, request: LlmRequest):
+        yield LlmStreamChunk(content=(await self.send_request(request)).content)
+
+    async def validate_tools(self, tools) -> List[str]:
+        return []
+
+
+def judged_pair(index: int, answer: str = "Revenue was 42"):
+    test_case = EvalCase(
+        id=f"t{index}", user=User(id="alice"), message=f"question {index}"
+    )
+    agent_result = AgentResult(
+        test_case_id=test_case.id,
+        components=[UiComponent(rich_component=RichTextComponent(content=answer))],
+    )
+    return test_case, agent_result
+
+
+class TestLlmAsJudge:
+    @pytest.mark.asyncio
+    async def test_verdicts_cached_on_disk(self, tmp_path):
+        path = str(tmp_path / "judgments.jsonl")
+        judge = FakeJudge()
+        evaluator = LLMAsJudgeEvaluator(judge, "Is it correct?", cache_path=path)
+
+        first = await evaluator.evaluate(*judged_pair(0))
+        second = await evaluator.evaluate(*judged_pair(0))
+        assert len(judge.prompts) == 1
+        assert first.score == second.score == 0.9
+        assert second.metrics["cached"]
+
+        reopened = LLMAsJudgeEvaluator(judge, "Is it correct?", cache_path=path)
+        assert (await reopened.evaluate(*judged_pair(0))).passed
+        assert len(judge.prompts) == 1
+
+        # Different criteria are judged again
+        other = LLMAsJudgeEvaluator(judge, "Is it concise?", cache_path=path)
+        await other.evaluate(*judged_pair(0))
+        assert len(judge.prompts) == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_judgments_in_flight_share_a_request(self):
+        judge = FakeJudge()
+        evaluator = LLMAsJudgeEvaluator(judge, "Is it correct?")
+        results = await asyncio.gather(
+            *(evaluator.evaluate(*judged_pair(0)) for _ in range(3))
+        )
+        assert len(judge.prompts) == 1
+        assert all(r.passed for r in results)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_judgments_are_batched(self):
+        judge = FakeJudge()
+        evaluator = LLMAsJudgeEvaluator(judge, "Is it correct?", batch_size=3)
+        results = await asyncio.gather(
+            *(evaluator.evaluate(*judged_pair(i)) for i in range(4))
+        )
+
+        # One full batch of three, then the remaining one after the window
+        assert len(judge.prompts) == 2
+        assert [r.reasoning for r in results] == [
+            "batch 1",
+            "batch 2",
+            "batch 3",
+            "single",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unparseable_batch_falls_back_to_single_judgments(self):
+        judge = FakeJudge(batch_reply="I cannot produce JSON")
+        evaluator = LLMAsJudgeEvaluator(judge, "Is it correct?", batch_size=2)
+        results = await asyncio.gather(
+            *(evaluator.evaluate(*judged_pair(i)) for i in range(2))
+        )
+        assert len(judge.prompts) == 3
+        assert [r.score for r in results] == [0.9, 0.9]
+
+    @pytest.mark.asyncio
+    async def test_judge_limits_are_separate(self):
+        judge = FakeJudge()
+        evaluator = LLMAsJudgeEvaluator(
+            judge,
+            "Is it correct?",
+            max_concurrency=1,
+            rate_limit=RateLimit(capacity=2, refill_per_second=50),
+        )
+        await asyncio.gather(*(evaluator.evaluate(*judged_pair(i)) for i in range(4)))
+        assert judge.max_active == 1
+        assert len(judge.prompts) == 4
+
+        unlimited = FakeJudge()
+        evaluator = LLMAsJudgeEvaluator(unlimited, "Is it correct?")
+        await asyncio.gather(*(evaluator.evaluate(*judged_pair(i)) for i in range(4)))
+        assert unlimited.max_active == 4
+
+    @pytest.mark.asyncio
+    async def test_pickled_evaluator_shares_the_cache(self, tmp_path):
+        path = str(tmp_path / "judgments.jsonl")
+        evaluator = LLMAsJudgeEvaluator(
+            FakeJudge(), "Is it correct?", max_concurrency=2, cache_path=path
+        )
+        await evaluator.evaluate(*judged_pair(0))
+
+        # As sent to a worker process of the evaluation runner
+        copy = pickle.loads(pickle.dumps(evaluator))
+        assert (await copy.evaluate(*judged_pair(0))).metrics["cached"]
+        await copy.evaluate(*judged_pair(1))
+        assert len(copy.judge_llm.prompts) == 2
+        copy.cache.close()
+
+        reopened = LLMAsJudgeEvaluator(FakeJudge(), "Is it correct?", cache_path=path)
+        assert len(reopened.cache) == 2
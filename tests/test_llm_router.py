@@ -0,0 +1,157 @@
+"""
+Tests for the routing LLM service: routing, failover and hedging.
+"""
+
+import time
+
+import pytest
+
+from vanna.core.errors import LlmServiceError
+from vanna.core.llm import (
+    LlmMessage,
+    LlmRequest,
+    LlmRoute,
+    RoutingLlmService,
+    prompt_tokens_over,
+    user_in_groups,
+    uses_tools,
+)
+from vanna.core.tool import ToolSchema
+from vanna.core.user import User
+from vanna.integrations.local import InMemoryMetricsProvider
+from vanna.integrations.mock import MockLlmService
+
+
+class FailingLlmService(MockLlmService):
+    """Mock LLM service whose requests fail."""
+
+    async def send_request(self, request):
+        self.call_count += 1
+        raise ConnectionError("provider unavailable")
+
+    async def stream_request(self, request):
+        self.call_count += 1
+        raise ConnectionError("provider unavailable")
+        yield  # pragma: no cover
+
+
+def mock(content: str, latency: float = 0.0) -> MockLlmService:
+    return MockLlmService(content, latency=latency, chunk_latency=latency)
+
+
+def make_request(
+    text: str = "How many customers?", groups=(), tools=None
+) -> LlmRequest:
+    return LlmRequest(
+        messages=[LlmMessage(role="user", content=text)],
+        user=User(id="alice", group_memberships=list(groups)),
+        tools=tools,
+    )
+
+
+async def stream_text(llm, request) -> str:
+    return "".join([chunk.content or "" async for chunk in llm.stream_request(request)])
+
+
+class TestRouting:
+    @pytest.mark.asyncio
+    async def test_first_matching_route_serves_request(self):
+        tool = ToolSchema(name="run_sql", description="Run SQL", parameters={})
+        llm = RoutingLlmService(
+            [
+                LlmRoute("tenant", [mock("tenant")], condition=user_in_groups("acme")),
+                LlmRoute("long", [mock("strong")], condition=prompt_tokens_over(100)),
+                LlmRoute("tools", [mock("tools")], condition=uses_tools),
+                LlmRoute("default", [mock("fast")]),
+            ]
+        )
+
+        assert (await llm.send_request(make_request(groups=["acme"]))).metadata[
+            "llm_route"
+        ] == "tenant"
+        assert llm.select_route(make_request("word " * 200)).name == "long"
+        assert llm.select_route(make_request(tools=[tool])).name == "tools"
+        response = await llm.send_request(make_request())
+        assert response.content.startswith("fast")
+        assert response.metadata["llm_service"] == "MockLlmService"
+
+    def test_routes_need_services(self):
+        with pytest.raises(ValueError):
+            RoutingLlmService([LlmRoute("empty", [])])
+
+
+class TestFailover:
+    @pytest.mark.asyncio
+    async def test_fails_over_on_error(self):
+        failing, backup = FailingLlmService(), mock("backup")
+        metrics = InMemoryMetricsProvider()
+        llm = RoutingLlmService(
+            [LlmRoute("main", [failing, backup])], observability_provider=metrics
+        )
+
+        response = await llm.send_request(make_request())
+        assert response.content.startswith("backup")
+        assert (await stream_text(llm, make_request())).startswith("backup")
+        assert failing.call_count == backup.call_count == 2
+        assert metrics.get_counter("llm.router.failures", {"route": "main"}) == 2
+        assert metrics.summary("llm.router.latency", {"route": "main"})["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_timeout(self):
+        llm = RoutingLlmService(
+            [LlmRoute("main", [mock("slow", latency=5), mock("fast")], timeout=0.05)]
+        )
+        start = time.perf_counter()
+        response = await llm.send_request(make_request())
+        assert response.content.startswith("fast")
+        assert (await stream_text(llm, make_request())).startswith("fast")
+        assert time.perf_counter() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_raises_when_all_services_fail(self):
+        llm = RoutingLlmService([LlmRoute("main", [FailingLlmService()] * 2)])
+        with pytest.raises(LlmServiceError, match="provider unavailable"):
+            await llm.send_request(make_request())
+        with pytest.raises(LlmServiceError):
+            await stream_text(llm, make_request())
+
+
+class TestHedging:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", [False, True])
+    async def test_slow_request_is_hedged(self, stream):
+        slow, fast = mock("slow", latency=5), mock("fast")
+        metrics = InMemoryMetricsProvider()
+        llm = RoutingLlmService(
+            [LlmRoute("main", [slow, fast])],
+            hedge_percentile=95,
+            hedge_delay=0.05,
+            observability_provider=metrics,
+        )
+
+        start = time.perf_counter()
+        if stream:
+            text = await stream_text(llm, make_request())
+        else:
+            text = (await llm.send_request(make_request())).content
+        assert text.startswith("fast")
+        assert time.perf_counter() - start < 1
+        assert slow.call_count == fast.call_count == 1
+        assert metrics.get_counter("llm.router.hedges") == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_delay_follows_latency_percentile(self):
+        primary, backup = mock("primary", latency=0.01), mock("backup")
+        llm = RoutingLlmService(
+            [LlmRoute("main", [primary, backup])],
+            hedge_percentile=50,
+            hedge_delay=10,
+            hedge_min_samples=3,
+        )
+        route = llm.routes[0]
+        assert llm._hedge_after(route) == 10
+
+        for _ in range(3):
+            await llm.send_request(make_request())
+        assert 0.005 < llm._hedge_after(route) < 1
+        assert backup.call_count == 0
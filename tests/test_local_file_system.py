@@ -0,0 +1,182 @@
+"""
+Tests for the LocalFileSystem integration.
+"""
+
+import uuid
+
+import pytest
+
+from vanna.core.observability import ObservabilityProvider
+from vanna.core.tool import ToolContext
+from vanna.core.user import User
+from vanna.integrations.local import LocalFileSystem
+from vanna.integrations.local import file_system as file_system_module
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+
+
+class RecordingObservabilityProvider(ObservabilityProvider):
+    def __init__(self):
+        self.metrics = []
+
+    async def record_metric(self, name, value, unit="", tags=None):
+        self.metrics.append((name, value, unit, tags or {}))
+
+
+def make_context(user_id="alice", observability_provider=None):
+    return ToolContext(
+        user=User(id=user_id, email=f"{user_id}@example.com"),
+        conversation_id=str(uuid.uuid4()),
+        request_id=str(uuid.uuid4()),
+        agent_memory=DemoAgentMemory(),
+        observability_provider=observability_provider,
+    )
+
+
+@pytest.fixture
+def file_system(tmp_path):
+    return LocalFileSystem(working_directory=str(tmp_path / "workspace"))
+
+
+class TestLocalFileSystemIO:
+    @pytest.mark.asyncio
+    async def test_atomic_overwrite(self, file_system):
+        context = make_context()
+        await file_system.write_file("notes.txt", "first", context)
+        await file_system.write_file("notes.txt", "second", context, overwrite=True)
+
+        assert await file_system.read_file("notes.txt", context) == "second"
+        assert await file_system.list_files(".", context) == ["notes.txt"]
+
+        with pytest.raises(FileExistsError):
+            await file_system.write_file("notes.txt", "third", context)
+
+    @pytest.mark.asyncio
+    async def test_records_io_duration(self, file_system):
+        provider = RecordingObservabilityProvider()
+        context = make_context(observability_provider=provider)
+
+        await file_system.write_file("notes.txt", "hello", context)
+        with pytest.raises(FileNotFoundError):
+            await file_system.read_file("missing.txt", context)
+
+        recorded = [
+            (tags["operation"], tags["success"])
+            for name, _, _, tags in provider.metrics
+            if name == "file_system.io.duration"
+        ]
+        assert recorded == [("write_file", "True"), ("read_file", "False")]
+
+
+class TestLocalFileSystemSearch:
+    @pytest.mark.asyncio
+    async def test_filename_and_content_matches(self, file_system):
+        context = make_context()
+        await file_system.write_file(
+            "query_results_1.csv", "n,label\n1,alpha\n", context
+        )
+        await file_system.write_file("notes/summary.txt", "Revenue by REGION", context)
+        await file_system.write_file("other.txt", "nothing to see", context)
+
+        by_name = await file_system.search_files("RESULTS", context)
+        assert [(m.path, m.snippet) for m in by_name] == [
+            ("query_results_1.csv", "[filename match]")
+        ]
+
+        by_content = await file_system.search_files(
+            "by region", context, include_content=True
+        )
+        assert [(m.path, m.snippet) for m in by_content] == [
+            ("notes/summary.txt", "Revenue by REGION")
+        ]
+
+        # Tokens that co-occur but not as the exact phrase do not match
+        assert (
+            await file_system.search_files("region by", context, include_content=True)
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_detects_changes_made_outside_write_file(self, file_system):
+        context = make_context()
+        await file_system.write_file("a.txt", "first draft", context)
+        assert await file_system.search_files("draft", context, include_content=True)
+
+        await file_system.run_bash(
+            "echo 'rewritten by bash, longer' > a.txt && echo 'another draft' > b.txt",
+            context,
+        )
+
+        results = await file_system.search_files("draft", context, include_content=True)
+        assert [m.path for m in results] == ["b.txt"]
+
+        await file_system.run_bash("rm b.txt", context)
+        assert await file_system.search_files("b.txt", context) == []
+
+    @pytest.mark.asyncio
+    async def test_detects_changes_from_other_instances_and_processes(
+        self, tmp_path, file_system
+    ):
+        context = make_context()
+        await file_system.write_file("a.txt", "first draft", context)
+        assert await file_system.search_files("draft", context, include_content=True)
+
+        # Another tool's file system on the same workspace
+        other = LocalFileSystem(working_directory=str(tmp_path / "workspace"))
+        await other.write_file("query_results_1.csv", "id,draft", context)
+        results = await file_system.search_files("query", context)
+        assert [m.path for m in results] == ["query_results_1.csv"]
+
+        # Files created and edited in place by another process
+        user_dir = file_system._get_user_directory(context)
+        (user_dir / "b.txt").write_text("another draft")
+        results = await file_system.search_files("draft", context, include_content=True)
+        assert [m.path for m in results] == ["a.txt", "b.txt", "query_results_1.csv"]
+
+        (user_dir / "a.txt").write_text("rewritten, longer")
+        file_system._get_search_index(context).revalidate_interval = 0
+        results = await file_system.search_files("draft", context, include_content=True)
+        assert [m.path for m in results] == ["b.txt", "query_results_1.csv"]
+
+    @pytest.mark.asyncio
+    async def test_search_does_not_rescan_workspace(self, file_system, monkeypatch):
+        context = make_context()
+        await file_system.write_file("a.txt", "first draft", context)
+        assert await file_system.search_files("draft", context, include_content=True)
+
+        index = file_system._get_search_index(context)
+
+        def fail_scan():
+            raise AssertionError("the workspace should not be rescanned")
+
+        monkeypatch.setattr(index, "_scan", fail_scan)
+        await file_system.write_file("b.txt", "second draft", context)
+        results = await file_system.search_files("raf", context, include_content=True)
+        assert [m.path for m in results] == ["a.txt", "b.txt"]
+        assert (
+            await file_system.search_files("xyz", context, include_content=True) == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_index_is_persisted_and_scoped_to_user(self, tmp_path, monkeypatch):
+        workspace = str(tmp_path / "workspace")
+        alice, bob = make_context("alice"), make_context("bob")
+        file_system = LocalFileSystem(working_directory=workspace)
+        await file_system.write_file("report.txt", "quarterly numbers", alice)
+        await file_system.search_files("report", alice, include_content=True)
+        assert await file_system.search_files("report", bob) == []
+
+        # Saving is debounced; closing saves immediately
+        file_system.close()
+        assert list((tmp_path / "workspace" / ".search_index").iterdir())
+
+        # As in a new process
+        monkeypatch.setattr(file_system_module, "_search_indexes", {})
+        reopened = LocalFileSystem(working_directory=workspace)
+        index = reopened._get_search_index(alice)
+
+        def fail_read(*args, **kwargs):
+            raise AssertionError("unchanged files should not be re-indexed")
+
+        monkeypatch.setattr(index, "_read_tokens", fail_read)
+        results = await reopened.search_files("quarterly", alice, include_content=True)
+        assert [m.path for m in results] == ["report.txt"]
@@ -0,0 +1,177 @@
+"""
+Tests for the in-process metrics provider and the /metrics route.
+"""
+
+import pytest
+
+from vanna import Agent
+from vanna.core.observability import ObservabilityProvider
+from vanna.core.registry import ToolRegistry
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import InMemoryMetricsProvider
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.local.metrics import Histogram
+from vanna.integrations.mock import MockLlmService
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return User(id="alice", email="alice@example.com")
+
+
+def make_agent(provider):
+    return Agent(
+        llm_service=MockLlmService(),
+        tool_registry=ToolRegistry(),
+        user_resolver=SimpleUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        observability_provider=provider,
+    )
+
+
+class TestHistogram:
+    def test_quantiles_interpolate_within_buckets(self):
+        histogram = Histogram([10, 20, 50, 100])
+        for value in range(1, 101):
+            histogram.observe(value)
+
+        assert histogram.count == 100
+        assert histogram.sum == 5050
+        assert histogram.quantile(0.10) == pytest.approx(10)
+        assert histogram.quantile(0.50) == pytest.approx(50)
+        assert 90 <= histogram.quantile(0.95) <= 100
+
+    def test_overflow_reports_last_bound(self):
+        histogram = Histogram([10])
+        histogram.observe(500)
+        assert histogram.quantile(0.99) == 10
+
+
+class TestInMemoryMetricsProvider:
+    @pytest.mark.asyncio
+    async def test_counters_and_histograms(self):
+        metrics = InMemoryMetricsProvider()
+        await metrics.record_metric("agent.error.count", 1, "count", {"type": "a"})
+        await metrics.record_metric("agent.error.count", 2, "count", {"type": "b"})
+        for value in (5, 50, 500):
+            await metrics.record_metric(
+                "llm.request.duration", value, "ms", {"model": "m"}
+            )
+
+        assert metrics.get_counter("agent.error.count") == 3
+        assert metrics.get_counter("agent.error.count", {"type": "b"}) == 2
+
+        summary = metrics.summary("llm.request.duration")
+        assert summary["count"] == 3
+        assert summary["sum"] == 555
+        assert summary["p50"] <= summary["p95"] <= summary["p99"] <= 500
+
+    @pytest.mark.asyncio
+    async def test_sampled_out_traces_are_skipped(self):
+        metrics = InMemoryMetricsProvider(sample_rate=0.0)
+        span = await metrics.create_span("agent.send_message")
+        await metrics.record_metric("agent.tool.duration", 12, "ms")
+        await metrics.end_span(span)
+        await metrics.record_metric("agent.message.duration", 30, "ms")
+
+        assert metrics.get_histogram("agent.tool.duration") is None
+        assert metrics.summary("agent.message.duration")["count"] == 1
+
+    def test_rejects_invalid_sample_rate(self):
+        with pytest.raises(ValueError):
+            InMemoryMetricsProvider(sample_rate=1.5)
+
+    @pytest.mark.asyncio
+    async def test_prometheus_rendering(self):
+        metrics = InMemoryMetricsProvider(buckets_ms=[10, 100])
+        await metrics.record_metric("agent.tool.duration", 5, "ms", {"tool": 'a"b'})
+        await metrics.record_metric("agent.tool.duration", 50, "ms", {"tool": 'a"b'})
+        await metrics.record_metric("agent.error.count", 1, "count")
+
+        text = metrics.render_prometheus()
+        assert "# TYPE vanna_agent_error_count_total counter" in text
+        assert "vanna_agent_error_count_total 1\n" in text
+        assert "# TYPE vanna_agent_tool_duration_milliseconds histogram" in text
+        assert (
+            'vanna_agent_tool_duration_milliseconds_bucket{tool="a\\"b",le="10"} 1'
+            in text
+        )
+        assert (
+            'vanna_agent_tool_duration_milliseconds_bucket{tool="a\\"b",le="+Inf"} 2'
+            in text
+        )
+        assert 'vanna_agent_tool_duration_milliseconds_sum{tool="a\\"b"} 55' in text
+
+    @pytest.mark.asyncio
+    async def test_drops_high_cardinality_labels(self):
+        metrics = InMemoryMetricsProvider()
+        for user_id in ("alice", "bob", "carol"):
+            await metrics.record_metric(
+                "agent.message.duration", 10, "ms", {"user_id": user_id}
+            )
+            await metrics.record_metric(
+                "llm.tokens.input", 5, "tokens", {"user_id": user_id, "model": "m"}
+            )
+
+        assert len(metrics._histograms) == 1
+        assert len(metrics._counters) == 1
+        assert metrics.get_counter("llm.tokens.input", {"model": "m"}) == 15
+        assert "user_id" not in metrics.render_prometheus()
+
+        keep_users = InMemoryMetricsProvider(drop_labels=())
+        await keep_users.record_metric(
+            "llm.tokens.input", 5, "tokens", {"user_id": "a"}
+        )
+        assert keep_users.get_counter("llm.tokens.input", {"user_id": "a"}) == 5
+
+    @pytest.mark.asyncio
+    async def test_renders_non_finite_values(self):
+        metrics = InMemoryMetricsProvider(buckets_ms=[10])
+        await metrics.record_metric("a.count", float("inf"), "count")
+        await metrics.record_metric("b.count", float("-inf"), "count")
+        await metrics.record_metric("c.count", float("nan"), "count")
+        await metrics.record_metric("agent.tool.duration", float("nan"), "ms")
+
+        text = metrics.render_prometheus()
+        assert "vanna_a_count_total +Inf\n" in text
+        assert "vanna_b_count_total -Inf\n" in text
+        assert "vanna_c_count_total NaN\n" in text
+        assert "vanna_agent_tool_duration_milliseconds_sum NaN\n" in text
+
+    @pytest.mark.asyncio
+    async def test_records_agent_metrics(self):
+        metrics = InMemoryMetricsProvider()
+        agent = make_agent(metrics)
+
+        async for _ in agent.send_message(RequestContext(), "hello"):
+            pass
+
+        assert metrics.summary("agent.message.duration")["count"] == 1
+
+
+class TestMetricsRoute:
+    def test_served_when_agent_uses_metrics_provider(self):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from vanna.servers.fastapi import VannaFastAPIServer
+
+        metrics = InMemoryMetricsProvider()
+        app = VannaFastAPIServer(make_agent(metrics)).create_app()
+        client = TestClient(app)
+
+        client.post("/api/vanna/v2/chat_poll", json={"message": "hello"})
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "vanna_agent_message_duration_milliseconds_count" in response.text
+
+    def test_not_registered_without_metrics_provider(self):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from vanna.servers.fastapi import VannaFastAPIServer
+
+        app = VannaFastAPIServer(make_agent(ObservabilityProvider())).create_app()
+        assert TestClient(app).get("/metrics").status_code == 404
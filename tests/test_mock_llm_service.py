@@ -0,0 +1,78 @@
+"""
+Tests for the scripted mode of MockLlmService.
+"""
+
+from typing import Type
+
+import pytest
+from pydantic import BaseModel
+
+from vanna import Agent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.registry import ToolRegistry
+from vanna.core.tool import Tool, ToolCall, ToolContext, ToolResult
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return User(id="alice")
+
+
+class EchoArgs(BaseModel):
+    text: str
+
+
+class EchoTool(Tool[EchoArgs]):
+    def __init__(self) -> None:
+        self.calls = []
+
+    @property
+    def name(self) -> str:
+        return "echo"
+
+    @property
+    def description(self) -> str:
+        return "Echo text"
+
+    def get_args_schema(self) -> Type[EchoArgs]:
+        return EchoArgs
+
+    async def execute(self, context: ToolContext, args: EchoArgs) -> ToolResult:
+        self.calls.append(args.text)
+        return ToolResult(success=True, result_for_llm=args.text)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [True, False])
+async def test_script_is_replayed_for_every_message(stream):
+    tool = EchoTool()
+    registry = ToolRegistry()
+    registry.register_local_tool(tool, access_groups=[])
+    llm = MockLlmService(
+        response_content="Finished",
+        tool_call_script=[
+            [ToolCall(id="1", name="echo", arguments={"text": "first"})],
+            [ToolCall(id="2", name="echo", arguments={"text": "second"})],
+        ],
+        latency=0,
+        chunk_latency=0,
+    )
+    agent = Agent(
+        llm_service=llm,
+        tool_registry=registry,
+        user_resolver=SimpleUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        config=AgentConfig(stream_responses=stream),
+    )
+
+    for _ in range(2):
+        async for _ in agent.send_message(RequestContext(), "go", conversation_id="c1"):
+            pass
+
+    assert tool.calls == ["first", "second", "first", "second"]
+    # Two scripted steps and the final answer per message
+    assert llm.call_count == 6
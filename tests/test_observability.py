@@ -0,0 +1,155 @@
+"""
+Tests for span propagation and the OTLP/JSON exporter.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from vanna import Agent
+from vanna.core.observability import ObservabilityProvider, Span, get_current_span
+from vanna.core.registry import ToolRegistry
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import OtlpJsonObservabilityProvider
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return User(id="alice", email="alice@example.com")
+
+
+class RecordingObservabilityProvider(ObservabilityProvider):
+    def __init__(self):
+        self.spans = []
+
+    async def end_span(self, span: Span) -> None:
+        await super().end_span(span)
+        self.spans.append(span)
+
+
+class TestSpanPropagation:
+    @pytest.mark.asyncio
+    async def test_nested_spans_link_to_parent(self):
+        provider = ObservabilityProvider()
+        root = await provider.create_span("root")
+        child = await provider.create_span("child")
+        grandchild = await provider.create_span("grandchild")
+        await provider.end_span(grandchild)
+        await provider.end_span(child)
+        sibling = await provider.create_span("sibling")
+
+        assert root.parent_id is None
+        assert child.parent_id == root.id
+        assert grandchild.parent_id == child.id
+        assert sibling.parent_id == root.id
+        assert {child.trace_id, grandchild.trace_id, sibling.trace_id} == {
+            root.trace_id
+        }
+
+        await provider.end_span(sibling)
+        await provider.end_span(root)
+        assert get_current_span() is None
+
+    @pytest.mark.asyncio
+    async def test_child_tasks_inherit_active_span(self):
+        provider = ObservabilityProvider()
+        root = await provider.create_span("root")
+
+        async def work(name):
+            span = await provider.create_span(name)
+            await asyncio.sleep(0)
+            await provider.end_span(span)
+            return span
+
+        spans = await asyncio.gather(work("a"), work("b"))
+        assert [s.parent_id for s in spans] == [root.id, root.id]
+        assert get_current_span() is root
+        await provider.end_span(root)
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_end_skips_ended_spans(self):
+        provider = ObservabilityProvider()
+        root = await provider.create_span("root")
+        child = await provider.create_span("child")
+        await provider.end_span(root)
+
+        assert get_current_span() is child
+        await provider.end_span(child)
+        assert get_current_span() is None
+
+    def test_explicit_parent_is_kept(self):
+        span = Span(name="remote", parent_id="upstream", trace_id="t" * 32)
+        assert span.parent_id == "upstream"
+        assert span.parent is None
+
+    @pytest.mark.asyncio
+    async def test_agent_spans_form_one_trace(self):
+        provider = RecordingObservabilityProvider()
+        agent = Agent(
+            llm_service=MockLlmService(),
+            tool_registry=ToolRegistry(),
+            user_resolver=SimpleUserResolver(),
+            agent_memory=DemoAgentMemory(),
+            observability_provider=provider,
+        )
+
+        async for _ in agent.send_message(RequestContext(), "hello"):
+            pass
+
+        root = next(s for s in provider.spans if s.name == "agent.send_message")
+        by_id = {s.id: s for s in provider.spans}
+        descendants = [
+            s for s in provider.spans if s is not root and s.trace_id == root.trace_id
+        ]
+        assert descendants
+        for span in descendants:
+            ancestor = span
+            while ancestor.parent_id in by_id:
+                ancestor = by_id[ancestor.parent_id]
+            assert ancestor is root
+        assert get_current_span() is None
+
+
+class TestOtlpJsonObservabilityProvider:
+    def test_requires_exactly_one_destination(self, tmp_path):
+        with pytest.raises(ValueError):
+            OtlpJsonObservabilityProvider()
+        with pytest.raises(ValueError):
+            OtlpJsonObservabilityProvider(
+                endpoint="http://localhost:4318/v1/traces",
+                file_path=str(tmp_path / "spans.jsonl"),
+            )
+
+    @pytest.mark.asyncio
+    async def test_exports_batches_to_file(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        provider = OtlpJsonObservabilityProvider(file_path=str(path), flush_interval=60)
+        root = await provider.create_span("root", attributes={"rows": 3})
+        child = await provider.create_span("child", attributes={"error": "boom"})
+        await provider.end_span(child)
+        await provider.end_span(root)
+
+        # Nothing is written on the request path
+        assert not path.exists()
+        provider.shutdown()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        resource_spans = json.loads(lines[0])["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"] == [
+            {"key": "service.name", "value": {"stringValue": "vanna"}}
+        ]
+        exported = {s["name"]: s for s in resource_spans["scopeSpans"][0]["spans"]}
+        assert len(exported["root"]["traceId"]) == 32
+        assert len(exported["root"]["spanId"]) == 16
+        assert "parentSpanId" not in exported["root"]
+        assert exported["child"]["parentSpanId"] == exported["root"]["spanId"]
+        assert exported["child"]["traceId"] == exported["root"]["traceId"]
+        assert exported["child"]["status"] == {"code": 2, "message": "boom"}
+        assert exported["root"]["attributes"] == [
+            {"key": "rows", "value": {"intValue": "3"}}
+        ]
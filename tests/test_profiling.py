@@ -0,0 +1,193 @@
+"""
+Tests for request profiling and the profile stores.
+"""
+
+import pytest
+
+from vanna import Agent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.profiling import RequestProfile, RequestProfiler
+from vanna.core.registry import ToolRegistry
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import (
+    FileProfileStore,
+    InMemoryMetricsProvider,
+    MemoryProfileStore,
+)
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+
+class HeaderUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        user_id = request_context.get_header("x-user") or "alice"
+        groups = ["admin"] if user_id == "admin" else ["user"]
+        return User(id=user_id, group_memberships=groups)
+
+
+def make_agent(profiler, llm=None, observability_provider=None):
+    return Agent(
+        llm_service=llm or MockLlmService(latency=0, chunk_latency=0),
+        tool_registry=ToolRegistry(),
+        user_resolver=HeaderUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        config=AgentConfig(stream_responses=False),
+        observability_provider=observability_provider,
+        profiler=profiler,
+    )
+
+
+async def send(agent, message="hello", user_id="alice"):
+    context = RequestContext(headers={"x-user": user_id})
+    return [c async for c in agent.send_message(context, message)]
+
+
+def text_of(components) -> str:
+    return "\n".join(getattr(c.rich_component, "content", "") or "" for c in components)
+
+
+def make_profile(profile_id: str, started_at: float) -> RequestProfile:
+    return RequestProfile(
+        id=profile_id,
+        started_at=started_at,
+        duration_ms=1.0,
+        sampled=True,
+        slow=False,
+    )
+
+
+class TestRequestProfiler:
+    @pytest.mark.asyncio
+    async def test_sampled_request_records_stage_timeline(self):
+        metrics = InMemoryMetricsProvider()
+        profiler = RequestProfiler(sample_rate=1.0, cprofile=True)
+        agent = make_agent(profiler, observability_provider=metrics)
+
+        await send(agent, "show revenue")
+
+        [profile] = await profiler.store.list_profiles()
+        assert profile.sampled and not profile.slow
+        assert profile.user_id == "alice"
+        assert profile.message_preview == "show revenue"
+        names = [stage.name for stage in profile.stages]
+        for stage in [
+            "agent.user_resolution",
+            "agent.send_message",
+            "agent.tool_schemas.fetch",
+            "agent.system_prompt.build",
+            "llm.request",
+            "agent.conversation.save",
+        ]:
+            assert stage in names
+        assert profile.stages == sorted(profile.stages, key=lambda s: s.start_ms)
+        llm_stage = next(s for s in profile.stages if s.name == "llm.request")
+        assert llm_stage.depth > 0
+        assert "cumulative" in profile.cprofile_stats
+
+        # The wrapped provider still receives metrics
+        assert metrics.summary("agent.message.duration")["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_only_slow_requests_are_kept(self):
+        profiler = RequestProfiler(
+            slow_threshold_ms=100, sample_stacks=True, stack_interval_ms=5
+        )
+        await send(make_agent(profiler))
+        assert await profiler.store.list_profiles() == []
+
+        slow_llm = MockLlmService(latency=0.3, chunk_latency=0)
+        await send(make_agent(profiler, llm=slow_llm))
+
+        [profile] = await profiler.store.list_profiles()
+        assert profile.slow and not profile.sampled
+        assert profile.duration_ms >= 100
+        assert profile.stack_samples
+        assert profile.stack_interval_ms == 5
+        assert profile.slowest_stages(1)[0].duration_ms >= 300
+
+    @pytest.mark.asyncio
+    async def test_agent_provider_is_not_replaced(self):
+        metrics = InMemoryMetricsProvider()
+        profiler = RequestProfiler(sample_rate=1.0)
+        assert (
+            make_agent(profiler, observability_provider=metrics).observability_provider
+            is metrics
+        )
+
+        # Without a provider, requests that are not captured skip telemetry
+        unsampled = make_agent(RequestProfiler(sample_rate=0.0))
+        assert unsampled.observability_provider is None
+        assert not unsampled._observability
+        await send(unsampled)
+        assert await unsampled.profiler.store.list_profiles() == []
+
+    def test_stack_sampling_requires_threshold(self):
+        with pytest.raises(ValueError):
+            RequestProfiler(sample_stacks=True)
+
+    @pytest.mark.asyncio
+    async def test_profiles_command_is_admin_only(self):
+        profiler = RequestProfiler(sample_rate=1.0)
+        agent = make_agent(profiler)
+        await send(agent)
+
+        assert "Access Denied" in text_of(await send(agent, "/profiles"))
+
+        listing = text_of(await send(agent, "/profiles", user_id="admin"))
+        profile = (await profiler.store.list_profiles())[-1]
+        assert profile.id in listing
+
+        detail = text_of(await send(agent, f"/profile {profile.id}", user_id="admin"))
+        assert "llm.request" in detail
+
+
+class TestProfileStores:
+    @pytest.mark.asyncio
+    async def test_memory_store_evicts_oldest(self):
+        store = MemoryProfileStore(max_profiles=2)
+        for i in range(3):
+            await store.add(make_profile(f"p{i}", 1000.0 + i))
+
+        assert [p.id for p in await store.list_profiles()] == ["p2", "p1"]
+        assert await store.get_profile("p0") is None
+
+    @pytest.mark.asyncio
+    async def test_file_store_persists_and_evicts(self, tmp_path):
+        store = FileProfileStore(str(tmp_path), max_profiles=2)
+        for i in range(3):
+            await store.add(make_profile(f"p{i}", 1000.0 + i))
+
+        reopened = FileProfileStore(str(tmp_path), max_profiles=2)
+        assert [p.id for p in await reopened.list_profiles()] == ["p2", "p1"]
+        assert (await reopened.get_profile("p1")).started_at == 1001.0
+        assert await reopened.get_profile("p0") is None
+
+        await reopened.clear()
+        assert await store.list_profiles() == []
+
+
+class TestProfileRoutes:
+    def test_profiles_served_to_admins(self):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+
+        from vanna.servers.fastapi import VannaFastAPIServer
+
+        profiler = RequestProfiler(sample_rate=1.0)
+        client = TestClient(VannaFastAPIServer(make_agent(profiler)).create_app())
+        client.post("/api/vanna/v2/chat_poll", json={"message": "hello"})
+
+        assert client.get("/api/vanna/v2/profiles").status_code == 403
+
+        headers = {"x-user": "admin"}
+        listing = client.get("/api/vanna/v2/profiles", headers=headers).json()
+        [summary] = listing["profiles"]
+        assert "stages" not in summary
+
+        detail = client.get(
+            f"/api/vanna/v2/profiles/{summary['id']}", headers=headers
+        ).json()
+        assert detail["stages"]
+        missing = client.get("/api/vanna/v2/profiles/unknown", headers=headers)
+        assert missing.status_code == 404
@@ -0,0 +1,152 @@
+"""
+Tests for prompt caching hints on LLM requests.
+"""
+
+import pytest
+
+from vanna import Agent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.llm import LlmMessage, LlmRequest, ToolPayloadCache
+from vanna.core.registry import ToolRegistry
+from vanna.core.tool import ToolCall, ToolSchema
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.anthropic.llm import AnthropicLlmService
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+USER = User(id="alice", email="alice@example.com")
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return USER
+
+
+class RecordingLlm(MockLlmService):
+    def __init__(self) -> None:
+        super().__init__("done", latency=0, chunk_latency=0)
+        self.requests = []
+
+    async def send_request(self, request):
+        self.requests.append(request)
+        return await super().send_request(request)
+
+
+def anthropic_service() -> AnthropicLlmService:
+    # Payload building needs no client
+    service = AnthropicLlmService.__new__(AnthropicLlmService)
+    service.model = "claude-test"
+    service._tool_payloads = ToolPayloadCache(service._convert_tools)
+    return service
+
+
+def make_request(messages, **kwargs) -> LlmRequest:
+    tools = [
+        ToolSchema(name=name, description=name, parameters={"type": "object"})
+        for name in ("run_sql", "visualize")
+    ]
+    return LlmRequest(
+        messages=messages,
+        tools=tools,
+        user=USER,
+        system_prompt="You are a SQL assistant.",
+        **kwargs,
+    )
+
+
+def cached_blocks(payload):
+    return [
+        block
+        for message in payload["messages"]
+        for block in message["content"]
+        if "cache_control" in block
+    ]
+
+
+class TestAnthropicBreakpoints:
+    def test_marks_tools_system_prompt_and_messages(self):
+        service = anthropic_service()
+        request = make_request(
+            [
+                LlmMessage(role="user", content="Top customers?"),
+                LlmMessage(
+                    role="assistant",
+                    content="",
+                    tool_calls=[ToolCall(id="c1", name="run_sql", arguments={})],
+                ),
+                LlmMessage(
+                    role="tool",
+                    content="3 rows",
+                    tool_call_id="c1",
+                    cache_breakpoint=True,
+                ),
+            ],
+            cache_system_prompt=True,
+            cache_tools=True,
+        )
+
+        payload = service._build_payload(request)
+
+        assert payload["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in payload["tools"][0]
+        assert payload["system"] == [
+            {
+                "type": "text",
+                "text": "You are a SQL assistant.",
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+        [block] = cached_blocks(payload)
+        assert block["type"] == "tool_result"
+
+        # The shared tool payload is not modified
+        uncached = service._build_payload(
+            request.model_copy(update={"cache_tools": False})
+        )
+        assert "cache_control" not in uncached["tools"][-1]
+
+    def test_no_hints_sends_plain_payload(self):
+        payload = anthropic_service()._build_payload(
+            make_request([LlmMessage(role="user", content="hi")])
+        )
+        assert payload["system"] == "You are a SQL assistant."
+        assert "cache_control" not in payload["tools"][-1]
+        assert cached_blocks(payload) == []
+
+    def test_keeps_latest_message_breakpoints_within_limit(self):
+        messages = [
+            LlmMessage(
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"turn {i}",
+                cache_breakpoint=True,
+            )
+            for i in range(5)
+        ]
+        payload = anthropic_service()._build_payload(
+            make_request(messages, cache_system_prompt=True, cache_tools=True)
+        )
+
+        assert [b["text"] for b in cached_blocks(payload)] == ["turn 3", "turn 4"]
+
+
+class TestAgentCacheHints:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("enabled", [True, False])
+    async def test_agent_marks_stable_prefix(self, enabled):
+        llm = RecordingLlm()
+        agent = Agent(
+            llm_service=llm,
+            tool_registry=ToolRegistry(),
+            user_resolver=SimpleUserResolver(),
+            agent_memory=DemoAgentMemory(),
+            config=AgentConfig(stream_responses=False, prompt_caching=enabled),
+        )
+
+        [_ async for _ in agent.send_message(RequestContext(), "hello")]
+
+        [request] = llm.requests
+        assert request.cache_system_prompt is enabled
+        assert request.cache_tools is enabled
+        assert request.messages[-1].cache_breakpoint is enabled
+        assert not any(m.cache_breakpoint for m in request.messages[:-1])
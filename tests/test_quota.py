@@ -0,0 +1,322 @@
+"""
+Tests for rate limiting and concurrency quotas.
+"""
+
+import asyncio
+from typing import List, Type
+
+import pytest
+from pydantic import BaseModel
+
+from vanna import Agent
+from vanna.components import StatusCardComponent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.errors import QuotaExceededError
+from vanna.core.llm import LlmRequest, LlmResponse, LlmService, LlmStreamChunk
+from vanna.core.quota import (
+    AdmissionController,
+    QuotaHook,
+    QuotaPolicy,
+    RateLimit,
+    take_tokens,
+)
+from vanna.core.registry import ToolRegistry
+from vanna.core.tool import Tool, ToolCall, ToolContext, ToolResult
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import InMemoryMetricsProvider, MemoryQuotaBackend
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+from vanna.integrations.sqlite import SqliteQuotaBackend
+
+
+class HeaderUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        user_id = request_context.get_header("x-user") or "alice"
+        return User(id=user_id, group_memberships=["acme"])
+
+
+class SqlArgs(BaseModel):
+    sql: str
+
+
+class FakeSqlTool(Tool[SqlArgs]):
+    def __init__(self) -> None:
+        self.executions = 0
+
+    @property
+    def name(self) -> str:
+        return "run_sql"
+
+    @property
+    def description(self) -> str:
+        return "Run SQL"
+
+    def get_args_schema(self) -> Type[SqlArgs]:
+        return SqlArgs
+
+    async def execute(self, context: ToolContext, args: SqlArgs) -> ToolResult:
+        self.executions += 1
+        return ToolResult(success=True, result_for_llm="1 row")
+
+
+class SqlCallingLlm(LlmService):
+    """Calls run_sql once per message, then answers."""
+
+    async def send_request(self, request: LlmRequest) -> LlmResponse:
+        if request.messages[-1].role == "tool":
+            return LlmResponse(content="Done", usage={"total_tokens": 10})
+        return LlmResponse(
+            tool_calls=[
+                ToolCall(id="c1", name="run_sql", arguments={"sql": "SELECT 1"})
+            ],
+            usage={"total_tokens": 10},
+        )
+
+    async def stream_request(self, request: LlmRequest):
+        yield LlmStreamChunk(content=(await self.send_request(request)).content)
+
+    async def validate_tools(self, tools) -> List[str]:
+        return []
+
+
+def make_agent(hook: QuotaHook, llm: LlmService = None, tools=None) -> Agent:
+    registry = ToolRegistry()
+    for tool in tools or []:
+        registry.register_local_tool(tool, access_groups=[])
+    return Agent(
+        llm_service=llm or MockLlmService(),
+        tool_registry=registry,
+        user_resolver=HeaderUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        config=AgentConfig(stream_responses=False),
+        lifecycle_hooks=[hook],
+    )
+
+
+async def send(agent: Agent, user_id: str = "alice") -> list:
+    context = RequestContext(headers={"x-user": user_id})
+    return [c async for c in agent.send_message(context, "hello")]
+
+
+def rejection_cards(components) -> List[StatusCardComponent]:
+    return [
+        c.rich_component
+        for c in components
+        if isinstance(c.rich_component, StatusCardComponent)
+        and c.rich_component.title == "Rate Limit Reached"
+    ]
+
+
+class TestTokenBucket:
+    def test_refills_up_to_capacity(self):
+        limit = RateLimit(capacity=5, refill_per_second=1)
+        tokens, result = take_tokens(0, 100, limit, 1)
+        assert result.granted
+        assert tokens == 4
+
+    def test_rejection_reports_retry_after(self):
+        limit = RateLimit.per_minute(6)
+        tokens, result = take_tokens(0.5, 0, limit, 1)
+        assert not result.granted
+        assert tokens == 0.5
+        assert result.retry_after == pytest.approx(5.0)
+
+    def test_debt_blocks_until_repaid(self):
+        limit = RateLimit(capacity=10, refill_per_second=1)
+        tokens, _ = take_tokens(10, 0, limit, 15, force=True)
+        assert tokens == -5
+        _, result = take_tokens(tokens, 0, limit, 0)
+        assert not result.granted
+        assert result.retry_after == pytest.approx(5.0)
+
+    def test_over_capacity_never_granted(self):
+        _, result = take_tokens(1, 0, RateLimit(capacity=1, refill_per_second=1), 2)
+        assert not result.granted
+        assert result.retry_after is None
+
+
+class TestQuotaBackends:
+    @pytest.mark.asyncio
+    async def test_memory_backend(self):
+        backend = MemoryQuotaBackend()
+        limit = RateLimit(capacity=2, refill_per_second=0)
+        assert (await backend.take("k", limit)).granted
+        assert (await backend.take("k", limit)).granted
+        assert not (await backend.take("k", limit)).granted
+        await backend.charge("k", limit, -1)
+        assert (await backend.take("k", limit)).granted
+        await backend.reset("k")
+        assert (await backend.take("k", limit)).remaining == 1
+
+    @pytest.mark.asyncio
+    async def test_sqlite_backend_is_shared(self, tmp_path):
+        path = str(tmp_path / "quotas.db")
+        first, second = SqliteQuotaBackend(path), SqliteQuotaBackend(path)
+        limit = RateLimit(capacity=3, refill_per_second=0)
+
+        results = await asyncio.gather(
+            *(backend.take("k", limit) for backend in [first, second] * 3)
+        )
+        assert sum(r.granted for r in results) == 3
+
+        await first.reset()
+        assert (await second.take("k", limit)).granted
+
+
+class TestAdmissionController:
+    @pytest.mark.asyncio
+    async def test_round_robin_across_keys(self):
+        controller = AdmissionController(max_concurrent=1)
+        await controller.acquire("busy")
+        order = []
+
+        async def request(key):
+            await controller.acquire(key)
+            order.append(key)
+            controller.release(key)
+
+        tasks = [asyncio.create_task(request(k)) for k in ["a", "a", "a", "b"]]
+        await asyncio.sleep(0)
+        assert controller.queued == 4
+
+        controller.release("busy")
+        await asyncio.wait_for(asyncio.gather(*tasks), 5)
+        assert order == ["a", "b", "a", "a"]
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_per_key_limit_does_not_block_other_keys(self):
+        controller = AdmissionController(max_concurrent=3)
+        await controller.acquire("a", max_in_flight=1)
+        waiter = asyncio.create_task(controller.acquire("a", max_in_flight=1))
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+
+        await controller.acquire("b", max_in_flight=1)
+        assert controller.in_flight == 2
+
+        controller.release("a")
+        await waiter
+        assert controller.in_flight_for("a") == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_full_queue_reject(self):
+        controller = AdmissionController(max_concurrent=1, max_queued_per_key=1)
+        await controller.acquire("a")
+
+        with pytest.raises(QuotaExceededError) as exc_info:
+            await controller.acquire("b", timeout=0.01)
+        assert exc_info.value.limit == "concurrency"
+        assert controller.queued == 0
+
+        waiter = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(QuotaExceededError):
+            await controller.acquire("b")
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.queued == 0
+        controller.release("a")
+        assert controller.in_flight == 0
+
+
+class TestQuotaHook:
+    @pytest.mark.asyncio
+    async def test_message_limit_yields_structured_rejection(self):
+        metrics = InMemoryMetricsProvider()
+        hook = QuotaHook(
+            QuotaPolicy(messages=RateLimit(capacity=1, refill_per_second=0.1)),
+            observability_provider=metrics,
+        )
+        agent = make_agent(hook)
+
+        assert not rejection_cards(await send(agent))
+        cards = rejection_cards(await send(agent))
+
+        assert len(cards) == 1
+        assert cards[0].status == "warning"
+        assert cards[0].metadata["limit"] == "messages"
+        assert cards[0].metadata["scope"] == "user:alice"
+        assert cards[0].metadata["retry_after_seconds"] > 0
+        assert metrics.get_counter("quota.rejected", {"limit": "messages"}) == 1
+
+        # Other users have their own bucket
+        assert not rejection_cards(await send(agent, "bob"))
+
+    @pytest.mark.asyncio
+    async def test_group_limit_is_shared(self):
+        hook = QuotaHook(
+            group_policies={
+                "acme": QuotaPolicy(messages=RateLimit(capacity=1, refill_per_second=0))
+            }
+        )
+        agent = make_agent(hook)
+
+        assert not rejection_cards(await send(agent, "alice"))
+        cards = rejection_cards(await send(agent, "bob"))
+        assert cards[0].metadata["scope"] == "group:acme"
+        assert "group's" in cards[0].description
+
+    @pytest.mark.asyncio
+    async def test_llm_tokens_charged_after_message(self):
+        hook = QuotaHook(
+            QuotaPolicy(llm_tokens=RateLimit(capacity=100, refill_per_second=0))
+        )
+        agent = make_agent(hook)
+
+        # The mock LLM uses 70 tokens per request
+        assert not rejection_cards(await send(agent))
+        assert not rejection_cards(await send(agent))
+        cards = rejection_cards(await send(agent))
+        assert cards[0].metadata["limit"] == "llm_tokens"
+        assert cards[0].metadata["retry_after_seconds"] is None
+
+    @pytest.mark.asyncio
+    async def test_sql_limit_fails_tool_instead_of_message(self):
+        tool = FakeSqlTool()
+        hook = QuotaHook(
+            QuotaPolicy(sql_executions=RateLimit(capacity=1, refill_per_second=0))
+        )
+        agent = make_agent(hook, llm=SqlCallingLlm(), tools=[tool])
+
+        await send(agent)
+        assert tool.executions == 1
+
+        components = await send(agent)
+        assert tool.executions == 1
+        assert rejection_cards(components)[0].metadata["limit"] == "sql_executions"
+        # The LLM still answered after the rejected tool call
+        assert any(
+            getattr(c.rich_component, "content", None) == "Done" for c in components
+        )
+
+    @pytest.mark.asyncio
+    async def test_admission_slot_released_on_every_path(self):
+        controller = AdmissionController(max_concurrent=1)
+        hook = QuotaHook(
+            QuotaPolicy(max_concurrent_messages=1), admission_controller=controller
+        )
+        agent = make_agent(hook)
+
+        await send(agent)
+        assert controller.in_flight == 0
+
+        # Client disconnects mid-stream
+        stream = agent.send_message(RequestContext(), "hello")
+        await stream.__anext__()
+        assert controller.in_flight == 1
+        await stream.aclose()
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_exempt_groups_are_not_limited(self):
+        hook = QuotaHook(
+            QuotaPolicy(messages=RateLimit(capacity=1, refill_per_second=0)),
+            exempt_groups=["acme"],
+        )
+        agent = make_agent(hook)
+        for _ in range(3):
+            assert not rejection_cards(await send(agent))
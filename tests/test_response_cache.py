@@ -0,0 +1,174 @@
+"""
+Tests for the LLM response cache middleware and its local backends.
+"""
+
+import time
+
+import pytest
+
+from vanna import Agent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.llm import LlmMessage, LlmRequest, LlmResponse
+from vanna.core.middleware import ResponseCacheMiddleware
+from vanna.core.registry import ToolRegistry
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import (
+    FileLlmResponseCache,
+    InMemoryMetricsProvider,
+    MemoryLlmResponseCache,
+)
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+
+class HeaderUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return User(id=request_context.get_header("x-user") or "alice")
+
+
+VOCABULARY = ["revenue", "sales", "total", "customers", "by", "month", "region"]
+
+
+def bag_of_words(text: str):
+    words = text.lower().replace("?", "").split()
+    return [float(words.count(word)) for word in VOCABULARY]
+
+
+def make_agent(llm, cache, temperature=0.0, stream=False) -> Agent:
+    return Agent(
+        llm_service=llm,
+        tool_registry=ToolRegistry(),
+        user_resolver=HeaderUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        config=AgentConfig(stream_responses=stream, temperature=temperature),
+        llm_middlewares=[cache],
+    )
+
+
+async def ask(agent, message, user_id="alice") -> str:
+    context = RequestContext(headers={"x-user": user_id})
+    components = [c async for c in agent.send_message(context, message)]
+    return "\n".join(getattr(c.rich_component, "content", "") or "" for c in components)
+
+
+def make_request(text: str, temperature: float = 0.0) -> LlmRequest:
+    return LlmRequest(
+        messages=[LlmMessage(role="user", content=text)],
+        user=User(id="alice"),
+        temperature=temperature,
+    )
+
+
+class TestResponseCacheMiddleware:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", [False, True])
+    async def test_repeated_question_skips_llm(self, stream):
+        llm = MockLlmService("Revenue was 42", latency=0, chunk_latency=0)
+        metrics = InMemoryMetricsProvider()
+        cache = ResponseCacheMiddleware(
+            MemoryLlmResponseCache(), observability_provider=metrics
+        )
+        agent = make_agent(llm, cache, stream=stream)
+
+        first = await ask(agent, "total revenue?")
+        second = await ask(agent, "total revenue?")
+
+        assert llm.call_count == 1
+        assert "Revenue was 42" in second
+        assert first == second
+        assert cache.hit_rate() == 0.5
+        assert metrics.get_counter("llm.cache.lookups", {"result": "hit"}) == 1
+        assert metrics.get_counter("llm.cache.lookups", {"result": "miss"}) == 1
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_bypass_cache(self):
+        llm = MockLlmService(latency=0, chunk_latency=0)
+        cache = ResponseCacheMiddleware()
+        agent = make_agent(llm, cache, temperature=0.7)
+
+        await ask(agent, "total revenue?")
+        await ask(agent, "total revenue?")
+
+        assert llm.call_count == 2
+        assert cache.hits == cache.misses == 0
+
+    @pytest.mark.asyncio
+    async def test_entries_are_scoped_per_user(self):
+        llm = MockLlmService(latency=0, chunk_latency=0)
+        agent = make_agent(llm, ResponseCacheMiddleware())
+
+        await ask(agent, "total revenue?", user_id="alice")
+        await ask(agent, "total revenue?", user_id="bob")
+        assert llm.call_count == 2
+
+        shared = MockLlmService(latency=0, chunk_latency=0)
+        agent = make_agent(shared, ResponseCacheMiddleware(per_user=False))
+        await ask(agent, "total revenue?", user_id="alice")
+        await ask(agent, "total revenue?", user_id="bob")
+        assert shared.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_semantic_tier_matches_similar_first_turns(self):
+        cache = ResponseCacheMiddleware(
+            embedding_function=bag_of_words, similarity_threshold=0.9
+        )
+        response = LlmResponse(content="SELECT SUM(revenue) ...")
+
+        question = make_request("total revenue by month?")
+        assert await cache.short_circuit_llm_request(question) is None
+        await cache.after_llm_response(question, response)
+
+        similar = make_request("Total revenue by month")
+        hit = await cache.short_circuit_llm_request(similar)
+        assert hit.content == response.content
+        assert hit.metadata["cache_tier"] == "semantic"
+        assert hit.usage is None
+
+        different = make_request("customers by region?")
+        assert await cache.short_circuit_llm_request(different) is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_not_served(self):
+        backend = MemoryLlmResponseCache()
+        cache = ResponseCacheMiddleware(backend, ttl_seconds=60)
+        request = make_request("total revenue?")
+        await cache.after_llm_response(request, LlmResponse(content="42"))
+        assert await cache.short_circuit_llm_request(request) is not None
+
+        await backend.set(
+            cache.compute_key(request), LlmResponse(content="42"), time.time() - 1
+        )
+        assert await cache.short_circuit_llm_request(request) is None
+        assert len(backend) == 0
+
+
+class TestLocalResponseCaches:
+    @pytest.mark.asyncio
+    async def test_memory_cache_evicts_least_recently_used(self):
+        cache = MemoryLlmResponseCache(max_entries=2)
+        await cache.set("a", LlmResponse(content="a"), None)
+        await cache.set("b", LlmResponse(content="b"), None)
+        await cache.get("a")
+        await cache.set("c", LlmResponse(content="c"), None)
+
+        assert await cache.get("b") is None
+        assert (await cache.get("a")).content == "a"
+
+    @pytest.mark.asyncio
+    async def test_file_cache_persists_and_evicts(self, tmp_path):
+        cache = FileLlmResponseCache(str(tmp_path), max_entries=10)
+        for i in range(12):
+            await cache.set(f"key{i}", LlmResponse(content=str(i)), None)
+
+        reopened = FileLlmResponseCache(str(tmp_path), max_entries=10)
+        assert (await reopened.get("key11")).content == "11"
+        assert await reopened.get("key0") is None
+        assert len(list(tmp_path.glob("*.json"))) <= 10
+
+        await reopened.set("old", LlmResponse(content="x"), time.time() - 1)
+        assert await reopened.get("old") is None
+        assert await reopened.get("../escape") is None
+
+        await reopened.clear()
+        assert await cache.get("key11") is None
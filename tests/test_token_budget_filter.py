@@ -0,0 +1,141 @@
+"""
+Tests for the token budget conversation filter.
+"""
+
+from typing import List
+
+import pytest
+
+from vanna.core.filter import ApproximateTokenizer, TokenBudgetFilter, Tokenizer
+from vanna.core.storage import Message
+from vanna.core.tool import ToolCall
+from vanna.integrations.local import InMemoryMetricsProvider
+
+
+class WordTokenizer(Tokenizer):
+    """One token per word, counting calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def count_tokens(self, text: str) -> int:
+        self.calls += 1
+        return len(text.split())
+
+
+def csv_output(rows: int) -> str:
+    return "\n".join(
+        ["id,name,total"] + [f"{i},customer {i},{i * 10}" for i in range(rows)]
+    )
+
+
+def turn(question: str, call_id: str, output: str) -> List[Message]:
+    return [
+        Message(role="user", content=question),
+        Message(
+            role="assistant",
+            content="",
+            tool_calls=[
+                ToolCall(id=call_id, name="run_sql", arguments={"sql": "SELECT"})
+            ],
+        ),
+        Message(role="tool", content=output, tool_call_id=call_id),
+        Message(role="assistant", content=f"Answer to {question}"),
+    ]
+
+
+class TestTokenBudgetFilter:
+    @pytest.mark.asyncio
+    async def test_under_budget_is_unchanged(self):
+        messages = turn("how many?", "c1", "42")
+        assert (
+            await TokenBudgetFilter(max_tokens=1000).filter_messages(messages)
+            == messages
+        )
+
+    @pytest.mark.asyncio
+    async def test_elides_earlier_tool_outputs_only(self):
+        metrics = InMemoryMetricsProvider()
+        budget = TokenBudgetFilter(
+            max_tokens=100_000,
+            tokenizer=WordTokenizer(),
+            max_tool_output_tokens=50,
+            tool_output_preview_tokens=10,
+            observability_provider=metrics,
+        )
+        messages = turn("first", "c1", csv_output(100)) + turn(
+            "second", "c2", csv_output(100)
+        )
+
+        filtered = await budget.filter_messages(messages)
+
+        assert len(filtered) == len(messages)
+        old_output, new_output = filtered[2].content, filtered[6].content
+        assert old_output.startswith("id,name,total\n0,customer 0,0")
+        assert "more lines" in old_output and "elided" in old_output
+        assert new_output == messages[6].content
+        # The conversation's own messages are not modified
+        assert messages[2].content == csv_output(100)
+
+        assert budget.tokens_saved_total > 0
+        saved = metrics.get_counter("agent.filter.tokens_saved")
+        assert saved == budget.tokens_saved_total
+
+    @pytest.mark.asyncio
+    async def test_drops_oldest_turns_keeping_tool_pairs(self):
+        budget = TokenBudgetFilter(max_tokens=60, tokenizer=WordTokenizer())
+        messages = (
+            turn("first question", "c1", "result one")
+            + turn("second question", "c2", "result two")
+            + turn("third question", "c3", "result three")
+        )
+
+        filtered = await budget.filter_messages(messages)
+
+        assert filtered[0].role == "user"
+        assert filtered[-4:] == messages[-4:]
+        assert sum(budget.count_message_tokens(m) for m in filtered) <= 60
+        call_ids = {tc.id for m in filtered for tc in m.tool_calls or []}
+        assert {m.tool_call_id for m in filtered if m.role == "tool"} == call_ids
+
+    @pytest.mark.asyncio
+    async def test_current_turn_is_kept_over_budget(self):
+        messages = turn("old", "c1", "x") + turn("current " * 50, "c2", "y")
+        filtered = await TokenBudgetFilter(max_tokens=10).filter_messages(messages)
+        assert filtered == messages[4:]
+
+    @pytest.mark.asyncio
+    async def test_token_counts_are_cached(self):
+        tokenizer = WordTokenizer()
+        budget = TokenBudgetFilter(max_tokens=1000, tokenizer=tokenizer)
+        messages = turn("how many?", "c1", "42")
+
+        await budget.filter_messages(messages)
+        calls = tokenizer.calls
+        await budget.filter_messages([m.model_copy() for m in messages])
+        assert tokenizer.calls == calls
+
+    @pytest.mark.asyncio
+    async def test_caches_do_not_keep_message_text(self):
+        budget = TokenBudgetFilter(
+            max_tokens=10_000, max_tool_output_tokens=20, tool_output_preview_tokens=10
+        )
+        output = csv_output(50)
+        messages = turn("list customers", "c1", output) + turn("thanks", "c2", "ok")
+
+        filtered = await budget.filter_messages(messages)
+        assert filtered[2].content != output
+        assert all(isinstance(key, bytes) for key in budget._token_counts)
+        assert list(budget._elisions.values()) == [filtered[2].content]
+
+    def test_caches_are_bounded(self):
+        budget = TokenBudgetFilter(cache_size=2)
+        for text in ("a", "b", "c", "a"):
+            budget._count_text(text)
+        assert len(budget._token_counts) == 2
+
+    def test_approximate_tokenizer_counts_punctuation(self):
+        tokenizer = ApproximateTokenizer()
+        assert tokenizer.count_tokens("") == 0
+        assert tokenizer.count_tokens("SELECT a, b FROM t;") == 8
+        assert tokenizer.count_tokens("customers") == 3
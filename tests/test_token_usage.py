@@ -0,0 +1,185 @@
+"""
+Tests for token usage and cost accounting.
+"""
+
+import pytest
+
+from vanna import Agent
+from vanna.core.agent.config import AgentConfig
+from vanna.core.evaluation import EfficiencyEvaluator, EvaluationRunner
+from vanna.core.evaluation import TestCase as EvalCase
+from vanna.core.llm import (
+    LlmRoute,
+    ModelPrice,
+    PriceTable,
+    RoutingLlmService,
+    TokenUsage,
+    capture_llm_usage,
+)
+from vanna.core.registry import ToolRegistry
+from vanna.core.user import User, UserResolver
+from vanna.core.user.request_context import RequestContext
+from vanna.integrations.local import InMemoryMetricsProvider, MemoryConversationStore
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+from vanna.integrations.mock import MockLlmService
+
+
+class SimpleUserResolver(UserResolver):
+    async def resolve_user(self, request_context: RequestContext) -> User:
+        return User(id="alice", email="alice@example.com")
+
+
+PRICES = PriceTable(
+    {
+        "mock": ModelPrice(
+            input_per_million=1.0,
+            output_per_million=10.0,
+            cached_input_per_million=0.1,
+        )
+    }
+)
+
+
+def make_agent(stream, llm=None, **kwargs):
+    if llm is None:
+        llm = MockLlmService()
+        llm.model = "mock-1"
+    return Agent(
+        llm_service=llm,
+        tool_registry=ToolRegistry(),
+        user_resolver=SimpleUserResolver(),
+        agent_memory=DemoAgentMemory(),
+        config=AgentConfig(stream_responses=stream),
+        price_table=PRICES,
+        **kwargs,
+    )
+
+
+class TestTokenUsage:
+    def test_openai_style(self):
+        usage = TokenUsage.from_dict(
+            {
+                "prompt_tokens": 100,
+                "completion_tokens": 20,
+                "total_tokens": 120,
+                "cached_tokens": 60,
+            }
+        )
+        assert usage == TokenUsage(
+            prompt_tokens=100, completion_tokens=20, cached_tokens=60, total_tokens=120
+        )
+
+    def test_anthropic_style_adds_cache_tokens_to_prompt(self):
+        usage = TokenUsage.from_dict(
+            {
+                "input_tokens": 10,
+                "output_tokens": 5,
+                "cache_read_input_tokens": 80,
+                "cache_creation_input_tokens": 10,
+            }
+        )
+        assert usage.prompt_tokens == 100
+        assert usage.cached_tokens == 80
+        assert usage.total_tokens == 105
+
+    def test_price_table_prefix_match_and_cached_price(self):
+        usage = TokenUsage(
+            prompt_tokens=1_000_000, cached_tokens=500_000, completion_tokens=100_000
+        )
+        assert PRICES.estimate_cost("mock-2024-01-01", usage) == pytest.approx(
+            0.5 + 0.05 + 1.0
+        )
+        assert PRICES.estimate_cost("other", usage) is None
+
+
+class TestAgentUsageAccounting:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", [True, False])
+    async def test_usage_captured_in_both_modes(self, stream):
+        store = MemoryConversationStore()
+        metrics = InMemoryMetricsProvider(drop_labels=())
+        agent = make_agent(
+            stream, conversation_store=store, observability_provider=metrics
+        )
+
+        with capture_llm_usage() as recorder:
+            async for _ in agent.send_message(
+                RequestContext(), "hello", conversation_id="c1"
+            ):
+                pass
+
+        assert len(recorder.records) == 1
+        record = recorder.records[0]
+        assert record.model == "mock-1"
+        assert record.stream is stream
+        assert record.usage.total_tokens == 70
+        assert recorder.summary.cost_usd == pytest.approx((50 + 20 * 10) / 1e6)
+
+        user = User(id="alice", email="alice@example.com")
+        conversation = await store.get_conversation("c1", user)
+        assert conversation.metadata["usage"]["usage"]["total_tokens"] == 70
+        assert conversation.messages[0].metadata["usage"]["llm_requests"] == 1
+
+        assert metrics.get_counter("llm.tokens.prompt", {"user_id": "alice"}) == 50
+        assert metrics.get_counter("agent.message.tokens") == 70
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stream", [True, False])
+    async def test_routed_usage_is_priced_by_serving_model(self, stream):
+        served = MockLlmService()
+        served.model = "mock-2"
+        llm = RoutingLlmService([LlmRoute("main", [served])])
+        agent = make_agent(stream, llm=llm)
+
+        with capture_llm_usage() as recorder:
+            async for _ in agent.send_message(RequestContext(), "hello"):
+                pass
+
+        assert [record.model for record in recorder.records] == ["mock-2"]
+        assert recorder.summary.cost_usd == pytest.approx((50 + 20 * 10) / 1e6)
+
+    @pytest.mark.asyncio
+    async def test_conversation_total_accumulates(self):
+        store = MemoryConversationStore()
+        agent = make_agent(False, conversation_store=store)
+
+        for text in ("first", "second"):
+            async for _ in agent.send_message(
+                RequestContext(), text, conversation_id="c1"
+            ):
+                pass
+
+        user = User(id="alice", email="alice@example.com")
+        conversation = await store.get_conversation("c1", user)
+        total = conversation.metadata["usage"]
+        assert total["llm_requests"] == 2
+        assert total["usage"]["total_tokens"] == 140
+
+
+class TestEvaluationUsage:
+    @pytest.mark.asyncio
+    async def test_agent_result_reports_usage(self):
+        runner = EvaluationRunner(
+            evaluators=[EfficiencyEvaluator(max_tokens=50, max_cost_usd=1e-6)]
+        )
+        report = await runner.run_evaluation(
+            make_agent(False),
+            [
+                EvalCase(
+                    id="t1",
+                    user=User(id="alice", email="alice@example.com"),
+                    message="hello",
+                )
+            ],
+        )
+
+        agent_result = report.results[0].agent_result
+        assert agent_result.total_tokens == 70
+        assert agent_result.prompt_tokens == 50
+        assert agent_result.completion_tokens == 20
+        assert len(agent_result.llm_requests) == 1
+        assert agent_result.estimated_cost_usd == pytest.approx(250 / 1e6)
+
+        evaluation = report.results[0].evaluations[0]
+        assert "Token usage 70 exceeded limit 50" in evaluation.reasoning
+        assert "Estimated cost" in evaluation.reasoning
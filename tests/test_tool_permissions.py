@@ -416,6 +416,99 @@ async def test_list_tools():
     assert "tool3" in tools
 
 
+class CountingTool(MockTool):
+    """Mock tool counting schema generations."""
+
+    def __init__(self, tool_name: str = "counting_tool"):
+        super().__init__(tool_name)
+        self.schema_calls = 0
+
+    def get_args_schema(self) -> Type[SimpleToolArgs]:
+        self.schema_calls += 1
+        return SimpleToolArgs
+
+
+@pytest.mark.asyncio
+async def test_get_schemas_is_cached(admin_user, regular_user):
+    """Test that schemas are generated once and lists memoized per group set."""
+    registry = ToolRegistry()
+    public, admin = CountingTool("public_tool"), CountingTool("admin_tool")
+    registry.register_local_tool(public, access_groups=[])
+    registry.register_local_tool(admin, access_groups=["admin"])
+
+    for _ in range(3):
+        admin_schemas = await registry.get_schemas(admin_user)
+        user_schemas = await registry.get_schemas(regular_user)
+
+    assert public.schema_calls == 1 and admin.schema_calls == 1
+    assert [s.name for s in admin_schemas] == ["public_tool", "admin_tool"]
+    assert [s.name for s in user_schemas] == ["public_tool"]
+    # Same schema objects, but callers get their own list
+    assert (await registry.get_schemas(admin_user))[0] is admin_schemas[0]
+    user_schemas.clear()
+    assert len(await registry.get_schemas(regular_user)) == 1
+
+
+@pytest.mark.asyncio
+async def test_register_and_unregister_invalidate_schemas(regular_user):
+    """Test that registry changes are reflected in cached schema lists."""
+    registry = ToolRegistry()
+    registry.register_local_tool(MockTool("tool1"), access_groups=[])
+    assert len(await registry.get_schemas(regular_user)) == 1
+
+    registry.register_local_tool(MockTool("tool2"), access_groups=["user"])
+    assert [s.name for s in await registry.get_schemas(regular_user)] == [
+        "tool1",
+        "tool2",
+    ]
+
+    assert registry.unregister_tool("tool1") is True
+    assert registry.unregister_tool("tool1") is False
+    assert [s.name for s in await registry.get_schemas(regular_user)] == ["tool2"]
+    assert await registry.list_tools() == ["tool2"]
+
+
+class AdminOnlyRegistry(ToolRegistry):
+    """Registry with custom permission logic."""
+
+    async def _validate_tool_permissions(self, tool, user: User) -> bool:
+        return "admin" in user.group_memberships
+
+
+@pytest.mark.asyncio
+async def test_get_schemas_honors_custom_permissions(admin_user, regular_user):
+    """Test that overridden permission checks bypass the memoized lists."""
+    registry = AdminOnlyRegistry()
+    registry.register_local_tool(MockTool("tool1"), access_groups=[])
+
+    assert len(await registry.get_schemas(admin_user)) == 1
+    assert await registry.get_schemas(regular_user) == []
+
+
+def test_tool_payload_cache_reuses_conversions():
+    """Test that converted tool payloads are cached by schema identity."""
+    from vanna.core.llm import ToolPayloadCache
+
+    conversions = []
+
+    def convert(tools):
+        conversions.append(len(tools))
+        return [t.name for t in tools]
+
+    cache = ToolPayloadCache(convert, max_entries=1)
+    first = [MockTool("a").get_schema(), MockTool("b").get_schema()]
+    second = first[:1]
+
+    assert cache.get(first) == ["a", "b"]
+    assert cache.get(list(first)) == ["a", "b"]
+    assert conversions == [2]
+
+    # A different list evicts the least recently used one
+    assert cache.get(second) == ["a"]
+    cache.get(first)
+    assert conversions == [2, 1, 2]
+
+
 # ============================================================================
 # transform_args Tests
 # ============================================================================